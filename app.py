@@ -8,32 +8,47 @@ import os
 import sys
 import json
 import asyncio
+import importlib
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
-import psutil
 from flask import Flask, render_template, jsonify, request, redirect, url_for, flash, make_response
 from flask_socketio import SocketIO, emit
-import requests
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
+from utils.health_prober import HealthProber
+from utils.system_sampler import get_system_sampler
+from utils.response_cache import get_response_cache
+from utils.push_hub import PushHub, RemotePushHub
+from utils.startup import get_startup
+from utils.engine_ipc import (EngineClient, EngineServer, EventRelay, forward_request,
+                              relay_to_socketio, socketio_transports, wsgi_handler)
+from services.email.email_aggregator import EmailAggregator
+from services.email.email_index import EmailFeed, InvalidCursor, parse_page_args
+
+# Expensive subsystems start on first use or in the warm-up after the server is listening
+startup = get_startup()
+
 # Import our modules
 try:
     from utils.templates import RoyalCourtesyTemplates
     from email_processing.router import EmailRouter
     from email_processing.parser import EmailParser
-    from models.database import db, product_model, order_model, team_model, kpi_model
+    from models.database import db, product_catalog, product_model, order_model, team_model, kpi_model, CheckoutError
     from utils.order_email import order_email_generator
+    startup.register('catalog', product_catalog.preload, required=False)  # Catalog pages skip the database
+    startup.register('order_pdf', lambda: importlib.import_module('reportlab.platypus'), required=False)
     models_available = True
 except ImportError as e:
     print(f"Warning: Could not import some modules: {e}")
     models_available = False
     # Set fallback models
+    product_catalog = None
     product_model = None
     order_model = None
     team_model = None
@@ -72,50 +87,116 @@ except ImportError as e:
     scenario_system_available = False
     get_scenario_manager = lambda: None
 
+startup.mark('imports')
+
+# Deployment role: 'standalone' (one process), or the 'engine' and 'worker' processes of cluster.py
+DASHBOARD_ROLE = os.environ.get('DASHBOARD_ROLE', 'standalone')
+SOCKETIO_MESSAGE_QUEUE = os.environ.get('SOCKETIO_MESSAGE_QUEUE')
+
 app = Flask(__name__, template_folder='dashboard/templates')
 app.secret_key = 'happy_buttons_dashboard_secret'
-socketio = SocketIO(app, cors_allowed_origins="*")
+socketio = SocketIO(app, cors_allowed_origins="*",
+                    message_queue=SOCKETIO_MESSAGE_QUEUE if DASHBOARD_ROLE == 'worker' else None)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# The engine owns all live state and emits through the message queue or its IPC relay;
+# web workers serve pages and catalog reads and forward everything else to it
+engine_server = engine = None
+emitter = socketio
+if DASHBOARD_ROLE == 'engine':
+    engine_server = EngineServer.from_env()
+    emitter = SocketIO(message_queue=SOCKETIO_MESSAGE_QUEUE) if SOCKETIO_MESSAGE_QUEUE else EventRelay(engine_server)
+    if models_available:
+        product_catalog.add_listener(lambda quantities: engine_server.publish('catalog', quantities))
+elif DASHBOARD_ROLE == 'worker':
+    engine = EngineClient.from_env()
+    if models_available:
+        engine.listen('catalog', lambda quantities: product_catalog.preload(), on_connect=product_catalog.preload)
+
+WORKER_LOCAL_ENDPOINTS = {
+    'static', 'health', 'dashboard', 'scenarios', 'mailbox_view', 'config', 'external', 'teams',
+    'kpi_dashboard', 'api_kpi_summary', 'shop', 'product_detail', 'cart', 'checkout',
+    'api_products', 'api_product_detail', 'api_add_to_cart', 'api_get_order'
+}
+# Response cache names of the WORKER_LOCAL_ENDPOINTS views that are cached
+WORKER_CACHED_RESPONSES = {'kpi_summary'}
+
+
+@app.before_request
+def forward_to_engine():
+    """In a web worker, run requests that need live state in the engine process"""
+    if engine is not None and request.endpoint not in WORKER_LOCAL_ENDPOINTS:
+        return forward_request(engine, request)
+
+
+@app.context_processor
+def socketio_client_options():
+    """Long-polling needs sticky sessions, so pages served by any cluster process use WebSocket only"""
+    return {'socketio_transports': socketio_transports(DASHBOARD_ROLE)}
+
 
 class SystemMonitor:
     """Monitors system health and performance"""
 
     def __init__(self):
-        self.metrics_history = []
-        self.max_history = 100
+        self.sampler = get_system_sampler()
 
-        # Initialize system components
-        try:
-            self.templates = RoyalCourtesyTemplates()
-            self.router = EmailRouter()
-            self.parser = EmailParser()
-            self.agents = create_business_agents()
-
-            # Initialize Release 3.0 scenario system
-            if scenario_system_available:
-                self.scenario_manager = get_scenario_manager()
-                logger.info("Scenario system initialized successfully")
-            else:
-                self.scenario_manager = None
+        # Other services are probed in the background, the dashboard is this process
+        self.health_prober = HealthProber({
+            'email_processor': {'name': 'Email Processing Service', 'port': 80},
+            'swarm_coordinator': {'name': 'Claude Flow Swarm', 'port': 80}
+        })
 
-            # Start agents asynchronously
-            self._start_agents()
-        except Exception as e:
-            logger.warning(f"Could not initialize all components: {e}")
-            self.templates = None
-            self.router = None
-            self.parser = None
-            self.agents = {}
-            self.scenario_manager = None
-
-    def _start_agents(self):
+        # System components are built on first use (or during the startup warm-up)
+        startup.register('email_processing', self._create_email_processing)
+        startup.register('agents', self._create_agents)
+        startup.register('scenarios', self._create_scenario_manager)
+
+    def _create_email_processing(self) -> Dict[str, Any]:
+        return {'templates': RoyalCourtesyTemplates(), 'router': EmailRouter(), 'parser': EmailParser()}
+
+    def _create_agents(self) -> Dict[str, Any]:
+        """Build the business agents and start them (runs their Claude Flow hooks)"""
+        agents = create_business_agents()
+        self._start_agents(agents)
+        return agents
+
+    def _create_scenario_manager(self):
+        """Initialize Release 3.0 scenario system"""
+        if not scenario_system_available:
+            return None
+        scenario_manager = get_scenario_manager()
+        logger.info("Scenario system initialized successfully")
+        return scenario_manager
+
+    @property
+    def templates(self):
+        return startup.get('email_processing', {}).get('templates')
+
+    @property
+    def router(self):
+        return startup.get('email_processing', {}).get('router')
+
+    @property
+    def parser(self):
+        return startup.get('email_processing', {}).get('parser')
+
+    @property
+    def agents(self) -> Dict[str, Any]:
+        """Started agents; empty while they are still starting so status polls never wait"""
+        return startup.get('agents', {}, wait=False)
+
+    @property
+    def scenario_manager(self):
+        return startup.get('scenarios')
+
+    def _start_agents(self, agents: Dict[str, Any]):
         """Start all agents asynchronously"""
         async def start_all_agents():
-            for agent_name, agent in self.agents.items():
+            for agent_name, agent in agents.items():
                 try:
                     if hasattr(agent, 'start'):
                         await agent.start()
@@ -133,92 +214,29 @@ class SystemMonitor:
             logger.error(f"Error starting agents: {e}")
 
     def get_system_metrics(self) -> Dict[str, Any]:
-        """Get current system metrics"""
+        """Get current system metrics (latest background sample)"""
         try:
-            # System resources
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
-
-            # Network info
-            network_stats = psutil.net_io_counters()
-
-            # Process count
-            process_count = len(psutil.pids())
-
-            metrics = {
-                'timestamp': datetime.now().isoformat(),
-                'system': {
-                    'cpu_percent': cpu_percent,
-                    'memory_percent': memory.percent,
-                    'memory_available_gb': memory.available / (1024**3),
-                    'memory_total_gb': memory.total / (1024**3),
-                    'disk_percent': (disk.used / disk.total) * 100,
-                    'disk_free_gb': disk.free / (1024**3),
-                    'disk_total_gb': disk.total / (1024**3),
-                    'process_count': process_count,
-                    'boot_time': psutil.boot_time()
-                },
-                'network': {
-                    'bytes_sent': network_stats.bytes_sent,
-                    'bytes_recv': network_stats.bytes_recv,
-                    'packets_sent': network_stats.packets_sent,
-                    'packets_recv': network_stats.packets_recv
-                }
-            }
-
-            # Add to history
-            self.metrics_history.append(metrics)
-            if len(self.metrics_history) > self.max_history:
-                self.metrics_history.pop(0)
-
-            return metrics
-
+            return self.sampler.latest()
         except Exception as e:
             logger.error(f"Error getting system metrics: {e}")
             return {}
 
+    @property
+    def metrics_history(self) -> List[Dict[str, Any]]:
+        """Recent metric snapshots, oldest first"""
+        return self.sampler.get_history()
+
     def get_service_status(self) -> Dict[str, Any]:
-        """Get status of all services"""
+        """Get status of all services (cached background health probes)"""
         services = {
             'dashboard': {
                 'name': 'Dashboard Server',
                 'port': 80,
                 'status': 'running',
                 'health': 'healthy'
-            },
-            'email_processor': {
-                'name': 'Email Processing Service',
-                'port': 80,
-                'status': 'checking',
-                'health': 'unknown'
-            },
-            'swarm_coordinator': {
-                'name': 'Claude Flow Swarm',
-                'port': 80,
-                'status': 'checking',
-                'health': 'unknown'
             }
         }
-
-        # Check each service
-        for service_name, service_info in services.items():
-            if service_name != 'dashboard':  # Skip self
-                try:
-                    if service_info.get('port'):
-                        response = requests.get(
-                            f"http://localhost:{service_info['port']}/health",
-                            timeout=2
-                        )
-                        if response.status_code == 200:
-                            services[service_name]['status'] = 'running'
-                            services[service_name]['health'] = 'healthy'
-                        else:
-                            services[service_name]['status'] = 'error'
-                            services[service_name]['health'] = 'unhealthy'
-                except requests.RequestException:
-                    services[service_name]['status'] = 'stopped'
-                    services[service_name]['health'] = 'offline'
+        services.update(self.health_prober.get_status())
 
         return services
 
@@ -316,14 +334,41 @@ class SystemMonitor:
 # Initialize monitor
 monitor = SystemMonitor()
 
+# Polled dashboard endpoints are served from short-lived cached responses; the engine's
+# invalidations also drop the copies of the endpoints workers serve themselves
+response_cache = get_response_cache()
+if DASHBOARD_ROLE == 'engine':
+    def publish_worker_invalidations(names):
+        """Only the responses workers cache themselves are announced (none given means all)"""
+        local = [name for name in names if name in WORKER_CACHED_RESPONSES]
+        if local or not names:
+            engine_server.publish('responses', local)
+
+    response_cache.add_listener(publish_worker_invalidations)
+elif DASHBOARD_ROLE == 'worker':
+    engine.listen('responses', lambda names: response_cache.invalidate(*names), on_connect=response_cache.invalidate)
+
+# Socket.IO clients subscribe to topics and receive sequenced deltas
+if DASHBOARD_ROLE == 'worker':
+    push_hub = RemotePushHub(socketio, engine.proxy('push'), f"worker-{os.environ.get('WORKER_ID', os.getpid())}")
+else:
+    push_hub = PushHub(emitter, interval=5.0)
+push_hub.add_topic('metrics', monitor.get_system_metrics)
+push_hub.add_topic('services', monitor.get_service_status)
+push_hub.add_topic('email_stats', monitor.get_email_stats)
+push_hub.add_topic('agents', monitor.get_agent_status)
+push_hub.add_topic('swarm', monitor.get_swarm_status)
+push_hub.add_topic('scenarios', lambda: monitor.scenario_manager.get_system_status() if monitor.scenario_manager else {})
+if DASHBOARD_ROLE != 'engine':
+    push_hub.register_handlers()
+
 def get_recent_emails(limit=20):
     """Get recent emails for display on landing page - PRODUCTION MODE: REAL EMAIL SERVER"""
     try:
-        # Check email settings mode
-        import yaml
+        # Check email settings mode (parsed once, reloaded only when the file changes)
         try:
-            with open('config/email_settings.yaml', 'r') as f:
-                email_config = yaml.safe_load(f)
+            from services.config.config_registry import load_config
+            email_config = load_config('config/email_settings.yaml')
             production_mode = email_config.get('mode') == 'production'
         except:
             production_mode = True  # Default to production if config not found
@@ -488,67 +533,115 @@ def get_recent_emails_old_simulation(limit=20):
     return sorted(emails, key=lambda x: x['timestamp'], reverse=True)
 
 
-def get_combined_emails_for_landing(limit=20):
-    """Get combined emails from all sources for landing page display"""
-    try:
-        all_emails = []
+def _display_timestamp(email):
+    """Datetime timestamps become strings so all sources sort together"""
+    if 'timestamp' in email and hasattr(email['timestamp'], 'strftime'):
+        email['timestamp'] = email['timestamp'].strftime('%Y-%m-%d %H:%M:%S+02:00')
+    return email
 
-        # 1. Get real mailbox emails
-        try:
-            real_emails = get_recent_emails(limit=limit//3)
-            for email in real_emails:
-                email['source'] = 'real_mailbox'
-                email['email_type'] = email.get('type', 'order')
-                all_emails.append(email)
-        except Exception as e:
-            logger.warning(f"Error loading real emails: {e}")
 
-        # 2. Get enhanced business simulation emails (if running)
-        if enhanced_simulation_available:
-            try:
-                enhanced_emails = enhanced_sim.get_generated_emails(limit//3)
-                for email in enhanced_emails:
-                    # Convert enhanced simulation format to display format
-                    converted_email = {
-                        'id': f'enhanced_{hash(str(email))}',
-                        'from': email.get('from', 'business@simulation.com'),
-                        'subject': email.get('subject', 'Business Simulation Email'),
-                        'content': email.get('body', 'Enhanced business simulation email'),
-                        'timestamp': email.get('timestamp', datetime.now()).strftime('%Y-%m-%d %H:%M:%S+02:00'),
-                        'time_ago': 'gerade eben',
-                        'priority': email.get('priority', 'medium'),
-                        'type': email.get('needs_escalation', False) and 'urgent' or 'simulation',
-                        'email_type': 'business',
-                        'source': 'enhanced_simulation',
-                        'routing': {
-                            'category': 'business',
-                            'confidence': 0.95,
-                            'destination': 'business_agent'
-                        },
-                        'attachments': []
-                    }
-                    all_emails.append(converted_email)
-            except Exception as e:
-                logger.warning(f"Error loading enhanced simulation emails: {e}")
+def fetch_real_mailbox_emails(count):
+    """Email source: real mailbox"""
+    emails = []
+    for email in get_recent_emails(limit=count):
+        email['source'] = 'real_mailbox'
+        email['email_type'] = email.get('type', 'order')
+        emails.append(_display_timestamp(email))
+    return emails
+
+
+def fetch_timewarp_emails(count):
+    """Email source: TimeWarp simulation (in-process, formerly an HTTP call to /api/emails/recent)"""
+    emails = []
+    for email in generated_email_feed.page(limit=count)['emails']:
+        email['source'] = 'timewarp_simulation'
+        email['email_type'] = email.get('category', 'order')
+        # Convert timestamp format if needed
+        if 'timestamp' in email:
+            email['timestamp'] = email['timestamp'].replace('T', ' ')
+        emails.append(email)
+    return emails
+
+
+def fetch_enhanced_simulation_emails(count):
+    """Email source: enhanced business simulation (if running)"""
+    enhanced_sim = startup.get('enhanced_simulation') if enhanced_simulation_available else None
+    if enhanced_sim is None:
+        return []
+
+    emails = []
+    for email in enhanced_sim.get_generated_emails(count):
+        # Convert enhanced simulation format to display format
+        emails.append({
+            'id': f'enhanced_{hash(str(email))}',
+            'from': email.get('from', 'business@simulation.com'),
+            'subject': email.get('subject', 'Business Simulation Email'),
+            'content': email.get('body', 'Enhanced business simulation email'),
+            'timestamp': email.get('timestamp', datetime.now()).strftime('%Y-%m-%d %H:%M:%S'),
+            'time_ago': 'simulation',
+            'priority': email.get('priority', 'medium'),
+            'type': 'simulation',
+            'email_type': 'business',
+            'source': 'enhanced_simulation',
+            'routing': {
+                'category': 'business',
+                'confidence': 0.95,
+                'destination': 'business_agent'
+            },
+            'attachments': []
+        })
+    return emails
+
+
+def fetch_scenario_emails(count):
+    """Email source: weakness injection scenarios"""
+    from src.scenarios.email_generator import scenario_email_generator
+
+    emails = []
+    for email in scenario_email_generator.get_scenario_emails(limit=count):
+        # Convert scenario email format to display format
+        emails.append({
+            'id': email.get('id', f'scenario_{hash(str(email))}'),
+            'from': email.get('from', 'scenario@simulation.com'),
+            'subject': email.get('subject', 'Scenario Email'),
+            'content': email.get('body', 'Scenario simulation email'),
+            'timestamp': email.get('timestamp', datetime.now().isoformat()).replace('T', ' '),
+            'time_ago': 'scenario',
+            'priority': email.get('urgency', 'medium'),
+            'type': email.get('email_type', 'scenario'),
+            'email_type': email.get('scenario_type', 'business'),
+            'source': 'scenario_emails',
+            'routing': {
+                'category': email.get('scenario_type', 'business'),
+                'confidence': 0.98,
+                'destination': 'business_agent'
+            },
+            'attachments': [],
+            'scenario_info': {
+                'scenario_type': email.get('scenario_type'),
+                'business_impact': email.get('business_impact', {}),
+                'sla_violation': email.get('sla_violation', False),
+                'customer_info': email.get('customer_info', {})
+            }
+        })
+    return emails
 
-        # Sort all emails by timestamp (most recent first)
-        # Convert timestamps to string format for consistent sorting
-        for email in all_emails:
-            if 'timestamp' in email and hasattr(email['timestamp'], 'strftime'):
-                email['timestamp'] = email['timestamp'].strftime('%Y-%m-%d %H:%M:%S+02:00')
 
-        all_emails.sort(key=lambda x: str(x.get('timestamp', '')), reverse=True)
+# In-process email aggregation: parallel fan-out, per-source deadlines and TTL caches
+email_aggregator = EmailAggregator()
+email_aggregator.add_source('real_mailbox', fetch_real_mailbox_emails, ttl=15.0, deadline=3.0)
+email_aggregator.add_source('timewarp_simulation', fetch_timewarp_emails, ttl=10.0, deadline=0.5)
+email_aggregator.add_source('enhanced_simulation', fetch_enhanced_simulation_emails, ttl=5.0, deadline=0.5)
+email_aggregator.add_source('scenario_emails', fetch_scenario_emails, ttl=10.0, deadline=1.0, share=4)
 
-        # Limit final result
-        return all_emails[:limit]
 
+def get_combined_emails_for_landing(limit=20):
+    """Get combined emails from all sources for landing page display"""
+    try:
+        return email_aggregator.get_emails(limit=limit, sources=['real_mailbox', 'enhanced_simulation'])
     except Exception as e:
         logger.error(f"Error combining emails for landing: {e}")
-        # Fallback to just real emails if combination fails
-        try:
-            return get_recent_emails(limit=limit)
-        except:
-            return []
+        return []
 
 
 @app.route('/')
@@ -601,7 +694,27 @@ def health():
     return jsonify({'status': 'healthy', 'timestamp': datetime.now().isoformat()})
 
 
+@app.route('/ready')
+def ready():
+    """Readiness check: 503 until every required subsystem has initialized
+
+    Under runners that skip the warm-up (gunicorn, the test client) the
+    first probe starts it for whatever is still pending.
+    """
+    readiness = startup.readiness()
+    if readiness['waiting_for']:
+        startup.warm_up(readiness['waiting_for'])
+    return jsonify(readiness), 200 if readiness['ready'] else 503
+
+
+@app.route('/api/startup/profile')
+def api_startup_profile():
+    """Startup profile: time and memory per startup phase and subsystem"""
+    return jsonify(startup.profile())
+
+
 @app.route('/api/metrics')
+@response_cache.cached('metrics', ttl=2)
 def api_metrics():
     """API endpoint for system metrics"""
     return jsonify(monitor.get_system_metrics())
@@ -614,18 +727,21 @@ def api_services():
 
 
 @app.route('/api/email/stats')
+@response_cache.cached('email_stats', ttl=10)
 def api_email_stats():
     """API endpoint for email statistics"""
     return jsonify(monitor.get_email_stats())
 
 
 @app.route('/api/agents')
+@response_cache.cached('agents', ttl=5)
 def api_agents():
     """API endpoint for agent status"""
     return jsonify(monitor.get_agent_status())
 
 
 @app.route('/api/swarm')
+@response_cache.cached('swarm', ttl=30)
 def api_swarm():
     """API endpoint for swarm status"""
     return jsonify(monitor.get_swarm_status())
@@ -763,58 +879,68 @@ def api_test_email():
         return jsonify({'success': False, 'error': str(e)})
 
 
-@app.route('/api/recent_emails')
-def api_recent_emails():
-    """API endpoint to get last 100 emails for agents page"""
+def enhance_recent_email(i, email):
+    """Add ID, time ago, routing info and attachments to a recent email"""
     try:
-        limit = request.args.get('limit', 100, type=int)
-        limit = min(limit, 100)  # Cap at 100 emails
+        email_time = datetime.strptime(email['timestamp'], '%Y-%m-%d %H:%M')
+        time_diff = datetime.now() - email_time
+        if time_diff.days > 0:
+            time_ago = f"vor {time_diff.days} Tag{'en' if time_diff.days > 1 else ''}"
+        elif time_diff.seconds > 3600:
+            hours = time_diff.seconds // 3600
+            time_ago = f"vor {hours} Stunde{'n' if hours > 1 else ''}"
+        else:
+            minutes = max(1, time_diff.seconds // 60)
+            time_ago = f"vor {minutes} Minute{'n' if minutes > 1 else ''}"
+    except:
+        time_ago = "gerade eben"
+
+    return {
+        'id': email.get('id', f'email_{i + 1}'),
+        'from': email['from'],
+        'subject': email['subject'],
+        'type': email['type'],
+        'content': email['content'],
+        'priority': email['priority'],
+        'timestamp': email['timestamp'],
+        'time_ago': time_ago,
+        'attachments': email.get('attachments_list', []),
+        'source': email.get('source'),
+        'routing': {
+            'destination': email.get('route', f"{email['type']}@h-bu.de"),
+            'category': email['type'],
+            'confidence': 0.85
+        }
+    }
 
-        recent_emails = get_recent_emails(limit=limit)
 
-        # Add more details for each email including ID, routing info, and attachments
-        enhanced_emails = []
-        for i, email in enumerate(recent_emails):
-            # Calculate time ago from timestamp
-            from datetime import datetime
-            try:
-                email_time = datetime.strptime(email['timestamp'], '%Y-%m-%d %H:%M')
-                time_diff = datetime.now() - email_time
-                if time_diff.days > 0:
-                    time_ago = f"vor {time_diff.days} Tag{'en' if time_diff.days > 1 else ''}"
-                elif time_diff.seconds > 3600:
-                    hours = time_diff.seconds // 3600
-                    time_ago = f"vor {hours} Stunde{'n' if hours > 1 else ''}"
-                else:
-                    minutes = max(1, time_diff.seconds // 60)
-                    time_ago = f"vor {minutes} Minute{'n' if minutes > 1 else ''}"
-            except:
-                time_ago = "gerade eben"
-
-            enhanced_email = {
-                'id': email.get('id', f'email_{i + 1}'),
-                'from': email['from'],
-                'subject': email['subject'],
-                'type': email['type'],
-                'content': email['content'],
-                'priority': email['priority'],
-                'timestamp': email['timestamp'],
-                'time_ago': time_ago,
-                'attachments': email.get('attachments_list', []),
-                'routing': {
-                    'destination': email.get('route', f"{email['type']}@h-bu.de"),
-                    'category': email['type'],
-                    'confidence': 0.85
-                }
-            }
-            enhanced_emails.append(enhanced_email)
+# The last 100 emails, enhanced once per refresh and paged from an index
+recent_email_feed = EmailFeed(
+    lambda index: index.replace(enhance_recent_email(i, email)
+                                for i, email in enumerate(get_recent_emails(limit=100))),
+    ttl=10,
+    fields={
+        'mailbox': lambda e: e['routing']['destination'].split('@')[0],
+        'priority': lambda e: e.get('priority'),
+        'type': lambda e: e.get('type'),
+        'source': lambda e: e.get('source')
+    }
+)
 
+
+@app.route('/api/recent_emails')
+def api_recent_emails():
+    """API endpoint to page through the last 100 emails for agents page"""
+    try:
+        page = recent_email_feed.page(**parse_page_args(request.args, default_limit=100))
         return jsonify({
             'success': True,
-            'emails': enhanced_emails,
-            'total': len(enhanced_emails)
+            **page,
+            'total': len(page['emails'])
         })
 
+    except InvalidCursor as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
@@ -1143,163 +1269,175 @@ def agent_details(agent_name):
             'message': str(e)
         }), 500
 
+def generate_recent_emails(count=100):
+    """Generate realistic TimeWarp simulation emails with full details, newest first"""
+    import random
+    from datetime import datetime, timedelta
+
+    # More detailed email configurations with human-like content
+    email_scenarios = [
+        {
+            'type': 'order', 'route': 'orders@h-bu.de', 'priority': 'high',
+            'senders': ['john.smith@oem1.com', 'sarah.jones@manufacturing-corp.com', 'orders@premium-buttons.com'],
+            'subjects': [
+                'URGENT: Need 15,000 Navy Blue Buttons for Q4 Production',
+                'Re: Bulk Order Quote - Custom Logo Buttons Required',
+                'Follow-up: December Delivery Timeline for Holiday Orders',
+                'Special Request: Eco-Friendly Button Materials'
+            ],
+            'content_templates': [
+                "Hi Happy Buttons team,\n\nWe're facing an unexpected demand surge and urgently need 15,000 navy blue buttons (part #HB-NB-2024) for our Q4 production line. Can you please confirm availability and expedited shipping options?\n\nOur production deadline is November 15th, so timing is critical.\n\nBest regards,\n{sender_name}",
+                "Dear procurement team,\n\nFollowing up on our previous discussion about custom logo buttons. We've finalized our design and need 8,500 units with our company logo embossed.\n\nAttached you'll find:\n- Final logo specifications\n- Preferred button dimensions\n- Color matching requirements\n\nLooking forward to your quote.\n\nKind regards,\n{sender_name}"
+            ],
+            'attachment_types': ['order_form.pdf', 'specifications.docx', 'logo_design.ai', 'purchase_order.xlsx']
+        },
+        {
+            'type': 'oem', 'route': 'oem1@h-bu.de', 'priority': 'critical',
+            'senders': ['premium.orders@bmw-supplier.com', 'procurement@audi-parts.de', 'vip@luxury-brands.com'],
+            'subjects': [
+                'BMW Project X7: Critical Timeline Update Required',
+                'Audi Q8 Interior - Button Quality Specifications',
+                'CONFIDENTIAL: New Luxury Brand Partnership Opportunity'
+            ],
+            'content_templates': [
+                "Dear Happy Buttons VIP Team,\n\nRegarding the BMW Project X7 initiative, we need to discuss potential timeline adjustments. Our engineering team has identified some specification refinements that may impact delivery.\n\nCould we schedule a priority call this week? This project is mission-critical for our Q1 2025 launch.\n\nConfidential regards,\n{sender_name}\nSenior Procurement Manager",
+                "Happy Buttons Premium Division,\n\nOur quality assurance team requires additional documentation for the Audi Q8 interior button specifications. The automotive grade requirements are more stringent than initially outlined.\n\nPlease prioritize this request as it affects our production certification timeline.\n\nBest,\n{sender_name}"
+            ],
+            'attachment_types': ['nda_agreement.pdf', 'technical_specs.dwg', 'quality_standards.pdf', 'project_timeline.mpp']
+        },
+        {
+            'type': 'supplier', 'route': 'supplier@h-bu.de', 'priority': 'medium',
+            'senders': ['logistics@china-materials.com', 'dispatch@mexico-production.mx', 'shipping@poland-factory.pl'],
+            'subjects': [
+                'Shipment Delay: Raw Materials from Guangzhou Factory',
+                'Weekly Production Report - Mexico Facility',
+                'Quality Control Update: Poland Manufacturing Line'
+            ],
+            'content_templates': [
+                "Dear Happy Buttons Supply Chain,\n\nWe regret to inform you of a 3-day delay in shipment HB-GM-240920 from our Guangzhou facility. This is due to unexpected customs inspections and port congestion.\n\nNew estimated arrival: September 27th\nOriginal ETA: September 24th\n\nWe're working with our logistics partners to minimize further delays.\n\nApologies for any inconvenience,\n{sender_name}\nSupply Chain Coordinator",
+                "Hello Happy Buttons Team,\n\nPlease find attached our weekly production report from the Mexico facility. We've exceeded targets by 12% this week and quality metrics remain at 99.2%.\n\nNotable achievements:\n- Zero safety incidents\n- Improved efficiency in button finishing\n- Successful implementation of new quality protocols\n\nBest regards,\n{sender_name}"
+            ],
+            'attachment_types': ['shipping_manifest.pdf', 'production_report.xlsx', 'quality_certificate.pdf', 'customs_docs.pdf']
+        },
+        {
+            'type': 'quality', 'route': 'quality@h-bu.de', 'priority': 'high',
+            'senders': ['inspector@quality-control.com', 'compliance@certification-body.org', 'lab@materials-testing.de'],
+            'subjects': [
+                'Quality Alert: Batch HB-2024-0920 Color Variance Detected',
+                'ISO 9001 Compliance Audit - Action Items',
+                'Material Testing Results: New Polymer Samples'
+            ],
+            'content_templates': [
+                "QUALITY ALERT - IMMEDIATE ATTENTION REQUIRED\n\nBatch ID: HB-2024-0920\nIssue: Color variance exceeding tolerance (±2.3 Delta E)\nAffected Units: 2,847 buttons\n\nOur quality team detected color inconsistencies during routine inspection. Batch is currently quarantined pending investigation.\n\nRoot cause analysis initiated.\nCustomer notification: Pending your approval\n\nPlease advise on next steps.\n\n{sender_name}\nQuality Assurance Manager",
+                "Dear Happy Buttons Quality Team,\n\nFollowing our ISO 9001 compliance audit, please find attached the detailed findings report. Overall performance is excellent with minor improvement opportunities identified.\n\nKey action items:\n1. Update calibration records for measurement equipment\n2. Enhance traceability documentation\n3. Review supplier qualification process\n\nCompliance deadline: October 15th, 2024\n\nRegards,\n{sender_name}"
+            ],
+            'attachment_types': ['quality_report.pdf', 'test_results.xlsx', 'audit_findings.docx', 'calibration_cert.pdf']
+        }
+    ]
+
+    def get_file_icon(filename):
+        """Return appropriate icon for file type"""
+        extension = filename.split('.')[-1].lower()
+        icon_map = {
+            'pdf': 'fas fa-file-pdf',
+            'docx': 'fas fa-file-word',
+            'doc': 'fas fa-file-word',
+            'xlsx': 'fas fa-file-excel',
+            'xls': 'fas fa-file-excel',
+            'ai': 'fas fa-file-image',
+            'dwg': 'fas fa-drafting-compass',
+            'mpp': 'fas fa-project-diagram',
+            'zip': 'fas fa-file-archive',
+            'jpg': 'fas fa-file-image',
+            'png': 'fas fa-file-image'
+        }
+        return icon_map.get(extension, 'fas fa-file')
+
+    recent_emails = []
+    now = datetime.now()
+
+    for i in range(count):
+        # Choose a scenario and generate human-like email
+        scenario = random.choice(email_scenarios)
+        sender = random.choice(scenario['senders'])
+        subject = random.choice(scenario['subjects'])
+
+        # Extract sender name for content personalization
+        sender_name = sender.split('@')[0].replace('.', ' ').title()
+        if '.' in sender_name:
+            sender_name = sender_name.replace('.', ' ')
+
+        # Generate email content
+        content_template = random.choice(scenario['content_templates'])
+        email_content = content_template.format(sender_name=sender_name)
+
+        # Create realistic attachments with clickable details
+        num_attachments = random.randint(0, 3)
+        attachments_list = []
+        if num_attachments > 0:
+            available_attachments = scenario['attachment_types']
+            selected_attachments = random.sample(available_attachments, min(num_attachments, len(available_attachments)))
+
+            for attachment_name in selected_attachments:
+                attachments_list.append({
+                    'name': attachment_name,
+                    'size': f'{random.randint(50, 2500)}KB',
+                    'type': attachment_name.split('.')[-1].upper(),
+                    'url': f'/api/emails/attachment/{i+1}/{attachment_name}',
+                    'icon': get_file_icon(attachment_name)
+                })
+
+        # Create timestamp going backwards
+        minutes_ago = i * random.randint(2, 15)
+        timestamp = now - timedelta(minutes=minutes_ago)
+
+        email = {
+            'id': f'email_{i+1}',
+            'from': sender,
+            'from_name': sender_name,
+            'to': 'info@h-bu.de',
+            'subject': subject,
+            'content': email_content,
+            'timestamp': timestamp.isoformat(),
+            'time_ago': f'vor {minutes_ago} Min' if minutes_ago < 60 else f'vor {minutes_ago//60}h {minutes_ago%60}m',
+            'routed_to': scenario['route'],
+            'priority': scenario['priority'],
+            'status': random.choice(['processed', 'routed', 'escalated', 'auto_replied']),
+            'category': scenario['type'],
+            'size': f'{random.randint(15, 250)}KB',
+            'attachments': num_attachments,
+            'attachments_list': attachments_list,
+            'processing_time': f'{random.randint(50, 500)}ms',
+            'auto_reply_sent': random.choice([True, False]),
+            'escalation_level': random.choice([None, 'management', 'urgent']) if scenario['priority'] == 'critical' else None,
+            'importance': random.choice(['normal', 'high', 'urgent']) if scenario['priority'] in ['high', 'critical'] else 'normal',
+            'read_receipt_requested': random.choice([True, False]) if scenario['priority'] == 'critical' else False
+        }
+
+        recent_emails.append(email)
+
+    return recent_emails
+
+
+# Generated emails are rebuilt once a minute instead of on every request
+generated_email_feed = EmailFeed(lambda index: index.replace(generate_recent_emails()), ttl=60)
+
+
 @app.route('/api/emails/recent')
 def recent_emails():
-    """Get the last 100 processed emails with full details"""
+    """Get processed emails with full details, newest first (cursor paginated)"""
     try:
-        # Generate realistic email data for the last 100 emails
-        import random
-        from datetime import datetime, timedelta
-
-        # More detailed email configurations with human-like content
-        email_scenarios = [
-            {
-                'type': 'order', 'route': 'orders@h-bu.de', 'priority': 'high',
-                'senders': ['john.smith@oem1.com', 'sarah.jones@manufacturing-corp.com', 'orders@premium-buttons.com'],
-                'subjects': [
-                    'URGENT: Need 15,000 Navy Blue Buttons for Q4 Production',
-                    'Re: Bulk Order Quote - Custom Logo Buttons Required',
-                    'Follow-up: December Delivery Timeline for Holiday Orders',
-                    'Special Request: Eco-Friendly Button Materials'
-                ],
-                'content_templates': [
-                    "Hi Happy Buttons team,\n\nWe're facing an unexpected demand surge and urgently need 15,000 navy blue buttons (part #HB-NB-2024) for our Q4 production line. Can you please confirm availability and expedited shipping options?\n\nOur production deadline is November 15th, so timing is critical.\n\nBest regards,\n{sender_name}",
-                    "Dear procurement team,\n\nFollowing up on our previous discussion about custom logo buttons. We've finalized our design and need 8,500 units with our company logo embossed.\n\nAttached you'll find:\n- Final logo specifications\n- Preferred button dimensions\n- Color matching requirements\n\nLooking forward to your quote.\n\nKind regards,\n{sender_name}"
-                ],
-                'attachment_types': ['order_form.pdf', 'specifications.docx', 'logo_design.ai', 'purchase_order.xlsx']
-            },
-            {
-                'type': 'oem', 'route': 'oem1@h-bu.de', 'priority': 'critical',
-                'senders': ['premium.orders@bmw-supplier.com', 'procurement@audi-parts.de', 'vip@luxury-brands.com'],
-                'subjects': [
-                    'BMW Project X7: Critical Timeline Update Required',
-                    'Audi Q8 Interior - Button Quality Specifications',
-                    'CONFIDENTIAL: New Luxury Brand Partnership Opportunity'
-                ],
-                'content_templates': [
-                    "Dear Happy Buttons VIP Team,\n\nRegarding the BMW Project X7 initiative, we need to discuss potential timeline adjustments. Our engineering team has identified some specification refinements that may impact delivery.\n\nCould we schedule a priority call this week? This project is mission-critical for our Q1 2025 launch.\n\nConfidential regards,\n{sender_name}\nSenior Procurement Manager",
-                    "Happy Buttons Premium Division,\n\nOur quality assurance team requires additional documentation for the Audi Q8 interior button specifications. The automotive grade requirements are more stringent than initially outlined.\n\nPlease prioritize this request as it affects our production certification timeline.\n\nBest,\n{sender_name}"
-                ],
-                'attachment_types': ['nda_agreement.pdf', 'technical_specs.dwg', 'quality_standards.pdf', 'project_timeline.mpp']
-            },
-            {
-                'type': 'supplier', 'route': 'supplier@h-bu.de', 'priority': 'medium',
-                'senders': ['logistics@china-materials.com', 'dispatch@mexico-production.mx', 'shipping@poland-factory.pl'],
-                'subjects': [
-                    'Shipment Delay: Raw Materials from Guangzhou Factory',
-                    'Weekly Production Report - Mexico Facility',
-                    'Quality Control Update: Poland Manufacturing Line'
-                ],
-                'content_templates': [
-                    "Dear Happy Buttons Supply Chain,\n\nWe regret to inform you of a 3-day delay in shipment HB-GM-240920 from our Guangzhou facility. This is due to unexpected customs inspections and port congestion.\n\nNew estimated arrival: September 27th\nOriginal ETA: September 24th\n\nWe're working with our logistics partners to minimize further delays.\n\nApologies for any inconvenience,\n{sender_name}\nSupply Chain Coordinator",
-                    "Hello Happy Buttons Team,\n\nPlease find attached our weekly production report from the Mexico facility. We've exceeded targets by 12% this week and quality metrics remain at 99.2%.\n\nNotable achievements:\n- Zero safety incidents\n- Improved efficiency in button finishing\n- Successful implementation of new quality protocols\n\nBest regards,\n{sender_name}"
-                ],
-                'attachment_types': ['shipping_manifest.pdf', 'production_report.xlsx', 'quality_certificate.pdf', 'customs_docs.pdf']
-            },
-            {
-                'type': 'quality', 'route': 'quality@h-bu.de', 'priority': 'high',
-                'senders': ['inspector@quality-control.com', 'compliance@certification-body.org', 'lab@materials-testing.de'],
-                'subjects': [
-                    'Quality Alert: Batch HB-2024-0920 Color Variance Detected',
-                    'ISO 9001 Compliance Audit - Action Items',
-                    'Material Testing Results: New Polymer Samples'
-                ],
-                'content_templates': [
-                    "QUALITY ALERT - IMMEDIATE ATTENTION REQUIRED\n\nBatch ID: HB-2024-0920\nIssue: Color variance exceeding tolerance (±2.3 Delta E)\nAffected Units: 2,847 buttons\n\nOur quality team detected color inconsistencies during routine inspection. Batch is currently quarantined pending investigation.\n\nRoot cause analysis initiated.\nCustomer notification: Pending your approval\n\nPlease advise on next steps.\n\n{sender_name}\nQuality Assurance Manager",
-                    "Dear Happy Buttons Quality Team,\n\nFollowing our ISO 9001 compliance audit, please find attached the detailed findings report. Overall performance is excellent with minor improvement opportunities identified.\n\nKey action items:\n1. Update calibration records for measurement equipment\n2. Enhance traceability documentation\n3. Review supplier qualification process\n\nCompliance deadline: October 15th, 2024\n\nRegards,\n{sender_name}"
-                ],
-                'attachment_types': ['quality_report.pdf', 'test_results.xlsx', 'audit_findings.docx', 'calibration_cert.pdf']
-            }
-        ]
-
-        def get_file_icon(filename):
-            """Return appropriate icon for file type"""
-            extension = filename.split('.')[-1].lower()
-            icon_map = {
-                'pdf': 'fas fa-file-pdf',
-                'docx': 'fas fa-file-word',
-                'doc': 'fas fa-file-word',
-                'xlsx': 'fas fa-file-excel',
-                'xls': 'fas fa-file-excel',
-                'ai': 'fas fa-file-image',
-                'dwg': 'fas fa-drafting-compass',
-                'mpp': 'fas fa-project-diagram',
-                'zip': 'fas fa-file-archive',
-                'jpg': 'fas fa-file-image',
-                'png': 'fas fa-file-image'
-            }
-            return icon_map.get(extension, 'fas fa-file')
-
-        recent_emails = []
-        now = datetime.now()
-
-        for i in range(100):
-            # Choose a scenario and generate human-like email
-            scenario = random.choice(email_scenarios)
-            sender = random.choice(scenario['senders'])
-            subject = random.choice(scenario['subjects'])
-
-            # Extract sender name for content personalization
-            sender_name = sender.split('@')[0].replace('.', ' ').title()
-            if '.' in sender_name:
-                sender_name = sender_name.replace('.', ' ')
-
-            # Generate email content
-            content_template = random.choice(scenario['content_templates'])
-            email_content = content_template.format(sender_name=sender_name)
-
-            # Create realistic attachments with clickable details
-            num_attachments = random.randint(0, 3)
-            attachments_list = []
-            if num_attachments > 0:
-                available_attachments = scenario['attachment_types']
-                selected_attachments = random.sample(available_attachments, min(num_attachments, len(available_attachments)))
-
-                for attachment_name in selected_attachments:
-                    attachments_list.append({
-                        'name': attachment_name,
-                        'size': f'{random.randint(50, 2500)}KB',
-                        'type': attachment_name.split('.')[-1].upper(),
-                        'url': f'/api/emails/attachment/{i+1}/{attachment_name}',
-                        'icon': get_file_icon(attachment_name)
-                    })
-
-            # Create timestamp going backwards
-            minutes_ago = i * random.randint(2, 15)
-            timestamp = now - timedelta(minutes=minutes_ago)
-
-            email = {
-                'id': f'email_{i+1}',
-                'from': sender,
-                'from_name': sender_name,
-                'to': 'info@h-bu.de',
-                'subject': subject,
-                'content': email_content,
-                'timestamp': timestamp.isoformat(),
-                'time_ago': f'vor {minutes_ago} Min' if minutes_ago < 60 else f'vor {minutes_ago//60}h {minutes_ago%60}m',
-                'routed_to': scenario['route'],
-                'priority': scenario['priority'],
-                'status': random.choice(['processed', 'routed', 'escalated', 'auto_replied']),
-                'category': scenario['type'],
-                'size': f'{random.randint(15, 250)}KB',
-                'attachments': num_attachments,
-                'attachments_list': attachments_list,
-                'processing_time': f'{random.randint(50, 500)}ms',
-                'auto_reply_sent': random.choice([True, False]),
-                'escalation_level': random.choice([None, 'management', 'urgent']) if scenario['priority'] == 'critical' else None,
-                'importance': random.choice(['normal', 'high', 'urgent']) if scenario['priority'] in ['high', 'critical'] else 'normal',
-                'read_receipt_requested': random.choice([True, False]) if scenario['priority'] == 'critical' else False
-            }
-
-            recent_emails.append(email)
-
+        page_args = parse_page_args(request.args, default_limit=100)
+        page = generated_email_feed.page(**page_args)
         return jsonify({
             'status': 'success',
-            'total_count': 20,
-            'emails': recent_emails,
-            'last_updated': now.isoformat()
+            'total_count': generated_email_feed.index.count(page_args['filters']),
+            **page,
+            'last_updated': datetime.now().isoformat()
         })
 
+    except InvalidCursor as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
         logger.error(f"Error retrieving recent emails: {e}")
         return jsonify({
@@ -1352,150 +1490,91 @@ def download_attachment(email_id, filename):
             'message': f'Failed to download {filename}'
         }), 500
 
-@app.route('/api/agents/mailbox/<mailbox_name>')
-def mailbox_details(mailbox_name):
-    """Get detailed mailbox information with real emails"""
-    try:
-        # Get all emails from combined endpoint
-        all_emails = []
-        limit = 100  # Get more emails for filtering
+def mailboxes_for(email):
+    """Mailboxes an email is shown in (info gets all emails for now)"""
+    email_type = email.get('email_type', '').lower()
+    routing_category = email.get('routing', {}).get('category', '').lower() if isinstance(email.get('routing'), dict) else ''
+    subject = email.get('subject', '').lower()
+
+    mailboxes = ['info']
+    if (email_type in ['order', 'expedite_request'] or 'order' in subject or 'expedite' in subject or
+            routing_category in ['order', 'expedite']):
+        mailboxes.append('orders')
+    if email_type in ['quality', 'complaint'] or 'quality' in subject or routing_category == 'quality':
+        mailboxes.append('quality')
+    if email_type == 'supplier' or 'supplier' in subject or routing_category == 'supplier':
+        mailboxes.append('supplier')
+    if email_type == 'oem' or 'oem' in subject or routing_category == 'oem':
+        mailboxes.append('oem')
+    if email_type == 'management' or email.get('priority') == 'critical' or routing_category == 'management':
+        mailboxes.append('management')
+    return mailboxes
+
+
+def sync_mailbox_emails(index):
+    """Add each source's latest emails; earlier ones stay browsable until the index is full"""
+    for emails in email_aggregator.get_source_emails(count=100).values():
+        index.add_many(emails)
+
+
+# Aggregated emails indexed by mailbox, priority, type and source
+mailbox_email_feed = EmailFeed(
+    sync_mailbox_emails,
+    ttl=5,
+    max_size=5000,
+    fields={
+        'mailbox': mailboxes_for,
+        'priority': lambda e: e.get('priority'),
+        'type': lambda e: e.get('email_type'),
+        'source': lambda e: e.get('source'),
+        'today': lambda e: 'today' in str(e.get('timestamp', '')) or 'vor' in str(e.get('time_ago', ''))
+    }
+)
+
+
+def get_mailbox_details(mailbox_name, limit=10, cursor=None, filters=None):
+    """Mailbox summary with one page of its emails (the first page is pushed as topic mailbox:<name>)"""
+    filters = {**(filters or {}), 'mailbox': mailbox_name}
+    page = mailbox_email_feed.page(limit, cursor, filters)
+    index = mailbox_email_feed.index
+
+    # Format recent emails for display
+    recent_emails = []
+    for email in page['emails']:
+        recent_emails.append({
+            'id': email.get('id'),
+            'from': email.get('from', 'Unknown'),
+            'subject': email.get('subject', 'No Subject'),
+            'time': email.get('time_ago', 'Unknown'),
+            'timestamp': email.get('timestamp'),
+            'routed_to': f'{mailbox_name}@h-bu.de',
+            'status': email.get('status', 'processed'),
+            'priority': email.get('priority', 'medium'),
+            'source': email.get('source', 'unknown'),
+            'content': email.get('content', '')[:200] + '...' if len(email.get('content', '')) > 200 else email.get('content', '')
+        })
 
-        # 1. Get real mailbox emails
-        try:
-            real_emails = get_recent_emails(limit=limit//3)
-            for email in real_emails:
-                email['source'] = 'real_mailbox'
-                email['email_type'] = email.get('type', 'order')
-                all_emails.append(email)
-        except Exception as e:
-            logger.warning(f"Error loading real emails: {e}")
+    return {
+        'address': f'{mailbox_name}@h-bu.de',
+        'total_emails': index.count(filters),
+        'today_emails': index.count({**filters, 'today': True}),
+        'recent_emails': recent_emails,
+        'next_cursor': page['next_cursor'],
+        'has_more': page['has_more']
+    }
 
-        # 2. Get TimeWarp simulation emails
-        try:
-            import requests
-            response = requests.get(f'http://localhost:{request.environ.get("SERVER_PORT", "80")}/api/emails/recent?limit={limit//3}')
-            if response.status_code == 200:
-                sim_data = response.json()
-                if sim_data.get('emails'):
-                    for email in sim_data['emails'][:limit//3]:
-                        email['source'] = 'timewarp_simulation'
-                        email['email_type'] = email.get('category', 'order')
-                        if 'timestamp' in email:
-                            email['timestamp'] = email['timestamp'].replace('T', ' ')
-                        all_emails.append(email)
-        except Exception as e:
-            logger.warning(f"Error loading TimeWarp emails: {e}")
 
-        # 3. Get enhanced business simulation emails
-        if enhanced_simulation_available:
-            try:
-                enhanced_emails = enhanced_sim.get_generated_emails(limit//3)
-                for email in enhanced_emails:
-                    converted_email = {
-                        'id': f'enhanced_{hash(str(email))}',
-                        'from': email.get('from', 'business@simulation.com'),
-                        'subject': email.get('subject', 'Business Simulation Email'),
-                        'content': email.get('body', 'Enhanced business simulation email'),
-                        'timestamp': email.get('timestamp', datetime.now()).strftime('%Y-%m-%d %H:%M:%S'),
-                        'time_ago': 'simulation',
-                        'priority': email.get('priority', 'medium'),
-                        'type': 'simulation',
-                        'email_type': 'business',
-                        'source': 'enhanced_simulation'
-                    }
-                    all_emails.append(converted_email)
-            except Exception as e:
-                logger.warning(f"Error loading enhanced simulation emails: {e}")
+push_hub.add_topic('mailbox:', get_mailbox_details)
 
-        # 4. Get scenario emails
-        try:
-            from src.scenarios.email_generator import scenario_email_generator
-            scenario_emails = scenario_email_generator.get_scenario_emails(limit=limit//4)
-            for email in scenario_emails:
-                converted_email = {
-                    'id': email.get('id', f'scenario_{hash(str(email))}'),
-                    'from': email.get('from', 'scenario@simulation.com'),
-                    'subject': email.get('subject', 'Scenario Email'),
-                    'content': email.get('body', 'Scenario simulation email'),
-                    'timestamp': email.get('timestamp', datetime.now().isoformat()).replace('T', ' '),
-                    'time_ago': 'scenario',
-                    'priority': email.get('urgency', 'medium'),
-                    'type': email.get('email_type', 'scenario'),
-                    'email_type': email.get('scenario_type', 'business'),
-                    'source': 'scenario_emails',
-                    'scenario_info': email.get('scenario_info', {})
-                }
-                all_emails.append(converted_email)
-        except Exception as e:
-            logger.warning(f"Error loading scenario emails: {e}")
-
-        # Filter emails by mailbox type
-        filtered_emails = []
-        for email in all_emails:
-            email_type = email.get('email_type', '').lower()
-            routing_category = email.get('routing', {}).get('category', '').lower() if isinstance(email.get('routing'), dict) else ''
-
-            # Route emails to appropriate mailboxes
-            if mailbox_name == 'orders' and (
-                email_type in ['order', 'expedite_request'] or
-                'order' in email.get('subject', '').lower() or
-                'expedite' in email.get('subject', '').lower() or
-                routing_category in ['order', 'expedite']
-            ):
-                filtered_emails.append(email)
-            elif mailbox_name == 'quality' and (
-                email_type in ['quality', 'complaint'] or
-                'quality' in email.get('subject', '').lower() or
-                routing_category == 'quality'
-            ):
-                filtered_emails.append(email)
-            elif mailbox_name == 'supplier' and (
-                email_type == 'supplier' or
-                'supplier' in email.get('subject', '').lower() or
-                routing_category == 'supplier'
-            ):
-                filtered_emails.append(email)
-            elif mailbox_name == 'oem' and (
-                email_type == 'oem' or
-                'oem' in email.get('subject', '').lower() or
-                routing_category == 'oem'
-            ):
-                filtered_emails.append(email)
-            elif mailbox_name == 'management' and (
-                email_type == 'management' or
-                email.get('priority') == 'critical' or
-                routing_category == 'management'
-            ):
-                filtered_emails.append(email)
-            elif mailbox_name == 'info':
-                # Info gets all emails for now
-                filtered_emails.append(email)
-
-        # Sort by timestamp
-        filtered_emails.sort(key=lambda x: str(x.get('timestamp', '')), reverse=True)
-
-        # Format recent emails for display
-        recent_emails = []
-        for email in filtered_emails[:10]:  # Show last 10 emails
-            recent_emails.append({
-                'id': email.get('id'),
-                'from': email.get('from', 'Unknown'),
-                'subject': email.get('subject', 'No Subject'),
-                'time': email.get('time_ago', 'Unknown'),
-                'timestamp': email.get('timestamp'),
-                'routed_to': f'{mailbox_name}@h-bu.de',
-                'status': email.get('status', 'processed'),
-                'priority': email.get('priority', 'medium'),
-                'source': email.get('source', 'unknown'),
-                'content': email.get('content', '')[:200] + '...' if len(email.get('content', '')) > 200 else email.get('content', '')
-            })
 
-        return jsonify({
-            'address': f'{mailbox_name}@h-bu.de',
-            'total_emails': len(filtered_emails),
-            'today_emails': len([e for e in filtered_emails if 'today' in str(e.get('timestamp', '')) or 'vor' in str(e.get('time_ago', ''))]),
-            'recent_emails': recent_emails
-        })
+@app.route('/api/agents/mailbox/<mailbox_name>')
+def mailbox_details(mailbox_name):
+    """Get detailed mailbox information with real emails"""
+    try:
+        page_args = parse_page_args(request.args, default_limit=10)
+        return jsonify(get_mailbox_details(mailbox_name, **page_args))
+    except InvalidCursor as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
         logger.error(f"Error in mailbox endpoint: {e}")
         return jsonify({
@@ -1518,38 +1597,24 @@ def handle_connect():
 @socketio.on('disconnect')
 def handle_disconnect():
     """Handle WebSocket disconnection"""
+    push_hub.remove_client(request.sid)
     logger.info('Client disconnected from dashboard')
 
 
 @socketio.on('request_update')
 def handle_request_update():
-    """Handle real-time update requests"""
+    """Handle real-time update requests (served from the push hub's current snapshots)"""
     try:
-        data = {
-            'metrics': monitor.get_system_metrics(),
-            'services': monitor.get_service_status(),
-            'email_stats': monitor.get_email_stats(),
-            'agents': monitor.get_agent_status(),
-            'swarm': monitor.get_swarm_status()
-        }
+        data = {topic: push_hub.current(topic)
+                for topic in ('metrics', 'services', 'email_stats', 'agents', 'swarm')}
         emit('update', data)
     except Exception as e:
         emit('error', {'message': str(e)})
 
 
 def background_updates():
-    """Send periodic updates to connected clients"""
-    while True:
-        try:
-            socketio.sleep(5)  # Update every 5 seconds
-            data = {
-                'metrics': monitor.get_system_metrics(),
-                'services': monitor.get_service_status(),
-                'timestamp': datetime.now().isoformat()
-            }
-            socketio.emit('auto_update', data)
-        except Exception as e:
-            logger.error(f"Error in background updates: {e}")
+    """Push changed topic fields to subscribed clients every 5 seconds"""
+    push_hub.run()
 
 
 # ===== WEBSHOP ROUTES =====
@@ -1571,16 +1636,9 @@ def shop():
             }
             total_products = 3
         else:
-            products = product_model.get_all_products()
-
-            # Group products by category for better display
-            products_by_category = {}
-            for product in products:
-                category = product['category']
-                if category not in products_by_category:
-                    products_by_category[category] = []
-                products_by_category[category].append(product)
-            total_products = len(products)
+            # Grouped by category in the catalog cache
+            products_by_category = product_catalog.get_products_grouped()
+            total_products = sum(len(products) for products in products_by_category.values())
 
         return render_template('shop.html',
                              products_by_category=products_by_category,
@@ -1637,16 +1695,30 @@ def checkout():
 
 # ===== WEBSHOP API ROUTES =====
 
+def conditional_json(etag: str, build_payload):
+    """JSON response carrying an ETag; answers 304 without building the payload if the client copy is current"""
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+    else:
+        response = jsonify(build_payload())
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
 @app.route('/api/shop/products')
 def api_products():
     """API: Get all products"""
     try:
-        products = product_model.get_all_products()
-        return jsonify({
-            'status': 'success',
-            'products': products,
-            'total_count': len(products)
-        })
+        def payload():
+            products = product_catalog.get_all_products()
+            return {
+                'status': 'success',
+                'products': products,
+                'total_count': len(products)
+            }
+
+        return conditional_json(product_catalog.etag(), payload)
     except Exception as e:
         logger.error(f"Error fetching products: {e}")
         return jsonify({'status': 'error', 'message': str(e)}), 500
@@ -1656,11 +1728,11 @@ def api_products():
 def api_product_detail(product_id):
     """API: Get product by ID"""
     try:
-        product = product_model.get_product_by_id(product_id)
+        product = product_catalog.get_product_by_id(product_id)
         if not product:
             return jsonify({'status': 'error', 'message': 'Product not found'}), 404
 
-        return jsonify({
+        return conditional_json(product_catalog.etag(), lambda: {
             'status': 'success',
             'product': product
         })
@@ -1745,29 +1817,6 @@ def api_create_order():
             })
 
         # Normal mode with database models
-        # Calculate total and validate items
-        total_amount = 0
-        order_items = []
-
-        for item in data['items']:
-            product = product_model.get_product_by_id(item['product_id'])
-            if not product:
-                return jsonify({'status': 'error', 'message': f'Product {item["product_id"]} not found'}), 404
-
-            if product['stock_quantity'] < item['quantity']:
-                return jsonify({'status': 'error', 'message': f'Insufficient stock for {product["name"]}'}), 400
-
-            item_total = float(product['price']) * item['quantity']
-            total_amount += item_total
-
-            order_items.append({
-                'product_id': item['product_id'],
-                'quantity': item['quantity'],
-                'unit_price': product['price'],
-                'total_price': item_total
-            })
-
-        # Create order data
         order_data = {
             'customer_name': data['customer_name'],
             'customer_email': data['customer_email'],
@@ -1775,16 +1824,17 @@ def api_create_order():
             'customer_company': data.get('customer_company'),
             'shipping_address': data['shipping_address'],
             'billing_address': data.get('billing_address'),
-            'total_amount': total_amount,
             'notes': data.get('notes')
         }
 
-        # Create order
-        order_id = order_model.create_order(order_data, order_items)
+        # Price, create and reserve stock atomically
+        try:
+            checkout = order_model.checkout(order_data, data['items'])
+        except CheckoutError as e:
+            return jsonify({'status': 'error', 'message': str(e)}), e.status_code
 
-        # Update stock quantities
-        for item in order_items:
-            product_model.update_stock(item['product_id'], item['quantity'])
+        order_id = checkout['order_id']
+        total_amount = checkout['total_amount']
 
         # Get complete order details for email generation
         complete_order = order_model.get_order_by_id(order_id)
@@ -1842,6 +1892,7 @@ def api_kpi_refresh():
             })
 
         # Get updated KPI data
+        response_cache.invalidate('kpi_summary')
         kpis_by_department = kpi_model.get_kpis_by_department()
         info_center_kpis = kpi_model.get_info_center_kpis()
         performance_summary = kpi_model.get_performance_summary()
@@ -1859,6 +1910,7 @@ def api_kpi_refresh():
 
 
 @app.route('/api/kpi/summary')
+@response_cache.cached('kpi_summary', ttl=30)
 def api_kpi_summary():
     """API: Get KPI summary for dashboard"""
     try:
@@ -1958,17 +2010,13 @@ def api_demo_flow_stats():
 # Initialize TimeWarp system integration
 if timewarp_available:
     try:
-        # Load TimeWarp configuration
-        timewarp_config = get_timewarp_config()
-
-        # Initialize TimeWarp UI with Flask app and SocketIO
+        # Initialize TimeWarp UI with Flask app and SocketIO (registers routes, so not lazy)
         timewarp_ui = init_timewarp_ui(app, socketio)
-
-        # Initialize TimeWarp email generator with configuration
-        timewarp_email_gen = get_email_generator()
-
-        # Initialize TimeWarp agent processor
-        timewarp_agent_processor = init_agent_processor()
+        if DASHBOARD_ROLE == 'engine':
+            timewarp_ui.socketio = emitter
+        elif DASHBOARD_ROLE == 'worker':
+            timewarp_ui.timewarp = engine.proxy('timewarp')
+        push_hub.add_topic('timewarp', timewarp_ui.timewarp.get_time_status)
 
         # Add email callback to integrate with existing system
         def timewarp_email_callback(email):
@@ -1977,13 +2025,14 @@ if timewarp_available:
                 logger.info(f"TimeWarp generated: {email['type']} from {email['from']}")
 
                 # Route to appropriate agents based on configuration
+                timewarp_config = get_timewarp_config()
                 mailbox_id = timewarp_config.get_mailbox_for_email(email.get('to', 'info@h-bu.de'))
                 if mailbox_id:
                     agents = timewarp_config.get_agents_for_mailbox(mailbox_id)
                     logger.debug(f"Email routed to agents: {agents}")
 
                 # Process through TimeWarp agent system
-                success = timewarp_agent_processor.process_email(email)
+                success = get_agent_processor().process_email(email)
                 if success:
                     logger.debug(f"Email {email.get('id')} processed by agent system")
                 else:
@@ -1992,25 +2041,39 @@ if timewarp_available:
             except Exception as e:
                 logger.error(f"Error processing TimeWarp email: {e}")
 
-        timewarp_email_gen.add_generation_callback(timewarp_email_callback)
-
-        # Initialize TimeWarp engine with configuration
-        timewarp_engine = get_timewarp()
-        timewarp_engine.register_email_generator(timewarp_email_gen)
+        def start_timewarp():
+            """Load the configuration, start the agent processor and wire the engine to the generator"""
+            timewarp_config = get_timewarp_config()
+            timewarp_email_gen = get_email_generator()
+            init_agent_processor()
+            timewarp_email_gen.add_generation_callback(timewarp_email_callback)
+
+            # Initialize TimeWarp engine with configuration
+            timewarp_engine = get_timewarp()
+            timewarp_engine.register_email_generator(timewarp_email_gen)
+
+            # Set email patterns from configuration
+            email_patterns = timewarp_config.get_email_patterns()
+            if email_patterns:
+                timewarp_engine.configure_email_patterns(email_patterns)
+
+            # Start TimeWarp systems based on configuration
+            settings = timewarp_config.get_timewarp_settings()
+            if settings.get('auto_start', False):
+                timewarp_engine.start()
+                timewarp_email_gen.start_generation()
+                logger.info("🚀 TimeWarp auto-started")
+            else:
+                logger.info("⏸️ TimeWarp ready (manual start required)")
+            return timewarp_engine
 
-        # Set email patterns from configuration
-        email_patterns = timewarp_config.get_email_patterns()
-        if email_patterns:
-            timewarp_engine.configure_email_patterns(email_patterns)
+        startup.register('timewarp', start_timewarp)
 
-        # Start TimeWarp systems based on configuration
-        settings = timewarp_config.get_timewarp_settings()
-        if settings.get('auto_start', False):
-            timewarp_engine.start()
-            timewarp_email_gen.start_generation()
-            logger.info("🚀 TimeWarp auto-started")
-        else:
-            logger.info("⏸️ TimeWarp ready (manual start required)")
+        @app.before_request
+        def ensure_timewarp_started():
+            """TimeWarp routes need the engine wired to its generator and agents, warm-up or not"""
+            if request.path.startswith('/api/timewarp/'):
+                startup.get('timewarp')
 
         # Add TimeWarp management API endpoints
         @app.route('/api/timewarp/status', methods=['GET'])
@@ -2045,6 +2108,8 @@ if timewarp_available:
                 if not timewarp_available:
                     return jsonify({'success': False, 'error': 'TimeWarp not available'}), 503
 
+                timewarp_config = get_timewarp_config()
+
                 processor = get_agent_processor()
                 agent_stats = processor.get_processing_statistics()
 
@@ -2071,6 +2136,8 @@ if timewarp_available:
                 if not timewarp_available:
                     return jsonify({'success': False, 'error': 'TimeWarp not available'}), 503
 
+                timewarp_config = get_timewarp_config()
+
                 mailboxes = {}
                 for mailbox_id, config in timewarp_config.get_all_mailboxes().items():
                     mailboxes[mailbox_id] = {
@@ -2105,6 +2172,8 @@ if timewarp_available:
                 if not timewarp_available:
                     return jsonify({'success': False, 'error': 'TimeWarp not available'}), 503
 
+                timewarp_config = get_timewarp_config()
+
                 config_data = timewarp_config.export_config_for_ui()
                 summary = timewarp_config.get_configuration_summary()
 
@@ -2126,6 +2195,8 @@ if timewarp_available:
                 if not timewarp_available:
                     return jsonify({'success': False, 'error': 'TimeWarp not available'}), 503
 
+                timewarp_config = get_timewarp_config()
+
                 data = request.get_json()
                 if not data:
                     return jsonify({'success': False, 'error': 'No configuration data provided'}), 400
@@ -2153,6 +2224,7 @@ if timewarp_available:
                 # Save configuration
                 if success:
                     timewarp_config.save_configuration()
+                    response_cache.invalidate('timewarp_statistics')
 
                 return jsonify({
                     'success': success,
@@ -2165,12 +2237,15 @@ if timewarp_available:
                 return jsonify({'success': False, 'error': str(e)}), 500
 
         @app.route('/api/timewarp/statistics', methods=['GET'])
+        @response_cache.cached('timewarp_statistics', ttl=5)
         def get_timewarp_statistics():
             """Get comprehensive TimeWarp system statistics"""
             try:
                 if not timewarp_available:
                     return jsonify({'success': False, 'error': 'TimeWarp not available'}), 503
 
+                timewarp_config = get_timewarp_config()
+
                 # Get statistics from various components
                 timewarp_status = get_timewarp().get_time_status()
                 email_gen_stats = get_email_generator().get_generation_stats()
@@ -2214,7 +2289,7 @@ else:
 # Enhanced Business Simulation Integration
 try:
     from src.enhanced_business_simulation import get_enhanced_simulation
-    enhanced_sim = get_enhanced_simulation()
+    startup.register('enhanced_simulation', get_enhanced_simulation, required=False)
     enhanced_simulation_available = True
 
     @app.route('/api/simulation/start', methods=['POST'])
@@ -2224,6 +2299,7 @@ try:
             data = request.get_json() or {}
             speed_multiplier = data.get('speed', 1)
 
+            enhanced_sim = startup.get('enhanced_simulation')
             enhanced_sim.start_simulation(speed_multiplier)
 
             return jsonify({
@@ -2239,7 +2315,7 @@ try:
     def stop_enhanced_simulation():
         """Stop enhanced business simulation"""
         try:
-            enhanced_sim.stop_simulation()
+            startup.get('enhanced_simulation').stop_simulation()
             return jsonify({
                 'success': True,
                 'message': 'Enhanced simulation stopped'
@@ -2254,25 +2330,41 @@ try:
         try:
             return jsonify({
                 'success': True,
-                'status': enhanced_sim.get_simulation_status(),
+                'status': startup.get('enhanced_simulation').get_simulation_status(),
                 'available': True
             })
         except Exception as e:
             logger.error(f"Error getting simulation status: {e}")
             return jsonify({'success': False, 'error': str(e)}), 500
 
+    simulation_queue_position = {'seen': 0}
+
+    def sync_simulation_emails(index):
+        """Index only the emails appended to the simulation queue since the last sync"""
+        queue = startup.get('enhanced_simulation').email_queue
+        if len(queue) < simulation_queue_position['seen']:
+            index.replace([])
+            simulation_queue_position['seen'] = 0
+        for position in range(simulation_queue_position['seen'], len(queue)):
+            email = queue[position]
+            index.add(email if 'id' in email else {**email, 'id': f'sim_{position}'})
+        simulation_queue_position['seen'] = len(queue)
+
+    simulation_email_feed = EmailFeed(sync_simulation_emails, ttl=1, max_size=1000)
+
     @app.route('/api/simulation/emails', methods=['GET'])
     def get_simulation_emails():
-        """Get emails generated by enhanced simulation"""
+        """Get emails generated by enhanced simulation, newest first (cursor paginated)"""
         try:
-            limit = request.args.get('limit', 50, type=int)
-            emails = enhanced_sim.get_generated_emails(limit)
+            page = simulation_email_feed.page(**parse_page_args(request.args, default_limit=50))
 
             return jsonify({
                 'success': True,
-                'emails': emails,
-                'total': len(emails)
+                **page,
+                'total': len(page['emails'])
             })
+        except InvalidCursor as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
         except Exception as e:
             logger.error(f"Error getting simulation emails: {e}")
             return jsonify({'success': False, 'error': str(e)}), 500
@@ -2304,23 +2396,49 @@ if scenario_system_available:
             logger.error(f"Error getting scenarios: {e}")
             return jsonify({'success': False, 'error': str(e)}), 500
 
+    scenario_email_files = {}
+
+    def sync_scenario_emails(index):
+        """Parse only new scenario email files; forget deleted ones"""
+        from src.scenarios.email_generator import scenario_email_generator
+
+        names = {path.name: path for path in scenario_email_generator.scenario_emails_dir.glob('*.json')}
+        for name in set(scenario_email_files) - set(names):
+            index.discard(scenario_email_files.pop(name))
+        for name in set(names) - set(scenario_email_files):
+            try:
+                with open(names[name], 'r', encoding='utf-8') as f:
+                    email = json.load(f)
+            except Exception as e:
+                logger.error(f"Error reading email file {name}: {e}")
+                continue
+            email.setdefault('id', name)
+            scenario_email_files[name] = str(email['id'])
+            index.add(email)
+
+    scenario_email_feed = EmailFeed(sync_scenario_emails, ttl=2, fields={
+        'scenario_type': lambda e: e.get('scenario_type'),
+        'mailbox': lambda e: str(e.get('to', '')).split('@')[0],
+        'priority': lambda e: e.get('urgency'),
+        'type': lambda e: e.get('email_type'),
+        'source': lambda e: 'scenario'
+    })
+
     @app.route('/api/v3/scenarios/emails', methods=['GET'])
     def get_scenario_emails():
-        """Get scenario-generated emails"""
+        """Get scenario-generated emails, newest first (cursor paginated)"""
         try:
-            # Import the scenario email generator
-            from src.scenarios.email_generator import scenario_email_generator
-
-            scenario_type = request.args.get('scenario_type')
-            limit = int(request.args.get('limit', 50))
-
-            emails = scenario_email_generator.get_scenario_emails(scenario_type, limit)
+            page_args = parse_page_args(request.args, default_limit=50,
+                                        filters=scenario_email_feed.index.fields)
+            page = scenario_email_feed.page(**page_args)
 
             return jsonify({
                 'success': True,
-                'emails': emails,
-                'count': len(emails)
+                **page,
+                'count': len(page['emails'])
             })
+        except InvalidCursor as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
         except Exception as e:
             logger.error(f"Error getting scenario emails: {e}")
             return jsonify({'success': False, 'error': str(e)}), 500
@@ -2405,6 +2523,7 @@ if scenario_system_available:
             return jsonify({'success': False, 'error': str(e)}), 500
 
     @app.route('/api/v3/scenarios/status', methods=['GET'])
+    @response_cache.cached('scenarios_status', ttl=5)
     def get_scenarios_status():
         """Get status of all scenarios"""
         try:
@@ -2510,108 +2629,9 @@ def get_combined_emails():
     """Get combined emails from all sources for landing page display"""
     try:
         limit = request.args.get('limit', 20, type=int)
-        all_emails = []
-
-        # 1. Get real mailbox emails
-        try:
-            real_emails = get_recent_emails(limit=limit//3)
-            for email in real_emails:
-                # Normalize real email format
-                email['source'] = 'real_mailbox'
-                email['email_type'] = email.get('type', 'order')
-                all_emails.append(email)
-        except Exception as e:
-            logger.warning(f"Error loading real emails: {e}")
-
-        # 2. Get TimeWarp simulation emails
-        try:
-            import requests
-            response = requests.get(f'http://localhost:{request.environ.get("SERVER_PORT", "8080")}/api/emails/recent?limit={limit//3}')
-            if response.status_code == 200:
-                sim_data = response.json()
-                if sim_data.get('emails'):
-                    for email in sim_data['emails'][:limit//3]:
-                        email['source'] = 'timewarp_simulation'
-                        email['email_type'] = email.get('category', 'order')
-                        # Convert timestamp format if needed
-                        if 'timestamp' in email:
-                            email['timestamp'] = email['timestamp'].replace('T', ' ')
-                        all_emails.append(email)
-        except Exception as e:
-            logger.warning(f"Error loading TimeWarp emails: {e}")
-
-        # 3. Get enhanced business simulation emails
-        if enhanced_simulation_available:
-            try:
-                enhanced_emails = enhanced_sim.get_generated_emails(limit//3)
-                for email in enhanced_emails:
-                    # Convert enhanced simulation format to display format
-                    converted_email = {
-                        'id': f'enhanced_{hash(str(email))}',
-                        'from': email.get('from', 'business@simulation.com'),
-                        'subject': email.get('subject', 'Business Simulation Email'),
-                        'content': email.get('body', 'Enhanced business simulation email'),
-                        'timestamp': email.get('timestamp', datetime.now()).strftime('%Y-%m-%d %H:%M:%S'),
-                        'time_ago': 'simulation',
-                        'priority': email.get('priority', 'medium'),
-                        'type': 'simulation',
-                        'email_type': 'business',
-                        'source': 'enhanced_simulation',
-                        'routing': {
-                            'category': 'business',
-                            'confidence': 0.95,
-                            'destination': 'business_agent'
-                        },
-                        'attachments': []
-                    }
-                    all_emails.append(converted_email)
-            except Exception as e:
-                logger.warning(f"Error loading enhanced simulation emails: {e}")
 
-        # 4. Get scenario emails from weakness injection scenarios
-        try:
-            from src.scenarios.email_generator import scenario_email_generator
-            scenario_emails = scenario_email_generator.get_scenario_emails(limit=limit//4)
-            for email in scenario_emails:
-                # Convert scenario email format to display format
-                converted_email = {
-                    'id': email.get('id', f'scenario_{hash(str(email))}'),
-                    'from': email.get('from', 'scenario@simulation.com'),
-                    'subject': email.get('subject', 'Scenario Email'),
-                    'content': email.get('body', 'Scenario simulation email'),
-                    'timestamp': email.get('timestamp', datetime.now().isoformat()).replace('T', ' '),
-                    'time_ago': 'scenario',
-                    'priority': email.get('urgency', 'medium'),
-                    'type': email.get('email_type', 'scenario'),
-                    'email_type': email.get('scenario_type', 'business'),
-                    'source': 'scenario_emails',
-                    'routing': {
-                        'category': email.get('scenario_type', 'business'),
-                        'confidence': 0.98,
-                        'destination': 'business_agent'
-                    },
-                    'attachments': [],
-                    'scenario_info': {
-                        'scenario_type': email.get('scenario_type'),
-                        'business_impact': email.get('business_impact', {}),
-                        'sla_violation': email.get('sla_violation', False),
-                        'customer_info': email.get('customer_info', {})
-                    }
-                }
-                all_emails.append(converted_email)
-        except Exception as e:
-            logger.warning(f"Error loading scenario emails: {e}")
-
-        # Sort all emails by timestamp (most recent first)
-        # Convert timestamps to string format for consistent sorting
-        for email in all_emails:
-            if 'timestamp' in email and hasattr(email['timestamp'], 'strftime'):
-                email['timestamp'] = email['timestamp'].strftime('%Y-%m-%d %H:%M:%S+02:00')
-
-        all_emails.sort(key=lambda x: str(x.get('timestamp', '')), reverse=True)
-
-        # Limit final result
-        final_emails = all_emails[:limit]
+        # Sources are fetched in parallel and cached per source
+        final_emails = email_aggregator.get_emails(limit=limit)
 
         return jsonify({
             'success': True,
@@ -2633,12 +2653,37 @@ def get_combined_emails():
             'emails': []
         }), 500
 
-if __name__ == '__main__':
-    # Start background update thread
-    socketio.start_background_task(background_updates)
+startup.mark('app_setup')
 
-    # Run the dashboard
+if __name__ == '__main__':
     port = int(os.environ.get('FLASK_PORT', os.environ.get('PORT', 80)))
-    logger.info(f"🌐 Starting Happy Buttons Dashboard on http://localhost:{port}")
-    logger.info(f"🚀 Happy Buttons Release 2.2 - Enhanced Business Simulation")
-    socketio.run(app, host='0.0.0.0', port=port, debug=False, allow_unsafe_werkzeug=True)
\ No newline at end of file
+
+    if DASHBOARD_ROLE == 'engine':
+        # No HTTP port: the web workers reach the engine over its Unix socket
+        engine_server.expose('http', wsgi_handler(app))
+        engine_server.expose('push', push_hub)
+        if get_timewarp_ui() is not None:
+            engine_server.expose('timewarp', get_timewarp_ui().timewarp)
+        engine_server.start()
+        startup.warm_up()
+        logger.info(f"⚙️ Dashboard engine running (pid {os.getpid()})")
+        push_hub.run()
+
+    elif DASHBOARD_ROLE == 'worker':
+        from werkzeug.serving import make_server
+
+        push_hub.reset()
+        if not SOCKETIO_MESSAGE_QUEUE:
+            relay_to_socketio(engine, socketio)
+        logger.info(f"🌐 Dashboard web worker {os.environ.get('WORKER_ID')} serving on http://localhost:{port}")
+        make_server('0.0.0.0', port, app, threaded=True, fd=int(os.environ['LISTEN_FD'])).serve_forever()
+
+    else:
+        # Start background update thread
+        socketio.start_background_task(background_updates)
+
+        # Run the dashboard; subsystems warm up in parallel once it accepts connections
+        startup.warm_up_when_listening(port)
+        logger.info(f"🌐 Starting Happy Buttons Dashboard on http://localhost:{port}")
+        logger.info(f"🚀 Happy Buttons Release 2.2 - Enhanced Business Simulation")
+        socketio.run(app, host='0.0.0.0', port=port, debug=False, allow_unsafe_werkzeug=True)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Happy Buttons Dashboard - ASGI server mode
+Serves the JSON API from async handlers under uvicorn; pages and the remaining routes run on the Flask app behind it
+
+    python asgi.py                      # or: uvicorn asgi:api --host 0.0.0.0 --port 80
+
+Live updates are available as plain WebSocket frames at /ws/push
+(Socket.IO stays with ``python app.py``).
+"""
+
+import os
+from datetime import datetime
+
+import uvicorn
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+import app as dashboard
+from services.email.email_index import InvalidCursor, parse_page_args
+from utils.asgi_api import cached_json, create_asgi_app, run_blocking
+
+api = create_asgi_app(dashboard.app, dashboard.push_hub,
+                      io_threads=int(os.environ.get('ASGI_IO_THREADS', 32)))
+monitor = dashboard.monitor
+response_cache = dashboard.response_cache
+
+
+@api.get('/health')
+async def health():
+    """Health check endpoint"""
+    return {'status': 'healthy', 'timestamp': datetime.now().isoformat()}
+
+
+@api.get('/api/metrics')
+async def api_metrics(request: Request):
+    """API endpoint for system metrics"""
+    return await cached_json(request, response_cache, 'metrics', monitor.get_system_metrics, ttl=2)
+
+
+@api.get('/api/services')
+async def api_services():
+    """API endpoint for service status (probed in the background, never blocks)"""
+    return monitor.get_service_status()
+
+
+@api.get('/api/email/stats')
+async def api_email_stats(request: Request):
+    """API endpoint for email statistics (IMAP work runs on the bounded I/O threads)"""
+    return await cached_json(request, response_cache, 'email_stats', monitor.get_email_stats, ttl=10,
+                             limiter=api.state.io_limiter)
+
+
+@api.get('/api/agents')
+async def api_agents(request: Request):
+    """API endpoint for agent status"""
+    return await cached_json(request, response_cache, 'agents', monitor.get_agent_status, ttl=5)
+
+
+@api.get('/api/swarm')
+async def api_swarm(request: Request):
+    """API endpoint for swarm status"""
+    return await cached_json(request, response_cache, 'swarm', monitor.get_swarm_status, ttl=30,
+                             limiter=api.state.io_limiter)
+
+
+@api.get('/api/recent_emails')
+async def api_recent_emails(request: Request):
+    """API endpoint to page through the last 100 emails for agents page"""
+    try:
+        page_args = parse_page_args(request.query_params, default_limit=100)
+        page = await run_blocking(dashboard.recent_email_feed.page, **page_args,
+                                  limiter=api.state.io_limiter)
+        return {'success': True, **page, 'total': len(page['emails'])}
+    except InvalidCursor as e:
+        return JSONResponse({'success': False, 'error': str(e)}, status_code=400)
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+
+
+@api.get('/api/emails/recent')
+async def recent_emails(request: Request):
+    """Get processed emails with full details, newest first (cursor paginated)"""
+    feed = dashboard.generated_email_feed
+    try:
+        page_args = parse_page_args(request.query_params, default_limit=100)
+        page = await run_blocking(feed.page, **page_args)
+        return {
+            'status': 'success',
+            'total_count': feed.index.count(page_args['filters']),
+            **page,
+            'last_updated': datetime.now().isoformat()
+        }
+    except InvalidCursor as e:
+        return JSONResponse({'status': 'error', 'message': str(e)}, status_code=400)
+    except Exception as e:
+        dashboard.logger.error(f"Error retrieving recent emails: {e}")
+        return JSONResponse({'status': 'error', 'message': str(e)}, status_code=500)
+
+
+@api.get('/api/agents/mailbox/{mailbox_name}')
+async def mailbox_details(mailbox_name: str, request: Request):
+    """Get detailed mailbox information with real emails"""
+    try:
+        page_args = parse_page_args(request.query_params, default_limit=10)
+        return await run_blocking(dashboard.get_mailbox_details, mailbox_name, **page_args,
+                                  limiter=api.state.io_limiter)
+    except InvalidCursor as e:
+        return JSONResponse({'status': 'error', 'message': str(e)}, status_code=400)
+    except Exception as e:
+        dashboard.logger.error(f"Error in mailbox endpoint: {e}")
+        return JSONResponse({
+            'status': 'error',
+            'message': str(e),
+            'address': f'{mailbox_name}@h-bu.de',
+            'total_emails': 0,
+            'today_emails': 0,
+            'recent_emails': []
+        }, status_code=500)
+
+
+if __name__ == '__main__':
+    port = int(os.environ.get('FLASK_PORT', os.environ.get('PORT', 80)))
+    dashboard.logger.info(f"🌐 Starting Happy Buttons Dashboard (ASGI) on http://localhost:{port}")
+    dashboard.startup.warm_up_when_listening(port)
+    uvicorn.run(api, host='0.0.0.0', port=port)
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Happy Buttons Dashboard - multi-process mode
+One engine process runs the simulation, agents and push topics; N stateless web workers serve the clients
+
+    python cluster.py --workers 4 --port 80
+    python cluster.py --workers 4 --message-queue redis://localhost:6379/0
+
+Workers reach the engine over a local Unix socket. Socket.IO events from the
+engine are relayed over that socket, or through the message queue if given
+(needs the ``redis`` package). Browsers use the WebSocket transport only,
+since long-polling sessions would need sticky routing between workers.
+"""
+
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from utils.cluster import run_cluster
+
+logging.basicConfig(level=logging.INFO)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[2])
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2, help='Number of web workers')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('FLASK_PORT', os.environ.get('PORT', 80))))
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--message-queue', default=os.environ.get('SOCKETIO_MESSAGE_QUEUE'),
+                        help='Socket.IO message queue URL (default: relay over the engine socket)')
+    args = parser.parse_args()
+
+    run_cluster(str(Path(__file__).parent / 'app.py'), args.workers, args.port, args.host, args.message_queue)
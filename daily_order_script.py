@@ -24,6 +24,7 @@ sys.path.insert(0, '/home/pi/happy_button/src')
 
 from services.history.history_seeder import HistorySeeder, DailyOrderGenerator
 from services.order.state_machine import OrderStateMachine
+from services.events.event_log import get_event_log
 
 def setup_logging():
     """Setup logging for daily script"""
@@ -134,10 +135,14 @@ def show_system_statistics():
         return None
 
 def cleanup_old_events():
-    """Clean up old event files (older than 30 days)"""
+    """Apply event log retention and clean up legacy event files (older than 30 days)"""
     logger = logging.getLogger(__name__)
 
     try:
+        removed_segments = get_event_log().enforce_retention()
+        if removed_segments > 0:
+            logger.info(f"🧹 Removed {removed_segments} event log segments")
+
         events_dir = "data/events"
         if not os.path.exists(events_dir):
             return
@@ -8,31 +8,43 @@ import os
 import sys
 import json
 import asyncio
+import importlib
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
-import psutil
 from flask import Flask, render_template, jsonify, request, redirect, url_for, flash, make_response
 from flask_socketio import SocketIO, emit
-import requests
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
+from utils.health_prober import HealthProber
+from utils.system_sampler import get_system_sampler
+from utils.response_cache import get_response_cache
+from utils.push_hub import PushHub
+from utils.startup import get_startup
+from services.email.email_index import EmailFeed, InvalidCursor, parse_page_args
+
+# Expensive subsystems start on first use or in the warm-up after the server is listening
+startup = get_startup()
+
 # Import our modules
 try:
     from utils.templates import RoyalCourtesyTemplates
     from email_processing.router import EmailRouter
     from email_processing.parser import EmailParser
-    from models.database import db, product_model, order_model, team_model, kpi_model
+    from models.database import db, product_catalog, product_model, order_model, team_model, kpi_model, CheckoutError
     from utils.order_email import order_email_generator
+    startup.register('catalog', product_catalog.preload, required=False)  # Catalog pages skip the database
+    startup.register('order_pdf', lambda: importlib.import_module('reportlab.platypus'), required=False)
     models_available = True
 except ImportError as e:
     print(f"Warning: Could not import some modules: {e}")
     models_available = False
     # Set fallback models
+    product_catalog = None
     product_model = None
     order_model = None
     team_model = None
@@ -45,6 +57,8 @@ except ImportError:
     def create_business_agents():
         return {}
 
+startup.mark('imports')
+
 app = Flask(__name__)
 app.secret_key = 'happy_buttons_dashboard_secret'
 socketio = SocketIO(app, cors_allowed_origins="*")
@@ -54,113 +68,72 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+@app.context_processor
+def socketio_client_options():
+    """Socket.IO transports offered to the pages (the cluster's web workers use WebSocket only)"""
+    return {'socketio_transports': ['polling', 'websocket']}
+
+
 class SystemMonitor:
     """Monitors system health and performance"""
 
     def __init__(self):
-        self.metrics_history = []
-        self.max_history = 100
+        self.sampler = get_system_sampler()
 
-        # Initialize system components
-        try:
-            self.templates = RoyalCourtesyTemplates()
-            self.router = EmailRouter()
-            self.parser = EmailParser()
-            self.agents = create_business_agents()
-        except Exception as e:
-            logger.warning(f"Could not initialize all components: {e}")
-            self.templates = None
-            self.router = None
-            self.parser = None
-            self.agents = {}
+        # Other services are probed in the background, the dashboard is this process
+        self.health_prober = HealthProber({
+            'email_processor': {'name': 'Email Processing Service', 'port': 8081},
+            'swarm_coordinator': {'name': 'Claude Flow Swarm', 'port': 8082}
+        })
 
-    def get_system_metrics(self) -> Dict[str, Any]:
-        """Get current system metrics"""
-        try:
-            # System resources
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
+        # System components are built on first use (or during the startup warm-up)
+        startup.register('email_processing', self._create_email_processing)
+        startup.register('agents', create_business_agents)
 
-            # Network info
-            network_stats = psutil.net_io_counters()
+    def _create_email_processing(self) -> Dict[str, Any]:
+        return {'templates': RoyalCourtesyTemplates(), 'router': EmailRouter(), 'parser': EmailParser()}
 
-            # Process count
-            process_count = len(psutil.pids())
+    @property
+    def templates(self):
+        return startup.get('email_processing', {}).get('templates')
 
-            metrics = {
-                'timestamp': datetime.now().isoformat(),
-                'system': {
-                    'cpu_percent': cpu_percent,
-                    'memory_percent': memory.percent,
-                    'memory_available_gb': memory.available / (1024**3),
-                    'memory_total_gb': memory.total / (1024**3),
-                    'disk_percent': (disk.used / disk.total) * 100,
-                    'disk_free_gb': disk.free / (1024**3),
-                    'disk_total_gb': disk.total / (1024**3),
-                    'process_count': process_count,
-                    'boot_time': psutil.boot_time()
-                },
-                'network': {
-                    'bytes_sent': network_stats.bytes_sent,
-                    'bytes_recv': network_stats.bytes_recv,
-                    'packets_sent': network_stats.packets_sent,
-                    'packets_recv': network_stats.packets_recv
-                }
-            }
+    @property
+    def router(self):
+        return startup.get('email_processing', {}).get('router')
 
-            # Add to history
-            self.metrics_history.append(metrics)
-            if len(self.metrics_history) > self.max_history:
-                self.metrics_history.pop(0)
+    @property
+    def parser(self):
+        return startup.get('email_processing', {}).get('parser')
 
-            return metrics
+    @property
+    def agents(self) -> Dict[str, Any]:
+        """Started agents; empty while they are still starting so status polls never wait"""
+        return startup.get('agents', {}, wait=False)
 
+    def get_system_metrics(self) -> Dict[str, Any]:
+        """Get current system metrics (latest background sample)"""
+        try:
+            return self.sampler.latest()
         except Exception as e:
             logger.error(f"Error getting system metrics: {e}")
             return {}
 
+    @property
+    def metrics_history(self) -> List[Dict[str, Any]]:
+        """Recent metric snapshots, oldest first"""
+        return self.sampler.get_history()
+
     def get_service_status(self) -> Dict[str, Any]:
-        """Get status of all services"""
+        """Get status of all services (cached background health probes)"""
         services = {
             'dashboard': {
                 'name': 'Dashboard Server',
                 'port': 80,
                 'status': 'running',
                 'health': 'healthy'
-            },
-            'email_processor': {
-                'name': 'Email Processing Service',
-                'port': 8081,
-                'status': 'checking',
-                'health': 'unknown'
-            },
-            'swarm_coordinator': {
-                'name': 'Claude Flow Swarm',
-                'port': 8082,
-                'status': 'checking',
-                'health': 'unknown'
             }
         }
-
-        # Check each service
-        for service_name, service_info in services.items():
-            if service_name != 'dashboard':  # Skip self
-                try:
-                    if service_info.get('port'):
-                        response = requests.get(
-                            f"http://localhost:{service_info['port']}/health",
-                            timeout=2
-                        )
-                        if response.status_code == 200:
-                            services[service_name]['status'] = 'running'
-                            services[service_name]['health'] = 'healthy'
-                        else:
-                            services[service_name]['status'] = 'error'
-                            services[service_name]['health'] = 'unhealthy'
-                except requests.RequestException:
-                    services[service_name]['status'] = 'stopped'
-                    services[service_name]['health'] = 'offline'
+        services.update(self.health_prober.get_status())
 
         return services
 
@@ -258,6 +231,18 @@ class SystemMonitor:
 # Initialize monitor
 monitor = SystemMonitor()
 
+# Polled dashboard endpoints are served from short-lived cached responses
+response_cache = get_response_cache()
+
+# Socket.IO clients subscribe to topics and receive sequenced deltas
+push_hub = PushHub(socketio, interval=5.0)
+push_hub.add_topic('metrics', monitor.get_system_metrics)
+push_hub.add_topic('services', monitor.get_service_status)
+push_hub.add_topic('email_stats', monitor.get_email_stats)
+push_hub.add_topic('agents', monitor.get_agent_status)
+push_hub.add_topic('swarm', monitor.get_swarm_status)
+push_hub.register_handlers()
+
 def get_recent_emails(limit=20):
     """Get recent emails for display on landing page - FROM REAL EMAIL SERVER"""
     try:
@@ -451,7 +436,27 @@ def health():
     return jsonify({'status': 'healthy', 'timestamp': datetime.now().isoformat()})
 
 
+@app.route('/ready')
+def ready():
+    """Readiness check: 503 until every required subsystem has initialized
+
+    Under runners that skip the warm-up (gunicorn, the test client) the
+    first probe starts it for whatever is still pending.
+    """
+    readiness = startup.readiness()
+    if readiness['waiting_for']:
+        startup.warm_up(readiness['waiting_for'])
+    return jsonify(readiness), 200 if readiness['ready'] else 503
+
+
+@app.route('/api/startup/profile')
+def api_startup_profile():
+    """Startup profile: time and memory per startup phase and subsystem"""
+    return jsonify(startup.profile())
+
+
 @app.route('/api/metrics')
+@response_cache.cached('metrics', ttl=2)
 def api_metrics():
     """API endpoint for system metrics"""
     return jsonify(monitor.get_system_metrics())
@@ -464,18 +469,21 @@ def api_services():
 
 
 @app.route('/api/email/stats')
+@response_cache.cached('email_stats', ttl=10)
 def api_email_stats():
     """API endpoint for email statistics"""
     return jsonify(monitor.get_email_stats())
 
 
 @app.route('/api/agents')
+@response_cache.cached('agents', ttl=5)
 def api_agents():
     """API endpoint for agent status"""
     return jsonify(monitor.get_agent_status())
 
 
 @app.route('/api/swarm')
+@response_cache.cached('swarm', ttl=30)
 def api_swarm():
     """API endpoint for swarm status"""
     return jsonify(monitor.get_swarm_status())
@@ -613,58 +621,68 @@ def api_test_email():
         return jsonify({'success': False, 'error': str(e)})
 
 
-@app.route('/api/recent_emails')
-def api_recent_emails():
-    """API endpoint to get last 100 emails for agents page"""
+def enhance_recent_email(i, email):
+    """Add ID, time ago, routing info and attachments to a recent email"""
     try:
-        limit = request.args.get('limit', 100, type=int)
-        limit = min(limit, 100)  # Cap at 100 emails
+        email_time = datetime.strptime(email['timestamp'], '%Y-%m-%d %H:%M')
+        time_diff = datetime.now() - email_time
+        if time_diff.days > 0:
+            time_ago = f"vor {time_diff.days} Tag{'en' if time_diff.days > 1 else ''}"
+        elif time_diff.seconds > 3600:
+            hours = time_diff.seconds // 3600
+            time_ago = f"vor {hours} Stunde{'n' if hours > 1 else ''}"
+        else:
+            minutes = max(1, time_diff.seconds // 60)
+            time_ago = f"vor {minutes} Minute{'n' if minutes > 1 else ''}"
+    except:
+        time_ago = "gerade eben"
+
+    return {
+        'id': email.get('id', f'email_{i + 1}'),
+        'from': email['from'],
+        'subject': email['subject'],
+        'type': email['type'],
+        'content': email['content'],
+        'priority': email['priority'],
+        'timestamp': email['timestamp'],
+        'time_ago': time_ago,
+        'attachments': email.get('attachments_list', []),
+        'source': email.get('source'),
+        'routing': {
+            'destination': email.get('route', f"{email['type']}@h-bu.de"),
+            'category': email['type'],
+            'confidence': 0.85
+        }
+    }
 
-        recent_emails = get_recent_emails(limit=limit)
 
-        # Add more details for each email including ID, routing info, and attachments
-        enhanced_emails = []
-        for i, email in enumerate(recent_emails):
-            # Calculate time ago from timestamp
-            from datetime import datetime
-            try:
-                email_time = datetime.strptime(email['timestamp'], '%Y-%m-%d %H:%M')
-                time_diff = datetime.now() - email_time
-                if time_diff.days > 0:
-                    time_ago = f"vor {time_diff.days} Tag{'en' if time_diff.days > 1 else ''}"
-                elif time_diff.seconds > 3600:
-                    hours = time_diff.seconds // 3600
-                    time_ago = f"vor {hours} Stunde{'n' if hours > 1 else ''}"
-                else:
-                    minutes = max(1, time_diff.seconds // 60)
-                    time_ago = f"vor {minutes} Minute{'n' if minutes > 1 else ''}"
-            except:
-                time_ago = "gerade eben"
-
-            enhanced_email = {
-                'id': email.get('id', f'email_{i + 1}'),
-                'from': email['from'],
-                'subject': email['subject'],
-                'type': email['type'],
-                'content': email['content'],
-                'priority': email['priority'],
-                'timestamp': email['timestamp'],
-                'time_ago': time_ago,
-                'attachments': email.get('attachments_list', []),
-                'routing': {
-                    'destination': email.get('route', f"{email['type']}@h-bu.de"),
-                    'category': email['type'],
-                    'confidence': 0.85
-                }
-            }
-            enhanced_emails.append(enhanced_email)
+# The last 100 emails, enhanced once per refresh and paged from an index
+recent_email_feed = EmailFeed(
+    lambda index: index.replace(enhance_recent_email(i, email)
+                                for i, email in enumerate(get_recent_emails(limit=100))),
+    ttl=10,
+    fields={
+        'mailbox': lambda e: e['routing']['destination'].split('@')[0],
+        'priority': lambda e: e.get('priority'),
+        'type': lambda e: e.get('type'),
+        'source': lambda e: e.get('source')
+    }
+)
+
 
+@app.route('/api/recent_emails')
+def api_recent_emails():
+    """API endpoint to page through the last 100 emails for agents page"""
+    try:
+        page = recent_email_feed.page(**parse_page_args(request.args, default_limit=100))
         return jsonify({
             'success': True,
-            'emails': enhanced_emails,
-            'total': len(enhanced_emails)
+            **page,
+            'total': len(page['emails'])
         })
 
+    except InvalidCursor as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
@@ -1260,38 +1278,24 @@ def handle_connect():
 @socketio.on('disconnect')
 def handle_disconnect():
     """Handle WebSocket disconnection"""
+    push_hub.remove_client(request.sid)
     logger.info('Client disconnected from dashboard')
 
 
 @socketio.on('request_update')
 def handle_request_update():
-    """Handle real-time update requests"""
+    """Handle real-time update requests (served from the push hub's current snapshots)"""
     try:
-        data = {
-            'metrics': monitor.get_system_metrics(),
-            'services': monitor.get_service_status(),
-            'email_stats': monitor.get_email_stats(),
-            'agents': monitor.get_agent_status(),
-            'swarm': monitor.get_swarm_status()
-        }
+        data = {topic: push_hub.current(topic)
+                for topic in ('metrics', 'services', 'email_stats', 'agents', 'swarm')}
         emit('update', data)
     except Exception as e:
         emit('error', {'message': str(e)})
 
 
 def background_updates():
-    """Send periodic updates to connected clients"""
-    while True:
-        try:
-            socketio.sleep(5)  # Update every 5 seconds
-            data = {
-                'metrics': monitor.get_system_metrics(),
-                'services': monitor.get_service_status(),
-                'timestamp': datetime.now().isoformat()
-            }
-            socketio.emit('auto_update', data)
-        except Exception as e:
-            logger.error(f"Error in background updates: {e}")
+    """Push changed topic fields to subscribed clients every 5 seconds"""
+    push_hub.run()
 
 
 # ===== WEBSHOP ROUTES =====
@@ -1313,16 +1317,9 @@ def shop():
             }
             total_products = 3
         else:
-            products = product_model.get_all_products()
-
-            # Group products by category for better display
-            products_by_category = {}
-            for product in products:
-                category = product['category']
-                if category not in products_by_category:
-                    products_by_category[category] = []
-                products_by_category[category].append(product)
-            total_products = len(products)
+            # Grouped by category in the catalog cache
+            products_by_category = product_catalog.get_products_grouped()
+            total_products = sum(len(products) for products in products_by_category.values())
 
         return render_template('shop.html',
                              products_by_category=products_by_category,
@@ -1383,12 +1380,15 @@ def checkout():
 def api_products():
     """API: Get all products"""
     try:
-        products = product_model.get_all_products()
-        return jsonify({
-            'status': 'success',
-            'products': products,
-            'total_count': len(products)
-        })
+        def payload():
+            products = product_catalog.get_all_products()
+            return {
+                'status': 'success',
+                'products': products,
+                'total_count': len(products)
+            }
+
+        return conditional_json(product_catalog.etag(), payload)
     except Exception as e:
         logger.error(f"Error fetching products: {e}")
         return jsonify({'status': 'error', 'message': str(e)}), 500
@@ -1398,11 +1398,11 @@ def api_products():
 def api_product_detail(product_id):
     """API: Get product by ID"""
     try:
-        product = product_model.get_product_by_id(product_id)
+        product = product_catalog.get_product_by_id(product_id)
         if not product:
             return jsonify({'status': 'error', 'message': 'Product not found'}), 404
 
-        return jsonify({
+        return conditional_json(product_catalog.etag(), lambda: {
             'status': 'success',
             'product': product
         })
@@ -1487,29 +1487,6 @@ def api_create_order():
             })
 
         # Normal mode with database models
-        # Calculate total and validate items
-        total_amount = 0
-        order_items = []
-
-        for item in data['items']:
-            product = product_model.get_product_by_id(item['product_id'])
-            if not product:
-                return jsonify({'status': 'error', 'message': f'Product {item["product_id"]} not found'}), 404
-
-            if product['stock_quantity'] < item['quantity']:
-                return jsonify({'status': 'error', 'message': f'Insufficient stock for {product["name"]}'}), 400
-
-            item_total = float(product['price']) * item['quantity']
-            total_amount += item_total
-
-            order_items.append({
-                'product_id': item['product_id'],
-                'quantity': item['quantity'],
-                'unit_price': product['price'],
-                'total_price': item_total
-            })
-
-        # Create order data
         order_data = {
             'customer_name': data['customer_name'],
             'customer_email': data['customer_email'],
@@ -1517,16 +1494,17 @@ def api_create_order():
             'customer_company': data.get('customer_company'),
             'shipping_address': data['shipping_address'],
             'billing_address': data.get('billing_address'),
-            'total_amount': total_amount,
             'notes': data.get('notes')
         }
 
-        # Create order
-        order_id = order_model.create_order(order_data, order_items)
+        # Price, create and reserve stock atomically
+        try:
+            checkout = order_model.checkout(order_data, data['items'])
+        except CheckoutError as e:
+            return jsonify({'status': 'error', 'message': str(e)}), e.status_code
 
-        # Update stock quantities
-        for item in order_items:
-            product_model.update_stock(item['product_id'], item['quantity'])
+        order_id = checkout['order_id']
+        total_amount = checkout['total_amount']
 
         # Get complete order details for email generation
         complete_order = order_model.get_order_by_id(order_id)
@@ -1584,6 +1562,7 @@ def api_kpi_refresh():
             })
 
         # Get updated KPI data
+        response_cache.invalidate('kpi_summary')
         kpis_by_department = kpi_model.get_kpis_by_department()
         info_center_kpis = kpi_model.get_info_center_kpis()
         performance_summary = kpi_model.get_performance_summary()
@@ -1601,6 +1580,7 @@ def api_kpi_refresh():
 
 
 @app.route('/api/kpi/summary')
+@response_cache.cached('kpi_summary', ttl=30)
 def api_kpi_summary():
     """API: Get KPI summary for dashboard"""
     try:
@@ -1705,50 +1685,29 @@ def order_workflow():
     return render_template('order_workflow.html')
 
 
+def conditional_json(etag: str, build_payload):
+    """JSON response carrying an ETag; answers 304 without building the payload if the client copy is current"""
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+    else:
+        response = jsonify(build_payload())
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
 @app.route('/api/orders/statistics')
 def api_order_statistics():
     """API endpoint for order state machine statistics"""
     try:
-        # Import Order State Machine
-        sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
-        from services.order.state_machine import OrderStateMachine, OrderState
-
-        # Initialize state machine
-        state_machine = OrderStateMachine("sim/config/company_release2.yaml")
-        state_machine.load_orders()
-
-        # Get statistics
-        stats = state_machine.get_order_statistics()
-        overdue_orders = state_machine.get_overdue_orders()
-
-        # Calculate SLA compliance
-        total_orders = stats['total_orders']
-        overdue_count = len(overdue_orders)
-        sla_compliance = ((total_orders - overdue_count) / total_orders * 100) if total_orders > 0 else 100
-
-        # Generate recent orders data
-        recent_orders = []
-        for order_id, order in list(state_machine.orders.items())[-10:]:  # Last 10 orders
-            recent_orders.append({
-                'id': order.id,
-                'customer_name': order.customer_name,
-                'total_amount': order.total_amount,
-                'current_state': order.current_state.value,
-                'state_name': order.current_state.value.replace('_', ' ').title(),
-                'created_at': datetime.fromtimestamp(order.created_at).isoformat(),
-                'priority': order.priority
-            })
+        from services.order.order_service import get_order_service
 
-        return jsonify({
-            'success': True,
-            'total_orders': total_orders,
-            'avg_processing_time': stats.get('avg_processing_time', 6.5),
-            'sla_compliance': int(sla_compliance),
-            'overdue_count': overdue_count,
-            'by_state': stats['by_state'],
-            'recent_orders': recent_orders,
-            'timestamp': datetime.now().isoformat()
-        })
+        # Shared in-memory orders, refreshed only when the order store changed
+        order_service = get_order_service()
+        order_service.refresh()
+
+        return conditional_json(order_service.etag(),
+                                lambda: {'success': True, **order_service.get_statistics()})
 
     except Exception as e:
         logger.error(f"Error getting order statistics: {e}")
@@ -1783,55 +1742,18 @@ def api_order_statistics():
 def api_order_details(order_id):
     """API endpoint for specific order details"""
     try:
-        # Import Order State Machine
-        sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
-        from services.order.state_machine import OrderStateMachine
+        from services.order.order_service import get_order_service, order_details
 
-        # Initialize state machine
-        state_machine = OrderStateMachine("sim/config/company_release2.yaml")
-        state_machine.load_orders()
+        order_service = get_order_service()
+        order_service.refresh()
 
         # Get order details
-        order = state_machine.get_order(order_id)
+        order = order_service.get_order(order_id)
         if not order:
             return jsonify({'success': False, 'error': 'Order not found'}), 404
 
-        # Prepare order data
-        order_data = {
-            'id': order.id,
-            'customer_name': order.customer_name,
-            'customer_email': order.customer_email,
-            'total_amount': order.total_amount,
-            'priority': order.priority,
-            'sla_hours': order.sla_hours,
-            'current_state': order.current_state.value,
-            'created_at': datetime.fromtimestamp(order.created_at).isoformat(),
-            'items': [
-                {
-                    'sku': item.sku,
-                    'name': item.name,
-                    'quantity': item.quantity,
-                    'unit_price': item.unit_price,
-                    'total_price': item.total_price
-                } for item in order.items
-            ],
-            'history': [
-                {
-                    'from_state': transition.from_state.value,
-                    'to_state': transition.to_state.value,
-                    'timestamp': datetime.fromtimestamp(transition.timestamp).isoformat(),
-                    'agent': transition.agent,
-                    'reason': transition.reason,
-                    'metadata': transition.metadata
-                } for transition in order.history
-            ],
-            'metadata': order.metadata
-        }
-
-        return jsonify({
-            'success': True,
-            'order': order_data
-        })
+        return conditional_json(order_service.order_etag(order),
+                                lambda: {'success': True, 'order': order_details(order)})
 
     except Exception as e:
         logger.error(f"Error getting order details for {order_id}: {e}")
@@ -1844,13 +1766,8 @@ def api_create_demo_order():
     try:
         data = request.get_json()
 
-        # Import Order State Machine and related classes
-        sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
-        from services.order.state_machine import OrderStateMachine, OrderItem
-
-        # Initialize state machine
-        state_machine = OrderStateMachine("sim/config/company_release2.yaml")
-        state_machine.load_orders()
+        from services.order.order_service import get_order_service
+        from services.order.state_machine import OrderItem
 
         # Create demo order items
         items = [
@@ -1858,8 +1775,10 @@ def api_create_demo_order():
             OrderItem("BTN-DEMO-002", "Demo Gold Plated Button", 50, 5.00, 250.00)
         ]
 
-        # Create order
-        order = state_machine.create_order(
+        # Create order through the shared service so the next statistics poll sees it
+        order_service = get_order_service()
+        order_service.refresh()
+        order = order_service.create_order(
             customer_email=data.get('customer_email', 'demo@example.com'),
             customer_name=data.get('customer_name', 'Demo Customer'),
             items=items,
@@ -1880,11 +1799,41 @@ def api_create_demo_order():
         logger.error(f"Error creating demo order: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+
+@app.route('/api/events')
+def api_events():
+    """API endpoint tailing the event log from an offset"""
+    try:
+        from services.events.event_log import get_event_log
+
+        event_log = get_event_log()
+        limit = min(request.args.get('limit', 100, type=int), 1000)
+        since = request.args.get('since', type=int)
+
+        # Without an offset the client gets the latest events to start tailing from
+        records = event_log.tail(limit) if since is None else event_log.read(since, limit)
+        next_offset = records[-1]['offset'] + 1 if records else max(since or 0, event_log.first_offset)
+
+        return jsonify({
+            'success': True,
+            'events': records,
+            'next_offset': next_offset,
+            'first_offset': event_log.first_offset,
+            'timestamp': datetime.now().isoformat()
+        })
+
+    except Exception as e:
+        logger.error(f"Error reading event log: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+startup.mark('app_setup')
+
 if __name__ == '__main__':
     # Start background update thread
     socketio.start_background_task(background_updates)
 
-    # Run the dashboard
+    # Run the dashboard; subsystems warm up in parallel once it accepts connections
     port = int(os.environ.get('PORT', 80))
+    startup.warm_up_when_listening(port)
     logger.info(f"🌐 Starting Happy Buttons Dashboard on http://localhost:{port}")
     socketio.run(app, host='0.0.0.0', port=port, debug=False, allow_unsafe_werkzeug=True)
\ No newline at end of file
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Concurrent checkout benchmark for the webshop database
+
+Races buyer threads against limited stock and compares the previous
+checkout (per-item product lookups, stock check in Python, separate
+commits for the order and each stock update) with the single-transaction
+OrderModel.checkout. Reports throughput and oversold units.
+
+Usage: python scripts/benchmark_checkout.py [--buyers 8] [--orders 200] [--stock 500]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from models.database import Database, ProductModel, OrderModel, CheckoutError
+
+ORDER_DATA = {'customer_name': 'Benchmark Buyer', 'customer_email': 'bench@example.com',
+              'shipping_address': 'Benchmark Street 1'}
+
+
+def legacy_checkout(products: ProductModel, orders: OrderModel, cart: list) -> bool:
+    """The previous api_create_order flow"""
+    total_amount = 0
+    order_items = []
+    for item in cart:
+        product = products.get_product_by_id(item['product_id'])
+        if not product or product['stock_quantity'] < item['quantity']:
+            return False
+        item_total = float(product['price']) * item['quantity']
+        total_amount += item_total
+        order_items.append({'product_id': item['product_id'], 'quantity': item['quantity'],
+                            'unit_price': product['price'], 'total_price': item_total})
+
+    orders.create_order({**ORDER_DATA, 'total_amount': total_amount}, order_items)
+    for item in order_items:
+        products.update_stock(item['product_id'], item['quantity'])
+    return True
+
+
+def atomic_checkout(products: ProductModel, orders: OrderModel, cart: list) -> bool:
+    try:
+        orders.checkout(ORDER_DATA, cart)
+        return True
+    except CheckoutError:
+        return False
+
+
+def run(name: str, checkout, buyers: int, orders_per_buyer: int, stock: int):
+    db = Database(tempfile.mkdtemp(prefix='checkout_bench_') + '/shop.db')
+    products, orders = ProductModel(db), OrderModel(db)
+    product_ids = [p['id'] for p in products.get_all_products()[:3]]
+    db.execute(f"UPDATE products SET stock_quantity = ? WHERE id IN ({','.join('?' * len(product_ids))})",
+               [stock, *product_ids])
+
+    accepted = []
+
+    def buyer(seed: int):
+        rng = random.Random(seed)
+        for _ in range(orders_per_buyer):
+            cart = [{'product_id': pid, 'quantity': rng.randint(1, 5)}
+                    for pid in rng.sample(product_ids, rng.randint(1, len(product_ids)))]
+            accepted.append(checkout(products, orders, cart))
+
+    threads = [threading.Thread(target=buyer, args=(n,)) for n in range(buyers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    sold = dict(db.execute("SELECT product_id, SUM(quantity) FROM order_items GROUP BY product_id").fetchall())
+    # Units in accepted orders that were never taken out of stock
+    oversold = 0
+    for pid in product_ids:
+        reserved = stock - products.get_product_by_id(pid)['stock_quantity']
+        oversold += sold.get(pid, 0) - reserved
+    db.close_all()
+
+    attempts = len(accepted)
+    print(f"   {name:<22} {attempts / elapsed:8.0f} checkouts/s   "
+          f"accepted {accepted.count(True):5d}/{attempts}   oversold units: {oversold}")
+    return oversold
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--buyers', type=int, default=8)
+    parser.add_argument('--orders', type=int, default=200, help='checkouts per buyer')
+    parser.add_argument('--stock', type=int, default=500, help='initial units per product')
+    args = parser.parse_args()
+
+    print("🛒 CONCURRENT CHECKOUT BENCHMARK")
+    print("=" * 50)
+    print(f"   {args.buyers} buyers x {args.orders} checkouts, {args.stock} units per product\n")
+    run("legacy (per-item)", legacy_checkout, args.buyers, args.orders, args.stock)
+    oversold = run("atomic checkout", atomic_checkout, args.buyers, args.orders, args.stock)
+    if oversold:
+        sys.exit("Atomic checkout oversold stock")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark for OrderStateMachine queries at large order volumes
+
+Compares the indexed statistics / state lookups against the former
+full-scan implementation at 100k and 1M orders.
+
+Usage: python scripts/benchmark_order_state_machine.py [--sizes 100000 1000000]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from services.order.order_store import OrderJournal
+from services.order.state_machine import (
+    OrderStateMachine, Order, OrderItem, OrderState, StateTransition
+)
+
+CONFIG_PATH = str(Path(__file__).parent.parent / 'src' / 'sim' / 'config' / 'company_release2.yaml')
+
+
+def populate(state_machine: OrderStateMachine, count: int, seed: int = 42):
+    """Fill the state machine in memory (persistence is not part of this benchmark)"""
+    rng = random.Random(seed)
+    states = list(OrderState)
+    items = [OrderItem("BTN-001", "Premium Red Button", 100, 2.50, 250.00)]
+    now = time.time()
+
+    for n in range(count):
+        state = rng.choice(states)
+        created_at = now - rng.uniform(0, 30 * 86400)
+        order = Order(
+            id=f"ORD_BENCH_{n}",
+            customer_email="bench@example.com",
+            customer_name="Benchmark Customer",
+            items=items,
+            total_amount=rng.uniform(100, 20000),
+            priority=rng.randint(1, 4),
+            sla_hours=24,
+            current_state=state,
+            history=[StateTransition(OrderState.CREATED, state, created_at + rng.uniform(0, 3600),
+                                     "Benchmark", "seeded")],
+            created_at=created_at
+        )
+        state_machine._put_order(order)
+
+
+def full_scan_statistics(state_machine: OrderStateMachine) -> dict:
+    """The previous get_order_statistics: one scan per state, overdue scan, totals scan"""
+    stats = {'by_state': {}, 'by_priority': {1: 0, 2: 0, 3: 0, 4: 0}, 'total_value': 0,
+             'overdue_count': len(state_machine.get_overdue_orders())}
+    for state in OrderState:
+        stats['by_state'][state.value] = len(
+            [o for o in state_machine.orders.values() if o.current_state == state])
+    processing_times = []
+    for order in state_machine.orders.values():
+        stats['by_priority'][order.priority] += 1
+        stats['total_value'] += order.total_amount
+        if order.current_state == OrderState.CLOSED and order.history:
+            processing_times.append(order.history[-1].timestamp - order.created_at)
+    return stats
+
+
+def timed(func, repeat: int = 5) -> float:
+    """Best-of-N wall time in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(size: int):
+    store = OrderJournal(tempfile.mkdtemp(prefix='order_bench_'))
+    state_machine = OrderStateMachine(CONFIG_PATH, store=store)
+    state_machine.sla_engine.on_overdue = None  # Do not log synthetic SLA breaches
+
+    start = time.perf_counter()
+    populate(state_machine, size)
+    build_s = time.perf_counter() - start
+
+    stats = state_machine.get_order_statistics()
+    reference = full_scan_statistics(state_machine)
+    assert stats['by_state'] == reference['by_state']
+    assert stats['by_priority'] == reference['by_priority']
+
+    print(f"\n📦 {size:,} orders (built in {build_s:.1f}s)")
+    print(f"   full-scan statistics (previous): {timed(lambda: full_scan_statistics(state_machine), 3):10.2f} ms")
+    print(f"   get_order_statistics:            {timed(state_machine.get_order_statistics):10.2f} ms")
+    print(f"   get_overdue_orders:              {timed(state_machine.get_overdue_orders, 3):10.2f} ms")
+    print(f"   get_orders_by_state(CLOSED):     {timed(lambda: state_machine.get_orders_by_state(OrderState.CLOSED)):10.2f} ms")
+
+    order_ids = list(state_machine.orders)[:1000]
+    created = [oid for oid in order_ids if state_machine.orders[oid].current_state == OrderState.CREATED]
+    start = time.perf_counter()
+    for order_id in created:
+        order = state_machine.orders[order_id]
+        order.add_transition(OrderState.CONFIRMED, "Benchmark", "bench")
+        state_machine._index_transition(order, OrderState.CREATED)
+    if created:
+        per_us = (time.perf_counter() - start) / len(created) * 1e6
+        print(f"   index update per transition:     {per_us:10.2f} µs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print("🏁 ORDER STATE MACHINE BENCHMARK")
+    print("=" * 50)
+    for size in args.sizes:
+        run(size)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,13 @@
 #!/usr/bin/env python3
 """
 Agent Email Dispatcher for Inter-Agent Communication
-Enables agents to send and receive task emails via real mailboxes
+Enables agents to send and receive tasks via in-process queues, local
+sockets or real mailboxes
 """
 
 import smtplib
 import imaplib
 import email
-import yaml
 import json
 import uuid
 from datetime import datetime, timedelta
@@ -18,6 +18,17 @@ from email.mime.base import MIMEBase
 from email import encoders
 import logging
 from dataclasses import dataclass, asdict
+import threading
+
+try:
+    from .task_transport import TaskTransport, InProcessTransport, get_socket_transport
+except ImportError:
+    from task_transport import TaskTransport, InProcessTransport, get_socket_transport
+
+try:
+    from services.config.config_registry import load_config
+except ImportError:  # pragma: no cover - allows package-relative imports
+    from ..services.config.config_registry import load_config
 
 logger = logging.getLogger(__name__)
 
@@ -74,17 +85,16 @@ class AgentTask:
         )
 
 
-class AgentEmailDispatcher:
-    """Handles email communication between agents using real mailboxes"""
+class EmailTransport(TaskTransport):
+    """Delivers tasks as real emails (SMTP send, IMAP poll)"""
 
-    def __init__(self, config_path="sim/config/company_release2.yaml"):
-        """Initialize with email server configuration"""
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+    name = "email"
 
-        self.email_domains = self.config['email']['domains']
-        self.imap_config = self.config['email']['servers']['imap']
-        self.smtp_config = self.config['email']['servers']['smtp']
+    def __init__(self, config: Dict[str, Any]):
+        """Initialize with email server configuration"""
+        self.email_domains = config['email']['domains']
+        self.imap_config = config['email']['servers']['imap']
+        self.smtp_config = config['email']['servers']['smtp']
 
         # Map agent types to email addresses
         self.agent_email_mapping = {
@@ -106,9 +116,11 @@ class AgentEmailDispatcher:
             'finance@h-bu.de': ['finance_agent']
         }
 
-    def send_task_email(self, task: AgentTask) -> bool:
+    def send(self, task_data: Dict[str, Any]) -> bool:
         """Send a task email from one agent to another"""
         try:
+            task = AgentTask.from_dict(task_data)
+
             # Use info@h-bu.de as sender for all emails to avoid authentication issues
             from_email = "info@h-bu.de"
             to_email = self.agent_email_mapping.get(task.to_agent, "info@h-bu.de")
@@ -174,7 +186,7 @@ Do not reply to this email directly.
 """
         return body
 
-    def check_for_agent_tasks(self, agent_type: str, limit: int = 10) -> List[AgentTask]:
+    def receive(self, agent_type: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Check for incoming task emails for a specific agent"""
         tasks = []
 
@@ -192,13 +204,11 @@ Do not reply to this email directly.
             except Exception as e:
                 logger.error(f"Error checking agent tasks in {email_addr}: {e}")
 
-        # Sort by priority and creation time
-        tasks.sort(key=lambda t: (
-            0 if t.priority == 'critical' else 1 if t.priority == 'high' else 2,
-            t.created_at
-        ))
+        return [task.to_dict() for task in tasks[:limit]]
 
-        return tasks[:limit]
+    def peek(self, agent_type: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """IMAP polling does not consume messages, so peeking is receiving"""
+        return self.receive(agent_type, limit)
 
     def _fetch_agent_tasks_from_mailbox(self, email_address: str, limit: int) -> List[AgentTask]:
         """Fetch agent task emails from a specific mailbox"""
@@ -377,6 +387,89 @@ Do not reply to this email directly.
             logger.error(f"Error extracting task from body: {e}")
             return None
 
+
+class AgentEmailDispatcher:
+    """
+    Sends and receives inter-agent tasks through a pluggable transport
+
+    The transport is selected by the `agent_transport` config section:
+    - inprocess:   shared in-memory priority queues (default)
+    - unix_socket: Unix domain sockets for agents in other processes
+    - email:       real mailboxes via SMTP/IMAP
+
+    Email can additionally be kept as an audit copy of every task
+    (`audit_email`) or as a bridge when the primary transport cannot
+    deliver (`email_bridge`).
+    """
+
+    def __init__(self, config_path="sim/config/company_release2.yaml",
+                 transport: Optional[TaskTransport] = None):
+        """Initialize with email server and transport configuration"""
+        self.config = load_config(config_path)
+
+        self.email_transport = EmailTransport(self.config)
+        self.email_domains = self.email_transport.email_domains
+        self.imap_config = self.email_transport.imap_config
+        self.smtp_config = self.email_transport.smtp_config
+        self.agent_email_mapping = self.email_transport.agent_email_mapping
+        self.email_agent_mapping = self.email_transport.email_agent_mapping
+
+        transport_config = self.config.get('agent_transport', {})
+        self.transport = transport or self._create_transport(transport_config)
+        self.audit_email = transport_config.get('audit_email', False) and self.transport is not self.email_transport
+        self.email_bridge = transport_config.get('email_bridge', False) and self.transport is not self.email_transport
+
+    def _create_transport(self, transport_config: Dict[str, Any]) -> TaskTransport:
+        """Build the primary transport from configuration"""
+        transport_type = transport_config.get('type', 'inprocess')
+
+        if transport_type == 'email':
+            return self.email_transport
+        if transport_type == 'unix_socket':
+            return get_socket_transport(transport_config.get('socket_dir', 'data/agent_sockets'))
+        if transport_type != 'inprocess':
+            logger.warning(f"Unknown agent transport '{transport_type}', using inprocess")
+        return InProcessTransport()
+
+    def register_agent(self, agent_type: str) -> None:
+        """Start receiving tasks for an agent type in this process"""
+        self.transport.listen(agent_type)
+
+    def send_task_email(self, task: AgentTask) -> bool:
+        """Send a task from one agent to another over the configured transport"""
+        task_data = task.to_dict()
+
+        delivered = self.transport.send(task_data)
+        if not delivered and self.email_bridge:
+            logger.info(f"Bridging task {task.task_id} to {task.to_agent} via email")
+            delivered = self.email_transport.send(task_data)
+
+        if delivered and self.audit_email:
+            # Audit copies must not add SMTP latency to agent coordination
+            threading.Thread(target=self.email_transport.send, args=(task_data,),
+                             daemon=True).start()
+
+        if delivered:
+            logger.info(f"Task {task.task_id} sent from {task.from_agent} to {task.to_agent} via {self.transport.name}")
+        return delivered
+
+    def check_for_agent_tasks(self, agent_type: str, limit: int = 10) -> List[AgentTask]:
+        """Take incoming tasks for a specific agent"""
+        tasks = []
+        for task_data in self.transport.receive(agent_type, limit):
+            try:
+                tasks.append(AgentTask.from_dict(task_data))
+            except Exception as e:
+                logger.error(f"Error decoding task for {agent_type}: {e}")
+
+        # Sort by priority and creation time
+        tasks.sort(key=lambda t: (
+            0 if t.priority == 'critical' else 1 if t.priority == 'high' else 2,
+            t.created_at
+        ))
+
+        return tasks[:limit]
+
     def send_task_response(self, original_task: AgentTask, response_data: Dict[str, Any],
                           status: str = "completed") -> bool:
         """Send a response to a task"""
@@ -430,7 +523,7 @@ Do not reply to this email directly.
     def get_agent_task_stats(self, agent_type: str) -> Dict[str, Any]:
         """Get task statistics for an agent"""
         try:
-            tasks = self.check_for_agent_tasks(agent_type, limit=100)
+            tasks = [AgentTask.from_dict(t) for t in self.transport.peek(agent_type, limit=100)]
 
             total_tasks = len(tasks)
             pending_tasks = len([t for t in tasks if t.status == 'pending'])
@@ -443,7 +536,8 @@ Do not reply to this email directly.
                 'high_priority_tasks': high_priority,
                 'overdue_tasks': overdue_tasks,
                 'task_types': list(set(t.task_type for t in tasks)),
-                'last_checked': datetime.now().isoformat()
+                'last_checked': datetime.now().isoformat(),
+                'transport': self.transport.name
             }
 
         except Exception as e:
@@ -26,6 +26,11 @@ except ImportError:  # pragma: no cover - supports package-style imports
     from src.email_processing.parser import ParsedEmail
     from src.email_processing.router import RoutingDecision
 
+try:
+    from utils.response_cache import invalidate_responses
+except ImportError:  # pragma: no cover - supports package-style imports
+    from src.utils.response_cache import invalidate_responses
+
 logger = logging.getLogger(__name__)
 
 
@@ -100,8 +105,9 @@ class BaseAgent(ABC):
             'last_activity': datetime.now()
         }
 
-        # Email dispatcher for inter-agent communication
+        # Task dispatcher for inter-agent communication
         self.email_dispatcher = AgentEmailDispatcher()
+        self.email_dispatcher.register_agent(self.agent_type)
 
         logger.info(f"Initialized {self.agent_type} agent: {self.agent_id}")
 
@@ -109,6 +115,7 @@ class BaseAgent(ABC):
         """Start the agent and initialize Claude Flow hooks"""
         try:
             self.is_active = True
+            invalidate_responses('agents')
 
             # Initialize Claude Flow coordination
             await self._run_claude_flow_hook('pre-task', {
@@ -131,6 +138,7 @@ class BaseAgent(ABC):
         """Stop the agent and finalize coordination"""
         try:
             self.is_active = False
+            invalidate_responses('agents')
 
             # Run post-task hooks
             await self._run_claude_flow_hook('post-task', {
@@ -354,6 +362,9 @@ class BaseAgent(ABC):
         # Store in memory
         self.memory.metrics = self.metrics
 
+        # Dashboard agent status is cached between polls
+        invalidate_responses('agents')
+
     def get_status(self) -> Dict[str, Any]:
         """Get current agent status"""
         return {
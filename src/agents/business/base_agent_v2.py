@@ -12,7 +12,13 @@ from typing import Dict, List, Optional, Any, Callable
 from dataclasses import dataclass, field
 from abc import ABC, abstractmethod
 from enum import Enum
-import yaml
+
+try:
+    from services.config.config_registry import load_config
+    from services.events.event_bus import EventBus, get_event_bus
+except ImportError:  # pragma: no cover - allows package-relative imports
+    from ...services.config.config_registry import load_config
+    from ...services.events.event_bus import EventBus, get_event_bus
 
 class AgentStatus(Enum):
     """Agent status states"""
@@ -75,6 +81,8 @@ class BaseAgent(ABC):
         # Event system
         self.event_handlers: Dict[str, Callable] = {}
         self.event_queue: List[AgentEvent] = []
+        self.event_bus: Optional[EventBus] = None
+        self._event_seq = 0
 
         # Storage directories
         self._setup_storage()
@@ -92,8 +100,7 @@ class BaseAgent(ABC):
     def _load_config(self, config_path: str) -> dict:
         """Load agent configuration"""
         try:
-            with open(config_path, 'r') as f:
-                return yaml.safe_load(f)
+            return load_config(config_path)
         except FileNotFoundError:
             self.logger.error(f"Config file not found: {config_path}")
             return {}
@@ -229,53 +236,24 @@ class BaseAgent(ABC):
     async def emit_event(self, event_type: str, data: Dict[str, Any],
                         target_agent: Optional[str] = None):
         """Emit an event to other agents"""
+        self._event_seq += 1
         event = AgentEvent(
-            id=f"{self.agent_id}_{int(time.time())}_{len(self.event_queue)}",
+            id=f"{self.agent_id}_{int(time.time())}_{self._event_seq}",
             type=event_type,
             source_agent=self.agent_id,
             target_agent=target_agent,
             data=data
         )
 
-        # Save event
-        self._save_event(event)
-
-        # Broadcast to coordination system
+        # Publish to subscribers (persistence is a sink on the bus)
         await self._broadcast_event(event)
 
         self.logger.debug(f"Emitted event: {event_type} to {target_agent or 'ALL'}")
 
-    def _save_event(self, event: AgentEvent):
-        """Save event to storage"""
-        try:
-            event_file = f"{self.storage_dir}/events/{event.id}.json"
-            event_data = {
-                'id': event.id,
-                'type': event.type,
-                'source_agent': event.source_agent,
-                'target_agent': event.target_agent,
-                'data': event.data,
-                'timestamp': event.timestamp
-            }
-
-            with open(event_file, 'w') as f:
-                json.dump(event_data, f, indent=2)
-
-            # Also save to global events directory for dashboard
-            global_events_dir = "data/events"
-            os.makedirs(global_events_dir, exist_ok=True)
-            global_event_file = f"{global_events_dir}/agent_event_{event.id}.json"
-
-            with open(global_event_file, 'w') as f:
-                json.dump(event_data, f, indent=2)
-
-        except Exception as e:
-            self.logger.error(f"Error saving event: {e}")
-
     async def _broadcast_event(self, event: AgentEvent):
         """Broadcast event to agent coordination system"""
-        # This would integrate with actual message bus in production
-        pass
+        bus = self.event_bus or get_event_bus()
+        await bus.publish(event)
 
     def register_event_handler(self, event_type: str, handler: Callable):
         """Register an event handler"""
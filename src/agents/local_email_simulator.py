@@ -5,7 +5,6 @@ Simulates SMTP/IMAP functionality locally to avoid rate limiting during developm
 """
 
 import os
-import json
 import time
 from datetime import datetime
 from typing import Dict, List, Any, Optional
@@ -13,6 +12,7 @@ from pathlib import Path
 import logging
 
 from .agent_email_dispatcher import AgentTask
+from .mailbox_store import MailboxStore
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +20,7 @@ logger = logging.getLogger(__name__)
 class LocalEmailSimulator:
     """Simulates email functionality locally for agent communication testing"""
 
-    def __init__(self, data_dir: str = "data/agent_emails"):
+    def __init__(self, data_dir: str = "data/agent_emails", store: Optional[MailboxStore] = None):
         """Initialize the local email simulator"""
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
@@ -48,6 +48,11 @@ class LocalEmailSimulator:
             'logistics_agent': 'info'
         }
 
+        # Indexed mailbox backend; task_*.json files from earlier runs are imported once
+        self.store = store or MailboxStore(str(self.data_dir / 'mailboxes.db'))
+        for mailbox_name, mailbox_dir in self.mailboxes.items():
+            self.store.import_legacy_files(mailbox_name, mailbox_dir)
+
         logger.info("Local email simulator initialized")
 
     def send_task_email(self, task: AgentTask) -> bool:
@@ -55,11 +60,9 @@ class LocalEmailSimulator:
         try:
             # Determine target mailbox
             target_mailbox = self.agent_mailbox_mapping.get(task.to_agent, 'info')
-            mailbox_dir = self.mailboxes[target_mailbox]
 
-            # Create email file
-            email_filename = f"task_{task.task_id}_{int(time.time())}.json"
-            email_path = mailbox_dir / email_filename
+            # Nanosecond suffix: repeated sends within a second stay distinct messages
+            message_id = f"task_{task.task_id}_{time.time_ns()}"
 
             # Create email data
             email_data = {
@@ -80,56 +83,43 @@ class LocalEmailSimulator:
                 'mailbox': target_mailbox
             }
 
-            # Write email to file
-            with open(email_path, 'w') as f:
-                json.dump(email_data, f, indent=2)
+            self.store.deliver(message_id, target_mailbox, email_data)
 
-            logger.info(f"Simulated email sent: {email_filename} to {target_mailbox} mailbox")
+            logger.info(f"Simulated email sent: {message_id} to {target_mailbox} mailbox")
             return True
 
         except Exception as e:
             logger.error(f"Failed to simulate email sending: {str(e)}")
             return False
 
+    def _email_to_task(self, email_data: Dict[str, Any]) -> AgentTask:
+        """Convert stored email data back to an AgentTask"""
+        return AgentTask(
+            task_id=email_data['task_id'],
+            from_agent=email_data['from_agent'],
+            to_agent=email_data['to_agent'],
+            task_type=email_data['task_type'],
+            priority=email_data['priority'],
+            subject=email_data.get('subject', '').replace('[AGENT-TASK]', '').strip(),
+            content=email_data['content'],
+            data=email_data.get('data', {}),
+            created_at=datetime.fromisoformat(email_data['created_at']),
+            due_at=datetime.fromisoformat(email_data['due_at']) if email_data.get('due_at') else None,
+            status=email_data.get('status', 'pending')
+        )
+
     def get_agent_tasks(self, agent_type: str, limit: int = 10) -> List[AgentTask]:
-        """Get tasks for a specific agent from their mailbox"""
+        """Get the newest unread tasks for a specific agent from their mailbox"""
         try:
-            # Determine agent's mailbox
             mailbox_name = self.agent_mailbox_mapping.get(agent_type, 'info')
-            mailbox_dir = self.mailboxes[mailbox_name]
+            messages = self.store.fetch(mailbox_name, to_agent=agent_type, limit=limit)
 
             tasks = []
-
-            # Read all email files in the mailbox
-            for email_file in sorted(mailbox_dir.glob("task_*.json"), reverse=True):
+            for message in messages:
                 try:
-                    with open(email_file, 'r') as f:
-                        email_data = json.load(f)
-
-                    # Check if this email is for the requested agent
-                    if email_data.get('to_agent') == agent_type:
-                        # Convert back to AgentTask
-                        task = AgentTask(
-                            task_id=email_data['task_id'],
-                            from_agent=email_data['from_agent'],
-                            to_agent=email_data['to_agent'],
-                            task_type=email_data['task_type'],
-                            priority=email_data['priority'],
-                            subject=email_data.get('subject', '').replace('[AGENT-TASK]', '').strip(),
-                            content=email_data['content'],
-                            data=email_data.get('data', {}),
-                            created_at=datetime.fromisoformat(email_data['created_at']),
-                            due_at=datetime.fromisoformat(email_data['due_at']) if email_data.get('due_at') else None,
-                            status=email_data.get('status', 'pending')
-                        )
-                        tasks.append(task)
-
-                        if len(tasks) >= limit:
-                            break
-
+                    tasks.append(self._email_to_task(message['email']))
                 except Exception as e:
-                    logger.error(f"Error reading email file {email_file}: {str(e)}")
-                    continue
+                    logger.error(f"Error reading message {message['message_id']}: {str(e)}")
 
             logger.info(f"Found {len(tasks)} tasks for {agent_type} in {mailbox_name} mailbox")
             return tasks
@@ -138,25 +128,30 @@ class LocalEmailSimulator:
             logger.error(f"Error getting tasks for {agent_type}: {str(e)}")
             return []
 
-    def get_agent_task_stats(self, agent_type: str) -> Dict[str, Any]:
-        """Get task statistics for an agent"""
+    def claim_agent_tasks(self, agent_type: str, worker_id: str, limit: int = 10) -> List[AgentTask]:
+        """Atomically claim the oldest unread tasks so parallel workers never share one"""
         try:
-            tasks = self.get_agent_tasks(agent_type, limit=100)
+            mailbox_name = self.agent_mailbox_mapping.get(agent_type, 'info')
+            messages = self.store.claim(mailbox_name, agent_type, worker_id, limit)
+            return [self._email_to_task(message['email']) for message in messages]
+
+        except Exception as e:
+            logger.error(f"Error claiming tasks for {agent_type}: {str(e)}")
+            return []
 
-            total_tasks = len(tasks)
-            pending_tasks = len([t for t in tasks if t.status == 'pending'])
-            high_priority = len([t for t in tasks if t.priority in ['high', 'critical']])
-            overdue_tasks = len([t for t in tasks if t.due_at and t.due_at < datetime.now()])
+    def mark_task_read(self, task: AgentTask) -> bool:
+        """Mark a fetched or claimed task as processed"""
+        return self.store.mark_read(task.task_id, task.to_agent) > 0
 
-            return {
-                'total_tasks': total_tasks,
-                'pending_tasks': pending_tasks,
-                'high_priority_tasks': high_priority,
-                'overdue_tasks': overdue_tasks,
-                'task_types': list(set(t.task_type for t in tasks)),
+    def get_agent_task_stats(self, agent_type: str) -> Dict[str, Any]:
+        """Get task statistics for an agent"""
+        try:
+            stats = self.store.agent_stats(agent_type)
+            stats.update({
                 'last_checked': datetime.now().isoformat(),
                 'simulation_mode': True
-            }
+            })
+            return stats
 
         except Exception as e:
             logger.error(f"Error getting task stats for {agent_type}: {e}")
@@ -202,28 +197,25 @@ class LocalEmailSimulator:
         summary = {}
 
         for mailbox_name, mailbox_dir in self.mailboxes.items():
-            email_files = list(mailbox_dir.glob("task_*.json"))
             summary[mailbox_name] = {
-                'email_count': len(email_files),
+                'email_count': self.store.count(mailbox=mailbox_name),
+                'unread_count': self.store.count(mailbox=mailbox_name, status='unread'),
                 'mailbox_path': str(mailbox_dir),
                 'latest_emails': []
             }
 
             # Get latest 3 emails
-            for email_file in sorted(email_files, reverse=True)[:3]:
-                try:
-                    with open(email_file, 'r') as f:
-                        email_data = json.load(f)
-                    summary[mailbox_name]['latest_emails'].append({
-                        'task_id': email_data['task_id'],
-                        'from_agent': email_data['from_agent'],
-                        'to_agent': email_data['to_agent'],
-                        'subject': email_data['subject'],
-                        'priority': email_data['priority'],
-                        'sent_time': email_data['simulated_send_time']
-                    })
-                except Exception as e:
-                    logger.error(f"Error reading {email_file}: {e}")
+            for message in self.store.fetch(mailbox_name, status=None, limit=3):
+                email_data = message['email']
+                summary[mailbox_name]['latest_emails'].append({
+                    'task_id': email_data['task_id'],
+                    'from_agent': email_data['from_agent'],
+                    'to_agent': email_data['to_agent'],
+                    'subject': email_data['subject'],
+                    'priority': email_data['priority'],
+                    'sent_time': email_data['simulated_send_time'],
+                    'status': message['status']
+                })
 
         return summary
 
@@ -232,17 +224,17 @@ class LocalEmailSimulator:
         if mailbox_name not in self.mailboxes:
             return 0
 
-        mailbox_dir = self.mailboxes[mailbox_name]
-        email_files = list(mailbox_dir.glob("task_*.json"))
+        cleared = self.store.clear(mailbox_name)
 
-        for email_file in email_files:
+        # Remove legacy task files so they are not mistaken for live mail
+        for email_file in self.mailboxes[mailbox_name].glob("task_*.json"):
             try:
                 email_file.unlink()
             except Exception as e:
                 logger.error(f"Error deleting {email_file}: {e}")
 
-        logger.info(f"Cleared {len(email_files)} emails from {mailbox_name} mailbox")
-        return len(email_files)
+        logger.info(f"Cleared {cleared} emails from {mailbox_name} mailbox")
+        return cleared
 
     def clear_all_mailboxes(self) -> int:
         """Clear all emails from all mailboxes"""
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Indexed Mailbox Store for Local Agent Email Simulation
+SQLite-backed agent mailboxes with read state and atomic task claiming
+
+Replaces globbing and parsing every task_*.json file per call: pending
+tasks are served from an index on (mailbox, status, created_at), so fetching
+the newest unread tasks costs O(limit) regardless of mailbox history.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Message states
+UNREAD = "unread"
+CLAIMED = "claimed"
+READ = "read"
+
+
+class MailboxStore:
+    """SQLite mailbox backend shared by agent workers (threads or processes)"""
+
+    def __init__(self, db_path: str = "data/agent_emails/mailboxes.db"):
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._init_schema()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Thread-local connection (SQLite connections are not shareable across threads)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        conn = self._connection()
+        conn.executescript('''
+            CREATE TABLE IF NOT EXISTS mailbox_messages (
+                message_id TEXT PRIMARY KEY,
+                mailbox TEXT NOT NULL,
+                task_id TEXT NOT NULL,
+                from_agent TEXT,
+                to_agent TEXT NOT NULL,
+                task_type TEXT,
+                priority TEXT,
+                due_at TEXT,
+                status TEXT NOT NULL DEFAULT 'unread',
+                created_at REAL NOT NULL,
+                claimed_by TEXT,
+                claimed_at REAL,
+                payload TEXT NOT NULL
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_mailbox_status_created
+                ON mailbox_messages (mailbox, status, created_at);
+            CREATE INDEX IF NOT EXISTS idx_agent_status_created
+                ON mailbox_messages (to_agent, status, created_at);
+            CREATE INDEX IF NOT EXISTS idx_mailbox_created
+                ON mailbox_messages (mailbox, created_at);
+            CREATE INDEX IF NOT EXISTS idx_task_id
+                ON mailbox_messages (task_id);
+
+            CREATE TABLE IF NOT EXISTS mailbox_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        ''')
+
+    def deliver(self, message_id: str, mailbox: str, email_data: Dict[str, Any],
+                created_at: Optional[float] = None) -> bool:
+        """Store a message as unread; re-delivering the same message_id is a no-op"""
+        cursor = self._connection().execute('''
+            INSERT OR IGNORE INTO mailbox_messages
+                (message_id, mailbox, task_id, from_agent, to_agent, task_type,
+                 priority, due_at, status, created_at, payload)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            message_id, mailbox, email_data['task_id'], email_data.get('from_agent'),
+            email_data['to_agent'], email_data.get('task_type'), email_data.get('priority'),
+            email_data.get('due_at'), UNREAD, created_at or time.time(), json.dumps(email_data)
+        ))
+        return cursor.rowcount == 1
+
+    def fetch(self, mailbox: str, to_agent: Optional[str] = None,
+              status: Optional[str] = UNREAD, limit: int = 10) -> List[Dict[str, Any]]:
+        """Newest messages of a mailbox (optionally for one agent / in one state)"""
+        query = "SELECT * FROM mailbox_messages WHERE mailbox = ?"
+        params: List[Any] = [mailbox]
+        if status is not None:
+            query += " AND status = ?"
+            params.append(status)
+        if to_agent is not None:
+            query += " AND to_agent = ?"
+            params.append(to_agent)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+
+        return [self._row_to_message(row) for row in self._connection().execute(query, params)]
+
+    def claim(self, mailbox: str, to_agent: str, worker_id: str,
+              limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Atomically claim the oldest unread messages for an agent
+
+        Each message is handed to exactly one worker, even with several
+        workers (threads or processes) polling the same mailbox.
+        """
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute('''
+                UPDATE mailbox_messages
+                SET status = ?, claimed_by = ?, claimed_at = ?
+                WHERE message_id IN (
+                    SELECT message_id FROM mailbox_messages
+                    WHERE mailbox = ? AND status = ? AND to_agent = ?
+                    ORDER BY created_at ASC
+                    LIMIT ?
+                )
+                RETURNING *
+            ''', (CLAIMED, worker_id, time.time(), mailbox, UNREAD, to_agent, limit)).fetchall()
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        messages = [self._row_to_message(row) for row in rows]
+        messages.sort(key=lambda m: m['created_at'])
+        return messages
+
+    def mark_read(self, task_id: str, to_agent: str) -> int:
+        """Mark an agent's unread or claimed messages for a task as processed"""
+        cursor = self._connection().execute('''
+            UPDATE mailbox_messages SET status = ?
+            WHERE task_id = ? AND to_agent = ? AND status IN (?, ?)
+        ''', (READ, task_id, to_agent, UNREAD, CLAIMED))
+        return cursor.rowcount
+
+    def release_stale_claims(self, max_age_seconds: float = 300) -> int:
+        """Return messages claimed by workers that never finished them to unread"""
+        cursor = self._connection().execute('''
+            UPDATE mailbox_messages
+            SET status = ?, claimed_by = NULL, claimed_at = NULL
+            WHERE status = ? AND claimed_at < ?
+        ''', (UNREAD, CLAIMED, time.time() - max_age_seconds))
+        return cursor.rowcount
+
+    def count(self, mailbox: Optional[str] = None, to_agent: Optional[str] = None,
+              status: Optional[str] = None) -> int:
+        """Count messages matching the given filters"""
+        query = "SELECT COUNT(*) FROM mailbox_messages WHERE 1 = 1"
+        params: List[Any] = []
+        for column, value in (('mailbox', mailbox), ('to_agent', to_agent), ('status', status)):
+            if value is not None:
+                query += f" AND {column} = ?"
+                params.append(value)
+        return self._connection().execute(query, params).fetchone()[0]
+
+    def agent_stats(self, to_agent: str) -> Dict[str, Any]:
+        """Aggregate task statistics for one agent in a single indexed query"""
+        row = self._connection().execute('''
+            SELECT COUNT(*) AS total,
+                   COALESCE(SUM(status = 'unread'), 0) AS pending,
+                   COALESCE(SUM(priority IN ('high', 'critical')), 0) AS high_priority,
+                   COALESCE(SUM(due_at IS NOT NULL AND due_at < ?), 0) AS overdue
+            FROM mailbox_messages WHERE to_agent = ?
+        ''', (datetime.now().isoformat(), to_agent)).fetchone()
+        task_types = [r[0] for r in self._connection().execute(
+            "SELECT DISTINCT task_type FROM mailbox_messages WHERE to_agent = ?", (to_agent,))]
+        return {
+            'total_tasks': row['total'],
+            'pending_tasks': row['pending'],
+            'high_priority_tasks': row['high_priority'],
+            'overdue_tasks': row['overdue'],
+            'task_types': task_types
+        }
+
+    def clear(self, mailbox: str) -> int:
+        """Delete all messages of a mailbox"""
+        cursor = self._connection().execute(
+            "DELETE FROM mailbox_messages WHERE mailbox = ?", (mailbox,))
+        return cursor.rowcount
+
+    def import_legacy_files(self, mailbox: str, mailbox_dir: Path) -> int:
+        """One-time import of task_*.json files written by earlier versions"""
+        marker = f"legacy_imported:{mailbox}"
+        conn = self._connection()
+        if conn.execute("SELECT 1 FROM mailbox_meta WHERE key = ?", (marker,)).fetchone():
+            return 0
+
+        imported = 0
+        for email_file in mailbox_dir.glob("task_*.json"):
+            try:
+                with open(email_file, 'r') as f:
+                    email_data = json.load(f)
+                sent_at = email_data.get('simulated_send_time')
+                created_at = datetime.fromisoformat(sent_at).timestamp() \
+                    if sent_at else email_file.stat().st_mtime
+                if self.deliver(email_file.stem, mailbox, email_data, created_at):
+                    imported += 1
+            except Exception as e:
+                logger.error(f"Error importing {email_file}: {e}")
+
+        conn.execute("INSERT OR REPLACE INTO mailbox_meta (key, value) VALUES (?, ?)",
+                     (marker, str(time.time())))
+        if imported:
+            logger.info(f"Imported {imported} legacy messages into {mailbox} mailbox")
+        return imported
+
+    def _row_to_message(self, row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            'message_id': row['message_id'],
+            'mailbox': row['mailbox'],
+            'status': row['status'],
+            'created_at': row['created_at'],
+            'claimed_by': row['claimed_by'],
+            'email': json.loads(row['payload'])
+        }
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Inter-Agent Task Transports
+Delivery backends behind AgentEmailDispatcher
+
+Transports move task dictionaries (the AgentTask.to_dict() JSON schema)
+between agents. The in-process transport hands tasks over through a shared
+priority queue, the Unix-domain-socket transport reaches agents running in
+other processes on the same host.
+"""
+
+import errno
+import heapq
+import itertools
+import json
+import os
+import socket
+import socketserver
+import threading
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict, List, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_RANK = {'critical': 0, 'high': 1}
+
+
+def task_sort_key(task_data: Dict[str, Any]):
+    """Same ordering the dispatcher applies: priority first, then creation time"""
+    return (PRIORITY_RANK.get(task_data.get('priority'), 2), task_data.get('created_at') or '')
+
+
+class TaskTransport(ABC):
+    """Base class for inter-agent task delivery"""
+
+    name = "base"
+
+    @abstractmethod
+    def send(self, task_data: Dict[str, Any]) -> bool:
+        """Deliver a task to task_data['to_agent']"""
+        pass
+
+    @abstractmethod
+    def receive(self, agent_type: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Take up to `limit` pending tasks for an agent"""
+        pass
+
+    @abstractmethod
+    def peek(self, agent_type: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Look at pending tasks for an agent without taking them"""
+        pass
+
+    def listen(self, agent_type: str) -> None:
+        """Announce that an agent of this type receives tasks in this process"""
+        pass
+
+    def close(self) -> None:
+        """Release transport resources"""
+        pass
+
+
+class TaskQueueHub:
+    """Thread-safe per-agent priority queues of task dictionaries"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queues: Dict[str, List] = {}
+        self._sequence = itertools.count()
+
+    def put(self, task_data: Dict[str, Any]) -> None:
+        with self._lock:
+            queue = self._queues.setdefault(task_data['to_agent'], [])
+            heapq.heappush(queue, (task_sort_key(task_data), next(self._sequence), task_data))
+
+    def take(self, agent_type: str, limit: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            queue = self._queues.get(agent_type, [])
+            return [heapq.heappop(queue)[2] for _ in range(min(limit, len(queue)))]
+
+    def peek(self, agent_type: str, limit: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [entry[2] for entry in heapq.nsmallest(limit, self._queues.get(agent_type, []))]
+
+    def pending_count(self, agent_type: str) -> int:
+        with self._lock:
+            return len(self._queues.get(agent_type, []))
+
+
+class InProcessTransport(TaskTransport):
+    """Delivers tasks through a process-wide queue hub (microsecond hand-over)"""
+
+    name = "inprocess"
+
+    def __init__(self, hub: Optional[TaskQueueHub] = None):
+        self.hub = hub or get_task_hub()
+
+    def send(self, task_data: Dict[str, Any]) -> bool:
+        # Round-trip through JSON so receivers never share mutable state with senders
+        self.hub.put(json.loads(json.dumps(task_data)))
+        return True
+
+    def receive(self, agent_type: str, limit: int = 10) -> List[Dict[str, Any]]:
+        return self.hub.take(agent_type, limit)
+
+    def peek(self, agent_type: str, limit: int = 10) -> List[Dict[str, Any]]:
+        return self.hub.peek(agent_type, limit)
+
+
+class _TaskRequestHandler(socketserver.StreamRequestHandler):
+    """Reads newline-delimited task JSON and acknowledges each line"""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                self.server.hub.put(json.loads(line))
+                self.wfile.write(b"OK\n")
+            except Exception as e:
+                logger.error(f"Rejected task on {self.server.server_address}: {e}")
+                self.wfile.write(b"ERR\n")
+
+
+class _TaskSocketServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class UnixSocketTransport(TaskTransport):
+    """
+    Delivers tasks to agents in other processes over Unix domain sockets
+
+    Every receiving agent type listens on <socket_dir>/<agent_type>.sock and
+    queues incoming tasks locally; senders connect, write one JSON line and
+    wait for the acknowledgement.
+    """
+
+    name = "unix_socket"
+
+    def __init__(self, socket_dir: str = "data/agent_sockets", timeout: float = 2.0):
+        self.socket_dir = socket_dir
+        self.timeout = timeout
+        self.hub = TaskQueueHub()
+        self.servers: Dict[str, _TaskSocketServer] = {}
+        os.makedirs(self.socket_dir, exist_ok=True)
+
+    def _socket_path(self, agent_type: str) -> str:
+        return os.path.join(self.socket_dir, f"{agent_type}.sock")
+
+    def listen(self, agent_type: str) -> None:
+        if agent_type in self.servers:
+            return
+
+        path = self._socket_path(agent_type)
+        if os.path.exists(path):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                try:
+                    probe.connect(path)
+                except OSError:
+                    os.unlink(path)  # Stale socket from a previous run
+                else:
+                    raise OSError(errno.EADDRINUSE, f"Another process is listening for {agent_type} tasks on {path}")
+
+        server = _TaskSocketServer(path, _TaskRequestHandler)
+        server.hub = self.hub
+        thread = threading.Thread(target=server.serve_forever, daemon=True,
+                                  name=f"task-socket-{agent_type}")
+        thread.start()
+        self.servers[agent_type] = server
+        logger.info(f"Listening for {agent_type} tasks on {path}")
+
+    def send(self, task_data: Dict[str, Any]) -> bool:
+        to_agent = task_data['to_agent']
+
+        # Local listener: skip the socket round trip
+        if to_agent in self.servers:
+            self.hub.put(json.loads(json.dumps(task_data)))
+            return True
+
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self.timeout)
+                sock.connect(self._socket_path(to_agent))
+                sock.sendall(json.dumps(task_data).encode('utf-8') + b"\n")
+                return sock.makefile('rb').readline().strip() == b"OK"
+        except (FileNotFoundError, ConnectionRefusedError):
+            logger.warning(f"No agent listening for {to_agent} tasks")
+            return False
+        except Exception as e:
+            logger.error(f"Socket delivery to {to_agent} failed: {e}")
+            return False
+
+    def receive(self, agent_type: str, limit: int = 10) -> List[Dict[str, Any]]:
+        self.listen(agent_type)
+        return self.hub.take(agent_type, limit)
+
+    def peek(self, agent_type: str, limit: int = 10) -> List[Dict[str, Any]]:
+        return self.hub.peek(agent_type, limit)
+
+    def close(self) -> None:
+        for agent_type, server in self.servers.items():
+            server.shutdown()
+            server.server_close()
+            try:
+                os.unlink(self._socket_path(agent_type))
+            except FileNotFoundError:
+                pass
+        self.servers = {}
+
+
+# Global in-process task hub
+task_hub = None
+
+def get_task_hub() -> TaskQueueHub:
+    """Get or create the process-wide task hub"""
+    global task_hub
+    if task_hub is None:
+        task_hub = TaskQueueHub()
+    return task_hub
+
+
+# Socket transports shared by all dispatchers of a process, keyed by directory
+socket_transports: Dict[str, UnixSocketTransport] = {}
+
+def get_socket_transport(socket_dir: str = "data/agent_sockets") -> UnixSocketTransport:
+    """Get or create the process-wide socket transport for a directory"""
+    if socket_dir not in socket_transports:
+        socket_transports[socket_dir] = UnixSocketTransport(socket_dir)
+    return socket_transports[socket_dir]
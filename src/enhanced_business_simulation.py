@@ -471,9 +471,12 @@ class EnhancedBusinessSimulation:
         except Exception as e:
             logger.error(f"Error sending real email from Enhanced Simulation: {e}")
 
-# Global instance
-enhanced_simulation = EnhancedBusinessSimulation()
+# Global instance (created on first use)
+enhanced_simulation = None
 
 def get_enhanced_simulation():
-    """Get the global enhanced simulation instance"""
+    """Get or create the global enhanced simulation instance"""
+    global enhanced_simulation
+    if enhanced_simulation is None:
+        enhanced_simulation = EnhancedBusinessSimulation()
     return enhanced_simulation
\ No newline at end of file
@@ -2,29 +2,181 @@
 Database models for Happy Buttons Webshop
 Royal Courtesy Business Intelligence System
 """
+import logging
 import sqlite3
 import os
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Callable, Iterator, Sequence
 import json
 
+logger = logging.getLogger(__name__)
+
+# Materialized KPI aggregates: table name -> grouped kpis column
+KPI_AGGREGATES = {
+    'kpi_department_stats': 'department',
+    'kpi_category_stats': 'category',
+}
+
+# Connection pragmas: WAL lets dashboard reads run alongside shop writes,
+# NORMAL sync is durable in WAL mode apart from the last commits on power loss
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -16000",
+    "PRAGMA mmap_size = 67108864",
+    "PRAGMA temp_store = MEMORY",
+)
+
+
+class CheckoutError(ValueError):
+    """Raised when a cart cannot be checked out; nothing was written"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
 class Database:
-    """Database manager for Happy Buttons webshop and business intelligence"""
+    """Database manager for Happy Buttons webshop and business intelligence
+
+    Connections are pooled per thread: each thread keeps one connection (with
+    its prepared statement cache) for its lifetime, and connections owned by
+    finished threads go back to an idle pool for the next thread. Connections
+    run in autocommit mode; multi-statement writes use ``transaction()``.
+    """
 
-    def __init__(self, db_path: str = "happy_buttons.db"):
+    def __init__(self, db_path: str = "happy_buttons.db", pool_size: int = 8,
+                 cached_statements: int = 256, busy_timeout: float = 30.0):
         self.db_path = os.path.join(os.path.dirname(__file__), '..', '..', db_path)
+        self.pool_size = pool_size
+        self.cached_statements = cached_statements
+        self.busy_timeout = busy_timeout
+        self._reset_pool()
         self.init_database()
 
-    def get_connection(self):
-        """Get database connection"""
-        conn = sqlite3.connect(self.db_path)
+    def _reset_pool(self):
+        """Start with an empty pool (also used after fork)"""
+        self._pid = os.getpid()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._owners: Dict[threading.Thread, sqlite3.Connection] = {}
+        self._idle: List[sqlite3.Connection] = []
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open and configure a new connection"""
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout,
+                               isolation_level=None, check_same_thread=False,
+                               cached_statements=self.cached_statements)
         conn.row_factory = sqlite3.Row
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
         return conn
 
+    def get_connection(self) -> sqlite3.Connection:
+        """Get the pooled connection of the calling thread
+
+        The connection stays open and must not be closed by callers.
+        """
+        if self._pid != os.getpid():
+            # Never share SQLite handles with a parent process
+            self._reset_pool()
+
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            return conn
+
+        thread = threading.current_thread()
+        with self._lock:
+            self._reclaim_finished_threads()
+            conn = self._idle.pop() if self._idle else None
+            self._owners[thread] = conn = conn or self._connect()
+        self._local.conn = conn
+        return conn
+
+    def _reclaim_finished_threads(self):
+        """Return connections of finished threads to the idle pool (lock held)"""
+        for thread in [t for t in self._owners if not t.is_alive()]:
+            conn = self._owners.pop(thread)
+            if conn.in_transaction:
+                conn.rollback()
+            if len(self._idle) < self.pool_size:
+                self._idle.append(conn)
+            else:
+                conn.close()
+
+    def release_connection(self):
+        """Hand the calling thread's connection back to the idle pool"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._pid != os.getpid():
+            return
+        self._local.conn = None
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            self._owners.pop(threading.current_thread(), None)
+            if len(self._idle) < self.pool_size:
+                self._idle.append(conn)
+            else:
+                conn.close()
+
+    def close_all(self):
+        """Close every pooled connection"""
+        with self._lock:
+            connections = list(self._owners.values()) + self._idle
+            self._owners.clear()
+            self._idle.clear()
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    @contextmanager
+    def transaction(self, immediate: bool = True) -> Iterator[sqlite3.Connection]:
+        """Run a block of statements atomically
+
+        Commits when the block exits normally and rolls back when it raises.
+        ``immediate`` takes the write lock up front so concurrent writers
+        queue on the busy timeout instead of failing on lock upgrade. Nested
+        blocks join the outer transaction.
+        """
+        conn = self.get_connection()
+        if conn.in_transaction:
+            yield conn
+            return
+
+        conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+    def execute(self, sql: str, params: Sequence = ()) -> sqlite3.Cursor:
+        """Execute a statement on the pooled connection"""
+        return self.get_connection().execute(sql, params)
+
+    def query(self, sql: str, params: Sequence = ()) -> List[Dict[str, Any]]:
+        """Run a query and return all rows as dictionaries"""
+        return [dict(row) for row in self.execute(sql, params).fetchall()]
+
+    def query_one(self, sql: str, params: Sequence = ()) -> Optional[Dict[str, Any]]:
+        """Run a query and return the first row as a dictionary"""
+        row = self.execute(sql, params).fetchone()
+        return dict(row) if row else None
+
     def init_database(self):
         """Initialize all database tables"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.transaction() as conn:
+            self._create_tables(conn.cursor())
+
+        # Initialize sample data
+        self.init_sample_data()
+
+    def _create_tables(self, cursor: sqlite3.Cursor):
+        """Create all tables that do not exist yet"""
 
         # Products table
         cursor.execute('''
@@ -103,35 +255,115 @@ class Database:
                 timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
             )
         ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_kpis_department ON kpis(department, category, metric_name)')
+        # Serves the worst-performing metrics: matches "WHERE value < target ORDER BY (value / target)"
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_kpis_below_target ON kpis((value / target)) WHERE value < target')
+
+        self._create_kpi_aggregates(cursor)
+
+    def _create_kpi_aggregates(self, cursor: sqlite3.Cursor):
+        """Create the KPI aggregate tables and the triggers that keep them current
+
+        Each aggregate row holds counts and the performance sum of one
+        department or category, so summaries never scan ``kpis``. NULL
+        groups are stored as ''.
+        """
+        for table, column in KPI_AGGREGATES.items():
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+            existed = cursor.fetchone() is not None
+
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS {table} (
+                    {column} TEXT PRIMARY KEY,
+                    metric_count INTEGER NOT NULL DEFAULT 0,
+                    scored_count INTEGER NOT NULL DEFAULT 0,
+                    on_target_count INTEGER NOT NULL DEFAULT 0,
+                    below_target_count INTEGER NOT NULL DEFAULT 0,
+                    performance_sum REAL NOT NULL DEFAULT 0,
+                    avg_performance REAL GENERATED ALWAYS AS (
+                        CASE WHEN scored_count > 0 THEN performance_sum / scored_count END
+                    ) STORED
+                )
+            ''')
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_performance ON {table}(avg_performance DESC)')
+
+            add_new = self._kpi_aggregate_upsert(table, column, 'NEW', 1)
+            remove_old = self._kpi_aggregate_upsert(table, column, 'OLD', -1)
+            drop_empty = f"DELETE FROM {table} WHERE {column} = COALESCE(OLD.{column}, '') AND metric_count = 0;"
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_insert AFTER INSERT ON kpis
+                BEGIN {add_new} END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_update
+                AFTER UPDATE OF value, target, department, category ON kpis
+                BEGIN {remove_old} {add_new} {drop_empty} END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_delete AFTER DELETE ON kpis
+                BEGIN {remove_old} {drop_empty} END
+            ''')
+
+            if not existed:
+                # Databases created before the aggregates existed
+                self._rebuild_kpi_aggregate(cursor, table, column)
+
+    @staticmethod
+    def _kpi_aggregate_upsert(table: str, column: str, row: str, sign: int) -> str:
+        """Trigger statement adding (sign 1) or removing (sign -1) one kpis row"""
+        return f'''
+            INSERT INTO {table} ({column}, metric_count, scored_count, on_target_count,
+                                 below_target_count, performance_sum)
+            VALUES (COALESCE({row}.{column}, ''), {sign},
+                    {sign} * ({row}.target > 0),
+                    {sign} * ({row}.target > 0 AND {row}.value >= {row}.target),
+                    {sign} * ({row}.value < {row}.target),
+                    {sign} * (CASE WHEN {row}.target > 0 THEN ({row}.value / {row}.target) * 100 ELSE 0 END))
+            ON CONFLICT({column}) DO UPDATE SET
+                metric_count = metric_count + excluded.metric_count,
+                scored_count = scored_count + excluded.scored_count,
+                on_target_count = on_target_count + excluded.on_target_count,
+                below_target_count = below_target_count + excluded.below_target_count,
+                performance_sum = performance_sum + excluded.performance_sum;
+        '''
+
+    @staticmethod
+    def _rebuild_kpi_aggregate(cursor: sqlite3.Cursor, table: str, column: str):
+        """Recompute one aggregate table from kpis"""
+        cursor.execute(f"DELETE FROM {table}")
+        cursor.execute(f'''
+            INSERT INTO {table} ({column}, metric_count, scored_count, on_target_count,
+                                 below_target_count, performance_sum)
+            SELECT COALESCE({column}, ''), COUNT(*),
+                   SUM(target > 0),
+                   SUM(target > 0 AND value >= target),
+                   SUM(value < target),
+                   TOTAL(CASE WHEN target > 0 THEN (value / target) * 100 ELSE 0 END)
+            FROM kpis
+            GROUP BY COALESCE({column}, '')
+        ''')
 
-        conn.commit()
-        conn.close()
-
-        # Initialize sample data
-        self.init_sample_data()
+    def rebuild_kpi_aggregates(self):
+        """Recompute all KPI aggregates from kpis, dropping accumulated float rounding"""
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            for table, column in KPI_AGGREGATES.items():
+                self._rebuild_kpi_aggregate(cursor, table, column)
 
     def init_sample_data(self):
         """Initialize sample products and teams"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
         # Check if products already exist
-        cursor.execute("SELECT COUNT(*) FROM products")
-        if cursor.fetchone()[0] == 0:
+        if self.execute("SELECT COUNT(*) FROM products").fetchone()[0] == 0:
             self.insert_sample_products()
 
         # Check if teams already exist
-        cursor.execute("SELECT COUNT(*) FROM teams")
-        if cursor.fetchone()[0] == 0:
+        if self.execute("SELECT COUNT(*) FROM teams").fetchone()[0] == 0:
             self.insert_sample_teams()
 
         # Check if KPIs already exist
-        cursor.execute("SELECT COUNT(*) FROM kpis")
-        if cursor.fetchone()[0] == 0:
+        if self.execute("SELECT COUNT(*) FROM kpis").fetchone()[0] == 0:
             self.insert_sample_kpis()
 
-        conn.close()
-
     def insert_sample_products(self):
         """Insert sample Happy Buttons products"""
         products = [
@@ -201,20 +433,14 @@ class Database:
             }
         ]
 
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        for product in products:
-            cursor.execute('''
+        with self.transaction() as conn:
+            conn.executemany('''
                 INSERT INTO products (name, category, price, stock_quantity, description, specifications)
                 VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
+            ''', [(
                 product['name'], product['category'], product['price'],
                 product['stock_quantity'], product['description'], product['specifications']
-            ))
-
-        conn.commit()
-        conn.close()
+            ) for product in products])
 
     def insert_sample_teams(self):
         """Insert sample team members"""
@@ -250,17 +476,12 @@ class Database:
             {'name': 'Mr. Rupert Ashford', 'role': 'Warehouse Manager', 'department': 'Logistics', 'email': 'r.ashford@h-bu.de'},
         ]
 
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        for team_member in teams:
-            cursor.execute('''
+        with self.transaction() as conn:
+            conn.executemany('''
                 INSERT INTO teams (name, role, department, email)
                 VALUES (?, ?, ?, ?)
-            ''', (team_member['name'], team_member['role'], team_member['department'], team_member['email']))
-
-        conn.commit()
-        conn.close()
+            ''', [(team_member['name'], team_member['role'], team_member['department'], team_member['email'])
+                  for team_member in teams])
 
     def insert_sample_kpis(self):
         """Insert sample KPI metrics for business intelligence"""
@@ -302,64 +523,135 @@ class Database:
             {'metric_name': 'Data Processing Accuracy', 'value': 99.6, 'target': 99.0, 'department': 'IT', 'category': 'Accuracy'}
         ]
 
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        for kpi in kpis:
-            cursor.execute('''
+        with self.transaction() as conn:
+            conn.executemany('''
                 INSERT INTO kpis (metric_name, value, target, department, category)
                 VALUES (?, ?, ?, ?, ?)
-            ''', (kpi['metric_name'], kpi['value'], kpi['target'], kpi['department'], kpi['category']))
+            ''', [(kpi['metric_name'], kpi['value'], kpi['target'], kpi['department'], kpi['category'])
+                  for kpi in kpis])
 
-        conn.commit()
-        conn.close()
 
+class ProductCatalog:
+    """In-memory product catalog for the webshop
 
-class ProductModel:
-    """Product model for webshop"""
+    Holds the product list, a by-category grouping and an ID index, loaded
+    with one query. Stock changes made through ProductModel/OrderModel are
+    written through after commit and bump ``version``, which backs the
+    catalog ETag. Writes from other processes are picked up by ``preload()``;
+    ``add_listener`` lets the writing process announce its stock changes.
+    Readers get copies, so callers may annotate the returned products.
+    """
 
     def __init__(self, db: Database):
         self.db = db
+        self.version = 0
+        self._lock = threading.Lock()
+        self._products: List[Dict[str, Any]] = []
+        self._by_id: Dict[int, Dict[str, Any]] = {}
+        self._by_category: Dict[str, List[Dict[str, Any]]] = {}
+        self._token = None
+        self._loaded = False
+        self._listeners: List[Callable[[Dict[int, int]], None]] = []
+
+    def preload(self):
+        """(Re)load the whole catalog with one query"""
+        products = self.db.query("SELECT * FROM products ORDER BY category, name")
+        by_category: Dict[str, List[Dict[str, Any]]] = {}
+        for product in products:
+            by_category.setdefault(product['category'], []).append(product)
 
-    def get_all_products(self) -> List[Dict[str, Any]]:
-        """Get all products"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
+        with self._lock:
+            self._products = products
+            self._by_id = {product['id']: product for product in products}
+            self._by_category = by_category
+            self._token = f"{os.getpid()}x{time.monotonic_ns():x}"
+            self.version += 1
+            self._loaded = True
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.preload()
 
-        cursor.execute("SELECT * FROM products ORDER BY category, name")
-        products = [dict(row) for row in cursor.fetchall()]
+    def etag(self) -> str:
+        """Validator that changes whenever the cached catalog changes"""
+        self._ensure_loaded()
+        return f"catalog-{self._token}-{self.version}"
 
-        conn.close()
-        return products
+    def get_all_products(self) -> List[Dict[str, Any]]:
+        """All products ordered by category and name"""
+        self._ensure_loaded()
+        with self._lock:
+            return [dict(product) for product in self._products]
 
     def get_product_by_id(self, product_id: int) -> Optional[Dict[str, Any]]:
-        """Get product by ID"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
+        """Product by ID, None if unknown"""
+        self._ensure_loaded()
+        with self._lock:
+            product = self._by_id.get(product_id)
+            return dict(product) if product else None
 
-        cursor.execute("SELECT * FROM products WHERE id = ?", (product_id,))
-        row = cursor.fetchone()
+    def get_products_by_category(self, category: str) -> List[Dict[str, Any]]:
+        """Products of one category ordered by name"""
+        self._ensure_loaded()
+        with self._lock:
+            return [dict(product) for product in self._by_category.get(category, [])]
+
+    def get_products_grouped(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Products grouped by category, in category order"""
+        self._ensure_loaded()
+        with self._lock:
+            return {category: [dict(product) for product in products]
+                    for category, products in self._by_category.items()}
+
+    def apply_stock_changes(self, quantities_sold: Dict[int, int]):
+        """Write committed stock decrements through to the cache"""
+        if not self._loaded:
+            return
+        with self._lock:
+            for product_id, quantity in quantities_sold.items():
+                product = self._by_id.get(product_id)
+                if product is not None:
+                    product['stock_quantity'] -= quantity
+            self.version += 1
+        for listener in self._listeners:
+            try:
+                listener(quantities_sold)
+            except Exception as e:
+                logger.error(f"Error notifying catalog listener: {e}")
+
+    def add_listener(self, listener: Callable[[Dict[int, int]], None]):
+        """Call ``listener(quantities_sold)`` after stock changes are written through"""
+        self._listeners.append(listener)
 
-        conn.close()
-        return dict(row) if row else None
 
-    def get_products_by_category(self, category: str) -> List[Dict[str, Any]]:
-        """Get products by category"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
+class ProductModel:
+    """Product model for webshop"""
 
-        cursor.execute("SELECT * FROM products WHERE category = ? ORDER BY name", (category,))
-        products = [dict(row) for row in cursor.fetchall()]
+    def __init__(self, db: Database, catalog: Optional[ProductCatalog] = None):
+        self.db = db
+        self.catalog = catalog
 
-        conn.close()
-        return products
+    def get_all_products(self) -> List[Dict[str, Any]]:
+        """Get all products"""
+        if self.catalog:
+            return self.catalog.get_all_products()
+        return self.db.query("SELECT * FROM products ORDER BY category, name")
+
+    def get_product_by_id(self, product_id: int) -> Optional[Dict[str, Any]]:
+        """Get product by ID"""
+        if self.catalog:
+            return self.catalog.get_product_by_id(product_id)
+        return self.db.query_one("SELECT * FROM products WHERE id = ?", (product_id,))
+
+    def get_products_by_category(self, category: str) -> List[Dict[str, Any]]:
+        """Get products by category"""
+        if self.catalog:
+            return self.catalog.get_products_by_category(category)
+        return self.db.query("SELECT * FROM products WHERE category = ? ORDER BY name", (category,))
 
     def update_stock(self, product_id: int, quantity_sold: int) -> bool:
         """Update stock quantity after sale"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('''
+        cursor = self.db.execute('''
             UPDATE products
             SET stock_quantity = stock_quantity - ?,
                 updated_at = CURRENT_TIMESTAMP
@@ -367,8 +659,8 @@ class ProductModel:
         ''', (quantity_sold, product_id, quantity_sold))
 
         success = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
+        if success and self.catalog:
+            self.catalog.apply_stock_changes({product_id: quantity_sold})
 
         return success
 
@@ -376,91 +668,132 @@ class ProductModel:
 class OrderModel:
     """Order model for webshop"""
 
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, catalog: Optional[ProductCatalog] = None):
         self.db = db
+        self.catalog = catalog
 
     def create_order(self, order_data: Dict[str, Any], items: List[Dict[str, Any]]) -> int:
         """Create new order with items"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            # Insert order
-            cursor.execute('''
-                INSERT INTO orders (customer_name, customer_email, customer_phone,
-                                  customer_company, shipping_address, billing_address,
-                                  total_amount, notes)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                order_data['customer_name'], order_data['customer_email'],
-                order_data.get('customer_phone'), order_data.get('customer_company'),
-                order_data['shipping_address'], order_data.get('billing_address'),
-                order_data['total_amount'], order_data.get('notes')
-            ))
-
-            order_id = cursor.lastrowid
-
-            # Insert order items
-            for item in items:
-                cursor.execute('''
-                    INSERT INTO order_items (order_id, product_id, quantity, unit_price, total_price)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (order_id, item['product_id'], item['quantity'],
-                     item['unit_price'], item['total_price']))
-
-            conn.commit()
-            return order_id
-
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            conn.close()
+        with self.db.transaction() as conn:
+            return self._insert_order(conn, order_data, items)
+
+    def _insert_order(self, conn: sqlite3.Connection, order_data: Dict[str, Any],
+                      items: List[Dict[str, Any]]) -> int:
+        """Insert order and items on the given connection"""
+        # Insert order
+        cursor = conn.execute('''
+            INSERT INTO orders (customer_name, customer_email, customer_phone,
+                              customer_company, shipping_address, billing_address,
+                              total_amount, notes)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            order_data['customer_name'], order_data['customer_email'],
+            order_data.get('customer_phone'), order_data.get('customer_company'),
+            order_data['shipping_address'], order_data.get('billing_address'),
+            order_data['total_amount'], order_data.get('notes')
+        ))
+
+        order_id = cursor.lastrowid
+
+        # Insert order items
+        conn.executemany('''
+            INSERT INTO order_items (order_id, product_id, quantity, unit_price, total_price)
+            VALUES (?, ?, ?, ?, ?)
+        ''', [(order_id, item['product_id'], item['quantity'],
+               item['unit_price'], item['total_price']) for item in items])
+
+        return order_id
+
+    def checkout(self, order_data: Dict[str, Any], cart: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Price the cart, create the order and reserve stock in one transaction
+
+        ``cart`` holds ``{'product_id', 'quantity'}`` lines. The transaction
+        takes the write lock before reading stock, so concurrent checkouts
+        cannot both sell the same units; any unknown product or shortfall
+        raises CheckoutError and leaves no order and no stock change behind.
+        ``order_data`` needs no ``total_amount``, it is computed from the cart.
+        """
+        quantities: Dict[int, int] = {}
+        for line in cart:
+            try:
+                product_id, quantity = int(line['product_id']), int(line['quantity'])
+            except (KeyError, TypeError, ValueError):
+                raise CheckoutError(f"Invalid cart line: {line}")
+            if quantity <= 0:
+                raise CheckoutError(f"Invalid quantity for product {product_id}: {quantity}")
+            quantities[product_id] = quantities.get(product_id, 0) + quantity
+
+        if not quantities:
+            raise CheckoutError("Cart is empty")
+
+        with self.db.transaction() as conn:
+            placeholders = ','.join('?' * len(quantities))
+            products = {row['id']: row for row in conn.execute(
+                f"SELECT id, name, price, stock_quantity FROM products WHERE id IN ({placeholders})",
+                list(quantities))}
+
+            for product_id, quantity in quantities.items():
+                product = products.get(product_id)
+                if product is None:
+                    raise CheckoutError(f"Product {product_id} not found", status_code=404)
+                if product['stock_quantity'] < quantity:
+                    raise CheckoutError(f"Insufficient stock for {product['name']}")
+
+            order_items = []
+            for line in cart:
+                product = products[int(line['product_id'])]
+                quantity = int(line['quantity'])
+                order_items.append({
+                    'product_id': product['id'],
+                    'quantity': quantity,
+                    'unit_price': product['price'],
+                    'total_price': float(product['price']) * quantity
+                })
+            total_amount = sum(item['total_price'] for item in order_items)
+
+            order_id = self._insert_order(conn, {**order_data, 'total_amount': total_amount}, order_items)
+
+            # Conditional decrement guards the stock check above
+            cursor = conn.executemany('''
+                UPDATE products
+                SET stock_quantity = stock_quantity - ?,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND stock_quantity >= ?
+            ''', [(quantity, product_id, quantity) for product_id, quantity in quantities.items()])
+            if cursor.rowcount != len(quantities):
+                raise CheckoutError("Insufficient stock", status_code=409)
+
+        if self.catalog:
+            self.catalog.apply_stock_changes(quantities)
+
+        return {'order_id': order_id, 'total_amount': total_amount, 'items': order_items}
 
     def get_order_by_id(self, order_id: int) -> Optional[Dict[str, Any]]:
         """Get order with items by ID"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-
-        # Get order details
-        cursor.execute("SELECT * FROM orders WHERE id = ?", (order_id,))
-        order_row = cursor.fetchone()
+        # Read order and items from one snapshot
+        with self.db.transaction(immediate=False):
+            order = self.db.query_one("SELECT * FROM orders WHERE id = ?", (order_id,))
+            if not order:
+                return None
+
+            order['items'] = self.db.query('''
+                SELECT oi.*, p.name, p.category
+                FROM order_items oi
+                JOIN products p ON oi.product_id = p.id
+                WHERE oi.order_id = ?
+            ''', (order_id,))
 
-        if not order_row:
-            conn.close()
-            return None
-
-        order = dict(order_row)
-
-        # Get order items
-        cursor.execute('''
-            SELECT oi.*, p.name, p.category
-            FROM order_items oi
-            JOIN products p ON oi.product_id = p.id
-            WHERE oi.order_id = ?
-        ''', (order_id,))
-
-        order['items'] = [dict(row) for row in cursor.fetchall()]
-
-        conn.close()
         return order
 
     def update_order_status(self, order_id: int, status: str) -> bool:
         """Update order status"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('''
+        cursor = self.db.execute('''
             UPDATE orders
             SET status = ?, updated_at = CURRENT_TIMESTAMP
             WHERE id = ?
         ''', (status, order_id))
 
-        success = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
-
-        return success
+        return cursor.rowcount > 0
 
 
 class TeamModel:
@@ -471,19 +804,11 @@ class TeamModel:
 
     def get_all_teams(self) -> List[Dict[str, Any]]:
         """Get all team members"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('''
+        return self.db.query('''
             SELECT * FROM teams
             ORDER BY department, role
         ''')
 
-        teams = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-
-        return teams
-
     def get_teams_by_department(self) -> Dict[str, List[Dict[str, Any]]]:
         """Get teams organized by department"""
         teams = self.get_all_teams()
@@ -499,21 +824,11 @@ class TeamModel:
 
     def get_team_member_by_id(self, team_id: int) -> Optional[Dict[str, Any]]:
         """Get specific team member by ID"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT * FROM teams WHERE id = ?", (team_id,))
-        row = cursor.fetchone()
-        conn.close()
-
-        return dict(row) if row else None
+        return self.db.query_one("SELECT * FROM teams WHERE id = ?", (team_id,))
 
     def get_department_stats(self) -> Dict[str, Any]:
         """Get department statistics"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('''
+        rows = self.db.query('''
             SELECT
                 department,
                 COUNT(*) as member_count,
@@ -525,48 +840,31 @@ class TeamModel:
 
         stats = {}
         total_members = 0
-        for row in cursor.fetchall():
-            dept_data = dict(row)
+        for dept_data in rows:
             stats[dept_data['department']] = dept_data
             total_members += dept_data['member_count']
 
         stats['_total'] = {'total_members': total_members, 'total_departments': len(stats)}
-        conn.close()
 
         return stats
 
     def search_team_members(self, query: str) -> List[Dict[str, Any]]:
         """Search team members by name, role, or department"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('''
+        return self.db.query('''
             SELECT * FROM teams
             WHERE name LIKE ? OR role LIKE ? OR department LIKE ?
             ORDER BY name
         ''', (f'%{query}%', f'%{query}%', f'%{query}%'))
 
-        results = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-
-        return results
-
     def update_team_member_status(self, team_id: int, status: str) -> bool:
         """Update team member status"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('''
+        cursor = self.db.execute('''
             UPDATE teams
             SET status = ?
             WHERE id = ?
         ''', (status, team_id))
 
-        success = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
-
-        return success
+        return cursor.rowcount > 0
 
 
 class KPIModel:
@@ -577,19 +875,11 @@ class KPIModel:
 
     def get_all_kpis(self) -> List[Dict[str, Any]]:
         """Get all KPI metrics"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('''
+        return self.db.query('''
             SELECT * FROM kpis
             ORDER BY department, category, metric_name
         ''')
 
-        kpis = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-
-        return kpis
-
     def get_kpis_by_department(self) -> Dict[str, List[Dict[str, Any]]]:
         """Get KPIs organized by department"""
         kpis = self.get_all_kpis()
@@ -618,105 +908,98 @@ class KPIModel:
 
     def get_info_center_kpis(self) -> List[Dict[str, Any]]:
         """Get KPIs specific to info@h-bu.de email processing"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('''
+        return self.db.query('''
             SELECT * FROM kpis
             WHERE department = 'Info Center' OR department = 'Email Processing'
             ORDER BY category, metric_name
         ''')
 
-        kpis = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-
-        return kpis
-
     def get_performance_summary(self) -> Dict[str, Any]:
         """Get overall performance summary"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-
-        # Get performance statistics
-        cursor.execute('''
-            SELECT
-                COUNT(*) as total_metrics,
-                AVG(CASE WHEN value >= target THEN 1.0 ELSE 0.0 END) * 100 as metrics_on_target,
-                AVG((value / target) * 100) as avg_performance,
-                COUNT(DISTINCT department) as departments_tracked,
-                COUNT(DISTINCT category) as categories_tracked
-            FROM kpis
-            WHERE target > 0
-        ''')
-
-        summary = dict(cursor.fetchone())
-
-        # Get top performing departments
-        cursor.execute('''
-            SELECT
-                department,
-                AVG((value / target) * 100) as avg_performance,
-                COUNT(*) as metric_count
-            FROM kpis
-            WHERE target > 0
-            GROUP BY department
-            ORDER BY avg_performance DESC
-            LIMIT 5
-        ''')
-
-        summary['top_departments'] = [dict(row) for row in cursor.fetchall()]
+        with self.db.transaction(immediate=False):
+            # Get performance statistics from the materialized aggregates
+            summary = self.db.query_one('''
+                SELECT
+                    COALESCE(SUM(scored_count), 0) as total_metrics,
+                    SUM(on_target_count) * 100.0 / SUM(scored_count) as metrics_on_target,
+                    SUM(performance_sum) / SUM(scored_count) as avg_performance,
+                    COUNT(CASE WHEN scored_count > 0 AND department != '' THEN 1 END) as departments_tracked
+                FROM kpi_department_stats
+            ''')
+            summary['categories_tracked'] = self.db.execute('''
+                SELECT COUNT(*) FROM kpi_category_stats
+                WHERE scored_count > 0 AND category != ''
+            ''').fetchone()[0]
+
+            # Get top performing departments
+            summary['top_departments'] = self.db.query('''
+                SELECT
+                    NULLIF(department, '') as department,
+                    avg_performance,
+                    scored_count as metric_count
+                FROM kpi_department_stats
+                WHERE scored_count > 0
+                ORDER BY avg_performance DESC
+                LIMIT 5
+            ''')
+
+            # Get areas needing attention (idx_kpis_below_target)
+            summary['improvement_areas'] = self.db.query('''
+                SELECT
+                    metric_name,
+                    department,
+                    value,
+                    target,
+                    ((value / target) * 100) as performance_percent
+                FROM kpis
+                WHERE value < target
+                ORDER BY (value / target) ASC
+                LIMIT 5
+            ''')
 
-        # Get areas needing attention
-        cursor.execute('''
-            SELECT
-                metric_name,
-                department,
-                value,
-                target,
-                ((value / target) * 100) as performance_percent
-            FROM kpis
-            WHERE value < target
-            ORDER BY (value / target) ASC
-            LIMIT 5
-        ''')
-
-        summary['improvement_areas'] = [dict(row) for row in cursor.fetchall()]
-
-        conn.close()
         return summary
 
     def get_business_optimization_recommendations(self) -> List[Dict[str, Any]]:
         """Generate business optimization recommendations"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-
         recommendations = []
 
-        # Check email processing performance
-        cursor.execute('''
-            SELECT * FROM kpis
-            WHERE department IN ('Info Center', 'Email Processing')
-            AND value < target
-        ''')
+        with self.db.transaction(immediate=False) as conn:
+            # Check email processing performance
+            underperforming_email = conn.execute('''
+                SELECT COALESCE(SUM(below_target_count), 0) FROM kpi_department_stats
+                WHERE department IN ('Info Center', 'Email Processing')
+            ''').fetchone()[0]
+
+            # Check financial performance
+            strong_revenue = conn.execute('''
+                SELECT COALESCE(SUM(metric_count - below_target_count), 0) FROM kpi_category_stats
+                WHERE category = 'Revenue'
+            ''').fetchone()[0]
+
+            # Check operational efficiency
+            ops_performance = conn.execute('''
+                SELECT SUM(performance_sum) / SUM(scored_count) as avg_ops_performance
+                FROM kpi_category_stats
+                WHERE category IN ('Operations', 'Efficiency')
+            ''').fetchone()[0]
+
+            # Check technology adoption (idx_kpis_department)
+            tech_gaps = conn.execute('''
+                SELECT * FROM kpis
+                WHERE department = 'IT' AND metric_name LIKE '%Adoption%'
+                AND value < target
+            ''').fetchall()
 
-        underperforming_email = cursor.fetchall()
         if underperforming_email:
             recommendations.append({
                 'area': 'Email Processing',
                 'priority': 'High',
-                'issue': f"{len(underperforming_email)} email metrics below target",
+                'issue': f"{underperforming_email} email metrics below target",
                 'recommendation': 'Optimize email routing algorithms and increase automation coverage',
                 'impact': 'Improved customer response times and reduced manual workload'
             })
 
-        # Check financial performance
-        cursor.execute('''
-            SELECT * FROM kpis
-            WHERE category = 'Revenue' AND value >= target
-        ''')
-
-        strong_revenue = cursor.fetchall()
-        if len(strong_revenue) >= 2:
+        if strong_revenue >= 2:
             recommendations.append({
                 'area': 'Revenue Growth',
                 'priority': 'Medium',
@@ -725,15 +1008,7 @@ class KPIModel:
                 'impact': 'Increased market share and higher profit margins'
             })
 
-        # Check operational efficiency
-        cursor.execute('''
-            SELECT AVG((value / target) * 100) as avg_ops_performance
-            FROM kpis
-            WHERE category IN ('Operations', 'Efficiency')
-        ''')
-
-        ops_performance = cursor.fetchone()[0]
-        if ops_performance > 95:
+        if ops_performance is not None and ops_performance > 95:
             recommendations.append({
                 'area': 'Operational Excellence',
                 'priority': 'Low',
@@ -742,14 +1017,6 @@ class KPIModel:
                 'impact': 'Standardized excellence and knowledge transfer'
             })
 
-        # Check technology adoption
-        cursor.execute('''
-            SELECT * FROM kpis
-            WHERE department = 'IT' AND metric_name LIKE '%Adoption%'
-            AND value < target
-        ''')
-
-        tech_gaps = cursor.fetchall()
         if tech_gaps:
             recommendations.append({
                 'area': 'Digital Transformation',
@@ -759,30 +1026,33 @@ class KPIModel:
                 'impact': 'Enhanced productivity and competitive advantage'
             })
 
-        conn.close()
         return recommendations
 
+    def add_kpi(self, metric_name: str, value: float, target: float,
+                department: Optional[str] = None, category: Optional[str] = None) -> int:
+        """Record a KPI metric; aggregates are updated by trigger"""
+        cursor = self.db.execute('''
+            INSERT INTO kpis (metric_name, value, target, department, category)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (metric_name, value, target, department, category))
+
+        return cursor.lastrowid
+
     def update_kpi_value(self, kpi_id: int, new_value: float) -> bool:
         """Update KPI value"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('''
+        cursor = self.db.execute('''
             UPDATE kpis
             SET value = ?, timestamp = CURRENT_TIMESTAMP
             WHERE id = ?
         ''', (new_value, kpi_id))
 
-        success = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
-
-        return success
+        return cursor.rowcount > 0
 
 
 # Initialize database instance
 db = Database()
-product_model = ProductModel(db)
-order_model = OrderModel(db)
+product_catalog = ProductCatalog(db)
+product_model = ProductModel(db, product_catalog)
+order_model = OrderModel(db, product_catalog)
 team_model = TeamModel(db)
 kpi_model = KPIModel(db)
\ No newline at end of file
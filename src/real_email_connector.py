@@ -7,11 +7,15 @@ Connects dashboard to actual email server instead of mock data
 import imaplib
 import smtplib
 import email
-import yaml
 from datetime import datetime
 from typing import Dict, List, Any
 import logging
 
+try:
+    from services.config.config_registry import load_config
+except ImportError:  # pragma: no cover - allows package-relative imports
+    from .services.config.config_registry import load_config
+
 logger = logging.getLogger(__name__)
 
 class RealEmailConnector:
@@ -19,8 +23,7 @@ class RealEmailConnector:
 
     def __init__(self, config_path="sim/config/company_release2.yaml"):
         """Initialize with email server configuration"""
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        self.config = load_config(config_path)
 
         self.email_domains = self.config['email']['domains']
         self.imap_config = self.config['email']['servers']['imap']
@@ -16,10 +16,12 @@ from dataclasses import dataclass
 from services.email.imap_service import IMAPService
 from services.email.smtp_service import SMTPService, EmailToSend
 from services.order.state_machine import OrderStateMachine, OrderState
+from services.events.event_bus import get_event_bus
+from services.events.event_log import get_event_log
 from parsers.pdf.pdf_parser import PDFParser
 
 # Import agents
-from agents.business.base_agent_v2 import BaseAgent, AgentTask, TaskPriority
+from agents.business.base_agent_v2 import BaseAgent, AgentTask, AgentEvent, TaskPriority
 from agents.business.info_agent import InfoAgent
 from agents.business.sales_agent import SalesAgent
 
@@ -66,8 +68,11 @@ class Release2Orchestrator:
         self.metrics = SystemMetrics()
 
         # Event system
+        self.event_bus = get_event_bus()
+        self.event_log = get_event_log()
         self.event_handlers = {}
         self.pending_events = []
+        self._event_seq = 0
 
         # Storage setup
         self._setup_storage()
@@ -97,7 +102,8 @@ class Release2Orchestrator:
             # Step 2: Start email services
             await self._start_email_services()
 
-            # Step 3: Start orchestration loop
+            # Step 3: Announce SLA breaches as they happen, then start orchestration loop
+            self.order_machine.sla_engine.start()
             self.is_running = True
             self.logger.info("🚀 Release 2 system started successfully!")
 
@@ -137,11 +143,8 @@ class Release2Orchestrator:
 
     async def _register_agent_events(self, agent: BaseAgent):
         """Register agent with orchestrator event system"""
-        # Register common event handlers
-        if agent.agent_id == "InfoAgent":
-            self.event_handlers['email_received'] = agent._handle_email_received
-        elif agent.agent_id == "SalesAgent":
-            self.event_handlers['order_created'] = agent._handle_order_created
+        # Agents receive the event types they registered handlers for
+        self.event_bus.register_agent(agent)
 
     async def _start_email_services(self):
         """Start email ingestion and sending services"""
@@ -340,19 +343,12 @@ class Release2Orchestrator:
             # Get orders that need state transitions
             pending_orders = self.order_machine.get_orders_by_state(OrderState.CREATED)
 
-            for order in pending_orders:
-                # Check if order has been in CREATED state too long
-                time_in_state = time.time() - order.created_at
-                if time_in_state > 300:  # 5 minutes demo timeout
-                    # Auto-transition for demo
-                    success = self.order_machine.transition_order(
-                        order.id,
-                        OrderState.CONFIRMED,
-                        "SystemOrchestrator",
-                        "Auto-confirmed for demo"
-                    )
-                    if success:
-                        self.logger.info(f"Auto-confirmed order {order.id}")
+            # Orders in CREATED state too long are auto-confirmed for demo (5 minutes timeout)
+            now = time.time()
+            due = [(order.id, OrderState.CONFIRMED, "SystemOrchestrator", "Auto-confirmed for demo", None)
+                   for order in pending_orders if now - order.created_at > 300]
+            if due and self.order_machine.transition_many(due):
+                self.logger.info(f"Auto-confirmed {len(due)} orders")
 
             # Check for completed orders
             completed_orders = self.order_machine.get_orders_by_state(OrderState.CLOSED)
@@ -435,7 +431,7 @@ class Release2Orchestrator:
         try:
             self.logger.debug("Running periodic maintenance...")
 
-            # Clean up old event files (keep last 100)
+            # Drop event log segments beyond retention
             await self._cleanup_old_events()
 
             # Update agent coordination state
@@ -448,17 +444,9 @@ class Release2Orchestrator:
             self.logger.error(f"Error in periodic maintenance: {e}")
 
     async def _cleanup_old_events(self):
-        """Clean up old event files to prevent disk space issues"""
+        """Apply event log retention to prevent disk space issues"""
         try:
-            events_dir = "data/events"
-            if os.path.exists(events_dir):
-                event_files = sorted([f for f in os.listdir(events_dir) if f.endswith('.json')])
-
-                # Keep only the most recent 100 events
-                if len(event_files) > 100:
-                    files_to_remove = event_files[:-100]
-                    for filename in files_to_remove:
-                        os.remove(f"{events_dir}/{filename}")
+            self.event_log.enforce_retention()
 
         except Exception as e:
             self.logger.error(f"Error cleaning up events: {e}")
@@ -506,20 +494,16 @@ class Release2Orchestrator:
                 'source': 'Release2Orchestrator'
             }
 
-            # Call registered event handlers
-            if event_type in self.event_handlers:
-                handler = self.event_handlers[event_type]
-                # Create a simple event object for the handler
-                class SimpleEvent:
-                    def __init__(self, data):
-                        self.data = data
-
-                await handler(SimpleEvent(data))
-
-            # Save event to file
-            event_file = f"data/events/orchestrator_event_{int(time.time())}.json"
-            with open(event_file, 'w') as f:
-                json.dump(event, f, indent=2)
+            # Deliver to subscribed agents (the bus also appends it to the event log)
+            self._event_seq += 1
+            await self.event_bus.publish(AgentEvent(
+                id=f"orchestrator_{int(time.time())}_{self._event_seq}",
+                type=event_type,
+                source_agent='Release2Orchestrator',
+                target_agent=None,
+                data=data,
+                timestamp=event['timestamp']
+            ))
 
         except Exception as e:
             self.logger.error(f"Error emitting event {event_type}: {e}")
@@ -534,8 +518,12 @@ class Release2Orchestrator:
         try:
             self.logger.info("Shutting down Release 2 system...")
 
-            # Stop orchestration loop
+            # Stop orchestration loop and SLA polling
             self.is_running = False
+            self.order_machine.sla_engine.stop()
+
+            # Deliver events still queued for agents
+            await self.event_bus.drain()
 
             # Shutdown agents
             for agent_name, agent in self.agents.items():
@@ -546,6 +534,7 @@ class Release2Orchestrator:
 
             # Save final metrics
             await self._save_final_state()
+            self.event_log.sync()
 
             self.logger.info("✓ Release 2 system shutdown complete")
 
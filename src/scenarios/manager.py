@@ -21,6 +21,11 @@ from .vip_handling import VIPHandling
 from .global_disruption import GlobalDisruption
 from .kpi_tracker import kpi_tracker, KPIType
 
+try:
+    from utils.response_cache import invalidate_responses
+except ImportError:  # pragma: no cover - allows package-relative imports
+    from ..utils.response_cache import invalidate_responses
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -115,6 +120,11 @@ class ScenarioManager:
         # Start KPI monitoring
         self._setup_kpi_monitoring()
 
+    def _state_changed(self):
+        """Record a scenario state change and expire the cached dashboard status"""
+        self.last_update = datetime.now()
+        invalidate_responses('scenarios_status')
+
     def _setup_kpi_monitoring(self):
         """Setup KPI monitoring system"""
         try:
@@ -371,6 +381,7 @@ class ScenarioManager:
 
             # Add to active scenarios
             self.active_scenarios[scenario_id] = scenario_state
+            self._state_changed()
 
             # Start scenario execution
             asyncio.create_task(self._execute_scenario(scenario_id, duration_seconds))
@@ -388,6 +399,7 @@ class ScenarioManager:
             if scenario_id in self.active_scenarios:
                 self.active_scenarios[scenario_id].status = ScenarioStatus.ERROR
                 self.active_scenarios[scenario_id].error_message = str(e)
+                self._state_changed()
             return {'success': False, 'error': str(e)}
 
     async def _execute_scenario(self, scenario_id: str, duration_seconds: int) -> None:
@@ -400,6 +412,7 @@ class ScenarioManager:
             scenario_state.status = ScenarioStatus.ACTIVE
             scenario_state.metrics.start_time = datetime.now()
             scenario_state.updated_at = datetime.now()
+            self._state_changed()
 
             logger.info(f"Executing scenario {scenario_id} for {duration_seconds} seconds")
 
@@ -424,6 +437,7 @@ class ScenarioManager:
             if scenario_id in self.active_scenarios:
                 self.active_scenarios[scenario_id].status = ScenarioStatus.ERROR
                 self.active_scenarios[scenario_id].error_message = str(e)
+                self._state_changed()
 
     async def _execute_late_triage(self, scenario_state: ScenarioState, duration_seconds: int) -> None:
         """Execute late triage scenario using LateTriage implementation"""
@@ -544,6 +558,7 @@ class ScenarioManager:
             'duration_seconds': scenario_state.metrics.duration_seconds,
             'metrics': asdict(scenario_state.metrics)
         })
+        self._state_changed()
 
         # Clean up after delay
         reset_delay = self.config.get('global_settings', {}).get('reset_delay', 300)
@@ -551,6 +566,7 @@ class ScenarioManager:
 
         if scenario_id in self.active_scenarios:
             del self.active_scenarios[scenario_id]
+            self._state_changed()
 
         logger.info(f"Scenario completed and cleaned up: {scenario_id}")
 
@@ -608,6 +624,7 @@ class ScenarioManager:
             return {'success': False, 'error': f'Scenario not found: {scenario_id}'}
 
         self.config['scenarios'][scenario_id]['enabled'] = True
+        self._state_changed()
 
         # Save configuration (in real implementation, would save to file)
         logger.info(f"Scenario enabled: {scenario_id}")
@@ -623,6 +640,7 @@ class ScenarioManager:
             asyncio.create_task(self.stop_scenario(scenario_id))
 
         self.config['scenarios'][scenario_id]['enabled'] = False
+        self._state_changed()
 
         logger.info(f"Scenario disabled: {scenario_id}")
         return {'success': True, 'scenario_id': scenario_id, 'enabled': False}
@@ -635,6 +653,7 @@ class ScenarioManager:
 
         # Clear from history (optional)
         self.scenario_history = [h for h in self.scenario_history if h['scenario_id'] != scenario_id]
+        self._state_changed()
 
         logger.info(f"Scenario reset: {scenario_id}")
         return {'success': True, 'scenario_id': scenario_id}
@@ -670,10 +689,13 @@ class ScenarioManager:
             return []
 
 
-# Global instance
-scenario_manager = ScenarioManager()
+# Global instance (created on first use)
+scenario_manager = None
 
 # API helper functions
 def get_scenario_manager() -> ScenarioManager:
-    """Get the global scenario manager instance"""
+    """Get or create the global scenario manager instance"""
+    global scenario_manager
+    if scenario_manager is None:
+        scenario_manager = ScenarioManager()
     return scenario_manager
\ No newline at end of file
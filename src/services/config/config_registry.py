@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Configuration Registry
+Process-wide, memoized access to YAML configuration files
+
+Each file is parsed once and handed out as a read-only view. The file's
+mtime is re-checked at most every `check_interval` seconds; when it changed
+the file is re-parsed and subscribers are notified, mirroring
+TimeWarpConfigManager.reload_if_changed.
+"""
+
+import os
+import threading
+import time
+import weakref
+import logging
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+
+class FrozenDict(dict):
+    """dict that refuses mutation; stays JSON-serializable and isinstance(dict)"""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Configuration views are read-only; copy with thaw() to modify")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        # Default dict pickling restores items through __setitem__
+        return (FrozenDict, (dict(self),))
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert parsed YAML into read-only containers"""
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Mutable deep copy of a configuration view"""
+    if isinstance(value, dict):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(v) for v in value]
+    return value
+
+
+class _ConfigEntry:
+    def __init__(self, path: str):
+        self.path = path
+        self.data: Optional[FrozenDict] = None
+        self.signature: Optional[Tuple[int, int]] = None
+        self.checked_at = 0.0
+        self.load_count = 0
+        self.subscribers: List[Callable] = []
+
+
+class ConfigRegistry:
+    """Parses each configuration file once and reloads it only on change"""
+
+    def __init__(self, check_interval: float = 1.0):
+        self.check_interval = check_interval
+        self._entries: Dict[str, _ConfigEntry] = {}
+        self._lock = threading.RLock()
+
+    def _entry(self, config_path: str) -> _ConfigEntry:
+        path = os.path.abspath(config_path)
+        entry = self._entries.get(path)
+        if entry is None:
+            with self._lock:
+                entry = self._entries.setdefault(path, _ConfigEntry(path))
+        return entry
+
+    def get(self, config_path: str) -> FrozenDict:
+        """
+        Read-only view of a configuration file
+
+        Raises FileNotFoundError if the file does not exist and was never
+        loaded, just like opening it directly.
+        """
+        entry = self._entry(config_path)
+        if entry.data is not None and time.monotonic() - entry.checked_at < self.check_interval:
+            return entry.data
+
+        self._refresh(entry)
+        return entry.data
+
+    def _refresh(self, entry: _ConfigEntry) -> bool:
+        """Reload the entry if its file changed; returns True when reloaded"""
+        with self._lock:
+            try:
+                stat = os.stat(entry.path)
+            except FileNotFoundError:
+                if entry.data is None:
+                    raise
+                # Keep serving the last good configuration while the file is being replaced
+                logger.warning(f"Config file disappeared, keeping cached copy: {entry.path}")
+                entry.checked_at = time.monotonic()
+                return False
+
+            signature = (stat.st_mtime_ns, stat.st_size)
+            entry.checked_at = time.monotonic()
+            if entry.data is not None and signature == entry.signature:
+                return False
+
+            try:
+                with open(entry.path, 'r', encoding='utf-8') as f:
+                    data = freeze(yaml.safe_load(f) or {})
+            except yaml.YAMLError as e:
+                if entry.data is None:
+                    raise
+                logger.error(f"Invalid YAML in {entry.path}, keeping cached copy: {e}")
+                return False
+
+            reloaded = entry.data is not None
+            entry.data = data
+            entry.signature = signature
+            entry.load_count += 1
+            subscribers = list(entry.subscribers)
+
+        if reloaded:
+            logger.info(f"Configuration reloaded: {entry.path}")
+            self._notify(entry, subscribers)
+        return reloaded
+
+    def _notify(self, entry: _ConfigEntry, subscribers: List[Callable]):
+        for ref in subscribers:
+            callback = ref()
+            if callback is None:
+                with self._lock:
+                    if ref in entry.subscribers:
+                        entry.subscribers.remove(ref)
+                continue
+            try:
+                callback(entry.data)
+            except Exception as e:
+                logger.error(f"Config subscriber failed for {entry.path}: {e}")
+
+    def subscribe(self, config_path: str, callback: Callable[[FrozenDict], None]) -> None:
+        """
+        Call `callback(new_config)` whenever the file is reloaded
+
+        Bound methods are held weakly, so short-lived services subscribing
+        themselves do not stay alive through the registry.
+        """
+        if hasattr(callback, '__self__'):
+            ref = weakref.WeakMethod(callback)
+        else:
+            ref = lambda: callback
+        with self._lock:
+            entry = self._entry(config_path)
+            entry.subscribers = [r for r in entry.subscribers if r() is not None]
+            entry.subscribers.append(ref)
+
+    def reload_if_changed(self, config_path: Optional[str] = None) -> bool:
+        """Check one (or every loaded) file for changes; True if any was reloaded"""
+        if config_path is not None:
+            entries = [self._entry(config_path)]
+        else:
+            entries = [e for e in list(self._entries.values()) if e.data is not None]
+
+        reloaded = False
+        for entry in entries:
+            try:
+                reloaded = self._refresh(entry) or reloaded
+            except FileNotFoundError:
+                logger.warning(f"Config file not found: {entry.path}")
+        return reloaded
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Loaded files with their parse counts"""
+        return {
+            path: {'loaded': entry.data is not None, 'load_count': entry.load_count,
+                   'subscribers': len(entry.subscribers)}
+            for path, entry in self._entries.items()
+        }
+
+
+# Global config registry
+config_registry = None
+
+def get_config_registry() -> ConfigRegistry:
+    """Get or create global config registry"""
+    global config_registry
+    if config_registry is None:
+        config_registry = ConfigRegistry()
+    return config_registry
+
+
+def load_config(config_path: str) -> FrozenDict:
+    """Shortcut for get_config_registry().get(config_path)"""
+    return get_config_registry().get(config_path)
@@ -0,0 +1,129 @@
+"""
+Email Aggregation Service for the Happy Buttons dashboard
+Fans out to all email sources in-process with per-source deadlines and TTL caches
+"""
+
+import heapq
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def email_sort_key(email: Dict[str, Any]) -> str:
+    """Timestamps are compared as strings, newest first"""
+    return str(email.get('timestamp', ''))
+
+
+@dataclass
+class EmailSource:
+    """One email source: fetch(count) returns display-ready emails"""
+    name: str
+    fetch: Callable[[int], List[Dict[str, Any]]]
+    ttl: float = 10.0
+    deadline: float = 1.0
+    share: int = 3  # The source contributes limit // share emails
+    emails: List[Dict[str, Any]] = field(default_factory=list)
+    count: int = -1
+    fetched_at: float = 0.0
+    pending: Optional[Future] = None
+    pending_count: int = 0
+
+    def is_fresh(self, count: int, now: float) -> bool:
+        return self.count >= count and now - self.fetched_at < self.ttl
+
+
+class EmailAggregator:
+    """Merges recent emails from several sources
+
+    Stale sources are refreshed in parallel on a shared pool, at most one
+    refresh per source at a time. A source that misses its deadline
+    contributes its last cached emails (or none) while its refresh keeps
+    running for the next request, so a response takes at most the longest
+    deadline instead of the sum of all sources.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.sources: Dict[str, EmailSource] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='email-source')
+
+    def add_source(self, name: str, fetch: Callable[[int], List[Dict[str, Any]]], ttl: float = 10.0,
+                   deadline: float = 1.0, share: int = 3):
+        """Register a source; ``fetch(count)`` must be safe to call from a worker thread"""
+        self.sources[name] = EmailSource(name, fetch, ttl=ttl, deadline=deadline, share=share)
+
+    def _refresh(self, source: EmailSource, count: int) -> Future:
+        """Start (or join) the refresh of one source (lock held)
+
+        A refresh already running for at least ``count`` emails is joined; a
+        larger request starts its own, which the source then waits on.
+        """
+        if source.pending is None or count > source.pending_count:
+            source.pending = self._executor.submit(self._fetch, source, count)
+            source.pending_count = count
+        return source.pending
+
+    def _fetch(self, source: EmailSource, count: int) -> List[Dict[str, Any]]:
+        try:
+            emails = sorted(source.fetch(count), key=email_sort_key, reverse=True)
+        except Exception as e:
+            logger.warning(f"Error loading {source.name} emails: {e}")
+            emails = None
+
+        with self._lock:
+            if source.pending_count == count:
+                source.pending, source.pending_count = None, 0
+            now = time.monotonic()
+            if emails is not None and not (source.count > count and source.is_fresh(source.count, now)):
+                source.emails, source.count, source.fetched_at = emails, count, now
+        return emails if emails is not None else source.emails
+
+    def _collect(self, counts: Dict[str, int]) -> Dict[str, List[Dict[str, Any]]]:
+        """Newest ``counts[name]`` cached emails of each source, refreshing stale ones first"""
+        now = time.monotonic()
+
+        waiting = {}
+        with self._lock:
+            for name, count in counts.items():
+                source = self.sources[name]
+                if not source.is_fresh(count, now):
+                    waiting[name] = self._refresh(source, count)
+
+        # Refreshes run in parallel; each one is awaited until its own deadline
+        for name, future in sorted(waiting.items(), key=lambda item: self.sources[item[0]].deadline):
+            deadline = self.sources[name].deadline
+            wait([future], timeout=max(0.0, now + deadline - time.monotonic()))
+            if not future.done():
+                logger.warning(f"Email source {name} missed its {deadline}s deadline")
+
+        with self._lock:
+            return {name: self.sources[name].emails[:count] for name, count in counts.items()}
+
+    def _selected(self, sources: Optional[Iterable[str]]) -> List[EmailSource]:
+        return [self.sources[name] for name in (sources or self.sources) if name in self.sources]
+
+    def get_emails(self, limit: int = 20, sources: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Newest ``limit`` emails across the selected sources (all by default)"""
+        per_source = self._collect({source.name: limit // source.share for source in self._selected(sources)})
+
+        # Each source list is sorted newest first
+        merged = heapq.merge(*per_source.values(), key=email_sort_key, reverse=True)
+        return [dict(email) for email in islice(merged, limit)]
+
+    def get_source_emails(self, count: int = 100,
+                          sources: Optional[Iterable[str]] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Newest ``count`` emails of each selected source, by source name (no shares, no merge)"""
+        per_source = self._collect({source.name: count for source in self._selected(sources)})
+        return {name: [dict(email) for email in emails] for name, emails in per_source.items()}
+
+    def invalidate(self, name: Optional[str] = None):
+        """Expire one source (or all) so the next read refetches"""
+        with self._lock:
+            for source in ([self.sources[name]] if name else self.sources.values()):
+                source.fetched_at = 0.0
@@ -0,0 +1,235 @@
+"""
+Indexed Email Store with keyset pagination
+Keeps emails ordered by (timestamp, id) with per-field indexes behind opaque page cursors
+"""
+
+import base64
+import binascii
+import json
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+EmailKey = Tuple[str, str]
+FieldExtractor = Callable[[Dict[str, Any]], Any]
+
+
+def _local_part(address: Any) -> Optional[str]:
+    return str(address).split('@')[0] if address else None
+
+
+# Filterable fields: mailbox, priority, type and source
+DEFAULT_FIELDS: Dict[str, FieldExtractor] = {
+    'mailbox': lambda e: e.get('mailbox') or _local_part(e.get('routed_to') or e.get('to')),
+    'priority': lambda e: e.get('priority') or e.get('urgency'),
+    'type': lambda e: e.get('email_type') or e.get('type') or e.get('category'),
+    'source': lambda e: e.get('source'),
+}
+
+
+class InvalidCursor(ValueError):
+    """Raised for a cursor that was not issued by this API"""
+
+
+def encode_cursor(key: EmailKey) -> str:
+    """Opaque cursor for the position after ``key``"""
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> EmailKey:
+    try:
+        timestamp, email_id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        return str(timestamp), str(email_id)
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}") from e
+
+
+def parse_page_args(args: Mapping[str, Any], default_limit: int = DEFAULT_PAGE_SIZE,
+                    filters: Iterable[str] = DEFAULT_FIELDS) -> Dict[str, Any]:
+    """Page size, cursor and filters from query arguments (page size capped at MAX_PAGE_SIZE)"""
+    try:
+        limit = int(args.get('limit', default_limit))
+    except (TypeError, ValueError):
+        limit = default_limit
+    return {
+        'limit': max(1, min(limit, MAX_PAGE_SIZE)),
+        'cursor': args.get('cursor') or None,
+        'filters': {name: args[name] for name in filters if args.get(name)}
+    }
+
+
+def _normalize(value: Any) -> List[str]:
+    if value is None or value == '':
+        return []
+    values = value if isinstance(value, (list, tuple, set)) else [value]
+    return [str(v).lower() for v in values if v is not None and v != '']
+
+
+class EmailIndex:
+    """Emails sorted newest first by (timestamp, id) with a sorted key list per filter value
+
+    A page is a bisect to the cursor plus a slice, so page N costs the same
+    as page 1. Filtering on one field walks that field's own key list; more
+    filters walk the shortest list and check the others. Extractors may
+    return a list to put an email in several buckets (e.g. mailboxes).
+    """
+
+    def __init__(self, fields: Optional[Dict[str, FieldExtractor]] = None, max_size: Optional[int] = None):
+        self.fields = dict(DEFAULT_FIELDS if fields is None else fields)
+        self.max_size = max_size
+        self._keys: List[EmailKey] = []
+        self._emails: Dict[EmailKey, Dict[str, Any]] = {}
+        self._key_by_id: Dict[str, EmailKey] = {}
+        self._buckets: Dict[str, Dict[str, List[EmailKey]]] = {name: {} for name in self.fields}
+        self._values: Dict[EmailKey, Dict[str, List[str]]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @staticmethod
+    def key_for(email: Dict[str, Any]) -> EmailKey:
+        timestamp = email.get('timestamp', '')
+        if isinstance(timestamp, datetime):
+            timestamp = timestamp.isoformat()
+        return str(timestamp), str(email.get('id', ''))
+
+    def add(self, email: Dict[str, Any]):
+        """Insert an email, replacing an earlier one with the same id"""
+        with self._lock:
+            email_id = str(email.get('id', ''))
+            key = self.key_for(email)
+            if email_id and self._key_by_id.get(email_id) == key and self._emails[key] == email:
+                return  # Unchanged, so re-syncing a source's latest emails costs a lookup each
+            if email_id and email_id in self._key_by_id:
+                self._remove(self._key_by_id[email_id])
+
+            if key in self._emails:
+                self._remove(key)
+            insort(self._keys, key)
+            self._emails[key] = email
+            if email_id:
+                self._key_by_id[email_id] = key
+
+            values = {name: _normalize(extract(email)) for name, extract in self.fields.items()}
+            self._values[key] = values
+            for name, bucket_values in values.items():
+                for value in bucket_values:
+                    insort(self._buckets[name].setdefault(value, []), key)
+
+            if self.max_size is not None and len(self._keys) > self.max_size:
+                self._remove(self._keys[0])
+
+    def add_many(self, emails: Iterable[Dict[str, Any]]):
+        with self._lock:
+            for email in emails:
+                self.add(email)
+
+    def discard(self, email_id: str):
+        """Remove an email by id if present"""
+        with self._lock:
+            key = self._key_by_id.get(str(email_id))
+            if key is not None:
+                self._remove(key)
+
+    def replace(self, emails: Iterable[Dict[str, Any]]):
+        """Swap in a complete new set of emails"""
+        fresh = EmailIndex(self.fields, self.max_size)
+        fresh.add_many(emails)
+        with self._lock:
+            self._keys, self._emails, self._key_by_id = fresh._keys, fresh._emails, fresh._key_by_id
+            self._buckets, self._values = fresh._buckets, fresh._values
+
+    def _remove(self, key: EmailKey):
+        del self._keys[bisect_left(self._keys, key)]
+        email = self._emails.pop(key)
+        self._key_by_id.pop(str(email.get('id', '')), None)
+        for name, bucket_values in self._values.pop(key).items():
+            for value in bucket_values:
+                bucket = self._buckets[name][value]
+                del bucket[bisect_left(bucket, key)]
+                if not bucket:
+                    del self._buckets[name][value]
+
+    def _candidates(self, filters: Dict[str, Any]) -> Tuple[List[EmailKey], Dict[str, str]]:
+        """Shortest key list covering the filters, plus the filters left to check"""
+        wanted = {}
+        for name, value in filters.items():
+            if name not in self.fields:
+                raise ValueError(f"Unknown filter: {name}")
+            wanted[name] = str(value).lower()
+        if not wanted:
+            return self._keys, {}
+
+        lists = {name: self._buckets[name].get(value, []) for name, value in wanted.items()}
+        driver = min(lists, key=lambda name: len(lists[name]))
+        del wanted[driver]
+        return lists[driver], wanted
+
+    def page(self, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None,
+             filters: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Newest-first page of emails after ``cursor``; returns (emails, next_cursor)"""
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        with self._lock:
+            keys, remaining = self._candidates(filters or {})
+            position = bisect_left(keys, decode_cursor(cursor)) if cursor else len(keys)
+
+            selected = []
+            while position > 0 and len(selected) <= limit:
+                position -= 1
+                key = keys[position]
+                if all(value in self._values[key][name] for name, value in remaining.items()):
+                    selected.append(key)
+
+            has_more = len(selected) > limit
+            selected = selected[:limit]
+            emails = [dict(self._emails[key]) for key in selected]
+        return emails, (encode_cursor(selected[-1]) if has_more else None)
+
+    def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
+        """Number of emails matching the filters"""
+        with self._lock:
+            keys, remaining = self._candidates(filters or {})
+            if not remaining:
+                return len(keys)
+            return sum(1 for key in keys
+                       if all(value in self._values[key][name] for name, value in remaining.items()))
+
+
+class EmailFeed:
+    """An EmailIndex kept current by a refresh callback at most once per ``ttl`` seconds
+
+    ``refresh(index)`` either rebuilds the index (``index.replace``) or adds
+    only what is new since the last call; one request refreshes while
+    concurrent requests wait and then read the same index.
+    """
+
+    def __init__(self, refresh: Callable[[EmailIndex], None], ttl: float = 10.0,
+                 fields: Optional[Dict[str, FieldExtractor]] = None, max_size: Optional[int] = None):
+        self.index = EmailIndex(fields, max_size)
+        self.ttl = ttl
+        self._refresh = refresh
+        self._refreshed_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def sync(self) -> EmailIndex:
+        with self._lock:
+            now = time.monotonic()
+            if self._refreshed_at is None or now - self._refreshed_at >= self.ttl:
+                self._refresh(self.index)
+                self._refreshed_at = now
+        return self.index
+
+    def page(self, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None,
+             filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Page of the feed as a response fragment: emails, next_cursor, has_more"""
+        emails, next_cursor = self.sync().page(limit, cursor, filters)
+        return {'emails': emails, 'next_cursor': next_cursor, 'has_more': next_cursor is not None}
+
+    def invalidate(self):
+        self._refreshed_at = None
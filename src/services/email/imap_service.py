@@ -11,7 +11,12 @@ import logging
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from email.message import EmailMessage
-import yaml
+
+try:
+    from services.config.config_registry import load_config
+except ImportError:  # pragma: no cover - allows package-relative imports
+    from ..config.config_registry import load_config
+
 
 @dataclass
 class EmailAttachment:
@@ -48,8 +53,7 @@ class IMAPService:
     def _load_config(self, config_path: str) -> dict:
         """Load company configuration"""
         try:
-            with open(config_path, 'r') as f:
-                return yaml.safe_load(f)
+            return load_config(config_path)
         except FileNotFoundError:
             self.logger.error(f"Config file not found: {config_path}")
             return {}
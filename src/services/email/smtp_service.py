@@ -14,11 +14,17 @@ from email.mime.base import MIMEBase
 from email import encoders
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
-import yaml
 import asyncio
 from queue import Queue
 import threading
 
+try:
+    from services.config.config_registry import load_config
+    from services.events.event_log import get_event_log
+except ImportError:  # pragma: no cover - allows package-relative imports
+    from ..config.config_registry import load_config
+    from ..events.event_log import get_event_log
+
 @dataclass
 class EmailToSend:
     to: str
@@ -75,8 +81,7 @@ class SMTPService:
     def _load_config(self, config_path: str) -> dict:
         """Load configuration"""
         try:
-            with open(config_path, 'r') as f:
-                return yaml.safe_load(f)
+            return load_config(config_path)
         except FileNotFoundError:
             self.logger.error(f"Config file not found: {config_path}")
             return {}
@@ -381,13 +386,8 @@ class SMTPService:
                 'template': email.template_used
             }
 
-            # Save to events directory
-            events_dir = "data/events"
-            os.makedirs(events_dir, exist_ok=True)
-            event_file = f"{events_dir}/email_sent_{int(time.time())}.json"
-
-            with open(event_file, 'w') as f:
-                json.dump(event_data, f, indent=2)
+            # Append to the event log
+            get_event_log().append(event_data)
 
         except Exception as e:
             self.logger.error(f"Error saving sent email record: {e}")
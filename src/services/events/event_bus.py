@@ -0,0 +1,251 @@
+"""
+In-Process Event Bus for Happy Buttons Release 2
+Async publish/subscribe delivery of agent events with per-subscriber backpressure
+"""
+
+import asyncio
+import fnmatch
+import logging
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .event_log import EventLog, get_event_log
+
+logger = logging.getLogger(__name__)
+
+EventHandler = Callable[[Any], Awaitable[None]]
+
+
+class DeliveryPolicy(Enum):
+    """What to do when a subscriber queue is full"""
+    BLOCK = "block"              # Publisher waits until the subscriber catches up
+    DROP_NEWEST = "drop_newest"  # The incoming event is discarded
+    DROP_OLDEST = "drop_oldest"  # The oldest queued event is discarded
+
+
+@dataclass
+class SubscriptionStats:
+    delivered: int = 0
+    dropped: int = 0
+    failed: int = 0
+
+
+@dataclass
+class Subscription:
+    """A handler bound to a topic pattern with its own bounded queue"""
+    id: str
+    topic: str
+    handler: EventHandler
+    max_queue: int = 1000
+    policy: DeliveryPolicy = DeliveryPolicy.DROP_OLDEST
+    filter: Optional[Callable[[Any], bool]] = None
+    stats: SubscriptionStats = field(default_factory=SubscriptionStats)
+    queue: Optional[asyncio.Queue] = None
+    worker: Optional[asyncio.Task] = None
+    loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def matches(self, event: Any) -> bool:
+        """Check topic pattern and optional filter against an event"""
+        if not fnmatch.fnmatchcase(event.type, self.topic):
+            return False
+        return self.filter is None or self.filter(event)
+
+
+class EventBus:
+    """
+    Async in-process event bus
+
+    Features:
+    - Topic subscriptions with glob patterns ('order_*', '*')
+    - Per-subscriber bounded queues with block/drop policies
+    - Direct delivery to BaseAgent.handle_event for registered agents
+    - Optional sinks (e.g. event log persistence) running off the publish path
+    """
+
+    def __init__(self, default_max_queue: int = 1000,
+                 default_policy: DeliveryPolicy = DeliveryPolicy.DROP_OLDEST):
+        self.default_max_queue = default_max_queue
+        self.default_policy = default_policy
+        self.subscriptions: Dict[str, Subscription] = {}
+        self.agents: Dict[str, Any] = {}
+        self._next_id = 0
+        self.published = 0
+
+    def subscribe(self, topic: str, handler: EventHandler,
+                  max_queue: Optional[int] = None,
+                  policy: Optional[DeliveryPolicy] = None,
+                  filter: Optional[Callable[[Any], bool]] = None) -> str:
+        """Subscribe an async handler to a topic pattern, returns subscription ID"""
+        self._next_id += 1
+        sub_id = f"sub_{self._next_id}"
+        self.subscriptions[sub_id] = Subscription(
+            id=sub_id,
+            topic=topic,
+            handler=handler,
+            max_queue=max_queue or self.default_max_queue,
+            policy=policy or self.default_policy,
+            filter=filter
+        )
+        logger.debug(f"Subscription {sub_id} registered for topic '{topic}'")
+        return sub_id
+
+    def unsubscribe(self, sub_id: str) -> bool:
+        """Remove a subscription and stop its worker"""
+        sub = self.subscriptions.pop(sub_id, None)
+        if sub is None:
+            return False
+        if sub.worker and not sub.worker.done():
+            sub.worker.cancel()
+        return True
+
+    def register_agent(self, agent, topics: Optional[List[str]] = None,
+                       max_queue: Optional[int] = None,
+                       policy: Optional[DeliveryPolicy] = None) -> str:
+        """
+        Deliver events to an agent's handle_event
+
+        By default the agent receives every event type it has registered a
+        handler for, except its own events and events targeted at other agents.
+        """
+        self.unregister_agent(agent.agent_id)
+        wanted = set(topics) if topics else None
+
+        def accepts(event) -> bool:
+            if event.source_agent == agent.agent_id:
+                return False
+            if event.target_agent and event.target_agent != agent.agent_id:
+                return False
+            if wanted is not None:
+                return event.type in wanted
+            return event.type in agent.event_handlers
+
+        sub_id = self.subscribe("*", agent.handle_event, max_queue, policy, accepts)
+        self.agents[agent.agent_id] = sub_id
+        agent.event_bus = self
+        return sub_id
+
+    def unregister_agent(self, agent_id: str) -> bool:
+        """Stop delivering events to an agent"""
+        sub_id = self.agents.pop(agent_id, None)
+        return self.unsubscribe(sub_id) if sub_id else False
+
+    def add_sink(self, sink, max_queue: int = 10000,
+                 policy: DeliveryPolicy = DeliveryPolicy.DROP_OLDEST) -> str:
+        """Attach a sink (object with async write(event)) receiving all events"""
+        return self.subscribe("*", sink.write, max_queue, policy)
+
+    async def publish(self, event: Any) -> int:
+        """Publish an event, returns the number of subscribers it was queued for"""
+        self.published += 1
+        queued = 0
+
+        for sub in list(self.subscriptions.values()):
+            try:
+                if not sub.matches(event):
+                    continue
+            except Exception as e:
+                logger.warning(f"Subscription {sub.id} filter failed: {e}")
+                continue
+
+            self._ensure_worker(sub)
+
+            if sub.policy == DeliveryPolicy.BLOCK:
+                await sub.queue.put(event)
+                queued += 1
+            elif sub.queue.full() and sub.policy == DeliveryPolicy.DROP_NEWEST:
+                sub.stats.dropped += 1
+            else:
+                if sub.queue.full():
+                    sub.queue.get_nowait()
+                    sub.queue.task_done()
+                    sub.stats.dropped += 1
+                sub.queue.put_nowait(event)
+                queued += 1
+
+        return queued
+
+    def _ensure_worker(self, sub: Subscription):
+        """Start (or restart on a new event loop) the delivery worker"""
+        loop = asyncio.get_running_loop()
+        if sub.worker is not None and not sub.worker.done() and sub.loop is loop:
+            return
+
+        sub.queue = asyncio.Queue(maxsize=sub.max_queue)
+        sub.loop = loop
+        sub.worker = loop.create_task(self._deliver(sub))
+
+    async def _deliver(self, sub: Subscription):
+        """Worker loop draining a subscriber queue into its handler"""
+        while True:
+            event = await sub.queue.get()
+            try:
+                await sub.handler(event)
+                sub.stats.delivered += 1
+            except Exception as e:
+                sub.stats.failed += 1
+                logger.error(f"Subscription {sub.id} handler failed for {event.type}: {e}")
+            finally:
+                sub.queue.task_done()
+
+    async def drain(self):
+        """Wait until every queued event has been handled"""
+        loop = asyncio.get_running_loop()
+        for sub in list(self.subscriptions.values()):
+            if sub.queue is not None and sub.loop is loop:
+                await sub.queue.join()
+
+    async def shutdown(self):
+        """Deliver pending events and stop all workers"""
+        await self.drain()
+        for sub in self.subscriptions.values():
+            if sub.worker and not sub.worker.done():
+                sub.worker.cancel()
+            sub.worker = None
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Per-subscription delivery statistics"""
+        return {
+            'published': self.published,
+            'subscriptions': {
+                sub.id: {
+                    'topic': sub.topic,
+                    'policy': sub.policy.value,
+                    'queue_size': sub.queue.qsize() if sub.queue else 0,
+                    'max_queue': sub.max_queue,
+                    'delivered': sub.stats.delivered,
+                    'dropped': sub.stats.dropped,
+                    'failed': sub.stats.failed
+                } for sub in self.subscriptions.values()
+            },
+            'agents': dict(self.agents)
+        }
+
+
+class EventLogSink:
+    """Persists agent events to the append-only event log off the publish path"""
+
+    def __init__(self, event_log: Optional[EventLog] = None):
+        self.event_log = event_log or get_event_log()
+
+    async def write(self, event: Any):
+        await asyncio.to_thread(self.event_log.append, {
+            'id': event.id,
+            'type': event.type,
+            'source_agent': event.source_agent,
+            'target_agent': event.target_agent,
+            'data': event.data,
+            'timestamp': event.timestamp
+        })
+
+
+# Global event bus instance
+event_bus = None
+
+def get_event_bus() -> EventBus:
+    """Get or create the global event bus (with event log persistence attached)"""
+    global event_bus
+    if event_bus is None:
+        event_bus = EventBus()
+        event_bus.add_sink(EventLogSink(), policy=DeliveryPolicy.BLOCK)
+    return event_bus
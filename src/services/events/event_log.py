@@ -0,0 +1,321 @@
+"""
+Segmented Event Log for Happy Buttons Release 2
+Append-only JSONL segments with monotonically increasing offsets
+
+Replaces the one-JSON-file-per-event layout in data/events: every event is a
+single line appended to the active segment, segments roll over at a size
+limit and retention deletes whole segments.
+"""
+
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".jsonl"
+
+
+class EventLog:
+    """
+    Append-only event log
+
+    Features:
+    - Rotating JSONL segments named by their first offset
+    - Monotonic offsets, safe across threads and writer processes
+    - Batched fsync (every N appends or T seconds)
+    - Offset-based reader API for tailing (dashboard, replay)
+    - Size/age retention that deletes whole closed segments
+    """
+
+    def __init__(self, log_dir: str = "data/events/log",
+                 segment_max_bytes: int = 4 * 1024 * 1024,
+                 fsync_batch: int = 64,
+                 fsync_interval: float = 1.0,
+                 retention_bytes: int = 256 * 1024 * 1024,
+                 retention_hours: float = 30 * 24):
+        self.log_dir = log_dir
+        self.segment_max_bytes = segment_max_bytes
+        self.fsync_batch = fsync_batch
+        self.fsync_interval = fsync_interval
+        self.retention_bytes = retention_bytes
+        self.retention_hours = retention_hours
+
+        self._lock = threading.RLock()
+        self._active = None
+        self._active_base = 0
+        self._active_size = 0
+        self._dir_mtime = None
+        self._unsynced = 0
+        self._last_sync = time.time()
+
+        self.segments: List[int] = []
+        self.next_offset = 0
+
+        os.makedirs(self.log_dir, exist_ok=True)
+        self._lock_path = os.path.join(self.log_dir, ".lock")
+        self._open_active()
+
+    # Writer API
+    def append(self, event: Dict[str, Any]) -> int:
+        """Append one event, returns its offset"""
+        return self.append_many([event])[0]
+
+    def append_many(self, events: List[Dict[str, Any]]) -> List[int]:
+        """Append several events with a single write, returns their offsets"""
+        if not events:
+            return []
+
+        with self._lock, self._process_lock():
+            self._refresh_if_stale()
+
+            now = time.time()
+            offsets = []
+            lines = []
+            for event in events:
+                offset = self.next_offset + len(offsets)
+                record = {'offset': offset, 'timestamp': now, 'event': event}
+                lines.append(json.dumps(record, separators=(',', ':'), default=str))
+                offsets.append(offset)
+
+            payload = ("\n".join(lines) + "\n").encode('utf-8')
+            if self._active_size > 0 and self._active_size + len(payload) > self.segment_max_bytes:
+                self._roll()
+
+            self._active.write(payload)
+            self._active.flush()
+            self._active_size += len(payload)
+            self.next_offset += len(offsets)
+
+            self._unsynced += len(offsets)
+            if self._unsynced >= self.fsync_batch or now - self._last_sync >= self.fsync_interval:
+                self._sync()
+
+            return offsets
+
+    def sync(self):
+        """Force pending appends to disk"""
+        with self._lock:
+            self._sync()
+
+    def close(self):
+        """Sync and close the active segment"""
+        with self._lock:
+            if self._active:
+                self._sync()
+                self._active.close()
+                self._active = None
+
+    # Reader API
+    def read(self, from_offset: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        """Read up to `limit` records starting at `from_offset`"""
+        with self._lock:
+            if self._active:
+                self._active.flush()
+            segments = self._scan_segments()
+
+        if not segments or limit <= 0:
+            return []
+
+        index = max(bisect.bisect_right(segments, from_offset) - 1, 0)
+        records = []
+
+        for base in segments[index:]:
+            try:
+                with open(self._segment_path(base), 'rb') as f:
+                    for position, line in enumerate(f):
+                        if base + position < from_offset:
+                            continue
+                        if not line.endswith(b"\n"):
+                            break  # Partially written record
+                        records.append(json.loads(line))
+                        if len(records) >= limit:
+                            return records
+            except FileNotFoundError:
+                continue  # Removed by retention while reading
+
+        return records
+
+    def tail(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Read the most recent `limit` records"""
+        with self._lock:
+            self._refresh_if_stale()
+            start = max(self.next_offset - limit, self.first_offset)
+        return self.read(start, limit)
+
+    @property
+    def first_offset(self) -> int:
+        """Oldest offset still retained"""
+        return self.segments[0] if self.segments else self.next_offset
+
+    # Retention
+    def enforce_retention(self) -> int:
+        """Delete closed segments beyond the size/age limits, returns count deleted"""
+        with self._lock, self._process_lock():
+            self._refresh_if_stale()
+            closed = [base for base in self.segments if base != self._active_base]
+            cutoff = time.time() - self.retention_hours * 3600
+
+            sizes = {}
+            total = self._active_size
+            for base in closed:
+                try:
+                    stat = os.stat(self._segment_path(base))
+                    sizes[base] = (stat.st_size, stat.st_mtime)
+                    total += stat.st_size
+                except FileNotFoundError:
+                    sizes[base] = (0, 0)
+
+            deleted = 0
+            for base in closed:
+                size, mtime = sizes[base]
+                if total <= self.retention_bytes and mtime >= cutoff:
+                    break
+                try:
+                    os.remove(self._segment_path(base))
+                except FileNotFoundError:
+                    pass
+                total -= size
+                deleted += 1
+
+            if deleted:
+                self.segments = self._scan_segments()
+                self._dir_mtime = os.stat(self.log_dir).st_mtime
+                logger.info(f"Event log retention removed {deleted} segments")
+
+            return deleted
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Log size and offset information"""
+        with self._lock:
+            self._refresh_if_stale()
+            return {
+                'log_dir': self.log_dir,
+                'segments': len(self.segments),
+                'first_offset': self.first_offset,
+                'next_offset': self.next_offset,
+                'active_segment_bytes': self._active_size
+            }
+
+    # Internals
+    def _segment_path(self, base: int) -> str:
+        return os.path.join(self.log_dir, f"{base:020d}{SEGMENT_SUFFIX}")
+
+    def _scan_segments(self) -> List[int]:
+        bases = []
+        for filename in os.listdir(self.log_dir):
+            if filename.endswith(SEGMENT_SUFFIX):
+                try:
+                    bases.append(int(filename[:-len(SEGMENT_SUFFIX)]))
+                except ValueError:
+                    continue
+        return sorted(bases)
+
+    def _open_active(self):
+        """Open the newest segment for appending, recovering its offsets"""
+        self.segments = self._scan_segments()
+        if not self.segments:
+            self.segments = [self.next_offset]
+
+        self._active_base = self.segments[-1]
+        path = self._segment_path(self._active_base)
+
+        count, valid_size = self._count_records(path)
+        if os.path.exists(path) and os.path.getsize(path) != valid_size:
+            # Drop a torn trailing record left by a crash mid-write
+            with open(path, 'r+b') as f:
+                f.truncate(valid_size)
+
+        if self._active:
+            self._active.close()
+        self._active = open(path, 'ab')
+        self._active_size = valid_size
+        self.next_offset = self._active_base + count
+        self._dir_mtime = os.stat(self.log_dir).st_mtime
+
+    def _count_records(self, path: str):
+        count = 0
+        valid_size = 0
+        if not os.path.exists(path):
+            return count, valid_size
+        with open(path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                count += 1
+                valid_size += len(line)
+        return count, valid_size
+
+    def _refresh_if_stale(self):
+        """Pick up appends or rolls made by another writer process"""
+        dir_mtime = os.stat(self.log_dir).st_mtime
+        if dir_mtime != self._dir_mtime:
+            self._sync()
+            self._open_active()
+            return
+
+        size = os.fstat(self._active.fileno()).st_size
+        if size != self._active_size:
+            count, valid_size = self._count_records(self._segment_path(self._active_base))
+            self._active_size = valid_size
+            self.next_offset = self._active_base + count
+
+    def _roll(self):
+        """Close the active segment and start a new one at next_offset"""
+        self._sync()
+        self._active.close()
+        self._active_base = self.next_offset
+        self._active = open(self._segment_path(self._active_base), 'ab')
+        self._active_size = 0
+        self.segments.append(self._active_base)
+        self._dir_mtime = os.stat(self.log_dir).st_mtime
+
+    def _sync(self):
+        if self._active and self._unsynced:
+            self._active.flush()
+            os.fsync(self._active.fileno())
+        self._unsynced = 0
+        self._last_sync = time.time()
+
+    def _process_lock(self):
+        return _FileLock(self._lock_path)
+
+
+class _FileLock:
+    """Advisory inter-process lock around log mutations"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.handle = None
+
+    def __enter__(self):
+        if fcntl is not None:
+            self.handle = open(self.path, 'a')
+            fcntl.flock(self.handle, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if self.handle:
+            fcntl.flock(self.handle, fcntl.LOCK_UN)
+            self.handle.close()
+            self.handle = None
+
+
+# Global event log instance
+event_log = None
+
+def get_event_log() -> EventLog:
+    """Get or create the global event log"""
+    global event_log
+    if event_log is None:
+        event_log = EventLog()
+    return event_log
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Bulk History Seeder for Happy Buttons Release 2
+Vectorized generation of years of order history for load tests
+
+HistorySeeder walks every order through OrderStateMachine, which suits a
+month of demo data but not millions of orders. BulkHistorySeeder samples
+daily order counts, customers, order values, items and transition delays
+with NumPy for a block of days at once, renders the orders through
+precompiled JSON templates and appends them to the order store with one
+write per block.
+
+Blocks of BLOCK_DAYS days are the unit of sharding: each draws from its own
+random stream derived from the master seed, so worker processes can render
+blocks in parallel while the parent appends them in block order. The same
+(seed, start date, days) produces the same journal for any worker count.
+
+Usage: PYTHONPATH=src python -m services.history.bulk_seeder --days 1095 --orders-per-day 800 1200 --workers 4
+"""
+
+import argparse
+import gc
+import itertools
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from services.history.history_seeder import HistorySeeder, TRANSITION_HOURS, STATE_HANDLERS
+    from services.order.order_store import OrderJournal
+    from services.order.state_machine import OrderState
+except ImportError:  # pragma: no cover - allows package-relative imports
+    from .history_seeder import HistorySeeder, TRANSITION_HOURS, STATE_HANDLERS
+    from ..order.order_store import OrderJournal
+    from ..order.state_machine import OrderState
+
+BLOCK_DAYS = 32       # Days per random stream
+MAX_ITEMS = 4         # Items per generated order
+WRITER_ID = "history_seeder"
+
+# CREATED followed by the states an order passes through, in order
+LIFECYCLE = [OrderState.CREATED] + list(TRANSITION_HOURS)
+
+
+def _literal(text: str) -> str:
+    """Template-safe literal text"""
+    return text.replace('%', '%%')
+
+
+class BulkHistorySeeder:
+    """
+    Generates order history in vectorized blocks straight into the order store
+
+    Customers, products and lifecycle timings come from a HistorySeeder, so
+    the bulk data has the same shape as the per-order simulation. Orders are
+    written as journal "create" records that already carry their full
+    history; transitions after end_time have not happened yet.
+    """
+
+    def __init__(self, seeder: Optional[HistorySeeder] = None, store: Optional[OrderJournal] = None,
+                 seed: int = 42, days: int = 365, orders_per_day: Optional[Tuple[int, int]] = None,
+                 start_date: Optional[datetime] = None, end_time: Optional[float] = None):
+        self.seeder = seeder or HistorySeeder()
+        self.store = store or self.seeder.state_machine.store
+        self.seed = seed
+        self.days = days
+        self.customers = self.seeder.customers
+        self.orders_per_day = orders_per_day or self.seeder.orders_per_day_range
+        self.completion_probability = self.seeder.completion_probability
+
+        start_date = start_date or datetime.now() - timedelta(days=days)
+        self.start_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        self.end_time = int(end_time if end_time is not None else time.time())
+
+        self._prepare_tables()
+
+    def __getstate__(self):
+        # Shard workers only need the tables; the seeder's state machine and the store stay in the parent
+        state = self.__dict__.copy()
+        state.update(seeder=None, store=None)
+        return state
+
+    def _prepare_tables(self):
+        """Per-customer/product arrays and JSON fragments shared by all blocks"""
+        customers = self.customers
+        products = self.seeder.products
+
+        weights = np.array([c["order_frequency"] for c in customers], dtype=float)
+        self.customer_p = weights / weights.sum()
+        self.customer_value = np.array([c["avg_order_value"] for c in customers], dtype=float)
+        self.customer_priority = np.array([c["priority"] for c in customers], dtype=np.int64)
+        self.customer_fields = [f'"customer_email":{json.dumps(c["email"])},"customer_name":{json.dumps(c["name"])}'.encode()
+                                for c in customers]
+        self.customer_types = [json.dumps(c["type"]).encode() for c in customers]
+
+        # Preferred products per customer, padded to a rectangle
+        preferred = []
+        for customer in customers:
+            indices = [i for i, p in enumerate(products)
+                       if any(pref in p["sku"] for pref in customer["product_preferences"])]
+            preferred.append(indices or list(range(len(products))))
+        self.preferred_count = np.array([len(p) for p in preferred], dtype=np.int64)
+        self.preferred = np.array([p + [p[0]] * (max(self.preferred_count) - len(p)) for p in preferred],
+                                  dtype=np.int64)
+
+        self.price_cents = np.array([round(p["price"] * 100) for p in products], dtype=np.int64)
+        self.product_fields = np.array(
+            [f'"sku":{json.dumps(p["sku"])},"name":{json.dumps(p["name"])},"unit_price":{p["price"]!r}'.encode()
+             for p in products], dtype=object)
+
+        hours = np.array(list(TRANSITION_HOURS.values()), dtype=float)
+        self.delay_low = hours[:, 0] * 3600
+        self.delay_span = (hours[:, 1] - hours[:, 0]) * 3600
+
+        self.day_labels = [(self.start_date + timedelta(days=d)).strftime('%Y%m%d').encode() for d in range(self.days)]
+        self.templates = [[self._template(steps, items) for items in range(MAX_ITEMS + 1)]
+                          for steps in range(len(LIFECYCLE))]
+
+    def _template(self, steps: int, items: int) -> bytes:
+        """
+        Journal line for an order that made `steps` transitions and has `items` items
+
+        Arguments: date label, day sequence, customer fields, total euros, total
+        cents, priority, SLA hours, created_at, customer type, simulation day,
+        one timestamp per transition, then (fields, quantity, euros, cents) per item.
+        """
+        head = ('{"op":"create","writer":"' + WRITER_ID + '","order":{"id":"ORD_H%s_%05d",%s,'
+                '"total_amount":%d.%02d,"priority":%d,"sla_hours":%d,'
+                '"current_state":"' + LIFECYCLE[steps].value + '","created_at":%d,'
+                '"metadata":{"customer_type":%s,"simulation_day":%d,"historical_seed":true,'
+                '"seed":' + str(int(self.seed)) + '},"history":[')
+        history = ['{"from_state":"CREATED","to_state":"CREATED","timestamp":%d,"agent":"OrderSystem",'
+                   '"reason":"Order created from email/PDF","metadata":{"source":"history_seed"}}']
+        for step in range(1, steps + 1):
+            agent, reason = STATE_HANDLERS[LIFECYCLE[step]]
+            history.append('{"from_state":"' + LIFECYCLE[step - 1].value + '","to_state":"' + LIFECYCLE[step].value +
+                           '","timestamp":%d,"agent":' + _literal(json.dumps(agent)) +
+                           ',"reason":' + _literal(json.dumps(reason)) + '}')
+        item = '{%s,"quantity":%d,"total_price":%d.%02d}'
+        # JSON fragments are ASCII (json.dumps escapes the rest); bytes formatting is cheaper than str
+        return (head + ",".join(history) + '],"items":[' + ",".join([item] * items) + ']}}\n').encode()
+
+    def block_count(self) -> int:
+        return (self.days + BLOCK_DAYS - 1) // BLOCK_DAYS
+
+    def generate_block(self, block: int) -> Tuple[List[bytes], Dict[str, Any]]:
+        """Journal lines and partial statistics for one block of days"""
+        rng = np.random.default_rng([self.seed, block])
+        day_from = block * BLOCK_DAYS
+        day_to = min(day_from + BLOCK_DAYS, self.days)
+        days = np.arange(day_from, day_to)
+
+        # Daily order counts (fewer on weekends)
+        low, high = self.orders_per_day
+        weekend = (self.start_date.weekday() + days) % 7 >= 5
+        day_low = np.where(weekend, max(1, int(low * 0.3)), low)
+        day_high = np.maximum(np.where(weekend, int(high * 0.3), high), day_low)
+        counts = rng.integers(day_low, day_high + 1)
+        n = int(counts.sum())
+
+        # Orders spread evenly over their day
+        day_of = np.repeat(days, counts)
+        sequence = np.arange(n) - np.repeat(np.cumsum(counts) - counts, counts)
+        start_ts = int(self.start_date.timestamp())
+        created = start_ts + day_of * 86400 + sequence * 86400 // np.repeat(counts, counts)
+
+        # Customer (weighted by order frequency) and order value with ±50% variation
+        customer = rng.choice(len(self.customer_p), size=n, p=self.customer_p)
+        value = self.customer_value[customer] * rng.uniform(0.7, 1.5, n)
+
+        # Items from the customer's preferred products, splitting the order value
+        item_count = rng.integers(1, MAX_ITEMS + 1, n)
+        slot_used = np.arange(MAX_ITEMS) < item_count[:, None]
+        share = rng.random((n, MAX_ITEMS)) * slot_used
+        share /= share.sum(axis=1, keepdims=True)
+        pick = (rng.random((n, MAX_ITEMS)) * self.preferred_count[customer][:, None]).astype(np.int64)
+        product = self.preferred[customer[:, None], pick]
+        quantity = np.clip(value[:, None] * share * 100 // self.price_cents[product], 50, 2000).astype(np.int64)
+        item_cents = quantity * self.price_cents[product] * slot_used
+        total_cents = item_cents.sum(axis=1)
+
+        # SLA rules of OrderStateMachine._calculate_sla
+        priority = self.customer_priority[customer]
+        sla_hours = np.select([total_cents > 1_000_000, priority == 1, priority == 2], [4, 2, 12], 24)
+
+        # Lifecycle: completing orders reach CLOSED, others stop after DELIVERED/INVOICED
+        complete = rng.random(n) < self.completion_probability
+        stalled = 6 + np.minimum(rng.geometric(0.7, n) - 1, 3)
+        steps = np.where(complete, len(LIFECYCLE) - 1, stalled)
+        delays = self.delay_low + self.delay_span * rng.random((n, len(self.delay_low)))
+        timestamps = created[:, None] + np.cumsum(delays, axis=1).astype(np.int64)
+        steps = np.minimum(steps, (timestamps <= self.end_time).sum(axis=1))  # Not reached yet
+
+        items = np.empty((n, MAX_ITEMS * 4), dtype=object)
+        items[:, 0::4] = self.product_fields[product]
+        items[:, 1::4] = quantity
+        items[:, 2::4] = item_cents // 100
+        items[:, 3::4] = item_cents % 100
+
+        templates = self.templates
+        labels = self.day_labels
+        customer_fields = self.customer_fields
+        customer_types = self.customer_types
+        lines = [
+            templates[s][k] % (labels[d], q, customer_fields[c], t // 100, t % 100, p, sla, ts0,
+                               customer_types[c], d + 1, ts0, *ts[:s], *row[:4 * k])
+            for d, q, c, t, p, sla, ts0, s, k, ts, row in zip(
+                day_of.tolist(), sequence.tolist(), customer.tolist(), total_cents.tolist(),
+                priority.tolist(), sla_hours.tolist(), created.tolist(), steps.tolist(),
+                item_count.tolist(), timestamps.tolist(), items.tolist())
+        ]
+
+        partial = {
+            'day_from': day_from,
+            'orders_per_day': counts,
+            'value_per_day': np.bincount(day_of - day_from, weights=total_cents, minlength=len(days)) / 100,
+            'by_customer': np.bincount(customer, minlength=len(self.customer_p)),
+            'by_state': np.bincount(steps, minlength=len(LIFECYCLE))
+        }
+        return lines, partial
+
+    def render_block(self, block: int) -> Tuple[bytes, int, Dict[str, Any]]:
+        """(journal payload, order count, partial statistics) for one block"""
+        lines, partial = self.generate_block(block)
+        return b"".join(lines), len(lines), partial
+
+    def _rendered_blocks(self, workers: int) -> Iterator[Tuple[int, bytes, int, Dict[str, Any]]]:
+        """Rendered blocks in block order, from this process or a pool of shard workers"""
+        if workers <= 1:
+            for block in range(self.block_count()):
+                yield (block,) + self.render_block(block)
+            return
+
+        blocks = iter(range(self.block_count()))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_shard_worker, initargs=(self,)) as pool:
+            # Keep a bounded window in flight so finished blocks do not pile up in memory
+            pending = deque((block, pool.submit(_render_shard, block))
+                            for block in itertools.islice(blocks, 2 * workers))
+            while pending:
+                block, future = pending.popleft()
+                payload, count, partial = future.result()
+                next_block = next(blocks, None)
+                if next_block is not None:
+                    pending.append((next_block, pool.submit(_render_shard, next_block)))
+                yield block, payload, count, partial
+
+    def build_report(self, partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Combine block statistics into the history_seed_report layout"""
+        partials = sorted(partials, key=lambda p: p['day_from'])
+        orders_per_day = np.concatenate([p['orders_per_day'] for p in partials])
+        value_per_day = np.concatenate([p['value_per_day'] for p in partials])
+        by_customer = sum(p['by_customer'] for p in partials)
+        by_state = sum(p['by_state'] for p in partials)
+
+        return {
+            "seed": self.seed,
+            "total_orders": int(orders_per_day.sum()),
+            "completed_orders": int(by_state[-1]),
+            "total_value": round(float(value_per_day.sum()), 2),
+            "orders_by_customer": {c["name"]: int(count) for c, count in zip(self.customers, by_customer)},
+            "orders_by_state": {state.value: int(count) for state, count in zip(LIFECYCLE, by_state)},
+            "daily_stats": [
+                {
+                    "date": (self.start_date + timedelta(days=day)).strftime("%Y-%m-%d"),
+                    "orders_created": int(orders_per_day[day]),
+                    "total_value": round(float(value_per_day[day]), 2)
+                } for day in range(len(orders_per_day))
+            ]
+        }
+
+    def run(self, save_report: bool = True, workers: int = 1) -> Dict[str, Any]:
+        """Generate the whole period into the order store, rendering blocks on `workers` processes"""
+        workers = max(1, min(workers, self.block_count()))
+        print(f"🌱 Bulk seeding {self.days} days from {self.start_date:%Y-%m-%d} "
+              f"(seed {self.seed}, {workers} worker{'s' if workers > 1 else ''})")
+
+        started = time.perf_counter()
+        last_progress = started
+        partials = []
+        written = 0
+
+        # Blocks allocate millions of short-lived tuples; cyclic GC passes over them only cost time
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for block, payload, count, partial in self._rendered_blocks(workers):
+                self.store.append_encoded(payload)
+                partials.append(partial)
+                written += count
+
+                now = time.perf_counter()
+                if now - last_progress >= 1 or block == self.block_count() - 1:
+                    days_done = min((block + 1) * BLOCK_DAYS, self.days)
+                    print(f"  ⏳ {days_done}/{self.days} days · {written:,} orders · "
+                          f"{written / (now - started):,.0f} orders/s")
+                    last_progress = now
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        elapsed = time.perf_counter() - started
+        stats = self.build_report(partials)
+        stats["workers"] = workers
+        stats["elapsed_seconds"] = round(elapsed, 3)
+        stats["orders_per_second"] = round(stats["total_orders"] / elapsed) if elapsed else 0
+
+        if save_report:
+            self.seeder._save_simulation_report(stats)
+
+        print(f"✅ Seeded {stats['total_orders']:,} orders worth €{stats['total_value']:,.2f} "
+              f"in {elapsed:.1f}s ({stats['orders_per_second']:,} orders/s)")
+        return stats
+
+
+# Shard worker state (one BulkHistorySeeder copy per worker process)
+_shard_seeder = None
+
+def _init_shard_worker(bulk_seeder: BulkHistorySeeder):
+    global _shard_seeder
+    _shard_seeder = bulk_seeder
+    gc.disable()  # Same reasoning as in run(): rendering only creates short-lived objects
+
+
+def _render_shard(block: int) -> Tuple[bytes, int, Dict[str, Any]]:
+    return _shard_seeder.render_block(block)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[2])
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--orders-per-day', type=int, nargs=2, default=None, metavar=('MIN', 'MAX'))
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--store-dir', default="data/order_store")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    seeder = HistorySeeder()
+    store = OrderJournal(args.store_dir)
+    BulkHistorySeeder(seeder, store, seed=args.seed, days=args.days,
+                      orders_per_day=tuple(args.orders_per_day) if args.orders_per_day else None
+                      ).run(workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
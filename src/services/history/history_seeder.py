@@ -11,12 +11,38 @@ import time
 import random
 import json
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from dataclasses import asdict
 
 sys.path.insert(0, '/home/pi/happy_button/src')
 from services.order.state_machine import OrderStateMachine, OrderState, OrderItem
 
+# Realistic time spent before each transition (hours, uniform range)
+TRANSITION_HOURS = {
+    OrderState.CONFIRMED: (0.5, 4),      # 30min - 4h
+    OrderState.PLANNED: (2, 12),         # 2h - 12h
+    OrderState.IN_PRODUCTION: (4, 48),   # 4h - 48h
+    OrderState.PRODUCED: (1, 8),         # 1h - 8h
+    OrderState.PACKED: (0.5, 4),         # 30min - 4h
+    OrderState.SHIPPED: (1, 6),          # 1h - 6h
+    OrderState.DELIVERED: (24, 72),      # 1-3 days
+    OrderState.INVOICED: (2, 24),        # 2h - 24h
+    OrderState.CLOSED: (240, 720)        # 10-30 days
+}
+
+# State-specific agents and reasons
+STATE_HANDLERS = {
+    OrderState.CONFIRMED: ("SalesAgent", "Customer confirmed order via email"),
+    OrderState.PLANNED: ("ProductionPlanning", "Production scheduled and materials reserved"),
+    OrderState.IN_PRODUCTION: ("ProductionAgent", "Manufacturing commenced"),
+    OrderState.PRODUCED: ("QualityInspector", "Quality inspection passed"),
+    OrderState.PACKED: ("LogisticsAgent", "Order packed and labeled"),
+    OrderState.SHIPPED: ("ShippingCoordinator", "Shipped via DHL Express"),
+    OrderState.DELIVERED: ("LogisticsAgent", "Delivery confirmed by recipient"),
+    OrderState.INVOICED: ("AccountsReceivable", "Invoice generated and sent"),
+    OrderState.CLOSED: ("FinanceAgent", "Payment received and processed")
+}
+
 class HistorySeeder:
     """Generates realistic business simulation data for 30-day period"""
 
@@ -194,33 +220,10 @@ class HistorySeeder:
         transitions = []
         current_time = start_time
 
-        # Define realistic transition timing (in hours)
-        transition_timings = {
-            OrderState.CONFIRMED: random.uniform(0.5, 4),      # 30min - 4h
-            OrderState.PLANNED: random.uniform(2, 12),         # 2h - 12h
-            OrderState.IN_PRODUCTION: random.uniform(4, 48),   # 4h - 48h
-            OrderState.PRODUCED: random.uniform(1, 8),         # 1h - 8h
-            OrderState.PACKED: random.uniform(0.5, 4),         # 30min - 4h
-            OrderState.SHIPPED: random.uniform(1, 6),          # 1h - 6h
-            OrderState.DELIVERED: random.uniform(24, 72),      # 1-3 days
-            OrderState.INVOICED: random.uniform(2, 24),        # 2h - 24h
-            OrderState.CLOSED: random.uniform(240, 720)        # 10-30 days
-        }
+        # Realistic transition timing (in hours)
+        transition_timings = {state: random.uniform(low, high) for state, (low, high) in TRANSITION_HOURS.items()}
 
-        # Define state-specific agents and reasons
-        state_handlers = {
-            OrderState.CONFIRMED: ("SalesAgent", "Customer confirmed order via email"),
-            OrderState.PLANNED: ("ProductionPlanning", "Production scheduled and materials reserved"),
-            OrderState.IN_PRODUCTION: ("ProductionAgent", "Manufacturing commenced"),
-            OrderState.PRODUCED: ("QualityInspector", "Quality inspection passed"),
-            OrderState.PACKED: ("LogisticsAgent", "Order packed and labeled"),
-            OrderState.SHIPPED: ("ShippingCoordinator", "Shipped via DHL Express"),
-            OrderState.DELIVERED: ("LogisticsAgent", "Delivery confirmed by recipient"),
-            OrderState.INVOICED: ("AccountsReceivable", "Invoice generated and sent"),
-            OrderState.CLOSED: ("FinanceAgent", "Payment received and processed")
-        }
-
-        # Execute transitions
+        # Plan transitions, then apply them with one batched write
         order_states = list(OrderState)
         for i, target_state in enumerate(order_states[1:], 1):  # Skip CREATED
             if not should_complete and i >= 7 and random.random() > 0.3:  # Some orders don't complete
@@ -230,22 +233,23 @@ class HistorySeeder:
             delay_hours = transition_timings.get(target_state, 2)
             current_time += delay_hours * 3600  # Convert to seconds
 
-            agent, reason = state_handlers.get(target_state, ("SystemAgent", "Automated transition"))
+            agent, reason = STATE_HANDLERS.get(target_state, ("SystemAgent", "Automated transition"))
 
             # Generate realistic metadata
             metadata = self._generate_transition_metadata(target_state, current_time)
 
-            success = self.state_machine.transition_order(order_id, target_state, agent, reason, metadata)
-            if success:
-                transitions.append({
-                    "state": target_state.value,
-                    "timestamp": current_time,
-                    "agent": agent,
-                    "reason": reason,
-                    "metadata": metadata
-                })
-            else:
-                break  # Stop if transition fails
+            transitions.append({
+                "state": target_state.value,
+                "timestamp": current_time,
+                "agent": agent,
+                "reason": reason,
+                "metadata": metadata
+            })
+
+        batch = [(order_id, OrderState(t["state"]), t["agent"], t["reason"], t["metadata"])
+                 for t in transitions]
+        if batch and not self.state_machine.transition_many(batch):
+            return []  # Nothing applied if any transition is invalid
 
         return transitions
 
@@ -320,7 +324,7 @@ class HistorySeeder:
         print("=" * 50)
 
         # Clear existing orders for clean simulation
-        self.state_machine.orders.clear()
+        self.state_machine.clear_orders()
 
         stats = {
             "total_orders": 0,
@@ -333,6 +337,7 @@ class HistorySeeder:
 
         # Generate orders for each day
         start_date = datetime.now() - timedelta(days=self.simulation_days)
+        customer_weights = [c["order_frequency"] for c in self.customers]
 
         for day in range(self.simulation_days):
             current_date = start_date + timedelta(days=day)
@@ -355,7 +360,6 @@ class HistorySeeder:
 
             for order_num in range(daily_orders):
                 # Select customer (weighted by order frequency)
-                customer_weights = [c["order_frequency"] for c in self.customers]
                 customer = random.choices(self.customers, weights=customer_weights)[0]
 
                 # Generate order value with some variation
@@ -399,8 +403,6 @@ class HistorySeeder:
                 if order.current_state == OrderState.CLOSED:
                     stats["completed_orders"] += 1
 
-                print(f"  📦 {order.id}: {customer['name']} - €{order.total_amount:,.2f} - {order.current_state.value}")
-
             stats["daily_stats"].append(day_stats)
 
         # Save comprehensive simulation report
@@ -415,6 +417,15 @@ class HistorySeeder:
 
         return stats
 
+    def seed_bulk(self, days: int, seed: int = 42, orders_per_day: Tuple[int, int] = None,
+                  start_date: datetime = None, workers: int = 1) -> Dict[str, Any]:
+        """Generate a long history straight into the order store (vectorized, deterministic per seed)"""
+        from services.history.bulk_seeder import BulkHistorySeeder
+
+        bulk_seeder = BulkHistorySeeder(self, seed=seed, days=days, orders_per_day=orders_per_day,
+                                        start_date=start_date)
+        return bulk_seeder.run(workers=workers)
+
     def _save_simulation_report(self, stats: Dict[str, Any]):
         """Save detailed simulation report"""
         report_dir = "data/simulation"
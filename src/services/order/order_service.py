@@ -0,0 +1,207 @@
+"""
+Shared Order Service for Happy Buttons Release 2
+Long-lived, process-wide order state for the dashboard
+
+The dashboard used to build a fresh OrderStateMachine and load every order on
+each request. This service keeps one state machine per process: it loads
+once, picks up other processes' writes when the journal or snapshot changes
+on disk, and serves statistics, recent orders and single-order lookups from
+memory. etag() changes whenever any of that data changes, so polling clients
+can revalidate with If-None-Match.
+"""
+
+import itertools
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from services.order.state_machine import OrderStateMachine, Order, OrderItem
+except ImportError:  # pragma: no cover - allows package-relative imports
+    from .state_machine import OrderStateMachine, Order, OrderItem
+
+logger = logging.getLogger(__name__)
+
+
+def order_summary(order: Order) -> Dict[str, Any]:
+    """Compact order representation used by order lists"""
+    return {
+        'id': order.id,
+        'customer_name': order.customer_name,
+        'total_amount': order.total_amount,
+        'current_state': order.current_state.value,
+        'state_name': order.current_state.value.replace('_', ' ').title(),
+        'created_at': datetime.fromtimestamp(order.created_at).isoformat(),
+        'priority': order.priority
+    }
+
+
+def order_details(order: Order) -> Dict[str, Any]:
+    """Full order representation including items and state history"""
+    return {
+        'id': order.id,
+        'customer_name': order.customer_name,
+        'customer_email': order.customer_email,
+        'total_amount': order.total_amount,
+        'priority': order.priority,
+        'sla_hours': order.sla_hours,
+        'current_state': order.current_state.value,
+        'created_at': datetime.fromtimestamp(order.created_at).isoformat(),
+        'items': [
+            {
+                'sku': item.sku,
+                'name': item.name,
+                'quantity': item.quantity,
+                'unit_price': item.unit_price,
+                'total_price': item.total_price
+            } for item in order.items
+        ],
+        'history': [
+            {
+                'from_state': transition.from_state.value,
+                'to_state': transition.to_state.value,
+                'timestamp': datetime.fromtimestamp(transition.timestamp).isoformat(),
+                'agent': transition.agent,
+                'reason': transition.reason,
+                'metadata': transition.metadata
+            } for transition in order.history
+        ],
+        'metadata': order.metadata
+    }
+
+
+class OrderService:
+    """
+    One in-memory OrderStateMachine shared by all request handlers
+
+    refresh() is cheap enough to call on every request: it stats the store at
+    most once per check_interval and only replays the journal when its size or
+    mtime changed. Writes made through this service are visible immediately.
+    """
+
+    def __init__(self, config_path: str = "sim/config/company_release2.yaml",
+                 state_machine: Optional[OrderStateMachine] = None, check_interval: float = 1.0):
+        self.state_machine = state_machine or OrderStateMachine(config_path)
+        self.check_interval = check_interval
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._last_check = 0.0
+        self._store_signature: Optional[Tuple] = None
+        self._statistics_cache: Tuple[Optional[Tuple], Optional[Dict[str, Any]]] = (None, None)
+        self.reloads = 0
+
+    def _signature(self) -> Tuple:
+        store = self.state_machine.store
+        signature = []
+        for path in (store.snapshot_path, store.journal_path):
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def refresh(self, force: bool = False) -> bool:
+        """Replay changes from other processes; returns True if the store was re-read"""
+        with self._lock:
+            now = time.monotonic()
+            if self._loaded and not force and now - self._last_check < self.check_interval:
+                return False
+            self._last_check = now
+
+            # Stat before loading: a write racing with the load changes the signature again
+            signature = self._signature()
+            if self._loaded and not force and signature == self._store_signature:
+                return False
+
+            self.state_machine.load_orders()
+            self._store_signature = signature
+            self._loaded = True
+            self.reloads += 1
+            return True
+
+    def etag(self) -> str:
+        """Validator for the order statistics and lists"""
+        with self._lock:
+            state_machine = self.state_machine
+            # Overdue orders only accumulate between version bumps, so the count tracks the overdue set
+            overdue = state_machine.sla_engine.overdue_count()
+            return f"orders-{state_machine._writer_id}-{state_machine.version}-{overdue}"
+
+    def get_statistics(self, recent_limit: int = 10) -> Dict[str, Any]:
+        """Dashboard statistics payload, rebuilt only when etag() changed"""
+        with self._lock:
+            cache_key = (self.etag(), recent_limit)
+            cached_key, payload = self._statistics_cache
+            if cached_key == cache_key:
+                return payload
+
+            stats = self.state_machine.get_order_statistics()
+            total_orders = stats['total_orders']
+            overdue_count = stats['overdue_count']
+            sla_compliance = ((total_orders - overdue_count) / total_orders * 100) if total_orders > 0 else 100
+
+            payload = {
+                'total_orders': total_orders,
+                'avg_processing_time': stats['avg_processing_time'],
+                'sla_compliance': int(sla_compliance),
+                'overdue_count': overdue_count,
+                'by_state': stats['by_state'],
+                'recent_orders': [order_summary(order) for order in self.get_recent_orders(recent_limit)],
+                'timestamp': datetime.now().isoformat()
+            }
+            self._statistics_cache = (cache_key, payload)
+            return payload
+
+    def get_recent_orders(self, limit: int = 10) -> List[Order]:
+        """Most recently added orders, oldest first"""
+        with self._lock:
+            recent = list(itertools.islice(reversed(self.state_machine.orders.values()), limit))
+        recent.reverse()
+        return recent
+
+    def get_order(self, order_id: str) -> Optional[Order]:
+        """Single order lookup by ID"""
+        with self._lock:
+            return self.state_machine.get_order(order_id)
+
+    def order_etag(self, order: Order) -> str:
+        """Validator for one order (history is append-only, other fields are fixed at creation)"""
+        return f"order-{order.id}-{len(order.history)}"
+
+    def create_order(self, customer_email: str, customer_name: str, items: List[OrderItem],
+                     priority: int = 3, metadata: Dict = None) -> Order:
+        with self._lock:
+            return self.state_machine.create_order(customer_email, customer_name, items,
+                                                   priority=priority, metadata=metadata)
+
+    def start(self, poll_interval: float = 1.0):
+        """Poll SLA deadlines in the background so breaches are logged as they happen"""
+        self.state_machine.sla_engine.start(poll_interval)
+
+    def stop(self):
+        self.state_machine.sla_engine.stop()
+
+    def get_service_statistics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'orders': len(self.state_machine.orders),
+                'version': self.state_machine.version,
+                'reloads': self.reloads,
+                'check_interval': self.check_interval
+            }
+
+
+# Global order service
+order_service = None
+
+def get_order_service() -> OrderService:
+    """Get or create the global order service (with its SLA poller running)"""
+    global order_service
+    if order_service is None:
+        order_service = OrderService()
+        order_service.start()
+    return order_service
@@ -0,0 +1,209 @@
+"""
+Journaled Order Store for Happy Buttons Release 2
+Append-only order journal with periodic snapshots
+
+Replaces one pretty-printed JSON file per order (rewritten with its full
+history on every transition): creating or transitioning an order appends a
+single JSONL record, startup reads the latest snapshot and replays the
+journal tail. Compaction writes a new snapshot and starts an empty journal.
+"""
+
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILE = "snapshot.json"
+JOURNAL_FILE = "journal.jsonl"
+
+
+class OrderJournal:
+    """
+    Order persistence as snapshot + journal
+
+    Journal records are dictionaries with an `op` of "create" (carrying the
+    full order) or "transition" (carrying one state transition), tagged with
+    the writer that produced them. Each compaction bumps the store generation;
+    readers that see a new generation reload from the snapshot.
+    """
+
+    def __init__(self, store_dir: str = "data/order_store", legacy_dir: str = "data/orders"):
+        self.store_dir = store_dir
+        self.legacy_dir = legacy_dir
+        self.snapshot_path = os.path.join(store_dir, SNAPSHOT_FILE)
+        self.journal_path = os.path.join(store_dir, JOURNAL_FILE)
+        self.lock_path = os.path.join(store_dir, ".lock")
+        self._thread_lock = threading.RLock()
+        self._lock_depth = 0
+        self._lock_handle = None
+        os.makedirs(store_dir, exist_ok=True)
+
+    @contextmanager
+    def lock(self):
+        """Exclusive, re-entrant lock across threads and processes"""
+        with self._thread_lock:
+            if self._lock_depth == 0 and fcntl is not None:
+                self._lock_handle = open(self.lock_path, 'a')
+                fcntl.flock(self._lock_handle, fcntl.LOCK_EX)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0 and self._lock_handle:
+                    fcntl.flock(self._lock_handle, fcntl.LOCK_UN)
+                    self._lock_handle.close()
+                    self._lock_handle = None
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Append one record to the journal"""
+        self.append_many([record])
+
+    def append_many(self, records: List[Dict[str, Any]]) -> None:
+        """Append several records with a single write"""
+        if not records:
+            return
+        self.append_encoded("".join(json.dumps(r, separators=(',', ':')) + "\n" for r in records).encode('utf-8'))
+
+    def append_encoded(self, payload: bytes) -> None:
+        """Append records already serialized as UTF-8 JSON lines (each ending in a newline)"""
+        if not payload:
+            return
+        with self.lock():
+            with open(self.journal_path, 'ab') as f:
+                if f.tell() == 0:
+                    payload = self._journal_header(self.generation()).encode('utf-8') + payload
+                f.write(payload)
+
+    def _journal_header(self, generation: int) -> str:
+        return json.dumps({'generation': generation}) + "\n"
+
+    def generation(self) -> int:
+        """Current snapshot generation (0 before the first snapshot)"""
+        return self.read_snapshot_header().get('generation', 0)
+
+    def read_snapshot_header(self) -> Dict[str, Any]:
+        """Snapshot metadata (first line of the snapshot file)"""
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                line = f.readline()
+        except FileNotFoundError:
+            return {}
+        return json.loads(line) if line.strip() else {}
+
+    def read_snapshot(self) -> Tuple[int, List[Dict[str, Any]]]:
+        """(generation, order dictionaries) of the latest snapshot"""
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                header = json.loads(f.readline() or '{}')
+                orders = [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return 0, []
+        return header.get('generation', 0), orders
+
+    def read_journal(self, position: int = 0, generation: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Records appended after byte `position` and the position to resume from
+
+        A trailing partial line (a write in progress) is left for the next call.
+        A journal left over from an interrupted compaction (older generation
+        than the snapshot) yields no records.
+        """
+        try:
+            with open(self.journal_path, 'rb') as f:
+                f.seek(position)
+                data = f.read()
+        except FileNotFoundError:
+            return [], 0
+
+        end = data.rfind(b"\n") + 1
+        records = []
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                logger.error(f"Skipping corrupt journal record at {self.journal_path}")
+
+        if position == 0 and records and 'op' not in records[0]:
+            journal_generation = records.pop(0).get('generation', 0)
+            if journal_generation != generation:
+                logger.warning(f"Ignoring stale order journal (generation {journal_generation})")
+                return [], end
+        return records, position + end
+
+    def write_snapshot(self, orders: List[Dict[str, Any]], **header) -> int:
+        """
+        Atomically replace the snapshot and truncate the journal
+
+        Must be called under lock() with `orders` reflecting every journal
+        record. Returns the new generation.
+        """
+        snapshot_header = self.read_snapshot_header()
+        snapshot_header.update(header)
+        generation = snapshot_header.get('generation', 0) + 1
+        snapshot_header.update({'generation': generation, 'order_count': len(orders)})
+
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(snapshot_header) + "\n")
+            for order in orders:
+                f.write(json.dumps(order, separators=(',', ':')) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+        # A crash before this rewrite leaves a journal of the previous generation,
+        # which readers skip because the snapshot already contains its records
+        with open(self.journal_path, 'w', encoding='utf-8') as f:
+            f.write(self._journal_header(generation))
+
+        logger.info(f"Order store snapshot generation {generation} ({len(orders)} orders)")
+        return generation
+
+    def legacy_files(self) -> List[str]:
+        """Per-order JSON files written by the previous storage layout"""
+        if not os.path.isdir(self.legacy_dir):
+            return []
+        return sorted(os.path.join(self.legacy_dir, name) for name in os.listdir(self.legacy_dir)
+                      if name.endswith('.json'))
+
+    def needs_import(self) -> bool:
+        return not self.read_snapshot_header().get('legacy_imported') and bool(self.legacy_files())
+
+
+# Global order journal
+order_journal = None
+
+def get_order_journal() -> OrderJournal:
+    """Get or create the global order journal"""
+    global order_journal
+    if order_journal is None:
+        order_journal = OrderJournal()
+    return order_journal
+
+
+def import_json_orders(config_path: str = "sim/config/company_release2.yaml") -> int:
+    """One-shot import of data/orders/*.json into the journaled store"""
+    try:
+        from services.order.state_machine import OrderStateMachine
+    except ImportError:  # pragma: no cover - allows package-relative imports
+        from .state_machine import OrderStateMachine
+
+    state_machine = OrderStateMachine(config_path)
+    return state_machine.import_legacy_orders()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(f"Imported {import_json_orders()} orders")
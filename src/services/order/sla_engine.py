@@ -0,0 +1,174 @@
+"""
+SLA Deadline Engine for Happy Buttons Release 2
+Min-heap of order state deadlines for overdue detection
+
+Instead of recomputing "time in current state vs. state SLA" for every open
+order on each query, every order has one deadline (state entry time + state
+SLA). Deadlines sit in a min-heap; polling pops the ones that passed and
+moves them to the overdue set, so "what is overdue now" costs O(k) for k
+overdue orders plus the newly expired entries.
+
+The engine reads time from an injectable clock, so simulations (or tests)
+can drive it with a VirtualClock. Long-lived owners call start() so
+breaches fire on time instead of on the next query.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Clock = Callable[[], float]
+
+
+class VirtualClock:
+    """Manually advanced clock (epoch seconds) for simulations and tests"""
+
+    def __init__(self, start: Optional[float] = None):
+        self.now = time.time() if start is None else start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> float:
+        self.now += seconds
+        return self.now
+
+
+class SLAEngine:
+    """
+    Deadline heap with lazy invalidation
+
+    schedule() replaces an order's deadline, cancel() removes it; superseded
+    heap entries are skipped when they surface. on_overdue(order_id, deadline)
+    fires once per deadline as soon as a poll sees it pass.
+    """
+
+    def __init__(self, clock: Clock = time.time,
+                 on_overdue: Optional[Callable[[str, float], None]] = None):
+        self.clock = clock
+        self.on_overdue = on_overdue
+        self._heap: List[Tuple[float, int, str]] = []
+        self._deadlines: Dict[str, Tuple[float, int]] = {}
+        self._overdue: Dict[str, float] = {}
+        self._sequence = itertools.count()
+        self._lock = threading.RLock()
+        self._poll_thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def schedule(self, order_id: str, deadline: float):
+        """
+        Set (or move) the deadline of an order
+
+        A deadline that already passed (e.g. orders loaded from storage) goes
+        straight to the overdue set without firing on_overdue.
+        """
+        with self._lock:
+            self._overdue.pop(order_id, None)
+            if deadline < self.clock():
+                self._deadlines.pop(order_id, None)
+                self._overdue[order_id] = deadline
+                return
+
+            entry = (deadline, next(self._sequence))
+            self._deadlines[order_id] = entry
+            heapq.heappush(self._heap, (entry[0], entry[1], order_id))
+            self._maybe_compact()
+
+    def cancel(self, order_id: str):
+        """Forget an order (closed or removed)"""
+        with self._lock:
+            self._deadlines.pop(order_id, None)
+            self._overdue.pop(order_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._heap.clear()
+            self._deadlines.clear()
+            self._overdue.clear()
+
+    def poll(self, now: Optional[float] = None) -> List[str]:
+        """Move every passed deadline to the overdue set; returns newly overdue order IDs"""
+        now = self.clock() if now is None else now
+        expired = []
+        with self._lock:
+            while self._heap and self._heap[0][0] < now:
+                deadline, seq, order_id = heapq.heappop(self._heap)
+                if self._deadlines.get(order_id) != (deadline, seq):
+                    continue  # Superseded or cancelled
+                del self._deadlines[order_id]
+                self._overdue[order_id] = deadline
+                expired.append((order_id, deadline))
+
+        if self.on_overdue:
+            for order_id, deadline in expired:
+                try:
+                    self.on_overdue(order_id, deadline)
+                except Exception as e:
+                    logger.error(f"SLA overdue callback failed for {order_id}: {e}")
+        return [order_id for order_id, _ in expired]
+
+    def overdue_ids(self, now: Optional[float] = None) -> List[str]:
+        """Orders whose current-state deadline has passed"""
+        self.poll(now)
+        with self._lock:
+            return list(self._overdue)
+
+    def overdue_count(self, now: Optional[float] = None) -> int:
+        """Number of overdue orders without building the list"""
+        self.poll(now)
+        return len(self._overdue)
+
+    def deadline(self, order_id: str) -> Optional[float]:
+        with self._lock:
+            if order_id in self._deadlines:
+                return self._deadlines[order_id][0]
+            return self._overdue.get(order_id)
+
+    def next_deadline(self) -> Optional[float]:
+        """Earliest pending deadline"""
+        with self._lock:
+            while self._heap and self._deadlines.get(self._heap[0][2]) != self._heap[0][:2]:
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    def _maybe_compact(self):
+        # Rebuild once superseded entries dominate the heap
+        if len(self._heap) > 2 * len(self._deadlines) + 1024:
+            self._heap = [(d, s, oid) for oid, (d, s) in self._deadlines.items()]
+            heapq.heapify(self._heap)
+
+    def start(self, poll_interval: float = 1.0):
+        """Poll in the background so overdue events fire without queries"""
+        if self._poll_thread and self._poll_thread.is_alive():
+            return
+        self._stop.clear()
+        self._poll_thread = threading.Thread(target=self._poll_loop, args=(poll_interval,),
+                                             daemon=True, name="sla-engine")
+        self._poll_thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._poll_thread:
+            self._poll_thread.join(timeout=2)
+            self._poll_thread = None
+
+    def _poll_loop(self, poll_interval: float):
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"SLA poll failed: {e}")
+            self._stop.wait(poll_interval)
+
+    def get_statistics(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'pending_deadlines': len(self._deadlines),
+                'overdue': len(self._overdue),
+                'heap_size': len(self._heap)
+            }
@@ -5,11 +5,22 @@ Manages the complete order lifecycle from creation to closure
 
 import time
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from enum import Enum
 from dataclasses import dataclass, field
 import json
-import os
+import uuid
+
+try:
+    from services.config.config_registry import get_config_registry, load_config
+    from services.events.event_log import get_event_log
+    from services.order.order_store import OrderJournal, get_order_journal
+    from services.order.sla_engine import SLAEngine, Clock
+except ImportError:  # pragma: no cover - allows package-relative imports
+    from ..config.config_registry import get_config_registry, load_config
+    from ..events.event_log import get_event_log
+    from .order_store import OrderJournal, get_order_journal
+    from .sla_engine import SLAEngine, Clock
 
 class OrderState(Enum):
     """Order states from company configuration"""
@@ -41,6 +52,27 @@ class StateTransition:
     reason: str
     metadata: Dict[str, Any] = field(default_factory=dict)
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'from_state': self.from_state.value,
+            'to_state': self.to_state.value,
+            'timestamp': self.timestamp,
+            'agent': self.agent,
+            'reason': self.reason,
+            'metadata': self.metadata
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'StateTransition':
+        return cls(
+            from_state=OrderState(data['from_state']),
+            to_state=OrderState(data['to_state']),
+            timestamp=data['timestamp'],
+            agent=data['agent'],
+            reason=data['reason'],
+            metadata=data.get('metadata', {})
+        )
+
 @dataclass
 class Order:
     id: str
@@ -55,30 +87,86 @@ class Order:
     created_at: float = field(default_factory=time.time)
     metadata: Dict[str, Any] = field(default_factory=dict)
 
-    def add_transition(self, to_state: OrderState, agent: str, reason: str, metadata: Dict = None):
+    def add_transition(self, to_state: OrderState, agent: str, reason: str, metadata: Dict = None,
+                       timestamp: Optional[float] = None):
         """Add a state transition to order history"""
         transition = StateTransition(
             from_state=self.current_state,
             to_state=to_state,
-            timestamp=time.time(),
+            timestamp=time.time() if timestamp is None else timestamp,
             agent=agent,
             reason=reason,
             metadata=metadata or {}
         )
         self.history.append(transition)
         self.current_state = to_state
+        return transition
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for the order store (same layout as the former data/orders files)"""
+        return {
+            'id': self.id,
+            'customer_email': self.customer_email,
+            'customer_name': self.customer_name,
+            'items': [
+                {
+                    'sku': item.sku,
+                    'name': item.name,
+                    'quantity': item.quantity,
+                    'unit_price': item.unit_price,
+                    'total_price': item.total_price
+                } for item in self.items
+            ],
+            'total_amount': self.total_amount,
+            'priority': self.priority,
+            'sla_hours': self.sla_hours,
+            'current_state': self.current_state.value,
+            'created_at': self.created_at,
+            'history': [t.to_dict() for t in self.history],
+            'metadata': self.metadata
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Order':
+        return cls(
+            id=data['id'],
+            customer_email=data['customer_email'],
+            customer_name=data['customer_name'],
+            items=[OrderItem(**item) for item in data.get('items', [])],
+            total_amount=data['total_amount'],
+            priority=data['priority'],
+            sla_hours=data['sla_hours'],
+            current_state=OrderState(data['current_state']),
+            history=[StateTransition.from_dict(t) for t in data.get('history', [])],
+            created_at=data['created_at'],
+            metadata=data.get('metadata', {})
+        )
 
 class OrderStateMachine:
     """Manages order state transitions and business logic"""
 
-    def __init__(self, config_path: str = "sim/config/company_release2.yaml"):
+    def __init__(self, config_path: str = "sim/config/company_release2.yaml",
+                 store: Optional[OrderJournal] = None, clock: Optional[Clock] = None):
         self.logger = logging.getLogger(__name__)
         self.orders: Dict[str, Order] = {}
         self.config = self._load_config(config_path)
 
-        # Storage setup
-        self.storage_dir = "data/orders"
-        os.makedirs(self.storage_dir, exist_ok=True)
+        # Time source for transitions and SLAs (pass a VirtualClock for simulated time)
+        self.clock = clock or time.time
+        self.sla_engine = SLAEngine(self.clock, on_overdue=self._on_order_overdue)
+
+        # Storage setup: snapshot + append-only journal shared by all processes
+        self.store = store or get_order_journal()
+        self.storage_dir = self.store.store_dir
+        self.snapshot_every = 1000
+        self._writer_id = uuid.uuid4().hex[:12]
+        self._store_generation: Optional[int] = None
+        self._store_position = 0
+        self._appends_since_snapshot = 0
+
+        # Secondary indexes kept current by every create/transition
+        self.version = 0  # Bumped on every in-memory change (cache validators)
+        self._reset_indexes()
 
         # State transition rules from config
         self.state_rules = self._load_state_rules()
@@ -86,13 +174,22 @@ class OrderStateMachine:
     def _load_config(self, config_path: str) -> dict:
         """Load company configuration"""
         try:
-            import yaml
-            with open(config_path, 'r') as f:
-                return yaml.safe_load(f)
+            config = load_config(config_path)
         except FileNotFoundError:
             self.logger.error(f"Config file not found: {config_path}")
             return {}
 
+        get_config_registry().subscribe(config_path, self._on_config_reload)
+        return config
+
+    def _on_config_reload(self, config: dict):
+        """Pick up edited SLAs and transitions without a restart"""
+        self.config = config
+        self.state_rules = self._load_state_rules()
+        for order in self.orders.values():
+            self._schedule_sla(order)
+        self.logger.info("Order state rules reloaded from configuration")
+
     def _load_state_rules(self) -> Dict[OrderState, Dict]:
         """Load state transition rules from configuration"""
         rules = {}
@@ -131,6 +228,7 @@ class OrderStateMachine:
             priority=priority,
             sla_hours=sla_hours,
             current_state=OrderState.CREATED,
+            created_at=self.clock(),
             metadata=metadata or {}
         )
 
@@ -139,12 +237,13 @@ class OrderStateMachine:
             OrderState.CREATED,
             "OrderSystem",
             "Order created from email/PDF",
-            {"source": "email_processing", "total_amount": total_amount}
+            {"source": "email_processing", "total_amount": total_amount},
+            timestamp=order.created_at
         )
 
         # Store order
-        self.orders[order_id] = order
-        self._save_order(order)
+        self._put_order(order)
+        self._persist([{'op': 'create', 'order': order.to_dict()}], [order_id])
 
         self.logger.info(f"Created order {order_id} for {customer_name} (€{total_amount:.2f})")
         return order
@@ -164,28 +263,55 @@ class OrderStateMachine:
     def transition_order(self, order_id: str, to_state: OrderState, agent: str,
                         reason: str, metadata: Dict = None) -> bool:
         """Transition an order to a new state"""
-        if order_id not in self.orders:
-            self.logger.error(f"Order not found: {order_id}")
+        if not self.transition_many([(order_id, to_state, agent, reason, metadata)]):
             return False
 
-        order = self.orders[order_id]
-        current_state = order.current_state
-
-        # Validate transition
-        if not self._is_valid_transition(current_state, to_state):
-            self.logger.error(f"Invalid transition from {current_state.value} to {to_state.value}")
-            return False
-
-        # Perform transition
-        order.add_transition(to_state, agent, reason, metadata)
-        self._save_order(order)
-
-        # Emit event for other systems
-        self._emit_state_change_event(order, current_state, to_state)
-
-        self.logger.info(f"Order {order_id} transitioned from {current_state.value} to {to_state.value}")
+        self.logger.info(f"Order {order_id} transitioned to {to_state.value}")
         return True
 
+    def transition_many(self, transitions: List[Tuple]) -> List[StateTransition]:
+        """
+        Apply a batch of transitions atomically
+
+        Entries are (order_id, to_state, agent, reason, metadata[, timestamp]);
+        an order may appear several times to walk it through consecutive
+        states. All entries are validated first: if any is invalid nothing is
+        applied and an empty list is returned. Otherwise the batch is persisted
+        with one journal append and announced with one event log append.
+        """
+        # Validate against the states earlier entries of the batch lead to
+        planned_states: Dict[str, OrderState] = {}
+        for order_id, to_state, *_ in transitions:
+            if order_id not in self.orders:
+                self.logger.error(f"Order not found: {order_id}")
+                return []
+            from_state = planned_states.get(order_id, self.orders[order_id].current_state)
+            if not self._is_valid_transition(from_state, to_state):
+                self.logger.error(f"Invalid transition from {from_state.value} to {to_state.value} for {order_id}")
+                return []
+            planned_states[order_id] = to_state
+
+        now = self.clock()
+        applied, records, events = [], [], []
+        for order_id, to_state, agent, reason, *rest in transitions:
+            metadata = rest[0] if rest else None
+            timestamp = rest[1] if len(rest) > 1 else now
+
+            order = self.orders[order_id]
+            from_state = order.current_state
+            transition = order.add_transition(to_state, agent, reason, metadata, timestamp=timestamp)
+            self._index_transition(order, from_state)
+
+            applied.append(transition)
+            records.append({'op': 'transition', 'order_id': order_id, 'transition': transition.to_dict()})
+            events.append(self._state_change_event(order, transition))
+
+        if records:
+            self._persist(records, list(planned_states))
+            # Emit events for other systems
+            self._emit_events(events)
+        return applied
+
     def _is_valid_transition(self, from_state: OrderState, to_state: OrderState) -> bool:
         """Check if state transition is valid according to business rules"""
         if from_state not in self.state_rules:
@@ -194,26 +320,25 @@ class OrderStateMachine:
         valid_next_states = self.state_rules[from_state]['next_states']
         return to_state in valid_next_states
 
-    def _emit_state_change_event(self, order: Order, from_state: OrderState, to_state: OrderState):
-        """Emit event for state change (for dashboard and other systems)"""
-        event = {
+    def _state_change_event(self, order: Order, transition: StateTransition) -> Dict[str, Any]:
+        """Event for a state change (for dashboard and other systems)"""
+        return {
             'type': 'order_state_change',
             'order_id': order.id,
-            'from_state': from_state.value,
-            'to_state': to_state.value,
-            'timestamp': time.time(),
+            'from_state': transition.from_state.value,
+            'to_state': transition.to_state.value,
+            'timestamp': transition.timestamp,
             'customer': order.customer_name,
             'total_amount': order.total_amount,
             'priority': order.priority
         }
 
-        # Save event to events directory for dashboard
-        events_dir = "data/events"
-        os.makedirs(events_dir, exist_ok=True)
-
-        event_file = f"{events_dir}/order_event_{int(time.time())}.json"
-        with open(event_file, 'w') as f:
-            json.dump(event, f, indent=2)
+    def _emit_events(self, events: List[Dict[str, Any]]):
+        """Append events to the event log for dashboard (one write per call)"""
+        try:
+            get_event_log().append_many(events)
+        except Exception as e:
+            self.logger.error(f"Error logging {len(events)} order events: {e}")
 
     def get_order(self, order_id: str) -> Optional[Order]:
         """Get order by ID"""
@@ -221,160 +346,229 @@ class OrderStateMachine:
 
     def get_orders_by_state(self, state: OrderState) -> List[Order]:
         """Get all orders in a specific state"""
-        return [order for order in self.orders.values() if order.current_state == state]
+        return [self.orders[order_id] for order_id in self._state_index[state]]
 
     def get_overdue_orders(self) -> List[Order]:
-        """Get orders that are overdue based on SLA"""
-        overdue = []
-        current_time = time.time()
-
-        for order in self.orders.values():
-            if order.current_state == OrderState.CLOSED:
-                continue
+        """Get orders that are overdue based on SLA (time in current state > state SLA)"""
+        return [self.orders[order_id] for order_id in self.sla_engine.overdue_ids()
+                if order_id in self.orders]
+
+    def _schedule_sla(self, order: Order):
+        """Track the deadline of the order's current state"""
+        if order.current_state == OrderState.CLOSED:
+            self.sla_engine.cancel(order.id)
+            return
+
+        entered_at = order.history[-1].timestamp if order.history else order.created_at
+        state_sla = self.state_rules.get(order.current_state, {}).get('sla_hours', 24)
+        self.sla_engine.schedule(order.id, entered_at + state_sla * 3600)  # Convert hours to seconds
+
+    def _on_order_overdue(self, order_id: str, deadline: float):
+        """Record an SLA breach the moment it happens"""
+        order = self.orders.get(order_id)
+        if order is None:
+            return
 
-            # Check if order is overdue
-            time_in_current_state = current_time - order.created_at
-            if len(order.history) > 0:
-                time_in_current_state = current_time - order.history[-1].timestamp
-
-            state_sla = self.state_rules.get(order.current_state, {}).get('sla_hours', 24)
-            if time_in_current_state > (state_sla * 3600):  # Convert hours to seconds
-                overdue.append(order)
-
-        return overdue
+        event = {
+            'type': 'order_sla_breached',
+            'order_id': order_id,
+            'state': order.current_state.value,
+            'deadline': deadline,
+            'timestamp': self.clock(),
+            'customer': order.customer_name,
+            'priority': order.priority
+        }
+        try:
+            get_event_log().append(event)
+        except Exception as e:
+            self.logger.error(f"Error logging SLA breach for {order_id}: {e}")
+        self.logger.warning(f"Order {order_id} exceeded its {order.current_state.value} SLA")
 
     def get_order_statistics(self) -> Dict[str, Any]:
-        """Get order processing statistics"""
-        stats = {
+        """Get order processing statistics (served from the running indexes)"""
+        closed_count = len(self._closed_durations)
+        return {
             'total_orders': len(self.orders),
-            'by_state': {},
-            'by_priority': {1: 0, 2: 0, 3: 0, 4: 0},
-            'overdue_count': len(self.get_overdue_orders()),
-            'avg_processing_time': 0,
-            'total_value': 0
+            'by_state': {state.value: len(self._state_index[state]) for state in OrderState},
+            'by_priority': dict(self._priority_counts),
+            'overdue_count': self.sla_engine.overdue_count(),
+            'avg_processing_time': (self._closed_duration_total / closed_count / 3600) if closed_count else 0,  # Hours
+            'total_value': self._total_value
         }
 
-        # Count by state
-        for state in OrderState:
-            stats['by_state'][state.value] = len(self.get_orders_by_state(state))
-
-        # Count by priority and calculate totals
-        processing_times = []
-        for order in self.orders.values():
-            stats['by_priority'][order.priority] += 1
-            stats['total_value'] += order.total_amount
-
-            # Calculate processing time for completed orders
-            if order.current_state == OrderState.CLOSED and order.history:
-                processing_time = order.history[-1].timestamp - order.created_at
-                processing_times.append(processing_time)
-
-        # Calculate average processing time
-        if processing_times:
-            stats['avg_processing_time'] = sum(processing_times) / len(processing_times) / 3600  # Hours
+    def _reset_indexes(self):
+        self._state_index: Dict[OrderState, Dict[str, None]] = {state: {} for state in OrderState}
+        self._priority_counts: Dict[int, int] = {1: 0, 2: 0, 3: 0, 4: 0}
+        self._total_value = 0.0
+        self._closed_durations: Dict[str, float] = {}
+        self._closed_duration_total = 0.0
+        self.sla_engine.clear()
+        self.version += 1
+
+    def _put_order(self, order: Order):
+        """Insert or replace an order, keeping the indexes in step"""
+        previous = self.orders.get(order.id)
+        if previous is not None:
+            self._unindex_order(previous)
+        self.orders[order.id] = order
+        self._index_order(order)
+
+    def _index_order(self, order: Order):
+        self._state_index[order.current_state][order.id] = None
+        self._priority_counts[order.priority] = self._priority_counts.get(order.priority, 0) + 1
+        self._total_value += order.total_amount
+        self._index_closed(order)
+        self._schedule_sla(order)
+        self.version += 1
+
+    def _unindex_order(self, order: Order):
+        self._state_index[order.current_state].pop(order.id, None)
+        self._priority_counts[order.priority] -= 1
+        self._total_value -= order.total_amount
+        self._unindex_closed(order)
+        self.sla_engine.cancel(order.id)
+
+    def _index_transition(self, order: Order, from_state: OrderState):
+        """Move an order between state buckets after order.current_state changed"""
+        self._state_index[from_state].pop(order.id, None)
+        self._state_index[order.current_state][order.id] = None
+        if from_state == OrderState.CLOSED:
+            self._unindex_closed(order)
+        self._index_closed(order)
+        self._schedule_sla(order)
+        self.version += 1
+
+    def _index_closed(self, order: Order):
+        if order.current_state == OrderState.CLOSED and order.history and order.id not in self._closed_durations:
+            duration = order.history[-1].timestamp - order.created_at
+            self._closed_durations[order.id] = duration
+            self._closed_duration_total += duration
+
+    def _unindex_closed(self, order: Order):
+        duration = self._closed_durations.pop(order.id, None)
+        if duration is not None:
+            self._closed_duration_total -= duration
+
+    def clear_orders(self):
+        """Drop all in-memory orders (the persisted journal is untouched)"""
+        self.orders.clear()
+        self._reset_indexes()
+
+    def _persist(self, records: List[Dict[str, Any]], order_ids: List[str]):
+        """Append order records to the journal (one small write per call)"""
+        for record in records:
+            record['writer'] = self._writer_id
 
-        return stats
-
-    def _save_order(self, order: Order):
-        """Save order to persistent storage"""
         try:
-            order_file = f"{self.storage_dir}/{order.id}.json"
-
-            order_data = {
-                'id': order.id,
-                'customer_email': order.customer_email,
-                'customer_name': order.customer_name,
-                'items': [
-                    {
-                        'sku': item.sku,
-                        'name': item.name,
-                        'quantity': item.quantity,
-                        'unit_price': item.unit_price,
-                        'total_price': item.total_price
-                    } for item in order.items
-                ],
-                'total_amount': order.total_amount,
-                'priority': order.priority,
-                'sla_hours': order.sla_hours,
-                'current_state': order.current_state.value,
-                'created_at': order.created_at,
-                'history': [
-                    {
-                        'from_state': t.from_state.value,
-                        'to_state': t.to_state.value,
-                        'timestamp': t.timestamp,
-                        'agent': t.agent,
-                        'reason': t.reason,
-                        'metadata': t.metadata
-                    } for t in order.history
-                ],
-                'metadata': order.metadata
-            }
-
-            with open(order_file, 'w') as f:
-                json.dump(order_data, f, indent=2)
-
+            self.store.append_many(records)
+        except Exception as e:
+            self.logger.error(f"Error saving orders {order_ids}: {e}")
+            return
+
+        self._appends_since_snapshot += len(records)
+        if self._appends_since_snapshot >= self.snapshot_every:
+            self.compact()
+
+    def _apply_record(self, record: Dict[str, Any]):
+        """Replay one journal record written by another state machine
+
+        Transitions are applied only if they continue from the order's
+        current state along an allowed edge; a record that conflicts with
+        what this machine already holds is skipped.
+        """
+        if record.get('writer') == self._writer_id:
+            return
+
+        if record['op'] == 'create':
+            if record['order']['id'] not in self.orders:
+                self._put_order(Order.from_dict(record['order']))
+        elif record['op'] == 'transition':
+            order = self.orders.get(record['order_id'])
+            if order is None:
+                return
+            transition = StateTransition.from_dict(record['transition'])
+            from_state = order.current_state
+            if transition.from_state != from_state or not self._is_valid_transition(from_state, transition.to_state):
+                self.logger.warning(f"Skipping replayed transition {transition.from_state.value} -> "
+                                    f"{transition.to_state.value} for {order.id} (order is {from_state.value})")
+                return
+            order.history.append(transition)
+            order.current_state = transition.to_state
+            self._index_transition(order, from_state)
+
+    def _refresh_from_store(self) -> int:
+        """Bring self.orders up to date; reads the snapshot only when its generation changed"""
+        generation = self.store.generation()
+        if generation != self._store_generation:
+            _, snapshot_orders = self.store.read_snapshot()
+            for order_data in snapshot_orders:
+                # An order this machine changed after the snapshot was taken keeps its newer history
+                current = self.orders.get(order_data['id'])
+                if current is None or len(order_data.get('history', [])) >= len(current.history):
+                    self._put_order(Order.from_dict(order_data))
+            self._store_generation = generation
+            self._store_position = 0
+
+        records, self._store_position = self.store.read_journal(self._store_position, generation)
+        for record in records:
+            self._apply_record(record)
+        return len(records)
+
+    def compact(self) -> int:
+        """Write a snapshot of all orders and start an empty journal"""
+        try:
+            with self.store.lock():
+                self._refresh_from_store()
+                self._store_generation = self.store.write_snapshot(
+                    [order.to_dict() for order in self.orders.values()])
+                self._store_position = 0
+            self._appends_since_snapshot = 0
+            return self._store_generation
         except Exception as e:
-            self.logger.error(f"Error saving order {order.id}: {e}")
+            self.logger.error(f"Error compacting order store: {e}")
+            return -1
 
     def load_orders(self):
-        """Load orders from persistent storage"""
+        """Load orders from persistent storage (snapshot plus journal tail, then only new records)"""
         try:
-            if not os.path.exists(self.storage_dir):
-                return
+            if self.store.needs_import():
+                self.import_legacy_orders()
 
-            for filename in os.listdir(self.storage_dir):
-                if filename.endswith('.json'):
-                    with open(f"{self.storage_dir}/{filename}", 'r') as f:
-                        order_data = json.load(f)
+            with self.store.lock():
+                replayed = self._refresh_from_store()
 
-                        # Reconstruct OrderItem objects
-                        items = []
-                        for item_data in order_data.get('items', []):
-                            item = OrderItem(
-                                sku=item_data['sku'],
-                                name=item_data['name'],
-                                quantity=item_data['quantity'],
-                                unit_price=item_data['unit_price'],
-                                total_price=item_data['total_price']
-                            )
-                            items.append(item)
-
-                        # Reconstruct StateTransition objects
-                        history = []
-                        for transition_data in order_data.get('history', []):
-                            transition = StateTransition(
-                                from_state=OrderState(transition_data['from_state']),
-                                to_state=OrderState(transition_data['to_state']),
-                                timestamp=transition_data['timestamp'],
-                                agent=transition_data['agent'],
-                                reason=transition_data['reason'],
-                                metadata=transition_data.get('metadata', {})
-                            )
-                            history.append(transition)
-
-                        # Reconstruct Order object
-                        order = Order(
-                            id=order_data['id'],
-                            customer_email=order_data['customer_email'],
-                            customer_name=order_data['customer_name'],
-                            items=items,
-                            total_amount=order_data['total_amount'],
-                            priority=order_data['priority'],
-                            sla_hours=order_data['sla_hours'],
-                            current_state=OrderState(order_data['current_state']),
-                            history=history,
-                            created_at=order_data['created_at'],
-                            metadata=order_data.get('metadata', {})
-                        )
-
-                        # Add to in-memory storage
-                        self.orders[order.id] = order
+            if replayed >= self.snapshot_every:
+                self.compact()
 
             self.logger.info(f"Loaded {len(self.orders)} orders from storage")
         except Exception as e:
             self.logger.error(f"Error loading orders: {e}")
 
+    def import_legacy_orders(self) -> int:
+        """One-shot import of the former per-order files in data/orders"""
+        imported = 0
+        with self.store.lock():
+            if self.store.read_snapshot_header().get('legacy_imported'):
+                return 0
+
+            self._refresh_from_store()
+            for order_file in self.store.legacy_files():
+                try:
+                    with open(order_file, 'r') as f:
+                        order_data = json.load(f)
+                    if order_data['id'] not in self.orders:
+                        self._put_order(Order.from_dict(order_data))
+                        imported += 1
+                except Exception as e:
+                    self.logger.error(f"Error importing {order_file}: {e}")
+
+            self._store_generation = self.store.write_snapshot(
+                [order.to_dict() for order in self.orders.values()], legacy_imported=True)
+            self._store_position = 0
+
+        self.logger.info(f"Imported {imported} orders from {self.store.legacy_dir}")
+        return imported
+
 # Demo usage
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
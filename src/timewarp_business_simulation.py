@@ -591,8 +591,11 @@ class TimeWarpBusinessSimulator:
         }
 
 # Global business simulator instance
-business_simulator = TimeWarpBusinessSimulator()
+business_simulator = None
 
 def get_business_simulator() -> TimeWarpBusinessSimulator:
-    """Get the global business simulator instance"""
+    """Get or create the global business simulator instance"""
+    global business_simulator
+    if business_simulator is None:
+        business_simulator = TimeWarpBusinessSimulator()
     return business_simulator
\ No newline at end of file
@@ -525,11 +525,14 @@ class TimeWarpEmailGenerator:
         }
 
 
-# Global email generator instance
-email_generator = TimeWarpEmailGenerator()
+# Global email generator instance (created on first use)
+email_generator = None
 
 def get_email_generator() -> TimeWarpEmailGenerator:
-    """Get the global TimeWarp email generator instance"""
+    """Get or create the global TimeWarp email generator instance"""
+    global email_generator
+    if email_generator is None:
+        email_generator = TimeWarpEmailGenerator()
     return email_generator
 
 
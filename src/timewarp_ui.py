@@ -7,12 +7,15 @@ Provides real-time UI updates and control interfaces for the TimeWarp system
 """
 
 from flask import jsonify, request, render_template
-from flask_socketio import emit, SocketIO
+from flask_socketio import emit, join_room, leave_room, SocketIO
 import json
 import logging
 from datetime import datetime
 from .timewarp_engine import get_timewarp
 
+# Socket.IO room of the clients showing TimeWarp controls
+TIMEWARP_ROOM = 'timewarp'
+
 logger = logging.getLogger(__name__)
 
 def get_timewarp_ui():
@@ -182,6 +185,7 @@ class TimeWarpUI:
         def handle_timewarp_connect():
             """Client connected to TimeWarp updates"""
             self.connected_clients.add(request.sid)
+            join_room(TIMEWARP_ROOM)
 
             # Send current status
             status = self.timewarp.get_time_status()
@@ -198,6 +202,7 @@ class TimeWarpUI:
         def handle_timewarp_disconnect():
             """Client disconnected from TimeWarp updates"""
             self.connected_clients.discard(request.sid)
+            leave_room(TIMEWARP_ROOM)
             logger.info(f"Client {request.sid} disconnected from TimeWarp updates")
 
         @self.socketio.on('timewarp_set_speed')
@@ -225,23 +230,23 @@ class TimeWarpUI:
             return
 
         try:
-            # Broadcast to all connected clients
+            # Only clients that opened the TimeWarp controls receive its events
             self.socketio.emit('timewarp_event', {
                 "type": event_type,
                 "data": data,
                 "timestamp": datetime.now().isoformat()
-            })
+            }, to=TIMEWARP_ROOM)
 
             # Special handling for specific events
             if event_type == "time_update":
-                self.socketio.emit('timewarp_time_update', data)
+                self.socketio.emit('timewarp_time_update', data, to=TIMEWARP_ROOM)
             elif event_type == "speed_changed":
-                self.socketio.emit('timewarp_speed_changed', data)
+                self.socketio.emit('timewarp_speed_changed', data, to=TIMEWARP_ROOM)
             elif event_type in ["paused", "resumed", "reset", "started", "stopped"]:
                 self.socketio.emit('timewarp_state_changed', {
                     "state": event_type,
                     "data": data
-                })
+                }, to=TIMEWARP_ROOM)
 
         except Exception as e:
             logger.error(f"Error broadcasting TimeWarp event: {e}")
@@ -529,7 +534,10 @@ class TimeWarpUI:
             }
 
             connectSocket() {
-                this.socket.emit('timewarp_connect');
+                // (Re)join the TimeWarp room whenever the socket connects
+                const join = () => this.socket.emit('timewarp_connect');
+                this.socket.on('connect', join);
+                if (this.socket.connected) join();
 
                 this.socket.on('timewarp_status', (data) => {
                     this.updateUI(data.status);
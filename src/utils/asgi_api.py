@@ -0,0 +1,198 @@
+"""
+ASGI Server Mode
+FastAPI front for the dashboard: async JSON handlers and WebSocket push, with the Flask pages mounted behind
+"""
+import asyncio
+import contextlib
+import itertools
+import json
+import logging
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+from anyio import CapacityLimiter, to_thread
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response
+from starlette.websockets import WebSocketClose
+
+try:
+    from a2wsgi import WSGIMiddleware
+except ImportError:  # pragma: no cover - Starlette's bundled (deprecated) adapter
+    from fastapi.middleware.wsgi import WSGIMiddleware
+
+try:
+    from utils.push_hub import PushHub
+    from utils.response_cache import ResponseCache, query_variant
+except ImportError:  # pragma: no cover - allows package-relative imports
+    from .push_hub import PushHub
+    from .response_cache import ResponseCache, query_variant
+
+logger = logging.getLogger(__name__)
+
+
+async def run_blocking(func: Callable, *args, limiter: Optional[CapacityLimiter] = None, **kwargs) -> Any:
+    """Run a blocking service call on a worker thread so the event loop keeps serving"""
+    return await to_thread.run_sync(partial(func, *args, **kwargs), limiter=limiter)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check (weak comparison, '*' matches anything)"""
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+    tags = {tag.strip().removeprefix('W/').strip('"') for tag in header.split(',')}
+    return '*' in tags or etag in tags
+
+
+async def cached_json(request: Request, cache: ResponseCache, name: str, compute: Callable,
+                      ttl: Optional[float] = None, limiter: Optional[CapacityLimiter] = None,
+                      args: Iterable[str] = ()) -> Response:
+    """JSON response from the shared response cache, computed off the event loop on a miss
+
+    ``args`` names the query arguments ``compute`` depends on; others share its cached entry.
+    """
+    variant = query_variant(request.query_params, args)
+    entry = cache.peek(name, variant)
+    if entry is None:
+        entry = await run_blocking(cache.get_json, name, compute, ttl, variant, limiter=limiter)
+
+    headers = {'ETag': f'"{entry.etag}"', 'Cache-Control': 'no-cache'}
+    if etag_matches(request, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(entry.body, media_type=entry.mimetype, headers=headers)
+
+
+class WebSocketPush:
+    """Delivers PushHub topics over plain WebSockets
+
+    Same protocol as the Socket.IO events, as JSON frames: clients send
+    ``{"action": "subscribe" | "unsubscribe", "topics": [...]}`` or
+    ``{"action": "resync", "topic": ...}`` and receive
+    ``{"event": "push_snapshot" | "push_delta" | "push_error", ...}``.
+    Each connection has a bounded queue; when a slow client's queue is full
+    its deltas are dropped and it resyncs on the sequence gap.
+    """
+
+    def __init__(self, hub: PushHub, queue_size: int = 100):
+        self.hub = hub
+        self.queue_size = queue_size
+        self.connections: Dict[str, asyncio.Queue] = {}
+        self.dropped = 0
+        self._ids = itertools.count(1)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        hub.add_sink(self.deliver)
+
+    def deliver(self, event: str, payload: Dict[str, Any], topic: str):
+        """PushHub sink: called from the tick thread"""
+        loop = self._loop
+        if loop is None:
+            return
+        message = json.dumps({'event': event, **payload})  # Serialized once for all subscribers
+        for sid in self.hub.subscribers(topic):
+            queue = self.connections.get(sid)
+            if queue is not None:
+                loop.call_soon_threadsafe(self._offer, queue, message)
+
+    def _offer(self, queue: asyncio.Queue, message: Any):
+        try:
+            queue.put_nowait(message if isinstance(message, str) else json.dumps(message))
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def _receive(self, websocket: WebSocket, sid: str, queue: asyncio.Queue):
+        while True:
+            data = await websocket.receive_json()
+            action = data.get('action')
+            if action == 'subscribe':
+                for topic in data.get('topics', []):
+                    message = await run_blocking(self.hub.subscribe, sid, topic)
+                    if message is None:
+                        self._offer(queue, {'event': 'push_error', 'topic': topic,
+                                            'message': f'Unknown topic: {topic}'})
+                    else:
+                        self._offer(queue, {'event': 'push_snapshot', **message})
+            elif action == 'unsubscribe':
+                for topic in data.get('topics', []):
+                    self.hub.unsubscribe(sid, topic)
+            elif action == 'resync':
+                message = self.hub.resync(data.get('topic', ''))
+                if message is not None:
+                    self._offer(queue, {'event': 'push_snapshot', **message})
+
+    async def _send(self, websocket: WebSocket, queue: asyncio.Queue):
+        while True:
+            await websocket.send_text(await queue.get())
+
+    async def serve(self, websocket: WebSocket):
+        """Handle one WebSocket connection until it closes"""
+        await websocket.accept()
+        self._loop = asyncio.get_running_loop()
+        sid = f'ws-{next(self._ids)}'
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self.connections[sid] = queue
+
+        tasks = [asyncio.create_task(self._receive(websocket, sid, queue)),
+                 asyncio.create_task(self._send(websocket, queue))]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                exception = task.exception()
+                if exception is not None and not isinstance(exception, WebSocketDisconnect):
+                    logger.warning(f"WebSocket push connection {sid} failed: {exception}")
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.connections.pop(sid, None)
+            self.hub.remove_client(sid)
+
+
+def create_asgi_app(flask_app, push_hub: Optional[PushHub] = None, io_threads: int = 32,
+                    title: str = 'Happy Buttons Dashboard API') -> FastAPI:
+    """FastAPI app with WebSocket push at /ws/push; requests it has no route for fall through to Flask
+
+    Register the async API routes on the returned app; ``app.state.io_limiter``
+    bounds the worker threads used by slow I/O (IMAP, HTTP) so those calls
+    cannot take every thread from the fast endpoints.
+    """
+    ticker: Set[asyncio.Task] = set()
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: FastAPI):
+        if push_hub is not None:
+            async def tick_forever():
+                while True:
+                    await asyncio.sleep(push_hub.interval)
+                    try:
+                        await run_blocking(push_hub.tick)
+                    except Exception as e:
+                        logger.error(f"Error in push tick: {e}")
+            ticker.add(asyncio.create_task(tick_forever()))
+        yield
+        for task in ticker:
+            task.cancel()
+
+    api = FastAPI(title=title, lifespan=lifespan, docs_url='/api/docs', openapi_url='/api/openapi.json')
+    api.state.io_limiter = CapacityLimiter(io_threads)
+
+    if push_hub is not None:
+        api.state.websocket_push = WebSocketPush(push_hub)
+
+        @api.websocket('/ws/push')
+        async def websocket_push(websocket: WebSocket):
+            await api.state.websocket_push.serve(websocket)
+
+    # Requests no FastAPI route matches (pages, remaining /api routes) go to Flask
+    api.router.default = flask_fallback(flask_app)
+    return api
+
+
+def flask_fallback(flask_app):
+    """ASGI app serving HTTP requests through the Flask app; other WebSockets are refused"""
+    wsgi = WSGIMiddleware(flask_app)
+
+    async def app(scope, receive, send):
+        if scope['type'] == 'http':
+            await wsgi(scope, receive, send)
+        elif scope['type'] == 'websocket':
+            await WebSocketClose()(scope, receive, send)
+    return app
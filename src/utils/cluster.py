@@ -0,0 +1,133 @@
+"""
+Dashboard Cluster
+One engine process owns the simulation and agent state; N stateless web workers share the listening socket
+"""
+import logging
+import os
+import secrets
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, Optional
+
+try:
+    from utils.engine_ipc import EngineClient
+except ImportError:  # pragma: no cover - allows package-relative imports
+    from .engine_ipc import EngineClient
+
+logger = logging.getLogger(__name__)
+
+
+def inheritable_listen_socket(host: str, port: int, backlog: int = 128) -> socket.socket:
+    """A listening TCP socket the worker processes inherit and all accept on"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class Cluster:
+    """Starts and supervises the engine and the web workers of one dashboard
+
+    Every child runs ``script`` with DASHBOARD_ROLE set. The engine starts
+    first and serves its state over a Unix socket (ENGINE_SOCKET, protected by
+    a per-cluster ENGINE_AUTHKEY); the workers are started once it answers and
+    accept connections on the socket bound here (LISTEN_FD), so the kernel
+    spreads requests across them. A child that exits is restarted; a
+    restarted engine starts from fresh state and the workers reconnect.
+    """
+
+    def __init__(self, script: str, workers: int = 2, port: int = 80, host: str = '0.0.0.0',
+                 socket_path: Optional[str] = None, message_queue: Optional[str] = None):
+        self.script = script
+        self.workers = workers
+        self.port = port
+        self.host = host
+        self.socket_path = socket_path or os.path.join(tempfile.gettempdir(), f'happy_buttons_engine_{port}.sock')
+        self.message_queue = message_queue
+        self.authkey = secrets.token_hex(16)
+        self.listen_socket: Optional[socket.socket] = None
+        self.processes: Dict[str, subprocess.Popen] = {}
+        self.started_at: Dict[str, float] = {}
+        self.running = False
+
+    def _env(self, role: str, **extra: str) -> Dict[str, str]:
+        env = dict(os.environ, DASHBOARD_ROLE=role, ENGINE_SOCKET=self.socket_path,
+                   ENGINE_AUTHKEY=self.authkey, FLASK_PORT=str(self.port), **extra)
+        if self.message_queue:
+            env['SOCKETIO_MESSAGE_QUEUE'] = self.message_queue
+        return env
+
+    def _spawn(self, name: str):
+        if name == 'engine':
+            process = subprocess.Popen([sys.executable, self.script], env=self._env('engine'))
+        else:
+            fd = self.listen_socket.fileno()
+            process = subprocess.Popen([sys.executable, self.script], pass_fds=(fd,),
+                                       env=self._env('worker', WORKER_ID=name.split('-')[1], LISTEN_FD=str(fd)))
+        self.processes[name] = process
+        self.started_at[name] = time.monotonic()
+        logger.info(f"Started {name} (pid {process.pid})")
+
+    def start(self, timeout: float = 120.0):
+        """Bind the port, start the engine, then start the workers once it answers"""
+        self.running = True
+        self.listen_socket = inheritable_listen_socket(self.host, self.port)
+        self._spawn('engine')
+        EngineClient(self.socket_path, bytes.fromhex(self.authkey)).wait_until_ready(timeout)
+        for number in range(1, self.workers + 1):
+            self._spawn(f'worker-{number}')
+        logger.info(f"Dashboard cluster serving on http://{self.host}:{self.port} "
+                    f"with {self.workers} web workers")
+
+    def supervise(self, interval: float = 1.0, min_uptime: float = 5.0):
+        """Restart children that exit until ``stop()``; quick crashes back off by ``min_uptime``"""
+        while self.running:
+            time.sleep(interval)
+            for name, process in list(self.processes.items()):
+                if not self.running or process.poll() is None:
+                    continue
+                if time.monotonic() - self.started_at[name] < min_uptime:
+                    continue  # Crashed right after starting: wait before trying again
+                logger.warning(f"{name} exited with code {process.returncode}, restarting")
+                self._spawn(name)
+
+    def stop(self, timeout: float = 10.0):
+        """Terminate every child (killing stragglers) and release the sockets"""
+        self.running = False
+        for process in self.processes.values():
+            if process.poll() is None:
+                process.terminate()
+        deadline = time.monotonic() + timeout
+        for process in self.processes.values():
+            try:
+                process.wait(max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                process.kill()
+        if self.listen_socket is not None:
+            self.listen_socket.close()
+        if 'engine' in self.processes and os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        logger.info("Dashboard cluster stopped")
+
+
+def run_cluster(script: str, workers: int, port: int, host: str = '0.0.0.0',
+                message_queue: Optional[str] = None):
+    """Run a cluster in the foreground until SIGINT or SIGTERM"""
+    cluster = Cluster(script, workers, port, host, message_queue=message_queue)
+
+    def shutdown(signum, frame):
+        cluster.running = False
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+    try:
+        cluster.start()
+        cluster.supervise()
+    finally:
+        cluster.stop()
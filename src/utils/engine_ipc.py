@@ -0,0 +1,408 @@
+"""
+Engine IPC
+Local Unix-socket channel between the dashboard's engine process and its stateless web workers
+"""
+import errno
+import logging
+import os
+import pickle
+import queue
+import socket
+import tempfile
+import threading
+import time
+from functools import partial
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from werkzeug.http import is_hop_by_hop_header
+from werkzeug.test import EnvironBuilder, run_wsgi_app
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), 'happy_buttons_engine.sock')
+
+_CLOSED = object()  # Ends a subscriber's sender thread
+
+
+class EngineUnavailable(ConnectionError):
+    """The engine process cannot be reached (not started, restarting or timed out)"""
+
+
+class RemoteError(RuntimeError):
+    """A call raised in the engine process; the message names the original exception"""
+
+
+def _authkey_from_env() -> Optional[bytes]:
+    authkey = os.environ.get('ENGINE_AUTHKEY')
+    return bytes.fromhex(authkey) if authkey else None
+
+
+class EngineServer:
+    """Serves calls on exposed objects and publishes events to subscribed workers
+
+    Workers send ``('call', 'push.subscribe', args, kwargs)`` and get
+    ``('ok', result)`` or ``('error', message)`` back; each connection is
+    served by its own thread, so one slow call does not hold up the others.
+    A connection that sends ``('subscribe', channel)`` instead receives every
+    message later published on that channel, through its own bounded outbox
+    and sender thread; a subscriber whose outbox overflows is disconnected
+    (it resubscribes and catches up) instead of holding up the publisher.
+    Only public attributes of the exposed objects can be called.
+    """
+
+    def __init__(self, address: str = DEFAULT_SOCKET, authkey: Optional[bytes] = None, outbox_size: int = 1000):
+        self.address = address
+        self.authkey = authkey
+        self.outbox_size = outbox_size
+        self._targets: Dict[str, Any] = {'ping': lambda: os.getpid()}
+        self._subscribers: Dict[str, Dict[Connection, queue.Queue]] = {}
+        self._connections: Set[Connection] = set()
+        self._lock = threading.Lock()
+        self._listener: Optional[Listener] = None
+
+    @classmethod
+    def from_env(cls) -> 'EngineServer':
+        """Server on ENGINE_SOCKET with ENGINE_AUTHKEY (hex), as set by the cluster launcher"""
+        return cls(os.environ.get('ENGINE_SOCKET', DEFAULT_SOCKET), _authkey_from_env())
+
+    def expose(self, name: str, target: Any):
+        """Make ``target`` callable as ``name`` (a function) or ``name.method`` (an object)"""
+        self._targets[name] = target
+
+    def start(self) -> threading.Thread:
+        """Listen on the Unix socket (replacing a stale one) and accept connections in the background"""
+        if os.path.exists(self.address):
+            with socket.socket(socket.AF_UNIX) as probe:
+                try:
+                    probe.connect(self.address)
+                except OSError:
+                    os.unlink(self.address)
+                else:
+                    raise OSError(errno.EADDRINUSE, f"An engine is already listening on {self.address}")
+        self._listener = Listener(self.address, family='AF_UNIX', authkey=self.authkey)
+        thread = threading.Thread(target=self._accept, name='engine-ipc', daemon=True)
+        thread.start()
+        logger.info(f"Engine IPC listening on {self.address}")
+        return thread
+
+    def close(self):
+        """Stop accepting, end every open connection and remove the socket file"""
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+        with self._lock:
+            connections = list(self._connections)
+        for connection in connections:
+            self._disconnect(connection)
+
+    @staticmethod
+    def _disconnect(connection: Connection):
+        """Wake the thread blocked reading from a connection, which then closes it"""
+        try:
+            with socket.socket(fileno=os.dup(connection.fileno())) as sock:
+                sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def _accept(self):
+        listener = self._listener
+        while listener is not None and self._listener is listener:
+            try:
+                connection = listener.accept()
+            except (AuthenticationError, EOFError) as e:
+                logger.warning(f"Rejected engine IPC connection: {e}")
+                continue
+            except OSError:
+                break  # Listener closed
+            threading.Thread(target=self._serve, args=(connection,), name='engine-ipc-conn', daemon=True).start()
+
+    def _resolve(self, path: str) -> Callable:
+        name, *attributes = path.split('.')
+        if name not in self._targets:
+            raise LookupError(f"Nothing exposed as {name!r}")
+        target = self._targets[name]
+        for attribute in attributes:
+            if attribute.startswith('_'):
+                raise AttributeError(f"{path!r} is not public")
+            target = getattr(target, attribute)
+        if not callable(target):
+            raise TypeError(f"{path!r} is not callable")
+        return target
+
+    def _serve(self, connection: Connection):
+        with self._lock:
+            self._connections.add(connection)
+        try:
+            while True:
+                message = connection.recv()
+                if message[0] == 'subscribe':
+                    outbox = queue.Queue(self.outbox_size)
+                    with self._lock:
+                        self._subscribers.setdefault(message[1], {})[connection] = outbox
+                    connection.send(('ok', None))
+                    threading.Thread(target=self._deliver, args=(connection, outbox),
+                                     name='engine-ipc-send', daemon=True).start()
+                    connection.recv()  # Subscribers only listen; this returns when the worker goes away
+                    return
+                _, path, args, kwargs = message
+                try:
+                    reply = ('ok', self._resolve(path)(*args, **kwargs))
+                except Exception as e:
+                    reply = ('error', f"{type(e).__name__}: {e}")
+                try:
+                    connection.send(reply)
+                except (pickle.PicklingError, TypeError, AttributeError) as e:
+                    connection.send(('error', f"Result of {path} cannot be sent: {e}"))
+        except (EOFError, OSError):
+            pass
+        finally:
+            self._drop(connection)
+            connection.close()
+
+    def _deliver(self, connection: Connection, outbox: queue.Queue):
+        """Send one subscriber its published messages, so a slow worker only delays itself"""
+        while True:
+            message = outbox.get()
+            if message is _CLOSED:
+                return
+            try:
+                connection.send(message)
+            except (OSError, TypeError, ValueError):  # TypeError: already closed by its reader thread
+                self._disconnect(connection)
+                return
+
+    def _drop(self, connection: Connection):
+        with self._lock:
+            self._connections.discard(connection)
+            outboxes = [subscribers.pop(connection) for subscribers in self._subscribers.values()
+                        if connection in subscribers]
+        for outbox in outboxes:
+            while not outbox.empty():
+                try:
+                    outbox.get_nowait()
+                except queue.Empty:
+                    break
+            try:
+                outbox.put_nowait(_CLOSED)
+            except queue.Full:
+                pass  # A publish raced in; the sender fails on the closed connection instead
+
+    def publish(self, channel: str, message: Any) -> int:
+        """Queue a message for every subscriber of a channel; returns how many it was queued for"""
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, {}).items())
+        queued = 0
+        for connection, outbox in subscribers:
+            try:
+                outbox.put_nowait(message)
+                queued += 1
+            except queue.Full:
+                logger.warning(f"Engine IPC subscriber to {channel!r} is not keeping up, disconnecting it")
+                self._disconnect(connection)
+        return queued
+
+
+class EngineClient:
+    """Calls into the engine process over a small pool of Unix-socket connections
+
+    Raises ``EngineUnavailable`` when the engine cannot be reached and
+    ``RemoteError`` when the call itself failed in the engine. A pooled
+    connection the engine has closed is replaced once, before anything was sent.
+    """
+
+    def __init__(self, address: str = DEFAULT_SOCKET, authkey: Optional[bytes] = None, timeout: float = 30.0):
+        self.address = address
+        self.authkey = authkey
+        self.timeout = timeout
+        self._pool: List[Connection] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'EngineClient':
+        """Client for ENGINE_SOCKET with ENGINE_AUTHKEY (hex), as set by the cluster launcher"""
+        return cls(os.environ.get('ENGINE_SOCKET', DEFAULT_SOCKET), _authkey_from_env(),
+                   timeout=float(os.environ.get('ENGINE_TIMEOUT', 30)))
+
+    def _connect(self) -> Connection:
+        try:
+            return Client(self.address, family='AF_UNIX', authkey=self.authkey)
+        except (OSError, EOFError, AuthenticationError) as e:
+            raise EngineUnavailable(f"Cannot reach the engine at {self.address}: {e}") from e
+
+    def _acquire(self) -> Connection:
+        with self._lock:
+            if self._pool:
+                return self._pool.pop()
+        return self._connect()
+
+    def _release(self, connection: Connection):
+        with self._lock:
+            self._pool.append(connection)
+
+    def call(self, path: str, *args, **kwargs) -> Any:
+        """Call ``path`` (``'name'`` or ``'name.method'``) in the engine and return its result"""
+        connection = self._acquire()
+        message = ('call', path, args, kwargs)
+        try:
+            try:
+                connection.send(message)
+            except OSError:
+                connection.close()
+                connection = self._connect()
+                connection.send(message)
+            if not connection.poll(self.timeout):
+                raise EngineUnavailable(f"Engine did not answer {path} within {self.timeout}s")
+            status, result = connection.recv()
+        except (OSError, EOFError, EngineUnavailable) as e:
+            connection.close()
+            if isinstance(e, EngineUnavailable):
+                raise
+            raise EngineUnavailable(f"Lost the engine connection during {path}: {e}") from e
+        self._release(connection)
+        if status == 'error':
+            raise RemoteError(result)
+        return result
+
+    def proxy(self, path: str) -> 'RemoteObject':
+        """Stand-in for an exposed object whose method calls run in the engine"""
+        return RemoteObject(self, path)
+
+    def listen(self, channel: str, callback: Callable[[Any], None],
+               on_connect: Optional[Callable[[], None]] = None, retry: float = 1.0) -> threading.Thread:
+        """Call ``callback(message)`` for each message published on ``channel``
+
+        Runs on a daemon thread that resubscribes after the engine restarts;
+        ``on_connect`` runs after every (re)subscription, to catch up on
+        anything missed while disconnected.
+        """
+        def run():
+            while True:
+                try:
+                    connection = self._connect()
+                    try:
+                        connection.send(('subscribe', channel))
+                        connection.recv()
+                        if on_connect is not None:
+                            on_connect()
+                        while True:
+                            message = connection.recv()
+                            try:
+                                callback(message)
+                            except Exception as e:
+                                logger.error(f"Error handling engine event on {channel}: {e}")
+                    finally:
+                        connection.close()
+                except (EngineUnavailable, OSError, EOFError) as e:
+                    logger.warning(f"Engine channel {channel} disconnected: {e}")
+                    time.sleep(retry)
+
+        thread = threading.Thread(target=run, name=f'engine-listen-{channel}', daemon=True)
+        thread.start()
+        return thread
+
+    def close(self):
+        """Close the pooled connections"""
+        with self._lock:
+            for connection in self._pool:
+                connection.close()
+            self._pool.clear()
+
+    def wait_until_ready(self, timeout: float = 60.0, interval: float = 0.1) -> int:
+        """Block until the engine answers ``ping``; returns its process ID"""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return self.call('ping')
+            except EngineUnavailable:
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(interval)
+
+
+class RemoteObject:
+    """Method-call proxy for an object exposed by the engine (attributes are not mirrored)"""
+
+    def __init__(self, client: EngineClient, path: str):
+        self._client = client
+        self._path = path
+
+    def __getattr__(self, name: str) -> Callable:
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return partial(self._client.call, f'{self._path}.{name}')
+
+    def __repr__(self) -> str:
+        return f'<RemoteObject {self._path}>'
+
+
+class EventRelay:
+    """Socket.IO stand-in for the engine: emits are published to the web workers
+
+    The local replacement for a Socket.IO message queue. Each worker relays
+    the events to its own clients with ``relay_to_socketio``; with
+    SOCKETIO_MESSAGE_QUEUE set, a real queue (Redis) is used instead.
+    """
+
+    sleep = staticmethod(time.sleep)
+
+    def __init__(self, server: EngineServer, channel: str = 'socketio'):
+        self.server = server
+        self.channel = channel
+
+    def emit(self, event: str, data: Any = None, to: Optional[str] = None, room: Optional[str] = None,
+             namespace: Optional[str] = None, **kwargs):
+        self.server.publish(self.channel, (event, data, to or room, namespace))
+
+
+def relay_to_socketio(client: EngineClient, socketio, channel: str = 'socketio') -> threading.Thread:
+    """Emit the engine's relayed events to this worker's Socket.IO clients"""
+    def emit(message: Tuple[str, Any, Optional[str], Optional[str]]):
+        event, data, to, namespace = message
+        socketio.emit(event, data, to=to, namespace=namespace)
+    return client.listen(channel, emit)
+
+
+def wsgi_handler(app) -> Callable:
+    """Engine side of request forwarding: run a forwarded request through the WSGI app"""
+    def handle(method: str, path: str, query_string: str, headers: List[Tuple[str, str]],
+               body: bytes, remote_addr: Optional[str] = None) -> Tuple[str, List[Tuple[str, str]], bytes]:
+        environ = EnvironBuilder(path=path, method=method, query_string=query_string, headers=headers,
+                                 data=body, environ_overrides={'REMOTE_ADDR': remote_addr or '127.0.0.1'}
+                                 ).get_environ()
+        app_iter, status, response_headers = run_wsgi_app(app, environ, buffered=True)
+        try:
+            content = b''.join(app_iter)
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+        return status, [(k, v) for k, v in response_headers.items() if not is_hop_by_hop_header(k)], content
+    return handle
+
+
+def forward_request(client: EngineClient, request, target: str = 'http'):
+    """Worker side of request forwarding: the engine's response to this Flask request"""
+    from flask import Response, jsonify
+
+    headers = [(k, v) for k, v in request.headers.items() if not is_hop_by_hop_header(k)]
+    try:
+        status, response_headers, content = client.call(target, request.method, request.path,
+                                                         request.query_string.decode('latin-1'), headers,
+                                                         request.get_data(), request.remote_addr)
+    except EngineUnavailable as e:
+        return jsonify({'status': 'error', 'message': f'Engine unavailable: {e}'}), 503
+    except RemoteError as e:
+        return jsonify({'status': 'error', 'message': f'Engine error: {e}'}), 502
+    return Response(content, status=status, headers=response_headers)
+
+
+
+def socketio_transports(role: str) -> List[str]:
+    """Socket.IO transports for the pages a process in ``role`` renders
+
+    Long-polling needs sticky sessions, which workers sharing one socket do
+    not have; the engine renders the pages workers forward to it, so every
+    cluster role offers the WebSocket transport only.
+    """
+    return ['websocket'] if role in ('engine', 'worker') else ['polling', 'websocket']
@@ -0,0 +1,155 @@
+"""
+Service Health Prober
+Probes service /health endpoints concurrently in the background and caches the results
+"""
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+class HealthTarget:
+    """Probe state of one service"""
+
+    def __init__(self, key: str, name: str, port: int, timeout: float, history_size: int):
+        self.key = key
+        self.name = name
+        self.port = port
+        self.url = f"http://localhost:{port}/health"
+        self.timeout = timeout
+        self.status = 'checking'
+        self.health = 'unknown'
+        self.last_checked: Optional[str] = None
+        self.latency_ms: Optional[float] = None
+        self.consecutive_failures = 0
+        self.next_probe_at = 0.0
+        self.history = deque(maxlen=history_size)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'port': self.port,
+            'status': self.status,
+            'health': self.health,
+            'last_checked': self.last_checked,
+            'latency_ms': self.latency_ms,
+            'consecutive_failures': self.consecutive_failures
+        }
+
+
+class HealthProber:
+    """Background health checks with per-target timeouts and exponential backoff
+
+    All due targets are probed in parallel; readers only see cached results,
+    so a dead service never delays a request. Healthy targets are probed
+    every ``interval`` seconds, failing ones back off exponentially up to
+    ``max_backoff``. Each target keeps a history of its state changes.
+    """
+
+    def __init__(self, services: Dict[str, Dict[str, Any]], interval: float = 5.0,
+                 timeout: float = 2.0, max_backoff: float = 60.0, history_size: int = 50):
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self.targets = {
+            key: HealthTarget(key, service['name'], service['port'],
+                              service.get('timeout', timeout), history_size)
+            for key, service in services.items()
+        }
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._executor = ThreadPoolExecutor(max_workers=max(1, len(self.targets)),
+                                            thread_name_prefix='health-probe')
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> 'HealthProber':
+        """Start the probing thread (no-op if already running)"""
+        with self._lock:
+            if not self.running:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name='health-prober', daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the probing thread"""
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.probe_due()
+            except Exception as e:
+                logger.error(f"Error probing service health: {e}")
+            next_at = min((t.next_probe_at for t in self.targets.values()), default=time.monotonic() + self.interval)
+            self._wake.wait(max(0.05, next_at - time.monotonic()))
+            self._wake.clear()
+
+    def probe_due(self) -> List[str]:
+        """Probe all targets whose next check is due, concurrently; returns their keys"""
+        now = time.monotonic()
+        due = [target for target in self.targets.values() if target.next_probe_at <= now]
+        for _ in self._executor.map(self._probe, due):
+            pass
+        return [target.key for target in due]
+
+    def probe_all(self) -> Dict[str, Dict[str, Any]]:
+        """Probe every target now, ignoring backoff"""
+        for _ in self._executor.map(self._probe, self.targets.values()):
+            pass
+        return self.get_status()
+
+    def _probe(self, target: HealthTarget):
+        started = time.monotonic()
+        try:
+            response = requests.get(target.url, timeout=target.timeout)
+            if response.status_code == 200:
+                status, health = 'running', 'healthy'
+            else:
+                status, health = 'error', 'unhealthy'
+        except requests.RequestException:
+            status, health = 'stopped', 'offline'
+        finished = time.monotonic()
+
+        with self._lock:
+            if (status, health) != (target.status, target.health):
+                target.history.append({'timestamp': datetime.now().isoformat(),
+                                       'status': status, 'health': health})
+            target.status, target.health = status, health
+            target.last_checked = datetime.now().isoformat()
+            target.latency_ms = (finished - started) * 1000
+
+            if health == 'healthy':
+                target.consecutive_failures = 0
+                target.next_probe_at = finished + self.interval
+            else:
+                target.consecutive_failures += 1
+                backoff = self.interval * 2 ** (target.consecutive_failures - 1)
+                target.next_probe_at = finished + min(self.max_backoff, backoff)
+
+    def get_status(self) -> Dict[str, Dict[str, Any]]:
+        """Cached status of every target; starts the prober on first use"""
+        if not self.running:
+            self.start()
+        with self._lock:
+            return {key: target.snapshot() for key, target in self.targets.items()}
+
+    def get_history(self, key: str) -> List[Dict[str, Any]]:
+        """State changes of one target, oldest first"""
+        with self._lock:
+            return list(self.targets[key].history)
@@ -6,12 +6,6 @@ import os
 import json
 from datetime import datetime
 from typing import Dict, List, Any, Optional
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 import tempfile
 
 
@@ -115,6 +109,13 @@ Distribution Centers: New York, Maryland
 
     def generate_order_pdf(self, order: Dict[str, Any]) -> str:
         """Generate professional order PDF"""
+        # reportlab is imported on first use, it is slow to import
+        from reportlab.lib.pagesizes import A4
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.units import inch
+        from reportlab.lib import colors
+        from reportlab.lib.enums import TA_CENTER
 
         # Create PDF file path
         filename = f'Order_HB-{order["id"]:06d}.pdf'
@@ -0,0 +1,282 @@
+"""
+Dashboard Push Hub
+Topic-scoped Socket.IO updates sent as sequenced deltas with snapshot resync
+"""
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+_UNCHANGED = object()
+
+
+def merge_patch(old: Any, new: Any) -> Any:
+    """JSON merge patch (RFC 7386) turning ``old`` into ``new``; ``_UNCHANGED`` if equal
+
+    Only changed object fields are included, removed fields are ``None``
+    and lists or scalars are replaced whole.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        patch = {key: None for key in old.keys() - new.keys()}
+        for key, value in new.items():
+            if key not in old:
+                patch[key] = value
+            else:
+                changed = merge_patch(old[key], value)
+                if changed is not _UNCHANGED:
+                    patch[key] = changed
+        return patch if patch else _UNCHANGED
+    return _UNCHANGED if old == new else new
+
+
+def apply_merge_patch(target: Any, patch: Any) -> Any:
+    """Apply a merge patch (the Python twin of the dashboard's applyMergePatch)"""
+    if not isinstance(patch, dict):
+        return patch
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = apply_merge_patch(result.get(key), value)
+    return result
+
+
+@dataclass
+class TopicState:
+    """Last pushed snapshot of one topic and the clients subscribed to it"""
+    name: str
+    compute: Callable[[], Any]
+    seq: int = 0
+    snapshot: Any = None
+    subscribers: Set[str] = field(default_factory=set)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class PushHub:
+    """Computes each subscribed topic once per tick and pushes only what changed
+
+    Clients join a Socket.IO room per topic (``metrics``, ``agents``,
+    ``mailbox:<name>``, ...) and receive a ``push_snapshot`` on subscribe.
+    Each tick recomputes the topics that have subscribers and emits one
+    ``push_delta`` per changed topic to its room, carrying a merge patch and
+    a sequence number. A client that sees a sequence gap asks for
+    ``push_resync`` and gets the current snapshot. Topics nobody listens to
+    are not computed at all.
+    """
+
+    def __init__(self, socketio=None, interval: float = 5.0):
+        self.socketio = socketio
+        self.interval = interval
+        self.topics: Dict[str, TopicState] = {}
+        self._providers: Dict[str, Callable] = {}
+        self._lock = threading.Lock()
+        self._sinks: List[Callable[[str, Dict[str, Any], str], None]] = []
+        self.stats = {'ticks': 0, 'deltas': 0, 'snapshots': 0, 'unchanged': 0}
+
+    def add_topic(self, name: str, compute: Callable):
+        """Register a topic; a name ending in ':' takes a parameter (``mailbox:`` -> compute(name))"""
+        self._providers[name] = compute
+
+    def _resolve(self, topic: str) -> Optional[Callable[[], Any]]:
+        if topic in self._providers and not topic.endswith(':'):
+            return self._providers[topic]
+        prefix, sep, param = topic.partition(':')
+        provider = self._providers.get(prefix + sep) if sep and param else None
+        return partial(provider, param) if provider else None
+
+    def _compute(self, state: TopicState) -> Any:
+        # Normalized through JSON: a private copy the next tick can be compared against
+        return json.loads(json.dumps(state.compute(), default=str))
+
+    def _message(self, state: TopicState) -> Dict[str, Any]:
+        return {'topic': state.name, 'seq': state.seq, 'data': state.snapshot}
+
+    def add_sink(self, sink: Callable[[str, Dict[str, Any], str], None]):
+        """Deliver room broadcasts to another transport as well: sink(event, payload, topic)"""
+        self._sinks.append(sink)
+
+    def _emit(self, event: str, payload: Dict[str, Any], to: str):
+        if self.socketio is not None:
+            self.socketio.emit(event, payload, to=to)
+        for sink in self._sinks:
+            try:
+                sink(event, payload, to)
+            except Exception as e:
+                logger.error(f"Error delivering {event} for {to}: {e}")
+
+    def _refresh(self, state: TopicState):
+        """Recompute one topic and broadcast the delta to its room (topic lock held)"""
+        data = self._compute(state)
+        if state.seq == 0:
+            state.seq, state.snapshot = 1, data
+            return
+
+        patch = merge_patch(state.snapshot, data)
+        if patch is _UNCHANGED:
+            self.stats['unchanged'] += 1
+            return
+
+        state.seq += 1
+        state.snapshot = data
+        self.stats['deltas'] += 1
+        self._emit('push_delta', {'topic': state.name, 'seq': state.seq, 'patch': patch}, to=state.name)
+
+    def subscribe(self, sid: str, topic: str) -> Optional[Dict[str, Any]]:
+        """Add a client to a topic; returns the snapshot message (None for unknown topics)"""
+        with self._lock:
+            state = self.topics.get(topic)
+            if state is None:
+                compute = self._resolve(topic)
+                if compute is None:
+                    return None
+                state = self.topics[topic] = TopicState(topic, compute)
+            state.subscribers.add(sid)
+
+        with state.lock:
+            if state.seq == 0:
+                self._refresh(state)
+            self.stats['snapshots'] += 1
+            return self._message(state)
+
+    def unsubscribe(self, sid: str, topic: str):
+        """Remove a client from a topic; topics without subscribers are dropped"""
+        with self._lock:
+            state = self.topics.get(topic)
+            if state is not None:
+                state.subscribers.discard(sid)
+                if not state.subscribers:
+                    del self.topics[topic]
+
+    def subscribers(self, topic: str) -> Set[str]:
+        """Client ids subscribed to a topic"""
+        with self._lock:
+            state = self.topics.get(topic)
+            return set(state.subscribers) if state is not None else set()
+
+    def remove_client(self, sid: str):
+        """Forget a disconnected client"""
+        for topic in [name for name, state in list(self.topics.items()) if sid in state.subscribers]:
+            self.unsubscribe(sid, topic)
+
+    def remove_clients(self, prefix: str):
+        """Forget every client whose id starts with ``prefix`` (a restarted web worker's)"""
+        for sid in {sid for state in list(self.topics.values()) for sid in list(state.subscribers)
+                    if sid.startswith(prefix)}:
+            self.remove_client(sid)
+
+    def resync(self, topic: str) -> Optional[Dict[str, Any]]:
+        """Current snapshot message of a subscribed topic"""
+        state = self.topics.get(topic)
+        if state is None:
+            return None
+        with state.lock:
+            self.stats['snapshots'] += 1
+            return self._message(state)
+
+    def current(self, topic: str) -> Any:
+        """Latest snapshot of a topic, computed on demand when nobody is subscribed"""
+        state = self.topics.get(topic)
+        if state is not None and state.seq:
+            return state.snapshot
+        compute = self._resolve(topic)
+        return self._compute(TopicState(topic, compute)) if compute else None
+
+    def tick(self) -> List[str]:
+        """Recompute every subscribed topic once; returns the topic names"""
+        with self._lock:
+            states = [state for state in self.topics.values() if state.subscribers]
+        for state in states:
+            try:
+                with state.lock:
+                    self._refresh(state)
+            except Exception as e:
+                logger.error(f"Error computing push topic {state.name}: {e}")
+        self.stats['ticks'] += 1
+        return [state.name for state in states]
+
+    def run(self):
+        """Tick forever (start with socketio.start_background_task)"""
+        while True:
+            self.socketio.sleep(self.interval)
+            self.tick()
+
+    def register_handlers(self):
+        """Bind the push_subscribe / push_unsubscribe / push_resync Socket.IO events"""
+        from flask import request
+        from flask_socketio import emit, join_room, leave_room
+
+        @self.socketio.on('push_subscribe')
+        def handle_push_subscribe(data):
+            for topic in (data or {}).get('topics', []):
+                join_room(topic)
+                message = self.subscribe(request.sid, topic)
+                if message is None:
+                    leave_room(topic)
+                    emit('push_error', {'topic': topic, 'message': f'Unknown topic: {topic}'})
+                else:
+                    emit('push_snapshot', message)
+
+        @self.socketio.on('push_unsubscribe')
+        def handle_push_unsubscribe(data):
+            for topic in (data or {}).get('topics', []):
+                leave_room(topic)
+                self.unsubscribe(request.sid, topic)
+
+        @self.socketio.on('push_resync')
+        def handle_push_resync(data):
+            message = self.resync((data or {}).get('topic', ''))
+            if message is not None:
+                emit('push_snapshot', message)
+
+
+class RemotePushHub(PushHub):
+    """A web worker's view of the engine process's PushHub
+
+    Topic state, ticks and deltas stay in the engine; subscribe, resync and
+    current are forwarded to it over the engine IPC (``remote`` is the
+    engine's ``push`` proxy) with client ids prefixed by the worker, so two
+    workers' Socket.IO sids cannot collide. The deltas come back as
+    room broadcasts relayed to (or queued for) every worker, and the
+    inherited Socket.IO handlers deliver them to the clients in the room.
+    """
+
+    def __init__(self, socketio, remote, client_prefix: Optional[str] = None):
+        super().__init__(socketio)
+        self.remote = remote
+        self.client_prefix = client_prefix or f'worker-{os.getpid()}'
+
+    def _client(self, sid: str) -> str:
+        return f'{self.client_prefix}:{sid}'
+
+    def subscribe(self, sid: str, topic: str) -> Optional[Dict[str, Any]]:
+        return self.remote.subscribe(self._client(sid), topic)
+
+    def unsubscribe(self, sid: str, topic: str):
+        self.remote.unsubscribe(self._client(sid), topic)
+
+    def subscribers(self, topic: str) -> Set[str]:
+        prefix = self._client('')
+        return {sid[len(prefix):] for sid in self.remote.subscribers(topic) if sid.startswith(prefix)}
+
+    def remove_client(self, sid: str):
+        self.remote.remove_client(self._client(sid))
+
+    def reset(self):
+        """Drop the subscriptions a previous process with this prefix left in the engine"""
+        self.remote.remove_clients(self._client(''))
+
+    def resync(self, topic: str) -> Optional[Dict[str, Any]]:
+        return self.remote.resync(topic)
+
+    def current(self, topic: str) -> Any:
+        return self.remote.current(topic)
+
+    def tick(self) -> List[str]:
+        """Nothing to compute here: the engine ticks"""
+        return []
@@ -0,0 +1,204 @@
+"""
+Dashboard Response Cache
+Serves polled JSON endpoints from short-lived cached bodies with strong ETags
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from functools import wraps
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+from urllib.parse import urlencode
+
+from flask import make_response, request
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedResponse:
+    """One rendered 200 response"""
+    body: bytes
+    mimetype: str
+    etag: str
+    expires_at: float
+
+
+def query_variant(args: Mapping[str, str], names: Iterable[str] = ()) -> bytes:
+    """Cache variant for a request: only the query arguments the view reads, in a fixed order"""
+    return urlencode([(name, args[name]) for name in sorted(names) if name in args]).encode()
+
+
+class ResponseCache:
+    """Per-endpoint TTL cache for read-heavy JSON views
+
+    Each endpoint name maps to its cached variants, one per combination of
+    the query arguments the view declares it reads (``query_variant``); at
+    most ``max_variants`` are kept per endpoint, expired ones first. A miss
+    is computed by the first request while concurrent requests for the same
+    variant wait on its lock and reuse the result, so any number of polling
+    tabs cost one computation per TTL. ``invalidate`` drops an endpoint
+    immediately; a computation that was running at the time is returned to
+    its caller but not stored.
+    """
+
+    def __init__(self, default_ttl: float = 5.0, max_variants: int = 64):
+        self.default_ttl = default_ttl
+        self.max_variants = max_variants
+        self._entries: Dict[str, Dict[bytes, CachedResponse]] = {}
+        self._locks: Dict[Tuple[str, bytes], threading.Lock] = {}
+        self._generations: Dict[str, int] = {}
+        self._listeners: List[Callable[[Tuple[str, ...]], None]] = []
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'not_modified': 0, 'invalidations': 0}
+
+    def _lookup(self, name: str, variant: bytes) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(name, {}).get(variant)
+            if entry is not None and entry.expires_at > time.monotonic():
+                self.stats['hits'] += 1
+                return entry
+            return None
+
+    def peek(self, name: str, variant: bytes = b'') -> Optional[CachedResponse]:
+        """Fresh cached entry without waiting on a running computation"""
+        return self._lookup(name, variant)
+
+    def get(self, name: str, variant: bytes, compute: Callable, ttl: Optional[float] = None):
+        """Cached entry for one variant, or the uncacheable response ``compute`` returned"""
+        def render():
+            response = make_response(compute())
+            if response.status_code != 200 or not response.is_json:
+                return response
+            return response.get_data(), response.mimetype
+
+        return self._get(name, variant, render, ttl)
+
+    def get_json(self, name: str, compute: Callable, ttl: Optional[float] = None,
+                 variant: bytes = b'') -> CachedResponse:
+        """Cached entry for a view outside Flask; ``compute`` returns a JSON-serializable payload"""
+        return self._get(name, variant,
+                         lambda: (json.dumps(compute(), default=str).encode(), 'application/json'), ttl)
+
+    def _get(self, name: str, variant: bytes, render: Callable, ttl: Optional[float]):
+        entry = self._lookup(name, variant)
+        if entry is not None:
+            return entry
+
+        with self._lock:
+            key_lock = self._locks.setdefault((name, variant), threading.Lock())
+
+        try:
+            with key_lock:
+                return self._compute(name, variant, render, ttl)
+        finally:
+            with self._lock:
+                # Later requests find the stored entry; a lock nobody holds is not kept around
+                if self._locks.get((name, variant)) is key_lock and not key_lock.locked():
+                    del self._locks[(name, variant)]
+
+    def _compute(self, name: str, variant: bytes, render: Callable, ttl: Optional[float]):
+        """Fill one variant (its lock held)"""
+        # Another request may have filled the entry while we waited
+        entry = self._lookup(name, variant)
+        if entry is not None:
+            return entry
+
+        with self._lock:
+            self.stats['misses'] += 1
+            generation = self._generations.setdefault(name, 0)
+
+        rendered = render()
+        if not isinstance(rendered, tuple):
+            return rendered
+
+        body, mimetype = rendered
+        entry = CachedResponse(
+            body=body,
+            mimetype=mimetype,
+            etag=hashlib.blake2b(body, digest_size=16).hexdigest(),
+            expires_at=time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        )
+        with self._lock:
+            if self._generations.get(name, 0) == generation:
+                self._store(name, variant, entry)
+        return entry
+
+    def _store(self, name: str, variant: bytes, entry: CachedResponse):
+        """Add a variant, evicting expired ones and then the soonest to expire (lock held)"""
+        variants = self._entries.setdefault(name, {})
+        variants[variant] = entry
+        if len(variants) > self.max_variants:
+            now = time.monotonic()
+            for key in [key for key, cached in variants.items() if cached.expires_at <= now]:
+                del variants[key]
+            while len(variants) > self.max_variants:
+                del variants[min(variants, key=lambda key: variants[key].expires_at)]
+
+    def cached(self, name: str, ttl: Optional[float] = None, args: Iterable[str] = ()):
+        """Decorator for a Flask view returning JSON; adds ETag / If-None-Match handling
+
+        ``args`` names the query arguments the view reads; any others share its cached entry.
+        """
+        args = tuple(args)
+
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*view_args, **kwargs):
+                entry = self.get(name, query_variant(request.args, args), lambda: view(*view_args, **kwargs), ttl)
+                if not isinstance(entry, CachedResponse):
+                    return entry
+
+                if request.if_none_match.contains(entry.etag):
+                    with self._lock:
+                        self.stats['not_modified'] += 1
+                    response = make_response('', 304)
+                else:
+                    response = make_response(entry.body)
+                    response.mimetype = entry.mimetype
+                response.set_etag(entry.etag)
+                response.headers['Cache-Control'] = 'no-cache'
+                return response
+            return wrapper
+        return decorator
+
+    def invalidate(self, *names: str):
+        """Drop the cached responses of the given endpoints (all endpoints if none given)"""
+        with self._lock:
+            for name in (names or list(self._generations)):
+                self._generations[name] = self._generations.get(name, 0) + 1
+                self._entries.pop(name, None)
+            self.stats['invalidations'] += 1
+
+        for listener in self._listeners:
+            try:
+                listener(names)
+            except Exception as e:
+                logger.error(f"Error notifying response cache listener: {e}")
+
+    def add_listener(self, listener: Callable[[Tuple[str, ...]], None]):
+        """Call ``listener(names)`` after every invalidation (empty ``names`` means all endpoints)"""
+        self._listeners.append(listener)
+
+
+# Global response cache instance
+response_cache = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get or create the global response cache"""
+    global response_cache
+    if response_cache is None:
+        response_cache = ResponseCache()
+    return response_cache
+
+
+def invalidate_responses(*names: str):
+    """Invalidation hook for agents and state machines; a no-op until the dashboard caches anything"""
+    if response_cache is not None:
+        try:
+            response_cache.invalidate(*names)
+        except Exception as e:
+            logger.warning(f"Error invalidating cached responses {names}: {e}")
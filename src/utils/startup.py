@@ -0,0 +1,188 @@
+"""
+Lazy Subsystem Startup
+Subsystems initialize on first use or in a parallel warm-up once the server is listening, with a startup profile
+"""
+import logging
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+STARTING = 'starting'
+READY = 'ready'
+FAILED = 'failed'
+
+
+def _rss_mb() -> float:
+    return psutil.Process().memory_info().rss / (1024 * 1024)
+
+
+@dataclass
+class Subsystem:
+    """One lazily initialized subsystem and how its initialization went"""
+    name: str
+    factory: Callable[[], Any]
+    required: bool = True
+    status: str = PENDING
+    value: Any = None
+    error: Optional[str] = None
+    trigger: Optional[str] = None  # 'first_use' or 'warm_up'
+    seconds: Optional[float] = None
+    memory_mb: Optional[float] = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class LazyStartup:
+    """Registry of subsystems that are built once, when first needed
+
+    ``get(name)`` runs the factory on first use and records its duration and
+    the RSS it added. ``warm_up()`` initializes whatever is still pending on
+    a thread pool, so once the server is listening the expensive parts start
+    in parallel instead of delaying the first response. Memory deltas are
+    approximate while subsystems initialize concurrently.
+    """
+
+    def __init__(self):
+        self.subsystems: Dict[str, Subsystem] = {}
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.warm_up_seconds: Optional[float] = None
+        self._last_mark = psutil.Process().create_time()
+        self._local = threading.local()
+
+    def register(self, name: str, factory: Callable[[], Any], required: bool = True):
+        """Add a subsystem; required ones must have initialized before the app reports ready"""
+        self.subsystems[name] = Subsystem(name, factory, required)
+
+    def get(self, name: str, default: Any = None, wait: bool = True) -> Any:
+        """The subsystem's value, initializing it first if needed (``default`` if it failed)
+
+        With ``wait=False`` a subsystem that is not ready yet returns ``default``
+        right away and initializes in the background.
+        """
+        subsystem = self.subsystems[name]
+        if subsystem.status != READY and not wait:
+            if subsystem.status == PENDING:
+                self.warm_up([name])
+            return default
+        if subsystem.status != READY:
+            with subsystem.lock:
+                if subsystem.status == PENDING:
+                    self._initialize(subsystem)
+        return subsystem.value if subsystem.status == READY else default
+
+    def _initialize(self, subsystem: Subsystem):
+        """Run a factory and record the measurements (subsystem lock held)"""
+        subsystem.status = STARTING
+        subsystem.trigger = 'warm_up' if getattr(self._local, 'warming', False) else 'first_use'
+        rss, started = _rss_mb(), time.perf_counter()
+        try:
+            subsystem.value = subsystem.factory()
+            subsystem.status = READY
+        except Exception as e:
+            subsystem.error = str(e)
+            subsystem.status = FAILED
+            logger.warning(f"Subsystem {subsystem.name} failed to initialize: {e}")
+        subsystem.seconds = round(time.perf_counter() - started, 4)
+        subsystem.memory_mb = round(_rss_mb() - rss, 2)
+        logger.info(f"Subsystem {subsystem.name} {subsystem.status} in {subsystem.seconds:.3f}s "
+                    f"({subsystem.trigger}, {subsystem.memory_mb:+.1f} MB)")
+
+    def mark(self, phase: str):
+        """End an eager startup phase; the first phase is measured from process start"""
+        now = time.time()
+        self.phases[phase] = {'seconds': round(now - self._last_mark, 4), 'rss_mb': round(_rss_mb(), 1)}
+        self._last_mark = now
+
+    def _warm(self, name: str):
+        self._local.warming = True
+        self.get(name)
+
+    def _run_warm_up(self, names: Optional[Iterable[str]], max_workers: int):
+        started = time.perf_counter()
+        pending = [name for name in (names or list(self.subsystems)) if self.subsystems[name].status == PENDING]
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='warm-up') as pool:
+            list(pool.map(self._warm, pending))
+        if names is None:
+            self.warm_up_seconds = round(time.perf_counter() - started, 4)
+            logger.info(self.report())
+
+    def warm_up(self, names: Optional[Iterable[str]] = None, max_workers: int = 4) -> threading.Thread:
+        """Initialize pending subsystems in parallel on a background thread"""
+        thread = threading.Thread(target=self._run_warm_up, args=(names, max_workers),
+                                  name='startup-warm-up', daemon=True)
+        thread.start()
+        return thread
+
+    def warm_up_when_listening(self, port: int, host: str = '127.0.0.1', timeout: float = 60.0,
+                               names: Optional[Iterable[str]] = None, max_workers: int = 4) -> threading.Thread:
+        """Start the warm-up once the server accepts connections on ``port``"""
+        def wait_then_warm_up():
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                try:
+                    with socket.create_connection((host, port), timeout=0.5):
+                        break
+                except OSError:
+                    time.sleep(0.05)
+            self.mark('listening')
+            self._run_warm_up(names, max_workers)
+
+        thread = threading.Thread(target=wait_then_warm_up, name='startup-warm-up', daemon=True)
+        thread.start()
+        return thread
+
+    def readiness(self) -> Dict[str, Any]:
+        """Ready once no required subsystem is still pending or starting; failures are listed"""
+        waiting = [name for name, s in self.subsystems.items() if s.required and s.status in (PENDING, STARTING)]
+        failed = [name for name, s in self.subsystems.items() if s.status == FAILED]
+        return {
+            'ready': not waiting,
+            'status': 'starting' if waiting else 'degraded' if failed else 'ready',
+            'waiting_for': waiting,
+            'failed': failed,
+            'subsystems': {name: s.status for name, s in self.subsystems.items()}
+        }
+
+    def profile(self) -> Dict[str, Any]:
+        """Startup phases and per-subsystem initialization time and memory"""
+        return {
+            'phases': self.phases,
+            'warm_up_seconds': self.warm_up_seconds,
+            'subsystems': {
+                name: {'status': s.status, 'required': s.required, 'trigger': s.trigger,
+                       'seconds': s.seconds, 'memory_mb': s.memory_mb, 'error': s.error}
+                for name, s in self.subsystems.items()
+            }
+        }
+
+    def report(self) -> str:
+        """Startup profile as a log-friendly table"""
+        lines: List[str] = ['Startup profile:']
+        for phase, values in self.phases.items():
+            lines.append(f"  {phase:<22} {values['seconds']:8.3f}s  rss {values['rss_mb']:.1f} MB")
+        for name, s in self.subsystems.items():
+            seconds = f"{s.seconds:8.3f}s" if s.seconds is not None else ' ' * 9
+            memory = f"{s.memory_mb:+.1f} MB" if s.memory_mb is not None else ''
+            lines.append(f"  {name:<22} {seconds}  {memory:<10} {s.status} ({s.trigger or 'not used'})")
+        if self.warm_up_seconds is not None:
+            lines.append(f"  warm-up wall time       {self.warm_up_seconds:8.3f}s")
+        return '\n'.join(lines)
+
+
+# Global startup registry
+startup = None
+
+
+def get_startup() -> LazyStartup:
+    """Get or create the global startup registry"""
+    global startup
+    if startup is None:
+        startup = LazyStartup()
+    return startup
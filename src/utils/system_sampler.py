@@ -0,0 +1,125 @@
+"""
+Background System Sampler
+Collects host metrics on a fixed cadence so dashboards never block on psutil
+"""
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+
+class SystemSampler:
+    """Samples CPU, memory, disk, network and process metrics in a daemon thread
+
+    ``cpu_percent`` is measured over the sampling interval without sleeping,
+    the latest snapshot is an atomic reference swap and the history is a
+    fixed-size ring buffer, so readers never wait for a measurement.
+    """
+
+    def __init__(self, interval: float = 2.0, history_size: int = 100, disk_path: str = '/'):
+        self.interval = interval
+        self.disk_path = disk_path
+        self.history = deque(maxlen=history_size)
+        self._latest: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._boot_time = psutil.boot_time()
+
+        # Prime the CPU counter: the first interval=None call always reports 0.0
+        psutil.cpu_percent(interval=None)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> 'SystemSampler':
+        """Start the sampling thread (no-op if already running)"""
+        with self._lock:
+            if not self.running:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name='system-sampler', daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the sampling thread"""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.sample()
+            except Exception as e:
+                logger.error(f"Error sampling system metrics: {e}")
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def sample(self) -> Dict[str, Any]:
+        """Take one measurement and publish it as the latest snapshot"""
+        cpu_percent = psutil.cpu_percent(interval=None)
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage(self.disk_path)
+        network_stats = psutil.net_io_counters()
+        process_count = len(psutil.pids())
+
+        metrics = {
+            'timestamp': datetime.now().isoformat(),
+            'system': {
+                'cpu_percent': cpu_percent,
+                'memory_percent': memory.percent,
+                'memory_available_gb': memory.available / (1024**3),
+                'memory_total_gb': memory.total / (1024**3),
+                'disk_percent': (disk.used / disk.total) * 100,
+                'disk_free_gb': disk.free / (1024**3),
+                'disk_total_gb': disk.total / (1024**3),
+                'process_count': process_count,
+                'boot_time': self._boot_time
+            },
+            'network': {
+                'bytes_sent': network_stats.bytes_sent,
+                'bytes_recv': network_stats.bytes_recv,
+                'packets_sent': network_stats.packets_sent,
+                'packets_recv': network_stats.packets_recv
+            }
+        }
+
+        self.history.append(metrics)
+        self._latest = metrics
+        return metrics
+
+    def latest(self) -> Dict[str, Any]:
+        """Most recent snapshot; starts the sampler on first use"""
+        if not self.running:
+            self.start()
+        metrics = self._latest
+        if metrics is None:
+            # Before the first background sample lands
+            metrics = self.sample()
+        return metrics
+
+    def get_history(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Snapshots oldest first, optionally only the last ``limit``"""
+        history = list(self.history)
+        return history[-limit:] if limit else history
+
+
+# Global sampler instance
+system_sampler = None
+
+
+def get_system_sampler() -> SystemSampler:
+    """Get or create the global system sampler"""
+    global system_sampler
+    if system_sampler is None:
+        system_sampler = SystemSampler()
+    return system_sampler
@@ -0,0 +1,25 @@
+"""
+Shared test fixtures
+Keeps events written by the code under test out of the repository's data/events/log
+"""
+
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+import pytest
+
+import services.events.event_bus as event_bus_module
+import services.events.event_log as event_log_module
+from services.events.event_log import EventLog
+
+
+@pytest.fixture(autouse=True)
+def isolated_event_log(tmp_path, monkeypatch):
+    """Point the global event log (and the global bus's log sink) at a per-test directory"""
+    events = EventLog(str(tmp_path / 'events'))
+    monkeypatch.setattr(event_log_module, 'event_log', events)
+    monkeypatch.setattr(event_bus_module, 'event_bus', None)  # Recreated with a sink on this log
+    yield events
+    events.close()
@@ -0,0 +1,108 @@
+"""
+Test Suite for the ASGI server mode
+Tests async cached handlers, the Flask fallback, WebSocket push and blocking-call isolation
+"""
+
+import threading
+import time
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from fastapi import Request
+from fastapi.testclient import TestClient
+from flask import Flask, jsonify
+
+from utils.asgi_api import cached_json, create_asgi_app, run_blocking
+from utils.push_hub import PushHub
+from utils.response_cache import ResponseCache
+
+
+class TestAsgiApi:
+    """Test the FastAPI front in front of the Flask dashboard"""
+
+    def setup_method(self):
+        self.flask_app = Flask(__name__)
+        self.cache = ResponseCache()
+        self.hub = PushHub(interval=3600)
+        self.metrics = {'cpu': 10, 'memory': 50}
+        self.calls = 0
+        self.release = threading.Event()
+
+        @self.flask_app.route('/legacy')
+        def legacy():
+            return jsonify({'served_by': 'flask'})
+
+        def metrics():
+            self.calls += 1
+            return dict(self.metrics)
+
+        self.hub.add_topic('metrics', metrics)
+        self.api = create_asgi_app(self.flask_app, self.hub, io_threads=2)
+
+        @self.api.get('/api/metrics')
+        async def api_metrics(request: Request):
+            return await cached_json(request, self.cache, 'metrics', metrics, ttl=60)
+
+        @self.api.get('/api/slow')
+        async def api_slow():
+            return {'released': await run_blocking(self.release.wait, 5)}
+
+        @self.api.get('/api/fast')
+        async def api_fast():
+            return {'ok': True}
+
+    def test_cached_handler_uses_etags(self):
+        """Repeated requests share one computation and revalidate with 304"""
+        with TestClient(self.api) as client:
+            first = client.get('/api/metrics')
+            assert first.json() == {'cpu': 10, 'memory': 50}
+            assert first.headers['cache-control'] == 'no-cache'
+
+            second = client.get('/api/metrics', headers={'If-None-Match': first.headers['etag']})
+            assert second.status_code == 304
+            assert self.calls == 1
+
+            client.get('/api/metrics?detail=1')  # Arguments the handler does not read share the entry
+            assert self.calls == 1
+
+    def test_unported_routes_fall_through_to_flask(self):
+        """Routes without an async handler are served by the Flask app"""
+        with TestClient(self.api) as client:
+            assert client.get('/legacy').json() == {'served_by': 'flask'}
+            assert client.get('/missing').status_code == 404
+            assert client.get('/api/openapi.json').status_code == 200
+
+    def test_websocket_push_snapshot_and_delta(self):
+        """WebSocket clients get the snapshot, then merge-patch deltas on change"""
+        with TestClient(self.api) as client:
+            with client.websocket_connect('/ws/push') as websocket:
+                websocket.send_json({'action': 'subscribe', 'topics': ['metrics', 'bogus']})
+                assert websocket.receive_json() == \
+                    {'event': 'push_snapshot', 'topic': 'metrics', 'seq': 1, 'data': {'cpu': 10, 'memory': 50}}
+                assert websocket.receive_json()['event'] == 'push_error'
+
+                self.metrics['cpu'] = 20
+                self.hub.tick()
+                assert websocket.receive_json() == \
+                    {'event': 'push_delta', 'topic': 'metrics', 'seq': 2, 'patch': {'cpu': 20}}
+            time.sleep(0.1)
+            assert self.hub.topics == {}
+
+    def test_blocking_call_does_not_stall_other_requests(self):
+        """A request waiting on a worker thread leaves the event loop free"""
+        with TestClient(self.api) as client:
+            results = {}
+            slow = threading.Thread(target=lambda: results.update(slow=client.get('/api/slow').json()))
+            slow.start()
+            time.sleep(0.1)
+
+            started = time.monotonic()
+            assert client.get('/api/fast').json() == {'ok': True}
+            assert time.monotonic() - started < 1
+            assert 'slow' not in results
+
+            self.release.set()
+            slow.join(5)
+            assert results['slow'] == {'released': True}
@@ -0,0 +1,86 @@
+"""
+Test Suite for the vectorized bulk history seeder
+Tests determinism, sharding, journal compatibility and lifecycle consistency
+"""
+
+from datetime import datetime
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from services.history.bulk_seeder import BulkHistorySeeder, LIFECYCLE
+from services.history.history_seeder import HistorySeeder
+from services.order.order_store import OrderJournal
+from services.order.state_machine import OrderStateMachine, OrderState
+
+CONFIG_PATH = str(Path(__file__).parent.parent / 'src' / 'sim' / 'config' / 'company_release2.yaml')
+START = datetime(2024, 1, 1)
+END_TIME = datetime(2024, 3, 1).timestamp()
+
+
+def seed_store(store_dir, seed=7, days=70, orders_per_day=(20, 40), workers=1):
+    store = OrderJournal(str(store_dir), legacy_dir=str(store_dir / 'legacy'))
+    bulk_seeder = BulkHistorySeeder(HistorySeeder(CONFIG_PATH), store, seed=seed, days=days,
+                                    orders_per_day=orders_per_day, start_date=START, end_time=END_TIME)
+    return store, bulk_seeder.run(save_report=False, workers=workers)
+
+
+def load_machine(store_dir):
+    state_machine = OrderStateMachine(CONFIG_PATH, store=OrderJournal(str(store_dir), legacy_dir=str(store_dir / 'legacy')))
+    state_machine.sla_engine.on_overdue = None
+    state_machine.load_orders()
+    return state_machine
+
+
+class TestBulkHistorySeeder:
+    """Test bulk seeding into the order store"""
+
+    def test_same_seed_same_history(self, tmp_path):
+        """Identical seeds produce byte-identical journals, other seeds differ"""
+        first, _ = seed_store(tmp_path / 'a')
+        second, _ = seed_store(tmp_path / 'b')
+        other, _ = seed_store(tmp_path / 'c', seed=8)
+
+        journal = Path(first.journal_path).read_bytes()
+        assert journal == Path(second.journal_path).read_bytes()
+        assert journal != Path(other.journal_path).read_bytes()
+
+    def test_worker_count_does_not_change_output(self, tmp_path):
+        """Sharded runs write the same journal and report as a single process"""
+        single, single_stats = seed_store(tmp_path / 'single')
+        sharded, sharded_stats = seed_store(tmp_path / 'sharded', workers=2)
+
+        assert Path(single.journal_path).read_bytes() == Path(sharded.journal_path).read_bytes()
+        assert sharded_stats['workers'] == 2
+        for key in ('total_orders', 'total_value', 'orders_by_state', 'orders_by_customer', 'daily_stats'):
+            assert single_stats[key] == sharded_stats[key]
+
+    def test_report_matches_loaded_orders(self, tmp_path):
+        """The state machine replays the seeded journal into the reported totals"""
+        _, stats = seed_store(tmp_path)
+        state_machine = load_machine(tmp_path)
+        order_stats = state_machine.get_order_statistics()
+
+        assert stats['total_orders'] == order_stats['total_orders'] == sum(d['orders_created'] for d in stats['daily_stats'])
+        assert order_stats['by_state'] == stats['orders_by_state']
+        assert abs(order_stats['total_value'] - stats['total_value']) < 0.01
+        assert len(stats['daily_stats']) == 70
+        assert stats['completed_orders'] == stats['orders_by_state']['CLOSED'] > 0
+
+    def test_lifecycles_are_valid(self, tmp_path):
+        """Histories follow the state rules and stop at end_time"""
+        seed_store(tmp_path)
+        state_machine = load_machine(tmp_path)
+
+        for order in state_machine.orders.values():
+            states = [t.to_state for t in order.history]
+            assert states == LIFECYCLE[:len(states)]
+            assert order.current_state == states[-1]
+            for previous, transition in zip(order.history, order.history[1:]):
+                assert state_machine._is_valid_transition(transition.from_state, transition.to_state)
+                assert previous.timestamp <= transition.timestamp <= END_TIME
+            assert abs(sum(item.total_price for item in order.items) - order.total_amount) < 0.01
+
+        # Orders from the last days have not been closed yet
+        assert any(o.current_state != OrderState.CLOSED for o in state_machine.orders.values())
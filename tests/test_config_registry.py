@@ -0,0 +1,105 @@
+"""
+Test Suite for the configuration registry
+Tests memoization, read-only views and mtime-based reloading
+"""
+
+import os
+import pickle
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from services.config.config_registry import ConfigRegistry, thaw
+
+
+def write_config(path, text, mtime=None):
+    path.write_text(text)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+class TestConfigRegistry:
+    """Test the process-wide config registry"""
+
+    def setup_method(self):
+        self.registry = ConfigRegistry(check_interval=0)
+
+    def test_parses_once(self, tmp_path):
+        """Repeated lookups share one parsed view"""
+        config_file = tmp_path / 'company.yaml'
+        write_config(config_file, "email:\n  domains:\n    info: info@h-bu.de\n")
+
+        first = self.registry.get(str(config_file))
+        second = self.registry.get(str(config_file))
+
+        assert first is second
+        assert first['email']['domains']['info'] == 'info@h-bu.de'
+        assert self.registry.get_statistics()[str(config_file)]['load_count'] == 1
+
+    def test_views_are_read_only(self, tmp_path):
+        """Views reject mutation but stay dict-compatible"""
+        config_file = tmp_path / 'company.yaml'
+        write_config(config_file, "oem_customers: [a, b]\nsmtp:\n  port: 587\n")
+        config = self.registry.get(str(config_file))
+
+        with pytest.raises(TypeError):
+            config['smtp']['port'] = 25
+        with pytest.raises(TypeError):
+            config.update({'x': 1})
+
+        assert isinstance(config, dict)
+        assert config['oem_customers'] == ('a', 'b')
+        assert pickle.loads(pickle.dumps(config)) == config
+
+        editable = thaw(config)
+        editable['smtp']['port'] = 25
+        assert config['smtp']['port'] == 587
+
+    def test_reload_on_mtime_change_notifies_subscribers(self, tmp_path):
+        """A changed file is re-parsed and subscribers get the new view"""
+        config_file = tmp_path / 'company.yaml'
+        write_config(config_file, "mode: simulation\n", mtime=1_000_000)
+        assert self.registry.get(str(config_file))['mode'] == 'simulation'
+
+        seen = []
+        self.registry.subscribe(str(config_file), lambda config: seen.append(config['mode']))
+
+        assert not self.registry.reload_if_changed(str(config_file))
+        write_config(config_file, "mode: production\n", mtime=1_000_100)
+
+        assert self.registry.get(str(config_file))['mode'] == 'production'
+        assert seen == ['production']
+
+    def test_invalid_yaml_keeps_last_good_config(self, tmp_path):
+        """A broken edit does not replace the working configuration"""
+        config_file = tmp_path / 'company.yaml'
+        write_config(config_file, "mode: production\n", mtime=1_000_000)
+        self.registry.get(str(config_file))
+
+        write_config(config_file, "mode: [unclosed\n", mtime=1_000_100)
+        assert self.registry.get(str(config_file))['mode'] == 'production'
+
+    def test_missing_file_raises(self, tmp_path):
+        """Unknown files behave like a failed open()"""
+        with pytest.raises(FileNotFoundError):
+            self.registry.get(str(tmp_path / 'missing.yaml'))
+
+    def test_bound_method_subscribers_are_weak(self, tmp_path):
+        """Short-lived services subscribing themselves can be collected"""
+        config_file = tmp_path / 'company.yaml'
+        write_config(config_file, "mode: simulation\n", mtime=1_000_000)
+        self.registry.get(str(config_file))
+
+        class Service:
+            def on_reload(self, config):
+                pass
+
+        service = Service()
+        self.registry.subscribe(str(config_file), service.on_reload)
+        del service
+
+        write_config(config_file, "mode: production\n", mtime=1_000_100)
+        self.registry.reload_if_changed()
+        assert self.registry.get_statistics()[str(config_file)]['subscribers'] == 0
@@ -0,0 +1,306 @@
+"""
+Test Suite for the pooled webshop database
+Tests connection pooling, transactions, checkout, the catalog cache and KPI aggregates
+"""
+
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from models.database import Database, ProductCatalog, ProductModel, OrderModel, KPIModel, CheckoutError
+
+
+def run_in_thread(target):
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(value=target()))
+    thread.start()
+    thread.join()
+    return result['value']
+
+
+class TestDatabase:
+    """Test the connection manager behind the models"""
+
+    def setup_method(self):
+        self.db_dir = tempfile.mkdtemp(prefix='webshop_db_')
+        self.db = Database(f"{self.db_dir}/shop.db")
+        self.products = ProductModel(self.db)
+        self.orders = OrderModel(self.db)
+
+    def teardown_method(self):
+        self.db.close_all()
+
+    def test_connections_pooled_per_thread(self):
+        """Each thread reuses one configured connection; finished threads hand theirs on"""
+        conn = self.db.get_connection()
+        assert self.db.get_connection() is conn
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+        worker_conn = run_in_thread(self.db.get_connection)
+        assert worker_conn is not conn
+        assert run_in_thread(self.db.get_connection) is worker_conn
+
+    def test_reads_not_blocked_by_open_write(self):
+        """Readers see the last committed snapshot while a checkout transaction is open"""
+        product = self.products.get_all_products()[0]
+
+        with self.db.transaction():
+            assert self.products.update_stock(product['id'], 10)
+            seen = run_in_thread(lambda: self.products.get_product_by_id(product['id']))
+            assert seen['stock_quantity'] == product['stock_quantity']
+
+        after = self.products.get_product_by_id(product['id'])
+        assert after['stock_quantity'] == product['stock_quantity'] - 10
+
+    def test_transaction_rolls_back_on_error(self):
+        """A failing order insert leaves neither the order nor earlier items behind"""
+        order_data = {'customer_name': 'Rollback', 'customer_email': 'r@example.com',
+                      'shipping_address': 'Street 1', 'total_amount': 5.0}
+        items = [{'product_id': 1, 'quantity': 2, 'unit_price': 2.5, 'total_price': 5.0},
+                 {'product_id': 1, 'quantity': None, 'unit_price': 2.5, 'total_price': 5.0}]
+
+        with pytest.raises(sqlite3.IntegrityError):
+            self.orders.create_order(order_data, items)
+        assert self.db.execute("SELECT COUNT(*) FROM orders").fetchone()[0] == 0
+        assert self.db.execute("SELECT COUNT(*) FROM order_items").fetchone()[0] == 0
+
+        order_id = self.orders.create_order(order_data, items[:1])
+        order = self.orders.get_order_by_id(order_id)
+        assert [item['quantity'] for item in order['items']] == [2]
+
+
+class TestCheckout:
+    """Test the single-transaction checkout"""
+
+    def setup_method(self):
+        self.db_dir = tempfile.mkdtemp(prefix='webshop_checkout_')
+        self.db = Database(f"{self.db_dir}/shop.db")
+        self.products = ProductModel(self.db)
+        self.orders = OrderModel(self.db)
+        self.order_data = {'customer_name': 'Checkout', 'customer_email': 'c@example.com',
+                           'shipping_address': 'Street 1'}
+
+    def teardown_method(self):
+        self.db.close_all()
+
+    def stock(self, product_id):
+        return self.products.get_product_by_id(product_id)['stock_quantity']
+
+    def test_checkout_prices_cart_and_reserves_stock(self):
+        """Totals come from catalog prices and every line decrements stock"""
+        before = {p: self.stock(p) for p in (1, 2)}
+        result = self.orders.checkout(self.order_data, [
+            {'product_id': 1, 'quantity': 3}, {'product_id': '2', 'quantity': 2}, {'product_id': 1, 'quantity': 1}])
+
+        prices = {p: self.products.get_product_by_id(p)['price'] for p in (1, 2)}
+        assert result['total_amount'] == pytest.approx(4 * prices[1] + 2 * prices[2])
+        assert self.stock(1) == before[1] - 4 and self.stock(2) == before[2] - 2
+        order = self.orders.get_order_by_id(result['order_id'])
+        assert [item['quantity'] for item in order['items']] == [3, 2, 1]
+
+    def test_shortfall_rolls_back_everything(self):
+        """A short line or unknown product leaves no order and no stock change"""
+        before = self.stock(1)
+        with pytest.raises(CheckoutError, match='Insufficient stock') as error:
+            self.orders.checkout(self.order_data, [
+                {'product_id': 1, 'quantity': 1}, {'product_id': 2, 'quantity': self.stock(2) + 1}])
+        assert error.value.status_code == 400
+
+        with pytest.raises(CheckoutError) as error:
+            self.orders.checkout(self.order_data, [{'product_id': 1, 'quantity': 1}, {'product_id': 999, 'quantity': 1}])
+        assert error.value.status_code == 404
+
+        assert self.stock(1) == before
+        assert self.db.execute("SELECT COUNT(*) FROM orders").fetchone()[0] == 0
+
+    def test_concurrent_checkouts_never_oversell(self):
+        """Threads racing for the last units sell exactly the available stock"""
+        self.db.execute("UPDATE products SET stock_quantity = 25 WHERE id = 1")
+        outcomes = []
+
+        def buyer():
+            for _ in range(10):
+                try:
+                    self.orders.checkout(self.order_data, [{'product_id': 1, 'quantity': 1}])
+                    outcomes.append(True)
+                except CheckoutError:
+                    outcomes.append(False)
+
+        threads = [threading.Thread(target=buyer) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        sold = self.db.execute("SELECT SUM(quantity) FROM order_items WHERE product_id = 1").fetchone()[0]
+        assert outcomes.count(True) == sold == 25
+        assert self.stock(1) == 0
+
+
+class TestProductCatalog:
+    """Test the in-memory catalog behind the shop pages"""
+
+    def setup_method(self):
+        self.db_dir = tempfile.mkdtemp(prefix='webshop_catalog_')
+        self.db = Database(f"{self.db_dir}/shop.db")
+        self.catalog = ProductCatalog(self.db)
+        self.products = ProductModel(self.db, self.catalog)
+        self.orders = OrderModel(self.db, self.catalog)
+        self.order_data = {'customer_name': 'Catalog', 'customer_email': 'c@example.com',
+                           'shipping_address': 'Street 1'}
+
+    def teardown_method(self):
+        self.db.close_all()
+
+    def test_reads_served_from_memory(self, monkeypatch):
+        """After preload the catalog answers without querying and hands out copies"""
+        expected = ProductModel(self.db).get_all_products()
+        self.catalog.preload()
+        monkeypatch.setattr(self.db, 'query', None)
+
+        assert self.products.get_all_products() == expected
+        grouped = self.catalog.get_products_grouped()
+        assert list(grouped) == sorted(grouped)
+        assert sum(len(products) for products in grouped.values()) == len(expected)
+        assert self.products.get_products_by_category('OEM') == grouped['OEM']
+
+        product = self.products.get_product_by_id(expected[0]['id'])
+        product['specs'] = {}
+        assert 'specs' not in self.products.get_product_by_id(expected[0]['id'])
+        assert self.products.get_product_by_id(999) is None
+
+    def test_stock_writes_go_through(self):
+        """Committed checkouts and stock updates change cache and ETag, failed ones do neither"""
+        etag = self.catalog.etag()
+        stock = self.products.get_product_by_id(1)['stock_quantity']
+
+        self.orders.checkout(self.order_data, [{'product_id': 1, 'quantity': 3}])
+        assert self.products.get_product_by_id(1)['stock_quantity'] == stock - 3
+        assert self.catalog.etag() != etag
+
+        etag = self.catalog.etag()
+        with pytest.raises(CheckoutError):
+            self.orders.checkout(self.order_data, [{'product_id': 1, 'quantity': stock}])
+        assert not self.products.update_stock(1, stock)
+        assert self.catalog.etag() == etag
+
+        assert self.products.update_stock(1, 2)
+        assert self.products.get_product_by_id(1)['stock_quantity'] == stock - 5
+        assert ProductModel(self.db).get_product_by_id(1)['stock_quantity'] == stock - 5
+
+    def test_preload_picks_up_external_writes(self):
+        """Changes made outside the models appear after preload with a new ETag"""
+        etag = self.catalog.etag()
+        self.db.execute("UPDATE products SET price = 99.0 WHERE id = 1")
+        assert self.catalog.get_product_by_id(1)['price'] != 99.0
+
+        self.catalog.preload()
+        assert self.catalog.get_product_by_id(1)['price'] == 99.0
+        assert self.catalog.etag() != etag
+
+
+def scan_performance_summary(db):
+    """The former full-scan summary queries, as reference"""
+    summary = db.query_one('''
+        SELECT COUNT(*) as total_metrics,
+               AVG(CASE WHEN value >= target THEN 1.0 ELSE 0.0 END) * 100 as metrics_on_target,
+               AVG((value / target) * 100) as avg_performance,
+               COUNT(DISTINCT department) as departments_tracked,
+               COUNT(DISTINCT category) as categories_tracked
+        FROM kpis WHERE target > 0
+    ''')
+    summary['top_departments'] = db.query('''
+        SELECT department, AVG((value / target) * 100) as avg_performance, COUNT(*) as metric_count
+        FROM kpis WHERE target > 0 GROUP BY department ORDER BY avg_performance DESC LIMIT 5
+    ''')
+    return summary
+
+
+class TestKPIAggregates:
+    """Test the trigger-maintained KPI aggregates"""
+
+    def setup_method(self):
+        self.db_dir = tempfile.mkdtemp(prefix='webshop_kpis_')
+        self.db = Database(f"{self.db_dir}/shop.db")
+        self.kpis = KPIModel(self.db)
+
+    def teardown_method(self):
+        self.db.close_all()
+
+    def assert_matches_scan(self):
+        summary = self.kpis.get_performance_summary()
+        reference = scan_performance_summary(self.db)
+        for key in ('total_metrics', 'departments_tracked', 'categories_tracked'):
+            assert summary[key] == reference[key]
+        for key in ('metrics_on_target', 'avg_performance'):
+            assert summary[key] == pytest.approx(reference[key])
+        assert [d['department'] for d in summary['top_departments']] == \
+               [d['department'] for d in reference['top_departments']]
+        for ours, theirs in zip(summary['top_departments'], reference['top_departments']):
+            assert ours['avg_performance'] == pytest.approx(theirs['avg_performance'])
+            assert ours['metric_count'] == theirs['metric_count']
+
+    def test_aggregates_follow_inserts_updates_and_deletes(self):
+        """Summary from the aggregates equals the full scan after every kind of write"""
+        self.assert_matches_scan()
+
+        kpi_id = self.kpis.add_kpi('Return Rate', 4.0, 5.0, 'Logistics', 'Quality')
+        self.kpis.add_kpi('Unassigned Metric', 10.0, 8.0)
+        self.assert_matches_scan()
+
+        assert self.kpis.update_kpi_value(kpi_id, 7.5)
+        self.db.execute("UPDATE kpis SET department = 'Finance' WHERE id = ?", (kpi_id,))
+        self.assert_matches_scan()
+
+        self.db.execute("DELETE FROM kpis WHERE department = 'HR'")
+        self.assert_matches_scan()
+        assert self.db.query_one("SELECT * FROM kpi_department_stats WHERE department = 'HR'") is None
+
+    def test_recommendations_from_aggregates(self):
+        """Recommendations react to metric changes"""
+        def email_issue():
+            return [r['issue'] for r in self.kpis.get_business_optimization_recommendations()
+                    if r['area'] == 'Email Processing']
+
+        below = self.db.execute("""SELECT COUNT(*) FROM kpis WHERE value < target
+                                   AND department IN ('Info Center', 'Email Processing')""").fetchone()[0]
+        assert email_issue() == [f'{below} email metrics below target']
+
+        kpi_id = self.kpis.add_kpi('Spam Filter Accuracy', 80.0, 95.0, 'Info Center', 'Accuracy')
+        assert email_issue() == [f'{below + 1} email metrics below target']
+
+        self.kpis.update_kpi_value(kpi_id, 96.0)
+        assert email_issue() == [f'{below} email metrics below target']
+
+        self.db.execute("UPDATE kpis SET value = target WHERE department IN ('Info Center', 'Email Processing')")
+        assert email_issue() == []
+
+    def test_dashboard_reads_use_indexes(self):
+        """Worst metrics and department lookups do not scan the kpis table"""
+        def plan(sql):
+            return ' '.join(row[3] for row in self.db.execute(f"EXPLAIN QUERY PLAN {sql}"))
+
+        assert 'idx_kpis_below_target' in plan(
+            "SELECT * FROM kpis WHERE value < target ORDER BY (value / target) ASC LIMIT 5")
+        assert 'idx_kpis_department' in plan(
+            "SELECT * FROM kpis WHERE department = 'IT' AND metric_name LIKE '%Adoption%' AND value < target")
+
+    def test_existing_database_is_backfilled(self):
+        """Aggregates are rebuilt for databases created before they existed"""
+        conn = self.db.get_connection()
+        for table in ('kpi_department_stats', 'kpi_category_stats'):
+            for suffix in ('insert', 'update', 'delete'):
+                conn.execute(f"DROP TRIGGER trg_{table}_{suffix}")
+            conn.execute(f"DROP TABLE {table}")
+        self.db.close_all()
+
+        self.db = Database(f"{self.db_dir}/shop.db")
+        self.kpis = KPIModel(self.db)
+        self.assert_matches_scan()
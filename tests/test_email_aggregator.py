@@ -0,0 +1,138 @@
+"""
+Test Suite for the in-process email aggregation service
+Tests parallel fan-out, per-source deadlines, TTL caching and merge order
+"""
+
+import threading
+import time
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from services.email.email_aggregator import EmailAggregator
+
+
+def make_source(name, minutes, delay=0.0, calls=None):
+    """Source returning one email per minute value, unsorted, after ``delay`` seconds"""
+    def fetch(count):
+        if calls is not None:
+            calls.append(count)
+        time.sleep(delay)
+        return [{'id': f'{name}_{m}', 'source': name, 'timestamp': f'2025-01-01 10:{m:02d}:00'}
+                for m in minutes][:count]
+    return fetch
+
+
+class TestEmailAggregator:
+    """Test the aggregator behind /api/emails/combined and the landing page"""
+
+    def setup_method(self):
+        self.aggregator = EmailAggregator()
+
+    def test_sources_merged_newest_first(self):
+        """Per-source shares are merged into one timestamp-ordered list"""
+        self.aggregator.add_source('a', make_source('a', [5, 40, 20, 30]))
+        self.aggregator.add_source('b', make_source('b', [10, 50, 45]))
+        self.aggregator.add_source('c', make_source('c', [59, 1]), share=6)
+
+        emails = self.aggregator.get_emails(limit=9)
+        assert [e['id'] for e in emails] == ['c_59', 'b_50', 'b_45', 'a_40', 'a_20', 'b_10', 'a_5']
+        assert self.aggregator.get_emails(limit=9, sources=['b'])[0]['id'] == 'b_50'
+
+    def test_fan_out_is_parallel_and_cached(self):
+        """Slow sources are fetched concurrently once, then served from cache until the TTL"""
+        calls = []
+        for name in ('a', 'b', 'c'):
+            self.aggregator.add_source(name, make_source(name, [1, 2, 3], delay=0.3, calls=calls), ttl=60)
+
+        start = time.perf_counter()
+        assert len(self.aggregator.get_emails(limit=9)) == 9
+        assert time.perf_counter() - start < 0.6
+
+        start = time.perf_counter()
+        self.aggregator.get_emails(limit=9)
+        self.aggregator.get_emails(limit=6)
+        assert time.perf_counter() - start < 0.05
+        assert calls == [3, 3, 3]
+
+        # Larger requests and invalidation refetch
+        self.aggregator.get_emails(limit=12)
+        self.aggregator.invalidate('a')
+        self.aggregator.get_emails(limit=12)
+        assert calls == [3, 3, 3, 4, 4, 4, 4]
+
+    def test_deadline_serves_stale_cache(self):
+        """A slow source is skipped at its deadline and its refresh lands for later requests"""
+        gate = threading.Event()
+        fetched = []
+
+        def slow(count):
+            fetched.append(count)
+            if len(fetched) > 1:
+                gate.wait(2)
+            return [{'id': f'slow_{len(fetched)}', 'timestamp': '2025-01-01 10:00:00'}]
+
+        self.aggregator.add_source('fast', make_source('fast', [1]), ttl=0)
+        self.aggregator.add_source('slow', slow, ttl=0, deadline=0.1)
+        assert {e['id'] for e in self.aggregator.get_emails(limit=3)} == {'fast_1', 'slow_1'}
+
+        start = time.perf_counter()
+        ids = {e['id'] for e in self.aggregator.get_emails(limit=3)}
+        assert time.perf_counter() - start < 0.5
+        assert ids == {'fast_1', 'slow_1'}
+
+        # Only one refresh is in flight per source
+        self.aggregator.get_emails(limit=3)
+        assert len(fetched) == 2
+
+        gate.set()
+        time.sleep(0.1)
+        self.aggregator.sources['slow'].ttl = 60
+        assert 'slow_2' in {e['id'] for e in self.aggregator.get_emails(limit=3)}
+
+    def test_failing_source_keeps_last_result(self):
+        """Errors are logged and the source falls back to its cached emails"""
+        state = {'fail': False}
+
+        def flaky(count):
+            if state['fail']:
+                raise ConnectionError("mailbox offline")
+            return [{'id': 'mail_1', 'timestamp': '2025-01-01 09:00:00'}]
+
+        self.aggregator.add_source('mail', flaky, ttl=0)
+        assert [e['id'] for e in self.aggregator.get_emails(limit=3)] == ['mail_1']
+        state['fail'] = True
+        assert [e['id'] for e in self.aggregator.get_emails(limit=3)] == ['mail_1']
+
+    def test_source_emails_by_name(self):
+        """Each source returns its own newest emails without shares or merging"""
+        self.aggregator.add_source('a', make_source('a', [5, 40, 20, 30]))
+        self.aggregator.add_source('b', make_source('b', [10, 50, 45]), share=6)
+
+        per_source = self.aggregator.get_source_emails(count=3)
+        assert [e['id'] for e in per_source['a']] == ['a_40', 'a_20', 'a_5']
+        assert [e['id'] for e in per_source['b']] == ['b_50', 'b_45', 'b_10']
+        assert list(self.aggregator.get_source_emails(count=3, sources=['b'])) == ['b']
+
+    def test_larger_request_does_not_join_a_smaller_refresh(self):
+        """A request for more emails than the running refresh fetches starts its own"""
+        started, gate, calls = threading.Event(), threading.Event(), []
+
+        def slow(count):
+            calls.append(count)
+            if len(calls) == 1:
+                started.set()
+                gate.wait(2)
+            return [{'id': f'slow_{n}', 'timestamp': f'2025-01-01 10:00:{n:02d}'} for n in range(count)]
+
+        self.aggregator.add_source('slow', slow, ttl=60, deadline=2)
+        small = threading.Thread(target=self.aggregator.get_emails, kwargs={'limit': 30})
+        small.start()
+        assert started.wait(2)
+
+        assert len(self.aggregator.get_source_emails(count=100)['slow']) == 100
+        gate.set()
+        small.join()
+        assert calls == [10, 100]
+        assert self.aggregator.sources['slow'].count == 100
@@ -0,0 +1,131 @@
+"""
+Test Suite for the indexed email store
+Tests keyset pagination, cursors, filtering and incremental feeds
+"""
+
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from services.email.email_index import (
+    EmailFeed, EmailIndex, InvalidCursor, MAX_PAGE_SIZE, decode_cursor, encode_cursor, parse_page_args
+)
+
+
+def make_email(n, **fields):
+    return {'id': f'email_{n}', 'timestamp': f'2025-01-01 10:{n % 60:02d}:{n // 60:02d}',
+            'routed_to': 'orders@h-bu.de' if n % 2 else 'quality@h-bu.de',
+            'priority': 'high' if n % 3 == 0 else 'medium', **fields}
+
+
+def walk(index, limit, filters=None):
+    """All pages in order"""
+    pages, cursor = [], None
+    while True:
+        emails, cursor = index.page(limit, cursor, filters)
+        pages.append([e['id'] for e in emails])
+        if cursor is None:
+            return pages
+
+
+class TestEmailIndex:
+    """Test the store behind the paginated email APIs"""
+
+    def setup_method(self):
+        self.index = EmailIndex()
+        self.index.add_many(make_email(n) for n in range(120))
+
+    def test_pages_cover_everything_newest_first(self):
+        """Cursor pages are disjoint, ordered and complete"""
+        pages = walk(self.index, 25)
+        assert [len(p) for p in pages] == [25, 25, 25, 25, 20]
+        ids = [i for page in pages for i in page]
+        assert len(set(ids)) == 120
+        assert ids[0] == 'email_119'  # 10:59:01 is the latest timestamp
+
+        expected = sorted((make_email(n) for n in range(120)),
+                          key=lambda e: (e['timestamp'], e['id']), reverse=True)
+        assert ids == [e['id'] for e in expected]
+
+    def test_cursor_survives_inserts(self):
+        """New emails do not shift or repeat entries on later pages"""
+        first, cursor = self.index.page(10)
+        self.index.add(make_email(500, timestamp='2025-01-02 00:00:00'))
+        second, _ = self.index.page(10, cursor)
+        assert not {e['id'] for e in first} & {e['id'] for e in second}
+        assert second[0]['timestamp'] < first[-1]['timestamp']
+
+    def test_filters(self):
+        """Single and combined filters page through matching emails only"""
+        orders = [i for page in walk(self.index, 7, {'mailbox': 'orders'}) for i in page]
+        assert len(orders) == 60 == self.index.count({'mailbox': 'ORDERS'})
+        assert all(int(i.split('_')[1]) % 2 for i in orders)
+
+        both = [i for page in walk(self.index, 4, {'mailbox': 'orders', 'priority': 'high'}) for i in page]
+        assert len(both) == 20 == self.index.count({'mailbox': 'orders', 'priority': 'high'})
+        assert self.index.page(5, filters={'source': 'nowhere'}) == ([], None)
+        with pytest.raises(ValueError):
+            self.index.page(5, filters={'colour': 'blue'})
+
+    def test_replace_discard_and_bounded_size(self):
+        """Updates by id replace, discard removes, and max_size evicts the oldest"""
+        self.index.add(make_email(1, priority='critical'))
+        assert len(self.index) == 120
+        assert self.index.count({'priority': 'critical'}) == 1
+        self.index.discard('email_1')
+        assert self.index.count({'mailbox': 'orders'}) == 59
+
+        bounded = EmailIndex(max_size=5)
+        bounded.add_many(make_email(n) for n in range(10))
+        assert [e['id'] for e in bounded.page(10)[0]] == ['email_9', 'email_8', 'email_7', 'email_6', 'email_5']
+
+    def test_cursor_and_page_args(self):
+        """Cursors round-trip, garbage is rejected, page sizes are bounded"""
+        assert decode_cursor(encode_cursor(('2025-01-01 10:00', 'email_1'))) == ('2025-01-01 10:00', 'email_1')
+        with pytest.raises(InvalidCursor):
+            self.index.page(5, 'not-a-cursor')
+
+        args = parse_page_args({'limit': '5000', 'cursor': 'abc', 'priority': 'high', 'colour': 'x'})
+        assert args == {'limit': MAX_PAGE_SIZE, 'cursor': 'abc', 'filters': {'priority': 'high'}}
+        assert parse_page_args({'limit': 'lots'}, default_limit=10)['limit'] == 10
+
+    def test_feed_refreshes_incrementally_per_ttl(self):
+        """The refresh callback runs once per TTL and can add only new emails"""
+        source, calls = [], []
+
+        def sync(index):
+            calls.append(len(source))
+            index.add_many(source[len(index):])
+
+        feed = EmailFeed(sync, ttl=60)
+        source.extend(make_email(n) for n in range(3))
+        assert [e['id'] for e in feed.page(2)['emails']] == ['email_2', 'email_1']
+
+        source.append(make_email(3))
+        page = feed.page(2)
+        assert page['has_more'] and len(feed.index) == 3
+        feed.invalidate()
+        assert feed.page(2)['emails'][0]['id'] == 'email_3'
+        assert calls == [3, 4]
+
+    def test_feed_keeps_emails_beyond_the_source_window(self):
+        """Re-syncing a source's latest few emails grows the index and keeps cursors anchored"""
+        newest = {'n': 5}
+
+        def sync(index):
+            index.add_many(make_email(n) for n in range(newest['n'] - 5, newest['n']))
+
+        feed = EmailFeed(sync, ttl=0)
+        first = feed.page(2)
+        for _ in range(4):
+            newest['n'] += 3
+            feed.sync()
+
+        assert len(feed.index) == 17
+        assert [e['id'] for e in feed.page(2, first['next_cursor'])['emails']] == ['email_2', 'email_1']
+        emails_before = dict(feed.index._emails)
+        feed.sync()  # An unchanged window re-adds nothing
+        assert all(feed.index._emails[key] is email for key, email in emails_before.items())
@@ -0,0 +1,212 @@
+"""
+Test Suite for the multi-process dashboard's engine IPC
+Tests remote calls and errors, event relay, request forwarding and the worker-side push hub
+"""
+
+import os
+import tempfile
+import threading
+import time
+from multiprocessing.connection import Client
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+import pytest
+from flask import Flask, jsonify, render_template_string, request
+
+from utils.engine_ipc import (EngineClient, EngineServer, EngineUnavailable, EventRelay, RemoteError,
+                              forward_request, socketio_transports, wsgi_handler)
+from utils.push_hub import PushHub, RemotePushHub
+from utils.response_cache import ResponseCache
+
+
+class Recorder:
+    """Stand-in Socket.IO server recording emits"""
+
+    def __init__(self):
+        self.emitted = []
+
+    def emit(self, event, data=None, to=None, namespace=None):
+        self.emitted.append((event, data, to))
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+
+    def add(self, amount=1):
+        self.value += amount
+        return self.value
+
+    def _secret(self):
+        return 'hidden'
+
+
+class TestEngineIpc:
+    """Test the Unix-socket channel between the engine and the web workers"""
+
+    def setup_method(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.address = os.path.join(self.directory.name, 'engine.sock')
+        self.server = EngineServer(self.address, authkey=b'secret')
+        self.counter = Counter()
+        self.server.expose('counter', self.counter)
+        self.server.start()
+        self.client = EngineClient(self.address, authkey=b'secret', timeout=5)
+
+    def teardown_method(self):
+        self.client.close()
+        self.server.close()
+        self.directory.cleanup()
+
+    def test_calls_share_engine_state(self):
+        """Calls from any client act on the one object in the engine"""
+        other = EngineClient(self.address, authkey=b'secret')
+        assert self.client.wait_until_ready(timeout=5) == os.getpid()
+        assert self.client.call('counter.add', 2) == 2
+        assert other.proxy('counter').add(amount=3) == 5
+        assert self.counter.value == 5
+        other.close()
+
+    def test_errors(self):
+        """Remote exceptions, private attributes and a missing engine are reported distinctly"""
+        with pytest.raises(RemoteError, match='TypeError'):
+            self.client.call('counter.add', 'x')
+        with pytest.raises(RemoteError, match='not public'):
+            self.client.call('counter._secret')
+        with pytest.raises(RemoteError, match='LookupError'):
+            self.client.call('missing.add')
+        assert self.client.call('counter.add') == 1  # The connection survives errors
+
+        with pytest.raises(EngineUnavailable):
+            EngineClient(self.address, authkey=b'wrong').call('ping')
+        with pytest.raises(EngineUnavailable):
+            EngineClient(os.path.join(self.directory.name, 'none.sock')).call('ping')
+        with pytest.raises(OSError, match='already listening'):
+            EngineServer(self.address).start()  # A live engine's socket is never replaced
+
+    def test_reconnects_after_engine_restart(self):
+        """A pooled connection to a restarted engine is replaced transparently"""
+        assert self.client.call('counter.add') == 1
+        self.server.close()
+        time.sleep(0.1)
+        self.server = EngineServer(self.address, authkey=b'secret')
+        self.server.expose('counter', Counter())
+        self.server.start()
+        assert self.client.call('counter.add') == 1
+
+    def test_event_relay(self):
+        """Engine emits reach every listening worker until it disconnects"""
+        received, connected = [], threading.Event()
+        self.client.listen('socketio', received.append, on_connect=connected.set)
+        assert connected.wait(5)
+
+        EventRelay(self.server).emit('push_delta', {'seq': 2}, to='metrics')
+        deadline = time.monotonic() + 5
+        while not received and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert received == [('push_delta', {'seq': 2}, 'metrics', None)]
+
+    def test_stuck_subscriber_does_not_block_publishing(self):
+        """A worker that stops reading is disconnected while the others keep receiving"""
+        self.server.outbox_size = 4
+        stuck = Client(self.address, family='AF_UNIX', authkey=b'secret')
+        stuck.send(('subscribe', 'responses'))
+        assert stuck.recv() == ('ok', None)
+        received, connected = [], threading.Event()
+        self.client.listen('responses', received.append, on_connect=connected.set)
+        assert connected.wait(5)
+
+        deadline = time.monotonic() + 5
+        for n in range(50):
+            self.server.publish('responses', [str(n), 'x' * 100_000])
+            while len(received) <= n and time.monotonic() < deadline:
+                time.sleep(0.01)
+        assert [message[0] for message in received] == [str(n) for n in range(50)]
+        assert len(self.server._subscribers['responses']) == 1
+        stuck.close()
+
+    def test_request_forwarding(self):
+        """A worker request runs in the engine's Flask app and its response comes back whole"""
+        engine_app, worker_app = Flask('engine'), Flask('worker')
+
+        @engine_app.route('/api/echo', methods=['POST'])
+        def echo():
+            response = jsonify({'args': request.args.to_dict(), 'json': request.get_json()})
+            response.headers['X-Engine'] = str(os.getpid())
+            return response, 201
+
+        @worker_app.route('/<path:path>', methods=['GET', 'POST'])
+        def forward(path):
+            return forward_request(self.client, request)
+
+        self.server.expose('http', wsgi_handler(engine_app))
+        response = worker_app.test_client().post('/api/echo?limit=5', json={'to': 'orders'})
+        assert response.status_code == 201
+        assert response.get_json() == {'args': {'limit': '5'}, 'json': {'to': 'orders'}}
+        assert response.headers['X-Engine'] == str(os.getpid())
+
+        self.server.close()
+        assert worker_app.test_client().get('/api/echo').status_code == 503
+
+    def test_remote_push_hub(self):
+        """Workers subscribe through the engine's hub and get its deltas as room broadcasts"""
+        metrics = {'cpu': 10}
+        hub = PushHub(EventRelay(self.server), interval=3600)
+        hub.add_topic('metrics', lambda: dict(metrics))
+        self.server.expose('push', hub)
+
+        worker = RemotePushHub(Recorder(), self.client.proxy('push'), client_prefix='worker-1')
+        assert worker.subscribe('abc', 'metrics') == {'topic': 'metrics', 'seq': 1, 'data': {'cpu': 10}}
+        assert hub.subscribers('metrics') == {'worker-1:abc'}
+        assert worker.subscribers('metrics') == {'abc'}
+
+        received = []
+        connected = threading.Event()
+        self.client.listen('socketio', received.append, on_connect=connected.set)
+        assert connected.wait(5)
+        metrics['cpu'] = 20
+        hub.tick()
+        deadline = time.monotonic() + 5
+        while not received and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert received == [('push_delta', {'topic': 'metrics', 'seq': 2, 'patch': {'cpu': 20}}, 'metrics', None)]
+
+        RemotePushHub(Recorder(), self.client.proxy('push'), client_prefix='worker-1').reset()
+        assert hub.topics == {}
+
+    def test_response_invalidations_reach_workers(self):
+        """A worker's cached copy of an endpoint is dropped when the engine invalidates it"""
+        engine_cache, worker_cache = ResponseCache(), ResponseCache()
+        engine_cache.add_listener(lambda names: self.server.publish('responses', list(names)))
+        connected = threading.Event()
+        self.client.listen('responses', lambda names: worker_cache.invalidate(*names), on_connect=connected.set)
+        assert connected.wait(5)
+
+        worker_cache.get_json('kpi_summary', lambda: {'score': 85}, ttl=60)
+        worker_cache.get_json('swarm', lambda: {'agents': 3}, ttl=60)
+        engine_cache.invalidate('kpi_summary')
+        deadline = time.monotonic() + 5
+        while worker_cache.peek('kpi_summary') is not None and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert worker_cache.peek('kpi_summary') is None
+        assert worker_cache.peek('swarm') is not None
+
+    def test_forwarded_pages_use_websocket_only(self):
+        """A page the engine renders for a worker never offers long-polling"""
+        engine_app, worker_app = Flask('engine'), Flask('worker')
+        engine_app.context_processor(lambda: {'socketio_transports': socketio_transports('engine')})
+
+        @engine_app.route('/agents')
+        def agents():
+            return render_template_string('io({ transports: {{ socketio_transports|tojson }} })')
+
+        @worker_app.route('/<path:path>')
+        def forward(path):
+            return forward_request(self.client, request)
+
+        self.server.expose('http', wsgi_handler(engine_app))
+        assert worker_app.test_client().get('/agents').data == b'io({ transports: ["websocket"] })'
+        assert socketio_transports('standalone') == ['polling', 'websocket']
@@ -0,0 +1,167 @@
+"""
+Test Suite for the in-process event bus
+Tests topic routing, backpressure policies and agent delivery
+"""
+
+import pytest
+import asyncio
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from services.events.event_bus import EventBus, DeliveryPolicy, EventLogSink
+from services.events.event_log import EventLog
+from agents.business.base_agent_v2 import AgentEvent
+
+
+def make_event(event_type, source='InfoAgent', target=None, n=0):
+    return AgentEvent(id=f"{source}_{n}", type=event_type, source_agent=source,
+                      target_agent=target, data={'n': n})
+
+
+class RecordingAgent:
+    """Minimal agent exposing the handle_event contract"""
+
+    def __init__(self, agent_id, handled_types):
+        self.agent_id = agent_id
+        self.event_handlers = {t: None for t in handled_types}
+        self.received = []
+        self.event_bus = None
+
+    async def handle_event(self, event):
+        self.received.append(event)
+
+
+class TestEventBus:
+    """Test event bus delivery semantics"""
+
+    def setup_method(self):
+        self.bus = EventBus()
+
+    @pytest.mark.asyncio
+    async def test_topic_pattern_delivery(self):
+        """Glob topics only receive matching event types"""
+        received = []
+
+        async def handler(event):
+            received.append(event.type)
+
+        self.bus.subscribe('order_*', handler)
+        await self.bus.publish(make_event('order_created'))
+        await self.bus.publish(make_event('email_processed'))
+        await self.bus.publish(make_event('order_confirmed'))
+        await self.bus.drain()
+
+        assert received == ['order_created', 'order_confirmed']
+
+    @pytest.mark.asyncio
+    async def test_drop_newest_policy(self):
+        """A full DROP_NEWEST queue discards incoming events"""
+        gate = asyncio.Event()
+        received = []
+
+        async def slow_handler(event):
+            await gate.wait()
+            received.append(event.data['n'])
+
+        sub_id = self.bus.subscribe('*', slow_handler, max_queue=2,
+                                    policy=DeliveryPolicy.DROP_NEWEST)
+        for n in range(5):
+            await self.bus.publish(make_event('tick', n=n))
+
+        gate.set()
+        await self.bus.drain()
+
+        stats = self.bus.get_statistics()['subscriptions'][sub_id]
+        assert received == [0, 1]
+        assert stats['dropped'] == 3
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_policy(self):
+        """A full DROP_OLDEST queue keeps the most recent events"""
+        gate = asyncio.Event()
+        received = []
+
+        async def slow_handler(event):
+            await gate.wait()
+            received.append(event.data['n'])
+
+        self.bus.subscribe('*', slow_handler, max_queue=2,
+                           policy=DeliveryPolicy.DROP_OLDEST)
+        for n in range(5):
+            await self.bus.publish(make_event('tick', n=n))
+
+        gate.set()
+        await self.bus.drain()
+
+        assert received == [3, 4]
+
+    @pytest.mark.asyncio
+    async def test_block_policy_delivers_everything(self):
+        """BLOCK subscribers never lose events"""
+        received = []
+
+        async def handler(event):
+            await asyncio.sleep(0)
+            received.append(event.data['n'])
+
+        self.bus.subscribe('*', handler, max_queue=1, policy=DeliveryPolicy.BLOCK)
+        for n in range(10):
+            await self.bus.publish(make_event('tick', n=n))
+        await self.bus.drain()
+
+        assert received == list(range(10))
+
+    @pytest.mark.asyncio
+    async def test_registered_agent_delivery(self):
+        """Agents get handled types, skip own events and foreign targets"""
+        sales = RecordingAgent('SalesAgent', ['order_created'])
+        self.bus.register_agent(sales)
+
+        await self.bus.publish(make_event('order_created', source='InfoAgent', n=1))
+        await self.bus.publish(make_event('email_processed', source='InfoAgent', n=2))
+        await self.bus.publish(make_event('order_created', source='SalesAgent', n=3))
+        await self.bus.publish(make_event('order_created', target='FinanceAgent', n=4))
+        await self.bus.drain()
+
+        assert [e.data['n'] for e in sales.received] == [1]
+        assert sales.event_bus is self.bus
+
+        assert self.bus.unregister_agent('SalesAgent')
+        await self.bus.publish(make_event('order_created', n=5))
+        await self.bus.drain()
+        assert len(sales.received) == 1
+
+    @pytest.mark.asyncio
+    async def test_handler_errors_are_isolated(self):
+        """A failing handler does not stop delivery"""
+        received = []
+
+        async def failing(event):
+            raise RuntimeError("boom")
+
+        async def handler(event):
+            received.append(event.type)
+
+        failing_id = self.bus.subscribe('*', failing)
+        self.bus.subscribe('*', handler)
+        await self.bus.publish(make_event('order_created'))
+        await self.bus.drain()
+
+        assert received == ['order_created']
+        assert self.bus.get_statistics()['subscriptions'][failing_id]['failed'] == 1
+
+    @pytest.mark.asyncio
+    async def test_event_log_sink(self, tmp_path):
+        """The event log sink appends every published event"""
+        event_log = EventLog(log_dir=str(tmp_path / 'log'))
+        self.bus.add_sink(EventLogSink(event_log), policy=DeliveryPolicy.BLOCK)
+
+        for n in range(3):
+            await self.bus.publish(make_event('order_created', n=n))
+        await self.bus.drain()
+
+        records = event_log.read(0)
+        assert [r['event']['id'] for r in records] == ['InfoAgent_0', 'InfoAgent_1', 'InfoAgent_2']
+        event_log.close()
@@ -0,0 +1,114 @@
+"""
+Test Suite for the background service health prober
+Tests concurrent probing, cached reads, backoff and the state history
+"""
+
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from utils.health_prober import HealthProber
+
+
+class SlowHealthHandler(BaseHTTPRequestHandler):
+    """Answers /health after the server's configured delay"""
+
+    def do_GET(self):
+        time.sleep(self.server.delay)
+        self.send_response(self.server.status_code)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server(delay=0.0, status_code=200):
+    server = ThreadingHTTPServer(('localhost', 0), SlowHealthHandler)
+    server.delay, server.status_code = delay, status_code
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('localhost', 0))
+        return sock.getsockname()[1]
+
+
+class TestHealthProber:
+    """Test the prober behind SystemMonitor.get_service_status"""
+
+    def setup_method(self):
+        self.servers = []
+
+    def teardown_method(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+
+    def server(self, **kwargs):
+        server = start_server(**kwargs)
+        self.servers.append(server)
+        return server.server_address[1]
+
+    def test_targets_probed_concurrently(self):
+        """Slow targets cost the slowest probe, not the sum; statuses map like before"""
+        prober = HealthProber({
+            'slow_a': {'name': 'Slow A', 'port': self.server(delay=0.3)},
+            'slow_b': {'name': 'Slow B', 'port': self.server(delay=0.3)},
+            'broken': {'name': 'Broken', 'port': self.server(status_code=500)},
+            'down': {'name': 'Down', 'port': free_port()}
+        }, timeout=1.0)
+
+        start = time.perf_counter()
+        status = prober.probe_all()
+        assert time.perf_counter() - start < 0.55
+
+        assert [status[k]['status'] for k in ('slow_a', 'slow_b', 'broken', 'down')] == \
+               ['running', 'running', 'error', 'stopped']
+        assert status['down']['health'] == 'offline'
+        assert status['slow_a']['latency_ms'] >= 300
+        prober.stop(timeout=1)
+
+    def test_reads_are_cached_while_probes_hang(self):
+        """get_status answers immediately even when a probe is stuck on its timeout"""
+        prober = HealthProber({'hung': {'name': 'Hung', 'port': self.server(delay=1.0)}}, timeout=2.0)
+        start = time.perf_counter()
+        status = prober.get_status()
+        time.sleep(0.1)
+        assert prober.get_status()['hung']['status'] == 'checking'
+        assert time.perf_counter() - start < 0.5
+        assert status['hung']['health'] == 'unknown'
+        prober.stop(timeout=3)
+
+    def test_dead_targets_back_off(self):
+        """Failures double the probe interval up to the cap; recovery is recorded"""
+        port = free_port()
+        prober = HealthProber({'svc': {'name': 'Service', 'port': port}},
+                              interval=1.0, max_backoff=3.0, timeout=0.5)
+        target = prober.targets['svc']
+
+        delays = []
+        for _ in range(4):
+            target.next_probe_at = 0
+            assert prober.probe_due() == ['svc']
+            delays.append(round(target.next_probe_at - time.monotonic()))
+        assert delays == [1, 2, 3, 3]
+        assert prober.probe_due() == []
+        assert target.consecutive_failures == 4
+
+        server = start_server()
+        self.servers.append(server)
+        target.url = f"http://localhost:{server.server_address[1]}/health"
+        target.next_probe_at = 0
+        prober.probe_due()
+
+        assert target.consecutive_failures == 0
+        assert [(h['status'], h['health']) for h in prober.get_history('svc')] == \
+               [('stopped', 'offline'), ('running', 'healthy')]
+        prober.stop(timeout=1)
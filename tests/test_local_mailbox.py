@@ -0,0 +1,120 @@
+"""
+Test Suite for the indexed local agent mailbox
+Tests unread fetching, atomic claiming and legacy file import
+"""
+
+import json
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from agents.agent_email_dispatcher import AgentTask, TaskTypes
+from agents.local_email_simulator import LocalEmailSimulator
+
+
+def make_task(n, to_agent='quality_agent', priority='medium', due_at=None):
+    return AgentTask(
+        task_id=f"coord_{n}",
+        from_agent='orders_agent',
+        to_agent=to_agent,
+        task_type=TaskTypes.QUALITY_INVESTIGATION,
+        priority=priority,
+        subject=f"Task {n}",
+        content=f"Investigate batch {n}",
+        data={'batch': n},
+        created_at=datetime.now(),
+        due_at=due_at
+    )
+
+
+class TestLocalMailbox:
+    """Test the SQLite-backed simulator mailboxes"""
+
+    def setup_method(self):
+        self.tmp_dir = Path(tempfile.mkdtemp(prefix='hb_mailbox_'))
+        self.simulator = LocalEmailSimulator(str(self.tmp_dir))
+
+    def test_newest_unread_tasks(self):
+        """get_agent_tasks returns the newest unread tasks for the agent only"""
+        for n in range(5):
+            assert self.simulator.send_task_email(make_task(n))
+        self.simulator.send_task_email(make_task(99, to_agent='finance_agent'))
+
+        tasks = self.simulator.get_agent_tasks('quality_agent', limit=3)
+        assert [t.task_id for t in tasks] == ['coord_4', 'coord_3', 'coord_2']
+        assert tasks[0].data == {'batch': 4}
+
+        assert self.simulator.mark_task_read(tasks[0])
+        tasks = self.simulator.get_agent_tasks('quality_agent', limit=3)
+        assert [t.task_id for t in tasks] == ['coord_3', 'coord_2', 'coord_1']
+
+    def test_claims_are_exclusive(self):
+        """Parallel workers never claim the same task twice"""
+        for n in range(50):
+            self.simulator.send_task_email(make_task(n))
+
+        claimed = []
+        lock = threading.Lock()
+
+        def worker(worker_id):
+            while True:
+                tasks = self.simulator.claim_agent_tasks('quality_agent', worker_id, limit=3)
+                if not tasks:
+                    return
+                with lock:
+                    claimed.extend(t.task_id for t in tasks)
+
+        threads = [threading.Thread(target=worker, args=(f"w{i}",)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(claimed) == sorted(f"coord_{n}" for n in range(50))
+        assert self.simulator.get_agent_tasks('quality_agent') == []
+
+    def test_stats_and_summary(self):
+        """Statistics and summaries come from the index"""
+        self.simulator.send_task_email(make_task(1, priority='high'))
+        self.simulator.send_task_email(make_task(2, due_at=datetime.now() - timedelta(hours=1)))
+
+        stats = self.simulator.get_agent_task_stats('quality_agent')
+        assert stats['total_tasks'] == 2
+        assert stats['pending_tasks'] == 2
+        assert stats['high_priority_tasks'] == 1
+        assert stats['overdue_tasks'] == 1
+        assert stats['simulation_mode']
+
+        summary = self.simulator.get_mailbox_summary()
+        assert summary['support']['email_count'] == 2
+        assert summary['support']['latest_emails'][0]['task_id'] == 'coord_2'
+
+        assert self.simulator.clear_all_mailboxes() == 2
+        assert self.simulator.get_mailbox_summary()['support']['email_count'] == 0
+
+    def test_legacy_files_imported_once(self):
+        """task_*.json files from the old layout are imported on startup"""
+        legacy = {
+            'task_id': 'coord_legacy', 'from_agent': 'orders_agent', 'to_agent': 'finance_agent',
+            'subject': '[AGENT-TASK] Approve', 'task_type': TaskTypes.APPROVAL_REQUEST,
+            'priority': 'high', 'content': 'Approve order', 'data': {},
+            'created_at': datetime.now().isoformat(), 'due_at': None, 'status': 'pending',
+            'simulated_send_time': datetime.now().isoformat(), 'mailbox': 'finance'
+        }
+        legacy_dir = Path(tempfile.mkdtemp(prefix='hb_legacy_'))
+        (legacy_dir / 'finance_mailbox').mkdir()
+        with open(legacy_dir / 'finance_mailbox' / 'task_coord_legacy_1.json', 'w') as f:
+            json.dump(legacy, f)
+
+        simulator = LocalEmailSimulator(str(legacy_dir))
+        tasks = simulator.get_agent_tasks('finance_agent')
+        assert [t.task_id for t in tasks] == ['coord_legacy']
+
+        # Already imported: a second start does not duplicate or re-import
+        simulator.mark_task_read(tasks[0])
+        simulator = LocalEmailSimulator(str(legacy_dir))
+        assert simulator.get_agent_tasks('finance_agent') == []
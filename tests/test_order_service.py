@@ -0,0 +1,93 @@
+"""
+Test Suite for the shared order service
+Tests store-change detection, ETag validators and cached statistics
+"""
+
+import tempfile
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from services.order.order_service import OrderService
+from services.order.order_store import OrderJournal
+from services.order.sla_engine import VirtualClock
+from services.order.state_machine import OrderStateMachine, OrderState, OrderItem
+
+CONFIG_PATH = str(Path(__file__).parent.parent / 'src' / 'sim' / 'config' / 'company_release2.yaml')
+
+
+def make_items():
+    return [OrderItem("BTN-001", "Premium Red Button", 100, 2.50, 250.00)]
+
+
+class TestOrderService:
+    """Test the long-lived order service used by the dashboard"""
+
+    def setup_method(self):
+        self.store_dir = tempfile.mkdtemp(prefix='order_service_')
+        self.clock = VirtualClock(start=1_700_000_000)
+        self.service = OrderService(state_machine=self.new_machine(), check_interval=0)
+        self.service.state_machine.sla_engine.on_overdue = None
+
+    def new_machine(self):
+        store = OrderJournal(self.store_dir, legacy_dir=f"{self.store_dir}/legacy")
+        return OrderStateMachine(CONFIG_PATH, store=store, clock=self.clock)
+
+    def test_refresh_only_rereads_changed_store(self):
+        """Unchanged store files are not replayed; another writer's orders appear after refresh"""
+        assert self.service.refresh()
+        assert not self.service.refresh()
+
+        writer = self.new_machine()
+        order = writer.create_order("w@example.com", "Writer", make_items())
+        assert self.service.refresh()
+        assert self.service.get_order(order.id).customer_name == "Writer"
+        assert not self.service.refresh()
+
+    def test_etag_tracks_changes(self):
+        """The validator changes on creates, transitions and new SLA breaches only"""
+        self.service.refresh()
+        initial = self.service.etag()
+        assert self.service.etag() == initial
+
+        order = self.service.create_order("e@example.com", "ETag", make_items())
+        created = self.service.etag()
+        assert created != initial
+        assert self.service.order_etag(order) == f"order-{order.id}-1"
+
+        self.service.state_machine.transition_order(order.id, OrderState.CONFIRMED, "SalesAgent", "ok")
+        confirmed = self.service.etag()
+        assert confirmed != created
+
+        self.clock.advance(30 * 86400)
+        assert self.service.etag() != confirmed
+
+    def test_statistics_cached_until_change(self):
+        """Statistics and recent orders are rebuilt only when the data changed"""
+        orders = [self.service.create_order(f"s{n}@example.com", f"Stats {n}", make_items())
+                  for n in range(12)]
+
+        stats = self.service.get_statistics()
+        assert stats is self.service.get_statistics()
+        assert stats['total_orders'] == 12
+        assert stats['by_state']['CREATED'] == 12
+        assert [o['id'] for o in stats['recent_orders']] == [o.id for o in orders[-10:]]
+        assert len(self.service.get_statistics(recent_limit=3)['recent_orders']) == 3
+
+        self.service.state_machine.transition_order(orders[0].id, OrderState.CONFIRMED, "SalesAgent", "ok")
+        assert self.service.get_statistics()['by_state']['CONFIRMED'] == 1
+
+    def test_other_process_transitions_on_own_orders(self):
+        """Orders created through the service show transitions made by another machine"""
+        order = self.service.create_order("t@example.com", "Transitioned", make_items())
+        before = self.service.etag()
+
+        agent_machine = self.new_machine()
+        agent_machine.load_orders()
+        assert agent_machine.transition_order(order.id, OrderState.CONFIRMED, "SalesAgent", "ok")
+
+        assert self.service.refresh()
+        assert self.service.get_order(order.id).current_state == OrderState.CONFIRMED
+        assert self.service.etag() != before
+        assert self.service.get_statistics()['by_state']['CONFIRMED'] == 1
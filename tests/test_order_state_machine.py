@@ -0,0 +1,221 @@
+"""
+Test Suite for OrderStateMachine queries
+Tests the incremental state/priority indexes, bulk transitions and the SLA deadline engine
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+import services.events.event_log as event_log_module
+from services.events.event_log import EventLog
+from services.order.order_store import OrderJournal
+from services.order.sla_engine import VirtualClock
+from services.order.state_machine import OrderStateMachine, OrderState, OrderItem
+
+CONFIG_PATH = str(Path(__file__).parent.parent / 'src' / 'sim' / 'config' / 'company_release2.yaml')
+
+LIFECYCLE = [OrderState.CONFIRMED, OrderState.PLANNED, OrderState.IN_PRODUCTION, OrderState.PRODUCED,
+             OrderState.PACKED, OrderState.SHIPPED, OrderState.DELIVERED, OrderState.INVOICED,
+             OrderState.CLOSED]
+
+
+def make_items(price=250.00):
+    return [OrderItem("BTN-001", "Premium Red Button", 100, price / 100, price)]
+
+
+def scan_by_state(state_machine):
+    return {state.value: len([o for o in state_machine.orders.values() if o.current_state == state])
+            for state in OrderState}
+
+
+class TestOrderIndexes:
+    """Test that indexes always agree with a full scan"""
+
+    def setup_method(self):
+        self.store_dir = tempfile.mkdtemp(prefix='order_idx_')
+        self.state_machine = self.new_machine()
+
+    def new_machine(self):
+        store = OrderJournal(self.store_dir, legacy_dir=f"{self.store_dir}/legacy")
+        return OrderStateMachine(CONFIG_PATH, store=store)
+
+    def advance(self, order, steps):
+        for to_state in LIFECYCLE[:steps]:
+            assert self.state_machine.transition_order(order.id, to_state, "Agent", "step")
+
+    def test_statistics_match_full_scan(self):
+        """Counts, totals and processing time follow creates and transitions"""
+        orders = [self.state_machine.create_order(f"c{n}@example.com", f"Customer {n}",
+                                                  make_items(100.0 * (n + 1)), priority=n % 4 + 1)
+                  for n in range(8)]
+        for n, order in enumerate(orders):
+            self.advance(order, n + 2 if n >= 6 else n)
+
+        stats = self.state_machine.get_order_statistics()
+        assert stats['by_state'] == scan_by_state(self.state_machine)
+        assert stats['by_priority'] == {1: 2, 2: 2, 3: 2, 4: 2}
+        assert stats['total_orders'] == 8
+        assert abs(stats['total_value'] - sum(100.0 * (n + 1) for n in range(8))) < 1e-6
+        assert stats['by_state']['CLOSED'] == 1
+        assert stats['avg_processing_time'] >= 0
+
+        closed = self.state_machine.get_orders_by_state(OrderState.CLOSED)
+        assert [o.id for o in closed] == [orders[7].id]
+
+    def test_replayed_records_update_indexes(self):
+        """Orders loaded from another writer's journal are indexed"""
+        writer = self.new_machine()
+        order = writer.create_order("w@example.com", "Writer", make_items(), priority=2)
+        writer.transition_order(order.id, OrderState.CONFIRMED, "SalesAgent", "ok")
+
+        self.state_machine.load_orders()
+        stats = self.state_machine.get_order_statistics()
+        assert stats['by_state']['CONFIRMED'] == 1
+        assert stats['by_state']['CREATED'] == 0
+        assert stats['by_priority'][2] == 1
+
+    def test_clear_orders_resets_indexes(self):
+        """clear_orders leaves empty statistics"""
+        self.state_machine.create_order("x@example.com", "X", make_items())
+        self.state_machine.clear_orders()
+
+        stats = self.state_machine.get_order_statistics()
+        assert stats['total_orders'] == 0
+        assert sum(stats['by_state'].values()) == 0
+        assert stats['total_value'] == 0
+
+
+class TestBulkTransitions:
+    """Test transition_many validation and batched persistence"""
+
+    def setup_method(self):
+        self.store_dir = tempfile.mkdtemp(prefix='order_bulk_')
+        store = OrderJournal(self.store_dir, legacy_dir=f"{self.store_dir}/legacy")
+        self.state_machine = OrderStateMachine(CONFIG_PATH, store=store)
+        self.orders = [self.state_machine.create_order(f"b{n}@example.com", f"Bulk {n}", make_items())
+                       for n in range(3)]
+
+        # Count journal writes
+        self.journal_writes = []
+        append_many = store.append_many
+        store.append_many = lambda records: (self.journal_writes.append(len(records)), append_many(records))[1]
+
+    def test_batch_is_one_journal_and_event_write(self, monkeypatch):
+        """A multi-order, multi-step batch persists and emits with one write each"""
+        events = EventLog(log_dir=f"{self.store_dir}/events")
+        monkeypatch.setattr(event_log_module, 'event_log', events)
+
+        batch = [(order.id, to_state, "Agent", "bulk", {'n': n})
+                 for n, order in enumerate(self.orders) for to_state in LIFECYCLE[:n + 1]]
+        applied = self.state_machine.transition_many(batch)
+
+        assert len(applied) == 6
+        assert self.journal_writes == [6]
+        assert [o.current_state for o in self.orders] == LIFECYCLE[:3]
+        assert self.state_machine.get_order_statistics()['by_state']['PLANNED'] == 1
+        assert [r['event']['to_state'] for r in events.read(0, 10)] == [t.to_state.value for t in applied]
+
+        reloaded = OrderStateMachine(CONFIG_PATH, store=OrderJournal(self.store_dir, legacy_dir=f"{self.store_dir}/legacy"))
+        reloaded.load_orders()
+        assert reloaded.get_order(self.orders[2].id).current_state == OrderState.IN_PRODUCTION
+        events.close()
+
+    def test_invalid_entry_rejects_whole_batch(self):
+        """Nothing is applied or written when any entry is invalid"""
+        batch = [(self.orders[0].id, OrderState.CONFIRMED, "Agent", "ok", None),
+                 (self.orders[1].id, OrderState.SHIPPED, "Agent", "skip ahead", None)]
+
+        assert self.state_machine.transition_many(batch) == []
+        assert self.state_machine.transition_many([("ORD_MISSING", OrderState.CONFIRMED, "Agent", "x")]) == []
+        assert all(o.current_state == OrderState.CREATED for o in self.orders)
+        assert self.journal_writes == []
+        assert self.state_machine.get_order_statistics()['by_state']['CREATED'] == 3
+
+
+class TestSLAEngine:
+    """Test deadline-based overdue detection on a virtual clock"""
+
+    def setup_method(self):
+        self.store_dir = tempfile.mkdtemp(prefix='order_sla_')
+        self.clock = VirtualClock(start=1_700_000_000)
+        store = OrderJournal(self.store_dir, legacy_dir=f"{self.store_dir}/legacy")
+        self.state_machine = OrderStateMachine(CONFIG_PATH, store=store, clock=self.clock)
+        self.breaches = []
+        self.state_machine.sla_engine.on_overdue = lambda order_id, deadline: self.breaches.append(order_id)
+
+    def test_breach_fires_when_virtual_time_passes_deadline(self):
+        """An order becomes overdue exactly when its state SLA runs out"""
+        order = self.state_machine.create_order("s@example.com", "SLA", make_items())
+        created_sla = self.state_machine.state_rules[OrderState.CREATED]['sla_hours'] * 3600
+
+        self.clock.advance(created_sla - 1)
+        assert self.state_machine.get_overdue_orders() == []
+
+        self.clock.advance(2)
+        assert [o.id for o in self.state_machine.get_overdue_orders()] == [order.id]
+        assert self.breaches == [order.id]
+
+        # Polling again does not fire twice
+        self.state_machine.sla_engine.poll()
+        assert self.breaches == [order.id]
+        assert self.state_machine.get_order_statistics()['overdue_count'] == 1
+
+    def test_transition_resets_deadline(self):
+        """Moving to the next state starts that state's SLA"""
+        order = self.state_machine.create_order("t@example.com", "Transit", make_items())
+        created_sla = self.state_machine.state_rules[OrderState.CREATED]['sla_hours'] * 3600
+        self.clock.advance(created_sla + 1)
+        assert self.state_machine.get_overdue_orders()
+
+        self.state_machine.transition_order(order.id, OrderState.CONFIRMED, "SalesAgent", "ok")
+        assert self.state_machine.get_overdue_orders() == []
+
+        confirmed_sla = self.state_machine.state_rules[OrderState.CONFIRMED]['sla_hours'] * 3600
+        assert self.state_machine.sla_engine.deadline(order.id) == self.clock() + confirmed_sla
+
+    def test_matches_full_recomputation(self):
+        """The heap agrees with recomputing time-in-state for every order"""
+        for n in range(20):
+            order = self.state_machine.create_order(f"m{n}@example.com", f"M{n}", make_items())
+            for to_state in LIFECYCLE[:n % 10]:
+                self.state_machine.transition_order(order.id, to_state, "Agent", "step")
+            self.clock.advance(1800)
+        self.clock.advance(12 * 3600)
+
+        expected = set()
+        for order in self.state_machine.orders.values():
+            if order.current_state == OrderState.CLOSED:
+                continue
+            state_sla = self.state_machine.state_rules[order.current_state]['sla_hours']
+            if self.clock() - order.history[-1].timestamp > state_sla * 3600:
+                expected.add(order.id)
+
+        assert {o.id for o in self.state_machine.get_overdue_orders()} == expected
+
+    def test_background_poll_fires_without_queries(self):
+        """A started engine announces a breach on its own once the deadline passes"""
+        order = self.state_machine.create_order("b@example.com", "Background", make_items())
+        self.state_machine.sla_engine.start(poll_interval=0.01)
+        try:
+            self.clock.advance(30 * 86400)
+            deadline = time.monotonic() + 5
+            while not self.breaches and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            self.state_machine.sla_engine.stop()
+        assert self.breaches == [order.id]
+
+    def test_loaded_overdue_orders_do_not_fire(self):
+        """Orders already overdue when loaded are reported but not announced"""
+        writer_store = OrderJournal(self.store_dir, legacy_dir=f"{self.store_dir}/legacy")
+        writer = OrderStateMachine(CONFIG_PATH, store=writer_store, clock=self.clock)
+        order = writer.create_order("l@example.com", "Loaded", make_items())
+        self.clock.advance(30 * 86400)
+
+        self.state_machine.load_orders()
+        assert [o.id for o in self.state_machine.get_overdue_orders()] == [order.id]
+        assert self.breaches == []
@@ -0,0 +1,148 @@
+"""
+Test Suite for the journaled order store
+Tests journal replay, snapshots, incremental loading and the legacy import
+"""
+
+import json
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from services.order.order_store import OrderJournal
+from services.order.state_machine import OrderStateMachine, OrderState, OrderItem
+
+CONFIG_PATH = str(Path(__file__).parent.parent / 'src' / 'sim' / 'config' / 'company_release2.yaml')
+
+
+def make_items():
+    return [OrderItem("BTN-001", "Premium Red Button", 100, 2.50, 250.00)]
+
+
+def new_machine(store_dir, legacy_dir=None):
+    store = OrderJournal(str(store_dir), legacy_dir=str(legacy_dir or store_dir / 'legacy'))
+    return OrderStateMachine(CONFIG_PATH, store=store)
+
+
+class TestOrderJournal:
+    """Test order persistence through the journal"""
+
+    def test_transition_is_single_append(self, tmp_path):
+        """A transition appends one record instead of rewriting the order"""
+        machine = new_machine(tmp_path)
+        order = machine.create_order("a@example.com", "Customer A", make_items())
+        records, position = machine.store.read_journal(0)
+
+        assert machine.transition_order(order.id, OrderState.CONFIRMED, "SalesAgent", "ok")
+        new_records, _ = machine.store.read_journal(position)
+
+        assert [r['op'] for r in records] == ['create']
+        assert len(new_records) == 1
+        assert new_records[0]['transition']['to_state'] == 'CONFIRMED'
+
+    def test_restart_replays_journal(self, tmp_path):
+        """A new state machine rebuilds orders from the journal"""
+        machine = new_machine(tmp_path)
+        order = machine.create_order("a@example.com", "Customer A", make_items(), priority=2)
+        machine.transition_order(order.id, OrderState.CONFIRMED, "SalesAgent", "ok")
+
+        restarted = new_machine(tmp_path)
+        restarted.load_orders()
+
+        loaded = restarted.get_order(order.id)
+        assert loaded.current_state == OrderState.CONFIRMED
+        assert [t.to_state for t in loaded.history] == [OrderState.CREATED, OrderState.CONFIRMED]
+        assert loaded.items == order.items
+
+    def test_incremental_load_sees_other_writers(self, tmp_path):
+        """load_orders only replays records appended since the last call"""
+        reader = new_machine(tmp_path)
+        reader.load_orders()
+        writer = new_machine(tmp_path)
+
+        order = writer.create_order("b@example.com", "Customer B", make_items())
+        reader.load_orders()
+        assert reader.get_order(order.id).current_state == OrderState.CREATED
+
+        writer.transition_order(order.id, OrderState.CONFIRMED, "SalesAgent", "ok")
+        reader.load_orders()
+        assert reader.get_order(order.id).current_state == OrderState.CONFIRMED
+        assert len(reader.get_order(order.id).history) == 2
+
+    def test_compaction_snapshot_and_empty_journal(self, tmp_path):
+        """Compaction folds the journal into a snapshot readers pick up"""
+        writer = new_machine(tmp_path)
+        writer.snapshot_every = 5
+        reader = new_machine(tmp_path)
+        reader.load_orders()
+
+        orders = [writer.create_order(f"c{n}@example.com", f"Customer {n}", make_items())
+                  for n in range(3)]
+        for order in orders:
+            writer.transition_order(order.id, OrderState.CONFIRMED, "SalesAgent", "ok")
+
+        assert writer.store.generation() == 1
+        records, _ = writer.store.read_journal(0, generation=1)
+        assert len(records) == 1  # the append after the snapshot
+
+        reader.load_orders()
+        assert all(reader.get_order(o.id).current_state == OrderState.CONFIRMED for o in orders)
+        assert all(len(reader.get_order(o.id).history) == 2 for o in orders)
+
+    def test_stale_journal_is_ignored(self, tmp_path):
+        """A journal from before an interrupted compaction is not replayed twice"""
+        machine = new_machine(tmp_path)
+        order = machine.create_order("d@example.com", "Customer D", make_items())
+        machine.transition_order(order.id, OrderState.CONFIRMED, "SalesAgent", "ok")
+        stale_journal = Path(machine.store.journal_path).read_text()
+
+        machine.compact()
+        Path(machine.store.journal_path).write_text(stale_journal)
+
+        restarted = new_machine(tmp_path)
+        restarted.load_orders()
+        assert len(restarted.get_order(order.id).history) == 2
+
+    def test_legacy_import_runs_once(self, tmp_path):
+        """Former data/orders/*.json files are imported on first load"""
+        source = new_machine(tmp_path / 'source')
+        order = source.create_order("e@example.com", "Customer E", make_items())
+        legacy_dir = tmp_path / 'orders'
+        legacy_dir.mkdir()
+        with open(legacy_dir / f"{order.id}.json", 'w') as f:
+            json.dump(order.to_dict(), f, indent=2)
+
+        machine = new_machine(tmp_path / 'store', legacy_dir)
+        machine.load_orders()
+        assert machine.get_order(order.id).customer_name == "Customer E"
+        assert not machine.store.needs_import()
+        assert machine.import_legacy_orders() == 0
+
+    def test_two_writers_share_transitions(self, tmp_path):
+        """An order one machine created picks up another machine's transitions, also through compaction"""
+        a = new_machine(tmp_path)
+        b = new_machine(tmp_path)
+        order = a.create_order("f@example.com", "Customer F", make_items())
+
+        b.load_orders()
+        assert b.transition_order(order.id, OrderState.CONFIRMED, "SalesAgent", "ok")
+
+        a.load_orders()
+        assert a.get_order(order.id).current_state == OrderState.CONFIRMED
+        a.compact()
+
+        fresh = new_machine(tmp_path)
+        fresh.load_orders()
+        assert fresh.get_order(order.id).current_state == OrderState.CONFIRMED
+        assert [t.to_state for t in fresh.get_order(order.id).history] == [OrderState.CREATED, OrderState.CONFIRMED]
+
+    def test_replay_skips_disallowed_transitions(self, tmp_path):
+        """A journaled transition that does not continue from the order's state is not applied"""
+        writer = new_machine(tmp_path)
+        order = writer.create_order("g@example.com", "Customer G", make_items())
+        writer.store.append_many([{'op': 'transition', 'order_id': order.id, 'writer': 'other', 'transition': {
+            'from_state': 'CREATED', 'to_state': 'SHIPPED', 'timestamp': 0, 'agent': 'x', 'reason': 'bogus'}}])
+
+        reader = new_machine(tmp_path)
+        reader.load_orders()
+        assert reader.get_order(order.id).current_state == OrderState.CREATED
@@ -0,0 +1,106 @@
+"""
+Test Suite for the Socket.IO push hub
+Tests merge-patch deltas, sequence numbers, topic scoping and resync
+"""
+
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from flask import Flask, request
+from flask_socketio import SocketIO
+
+from utils.push_hub import PushHub, apply_merge_patch, merge_patch, _UNCHANGED
+
+
+class TestMergePatch:
+    """Test the delta encoding"""
+
+    def test_only_changed_fields_are_sent(self):
+        """Patches carry changed fields only and reproduce the new snapshot"""
+        old = {'system': {'cpu': 10, 'memory': 50}, 'disk': [1, 2], 'gone': 1}
+        new = {'system': {'cpu': 12, 'memory': 50}, 'disk': [1, 2, 3], 'added': {'a': 1}}
+        patch = merge_patch(old, new)
+        assert patch == {'system': {'cpu': 12}, 'disk': [1, 2, 3], 'added': {'a': 1}, 'gone': None}
+        assert apply_merge_patch(old, patch) == new
+        assert merge_patch(new, dict(new)) is _UNCHANGED
+
+
+class TestPushHub:
+    """Test the hub behind the dashboard's live updates"""
+
+    def setup_method(self):
+        self.app = Flask(__name__)
+        self.socketio = SocketIO(self.app)
+        self.hub = PushHub(self.socketio)
+        self.metrics = {'cpu': 10, 'memory': 50}
+        self.calls = {'metrics': 0, 'mailbox': []}
+
+        def metrics():
+            self.calls['metrics'] += 1
+            return dict(self.metrics)
+
+        def mailbox(name):
+            self.calls['mailbox'].append(name)
+            return {'address': f'{name}@h-bu.de'}
+
+        self.hub.add_topic('metrics', metrics)
+        self.hub.add_topic('mailbox:', mailbox)
+        self.hub.register_handlers()
+
+        @self.socketio.on('disconnect')
+        def handle_disconnect():
+            self.hub.remove_client(request.sid)
+
+    def client(self):
+        return self.socketio.test_client(self.app)
+
+    def received(self, client, name):
+        return [event['args'][0] for event in client.get_received() if event['name'] == name]
+
+    def test_subscribers_get_snapshot_then_deltas(self):
+        """One computation per tick serves every subscriber with sequenced deltas"""
+        clients = [self.client() for _ in range(3)]
+        for client in clients:
+            client.emit('push_subscribe', {'topics': ['metrics']})
+            assert self.received(client, 'push_snapshot') == \
+                [{'topic': 'metrics', 'seq': 1, 'data': {'cpu': 10, 'memory': 50}}]
+        assert self.calls['metrics'] == 1
+
+        self.hub.tick()  # Nothing changed: nothing sent
+        self.metrics['cpu'] = 20
+        self.hub.tick()
+        assert self.calls['metrics'] == 3
+        for client in clients:
+            assert self.received(client, 'push_delta') == [{'topic': 'metrics', 'seq': 2, 'patch': {'cpu': 20}}]
+        assert self.hub.stats['unchanged'] == 1
+
+    def test_topics_are_scoped(self):
+        """Clients only receive their topics; unsubscribed topics are not computed"""
+        watcher, other = self.client(), self.client()
+        watcher.emit('push_subscribe', {'topics': ['mailbox:orders', 'bogus']})
+        other.emit('push_subscribe', {'topics': ['mailbox:quality']})
+        assert self.received(watcher, 'push_error')[0]['topic'] == 'bogus'
+        other.get_received()
+
+        self.hub.tick()
+        assert self.calls == {'metrics': 0, 'mailbox': ['orders', 'quality', 'orders', 'quality']}
+        assert sorted(self.hub.topics) == ['mailbox:orders', 'mailbox:quality']
+
+        other.emit('push_unsubscribe', {'topics': ['mailbox:quality']})
+        watcher.disconnect()
+        assert self.hub.topics == {}
+        assert self.hub.current('metrics') == {'cpu': 10, 'memory': 50}
+
+    def test_resync_returns_current_snapshot(self):
+        """A client that missed a delta can fetch the full state"""
+        client = self.client()
+        client.emit('push_subscribe', {'topics': ['metrics']})
+        self.metrics['memory'] = 70
+        self.hub.tick()
+        client.get_received()
+
+        client.emit('push_resync', {'topic': 'metrics'})
+        snapshot = self.received(client, 'push_snapshot')[0]
+        assert snapshot == {'topic': 'metrics', 'seq': 2, 'data': {'cpu': 10, 'memory': 70}}
@@ -0,0 +1,123 @@
+"""
+Test Suite for the dashboard response cache
+Tests TTL reuse, single-flight computation, ETag revalidation and invalidation
+"""
+
+import threading
+import time
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from flask import Flask, jsonify, request
+
+from utils.response_cache import ResponseCache
+
+
+class TestResponseCache:
+    """Test the cache behind the polled dashboard endpoints"""
+
+    def setup_method(self):
+        self.cache = ResponseCache()
+        self.calls = []
+        self.app = Flask(__name__)
+
+        @self.app.route('/api/metrics')
+        @self.cache.cached('metrics', ttl=60, args=['limit'])
+        def metrics():
+            self.calls.append(request.args.get('limit'))
+            time.sleep(0.1)
+            return jsonify({'calls': len(self.calls)})
+
+        @self.app.route('/api/broken')
+        @self.cache.cached('broken', ttl=60)
+        def broken():
+            self.calls.append('broken')
+            return jsonify({'success': False}), 503
+
+        self.client = self.app.test_client()
+
+    def test_concurrent_polls_compute_once(self):
+        """Many tabs polling at once share one computation"""
+        responses = []
+
+        def poll():
+            responses.append(self.app.test_client().get('/api/metrics'))
+
+        threads = [threading.Thread(target=poll) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert self.calls == [None]
+        assert {r.get_json()['calls'] for r in responses} == {1}
+        assert len({r.headers['ETag'] for r in responses}) == 1
+        assert self.cache.stats['misses'] == 1
+
+        # Query arguments the view reads are cached separately, others are ignored
+        assert self.client.get('/api/metrics?limit=5').get_json() == {'calls': 2}
+        assert self.client.get('/api/metrics?x=1&limit=5').get_json() == {'calls': 2}
+        assert self.calls == [None, '5']
+        assert self.cache._locks == {}
+
+    def test_if_none_match_returns_304(self):
+        """A current client copy is answered with an empty 304"""
+        first = self.client.get('/api/metrics')
+        assert first.status_code == 200
+        assert first.headers['Cache-Control'] == 'no-cache'
+        assert first.is_json
+
+        etag = first.headers['ETag']
+        second = self.client.get('/api/metrics', headers={'If-None-Match': etag})
+        assert second.status_code == 304
+        assert second.data == b''
+        assert second.headers['ETag'] == etag
+        assert self.client.get('/api/metrics', headers={'If-None-Match': '"stale"'}).status_code == 200
+
+    def test_ttl_and_invalidation(self):
+        """Entries expire after their TTL or when invalidated, with a new ETag"""
+        etag = self.client.get('/api/metrics').headers['ETag']
+
+        self.cache.invalidate('metrics')
+        response = self.client.get('/api/metrics', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+        assert len(self.calls) == 2
+
+        self.cache._entries['metrics'][b''].expires_at = time.monotonic() - 1
+        self.client.get('/api/metrics')
+        assert len(self.calls) == 3
+
+    def test_invalidation_during_computation_is_not_stored(self):
+        """A result computed before an invalidation is served once but not cached"""
+        started = threading.Event()
+        thread = threading.Thread(target=lambda: (started.set(), self.client.get('/api/metrics')))
+        thread.start()
+        started.wait()
+        time.sleep(0.05)
+        self.cache.invalidate()
+        thread.join()
+
+        assert self.client.get('/api/metrics').get_json() == {'calls': 2}
+
+    def test_errors_are_not_cached(self):
+        """Non-200 responses pass through unchanged and are recomputed"""
+        for _ in range(2):
+            response = self.client.get('/api/broken')
+            assert response.status_code == 503
+            assert 'ETag' not in response.headers
+        assert self.calls == ['broken', 'broken']
+
+    def test_variants_are_bounded(self):
+        """Each endpoint keeps at most max_variants entries, dropping expired ones first"""
+        self.cache.max_variants = 3
+        for limit in range(5):
+            self.client.get(f'/api/metrics?limit={limit}')
+        assert set(self.cache._entries['metrics']) == {b'limit=2', b'limit=3', b'limit=4'}
+
+        self.cache._entries['metrics'][b'limit=4'].expires_at = time.monotonic() - 1
+        self.client.get('/api/metrics?limit=9')
+        assert set(self.cache._entries['metrics']) == {b'limit=2', b'limit=3', b'limit=9'}
+        assert self.cache._locks == {}
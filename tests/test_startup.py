@@ -0,0 +1,105 @@
+"""
+Test Suite for lazy subsystem startup
+Tests first-use initialization, parallel warm-up, readiness and the startup profile
+"""
+
+import socket
+import threading
+import time
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from utils.startup import LazyStartup
+
+
+class TestLazyStartup:
+    """Test the registry behind the dashboard's lazy startup"""
+
+    def setup_method(self):
+        self.startup = LazyStartup()
+        self.calls = []
+
+    def slow(self, name, seconds=0.2):
+        def factory():
+            self.calls.append(name)
+            time.sleep(seconds)
+            return name.upper()
+        return factory
+
+    def test_initializes_once_on_first_use(self):
+        """Nothing runs at registration; concurrent first uses share one initialization"""
+        self.startup.register('agents', self.slow('agents'))
+        assert self.calls == []
+        assert self.startup.readiness()['waiting_for'] == ['agents']
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.startup.get('agents'))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == ['AGENTS'] * 4
+        assert self.calls == ['agents']
+
+        profile = self.startup.profile()['subsystems']['agents']
+        assert profile['trigger'] == 'first_use' and profile['seconds'] >= 0.2
+        assert self.startup.readiness()['status'] == 'ready'
+
+    def test_failures_fall_back_and_are_reported(self):
+        """A failing factory yields the default and shows up in readiness"""
+        def broken():
+            raise RuntimeError('no config')
+
+        self.startup.register('scenarios', broken)
+        self.startup.register('catalog', broken, required=False)
+        assert self.startup.get('scenarios', default={}) == {}
+        assert self.startup.readiness() == {  # Optional subsystems do not hold readiness back
+            'ready': True, 'status': 'degraded', 'waiting_for': [], 'failed': ['scenarios'],
+            'subsystems': {'scenarios': 'failed', 'catalog': 'pending'}
+        }
+        assert self.startup.profile()['subsystems']['scenarios']['error'] == 'no config'
+
+    def test_warm_up_runs_in_parallel(self):
+        """Pending subsystems initialize concurrently and are reported as warmed up"""
+        for name in ('agents', 'scenarios', 'timewarp'):
+            self.startup.register(name, self.slow(name, 0.3))
+
+        started = time.monotonic()
+        self.startup.warm_up(max_workers=3).join(5)
+        assert time.monotonic() - started < 0.8
+        assert sorted(self.calls) == ['agents', 'scenarios', 'timewarp']
+        assert {s['trigger'] for s in self.startup.profile()['subsystems'].values()} == {'warm_up'}
+        assert 'warm-up wall time' in self.startup.report()
+
+    def test_non_blocking_get(self):
+        """wait=False returns the default at once and initializes in the background"""
+        self.startup.register('agents', self.slow('agents', 0.3))
+        started = time.monotonic()
+        assert self.startup.get('agents', {}, wait=False) == {}
+        assert time.monotonic() - started < 0.1
+
+        deadline = time.monotonic() + 5
+        while self.startup.get('agents', {}, wait=False) == {} and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert self.startup.get('agents', wait=False) == 'AGENTS'
+        assert self.calls == ['agents']
+
+    def test_warm_up_starts_once_listening(self):
+        """The warm-up waits for the port to accept connections and records the phase"""
+        self.startup.register('agents', self.slow('agents', 0))
+        self.startup.mark('imports')
+
+        server = socket.socket()
+        server.bind(('127.0.0.1', 0))
+        port = server.getsockname()[1]
+        thread = self.startup.warm_up_when_listening(port, timeout=5)
+        time.sleep(0.3)
+        assert self.calls == []
+
+        server.listen()
+        thread.join(5)
+        server.close()
+        assert self.calls == ['agents']
+        assert list(self.startup.profile()['phases']) == ['imports', 'listening']
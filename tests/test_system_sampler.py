@@ -0,0 +1,56 @@
+"""
+Test Suite for the background system sampler
+Tests non-blocking reads, the sampling cadence and the bounded history
+"""
+
+import time
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from utils.system_sampler import SystemSampler
+
+
+class TestSystemSampler:
+    """Test the sampler behind SystemMonitor.get_system_metrics"""
+
+    def setup_method(self):
+        self.sampler = SystemSampler(interval=0.05, history_size=5)
+
+    def teardown_method(self):
+        self.sampler.stop(timeout=1)
+
+    def test_latest_does_not_block(self):
+        """Reads return a complete snapshot without the one-second CPU sleep"""
+        start = time.perf_counter()
+        metrics = self.sampler.latest()
+        assert time.perf_counter() - start < 0.5
+        assert self.sampler.running
+
+        assert 0 <= metrics['system']['cpu_percent'] <= 100
+        assert metrics['system']['process_count'] > 0
+        assert set(metrics['network']) == {'bytes_sent', 'bytes_recv', 'packets_sent', 'packets_recv'}
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            self.sampler.latest()
+        assert time.perf_counter() - start < 0.1
+
+    def test_background_samples_fill_ring_buffer(self):
+        """The thread keeps sampling and the history keeps only the newest entries"""
+        self.sampler.start()
+        deadline = time.monotonic() + 5
+        while len(self.sampler.history) < 5 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        first = self.sampler.get_history()[0]
+        time.sleep(0.2)
+
+        history = self.sampler.get_history()
+        assert len(history) == 5
+        assert first not in history
+        assert self.sampler.latest() is history[-1]
+        assert self.sampler.get_history(limit=2) == history[-2:]
+
+        self.sampler.stop(timeout=1)
+        assert not self.sampler.running
@@ -0,0 +1,150 @@
+"""
+Test Suite for inter-agent task transports
+Tests in-process and Unix socket delivery behind AgentEmailDispatcher
+"""
+
+import os
+import socket
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from agents.agent_email_dispatcher import AgentEmailDispatcher, TaskTypes
+from agents.task_transport import InProcessTransport, TaskQueueHub, UnixSocketTransport
+
+CONFIG_PATH = str(Path(__file__).parent.parent / 'sim' / 'config' / 'company_release2.yaml')
+
+
+class FailingTransport(InProcessTransport):
+    """Transport that never delivers, to exercise the email bridge"""
+
+    name = "failing"
+
+    def send(self, task_data):
+        return False
+
+
+class RecordingEmailTransport:
+    name = "email"
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, task_data):
+        self.sent.append(task_data)
+        return True
+
+
+class TestInProcessTransport:
+    """Test in-process task delivery"""
+
+    def setup_method(self):
+        self.dispatcher = AgentEmailDispatcher(CONFIG_PATH, transport=InProcessTransport(TaskQueueHub()))
+
+    def test_round_trip_preserves_schema(self):
+        """Received tasks match the sent task JSON"""
+        task = self.dispatcher.create_coordination_task(
+            from_agent="info_agent",
+            to_agent="orders_agent",
+            task_type=TaskTypes.INVENTORY_CHECK,
+            content="Check BTN-001 stock",
+            priority="high",
+            data={'sku': 'BTN-001', 'quantity': 5000},
+            due_hours=4
+        )
+
+        assert self.dispatcher.send_task_email(task)
+        received = self.dispatcher.check_for_agent_tasks("orders_agent")
+
+        assert len(received) == 1
+        assert received[0].to_dict() == task.to_dict()
+        assert received[0].data is not task.data
+
+    def test_receive_consumes_and_orders_by_priority(self):
+        """Critical tasks come first and each task is delivered once"""
+        for priority in ['medium', 'critical', 'high', 'medium']:
+            task = self.dispatcher.create_coordination_task(
+                "info_agent", "finance_agent", TaskTypes.APPROVAL_REQUEST,
+                f"{priority} approval", priority=priority
+            )
+            self.dispatcher.send_task_email(task)
+
+        stats = self.dispatcher.get_agent_task_stats("finance_agent")
+        assert stats['pending_tasks'] == 4
+        assert stats['transport'] == 'inprocess'
+
+        first = self.dispatcher.check_for_agent_tasks("finance_agent", limit=2)
+        assert [t.priority for t in first] == ['critical', 'high']
+
+        rest = self.dispatcher.check_for_agent_tasks("finance_agent", limit=10)
+        assert [t.priority for t in rest] == ['medium', 'medium']
+        assert self.dispatcher.check_for_agent_tasks("finance_agent") == []
+
+    def test_email_bridge_on_delivery_failure(self):
+        """The email bridge takes over when the transport cannot deliver"""
+        dispatcher = AgentEmailDispatcher(CONFIG_PATH, transport=FailingTransport(TaskQueueHub()))
+        dispatcher.email_transport = RecordingEmailTransport()
+        task = dispatcher.create_coordination_task(
+            "info_agent", "quality_agent", TaskTypes.ESCALATION, "Escalate")
+
+        assert not dispatcher.send_task_email(task)
+
+        dispatcher.email_bridge = True
+        assert dispatcher.send_task_email(task)
+        assert dispatcher.email_transport.sent[0]['task_id'] == task.task_id
+
+
+class TestUnixSocketTransport:
+    """Test cross-process delivery over Unix domain sockets"""
+
+    def setup_method(self):
+        # Short directory: Unix socket paths are limited to ~100 characters
+        self.socket_dir = tempfile.mkdtemp(prefix='hb_sock_')
+        self.sender = UnixSocketTransport(self.socket_dir)
+        self.receiver = UnixSocketTransport(self.socket_dir)
+
+    def teardown_method(self):
+        self.sender.close()
+        self.receiver.close()
+
+    def test_delivery_between_transports(self):
+        """A task sent by one transport arrives at another's listener"""
+        self.receiver.listen("quality_agent")
+        task_data = {
+            'task_id': 'coord_1',
+            'from_agent': 'orders_agent',
+            'to_agent': 'quality_agent',
+            'task_type': TaskTypes.QUALITY_INVESTIGATION,
+            'priority': 'high',
+            'subject': 'Investigate batch',
+            'content': 'Batch 42 has defects',
+            'data': {'batch': 42},
+            'created_at': datetime.now().isoformat(),
+            'due_at': None,
+            'status': 'pending',
+            'response_data': None
+        }
+
+        assert self.sender.send(task_data)
+        assert self.receiver.receive("quality_agent") == [task_data]
+
+    def test_send_without_listener_fails(self):
+        """Sending to an agent type nobody listens for reports failure"""
+        assert not self.sender.send({'to_agent': 'hr_agent', 'priority': 'medium'})
+
+    def test_live_listener_is_not_taken_over(self):
+        """A second listener for the same agent type fails; a stale socket file is replaced"""
+        self.receiver.listen("quality_agent")
+        with pytest.raises(OSError, match='Another process is listening'):
+            self.sender.listen("quality_agent")
+
+        stale_path = os.path.join(self.socket_dir, "hr_agent.sock")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+            stale.bind(stale_path)
+        self.receiver.listen("hr_agent")
+        assert self.sender.send({'to_agent': 'hr_agent', 'priority': 'medium'})